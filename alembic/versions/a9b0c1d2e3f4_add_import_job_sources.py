@@ -0,0 +1,35 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""add import job sources
+
+Revision ID: a9b0c1d2e3f4
+Revises: f8a9b0c1d2e3
+Create Date: 2026-10-17
+
+Multi-source import jobs list their files in import_jobs.sources and have no
+single file_path.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9b0c1d2e3f4'
+down_revision: Union[str, None] = 'f8a9b0c1d2e3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('import_jobs', sa.Column('sources', sa.JSON(), nullable=True))
+    op.alter_column('import_jobs', 'file_path', existing_type=sa.String(500), nullable=True)
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM import_jobs WHERE file_path IS NULL")
+    op.alter_column('import_jobs', 'file_path', existing_type=sa.String(500), nullable=False)
+    op.drop_column('import_jobs', 'sources')
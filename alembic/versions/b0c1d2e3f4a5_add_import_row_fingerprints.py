@@ -0,0 +1,47 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""add import row fingerprints
+
+Revision ID: b0c1d2e3f4a5
+Revises: a9b0c1d2e3f4
+Create Date: 2026-10-17
+
+Content hash of the last imported row per (source, EAN), so unchanged rows
+of a re-imported price list are skipped.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b0c1d2e3f4a5'
+down_revision: Union[str, None] = 'a9b0c1d2e3f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'import_row_fingerprints',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('source', sa.String(50), nullable=False),
+        sa.Column('ean', sa.String(13), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('row_hash', sa.String(32), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source', 'ean', name='uq_import_row_fingerprints_source_ean')
+    )
+    op.create_index(op.f('ix_import_row_fingerprints_id'), 'import_row_fingerprints', ['id'], unique=False)
+    op.create_index(op.f('ix_import_row_fingerprints_product_id'), 'import_row_fingerprints', ['product_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_import_row_fingerprints_product_id'), table_name='import_row_fingerprints')
+    op.drop_index(op.f('ix_import_row_fingerprints_id'), table_name='import_row_fingerprints')
+    op.drop_table('import_row_fingerprints')
@@ -0,0 +1,79 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""add product_listing projection table
+
+Revision ID: b4c5d6e7f8a9
+Revises: dedc5efc8add
+Create Date: 2026-10-17
+
+The API fills the empty table when it starts (ensure_product_listing);
+POST /api/v1/admin/products/listing/rebuild rebuilds it by hand.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b4c5d6e7f8a9'
+down_revision: Union[str, None] = 'dedc5efc8add'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'product_listing',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('product_id', sa.Integer(), nullable=False),
+        sa.Column('lang', sa.String(5), nullable=False),
+        sa.Column('reference', sa.String(100), nullable=False),
+        sa.Column('ean', sa.String(255), nullable=True),
+        sa.Column('product_type', sa.String(20), nullable=False),
+        sa.Column('condition', sa.String(20), nullable=True),
+        sa.Column('is_active', sa.Boolean(), nullable=True),
+        sa.Column('brand_id', sa.Integer(), nullable=True),
+        sa.Column('title', sa.String(255), nullable=True),
+        sa.Column('sub_title', sa.String(500), nullable=True),
+        sa.Column('simple_description', sa.Text(), nullable=True),
+        sa.Column('image_url', sa.String(500), nullable=True),
+        sa.Column('tax_class_id', sa.Integer(), nullable=True),
+        sa.Column('tax_name', sa.String(100), nullable=True),
+        sa.Column('tax_rate', sa.Float(), nullable=True),
+        sa.Column('tax_included_in_price', sa.Boolean(), nullable=True),
+        sa.Column('price_list', sa.Float(), nullable=True),
+        sa.Column('currency', sa.String(3), nullable=True),
+        sa.Column('discount_type', sa.String(20), nullable=True),
+        sa.Column('discount_value', sa.Float(), nullable=True),
+        sa.Column('discount_label', sa.String(10), nullable=False, server_default='0'),
+        sa.Column('stock_status', sa.String(20), nullable=True),
+        sa.Column('stock_quantity', sa.Integer(), nullable=True),
+        sa.Column('category_ids', sa.JSON(), nullable=True),
+        sa.Column('features', sa.JSON(), nullable=True),
+        sa.Column('attributes', sa.JSON(), nullable=True),
+        sa.Column('date_add', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['product_id'], ['products.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('product_id', 'lang', name='uq_product_listing_product_lang')
+    )
+    op.create_index('ix_product_listing_id', 'product_listing', ['id'], unique=False)
+    op.create_index('ix_product_listing_product_id', 'product_listing', ['product_id'], unique=False)
+    op.create_index('ix_product_listing_brand_id', 'product_listing', ['brand_id'], unique=False)
+    op.create_index('ix_product_listing_lang_active_product', 'product_listing', ['lang', 'is_active', 'product_id'], unique=False)
+    op.create_index('ix_product_listing_lang_date_add', 'product_listing', ['lang', 'date_add'], unique=False)
+    op.create_index('ix_product_listing_lang_created_at', 'product_listing', ['lang', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_product_listing_lang_created_at', table_name='product_listing')
+    op.drop_index('ix_product_listing_lang_date_add', table_name='product_listing')
+    op.drop_index('ix_product_listing_lang_active_product', table_name='product_listing')
+    op.drop_index('ix_product_listing_brand_id', table_name='product_listing')
+    op.drop_index('ix_product_listing_product_id', table_name='product_listing')
+    op.drop_index('ix_product_listing_id', table_name='product_listing')
+    op.drop_table('product_listing')
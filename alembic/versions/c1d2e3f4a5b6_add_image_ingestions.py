@@ -0,0 +1,53 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""add image ingestions
+
+Revision ID: c1d2e3f4a5b6
+Revises: b0c1d2e3f4a5
+Create Date: 2026-10-17
+
+Progress of copying supplier image URLs to Cloudinary.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c1d2e3f4a5b6'
+down_revision: Union[str, None] = 'b0c1d2e3f4a5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'image_ingestions',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('source_url', sa.String(500), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('content_hash', sa.String(64), nullable=True),
+        sa.Column('cdn_url', sa.String(500), nullable=True),
+        sa.Column('public_id', sa.String(255), nullable=True),
+        sa.Column('bytes', sa.Integer(), nullable=True),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source_url')
+    )
+    op.create_index(op.f('ix_image_ingestions_id'), 'image_ingestions', ['id'], unique=False)
+    op.create_index(op.f('ix_image_ingestions_content_hash'), 'image_ingestions', ['content_hash'], unique=False)
+    op.create_index('ix_image_ingestions_status_id', 'image_ingestions', ['status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_image_ingestions_status_id', table_name='image_ingestions')
+    op.drop_index(op.f('ix_image_ingestions_content_hash'), table_name='image_ingestions')
+    op.drop_index(op.f('ix_image_ingestions_id'), table_name='image_ingestions')
+    op.drop_table('image_ingestions')
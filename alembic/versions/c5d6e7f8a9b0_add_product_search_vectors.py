@@ -0,0 +1,99 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""add product search vectors and trigram indexes
+
+Revision ID: c5d6e7f8a9b0
+Revises: b4c5d6e7f8a9
+Create Date: 2026-10-17
+
+Adds product_listing.brand_name and a trigger-maintained search_vector
+(title, brand, sub title and description, stemmed per row language) with a
+GIN index, plus pg_trgm indexes on reference and ean.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5d6e7f8a9b0'
+down_revision: Union[str, None] = 'b4c5d6e7f8a9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    op.add_column('product_listing', sa.Column('brand_name', sa.String(255), nullable=True))
+    op.execute("ALTER TABLE product_listing ADD COLUMN search_vector tsvector")
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION product_listing_search_vector_update() RETURNS trigger AS $$
+        DECLARE
+            cfg regconfig;
+        BEGIN
+            cfg := CASE NEW.lang
+                WHEN 'it' THEN 'italian'
+                WHEN 'en' THEN 'english'
+                WHEN 'fr' THEN 'french'
+                WHEN 'de' THEN 'german'
+                ELSE 'simple'
+            END;
+            NEW.search_vector :=
+                setweight(to_tsvector(cfg, coalesce(NEW.title, '')), 'A') ||
+                setweight(to_tsvector('simple', coalesce(NEW.brand_name, '')), 'B') ||
+                setweight(to_tsvector(cfg, coalesce(NEW.sub_title, '')), 'B') ||
+                setweight(to_tsvector(cfg, coalesce(NEW.simple_description, '')), 'C');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER product_listing_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, sub_title, simple_description, brand_name, lang
+        ON product_listing
+        FOR EACH ROW EXECUTE FUNCTION product_listing_search_vector_update()
+    """)
+
+    # Brand renames reach the projection without a rebuild
+    op.execute("""
+        CREATE OR REPLACE FUNCTION product_listing_brand_name_update() RETURNS trigger AS $$
+        BEGIN
+            UPDATE product_listing SET brand_name = NEW.name WHERE brand_id = NEW.id;
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER brands_listing_name_trigger
+        AFTER UPDATE OF name ON brands
+        FOR EACH ROW WHEN (OLD.name IS DISTINCT FROM NEW.name)
+        EXECUTE FUNCTION product_listing_brand_name_update()
+    """)
+
+    # Backfill (the update also fires the search vector trigger)
+    op.execute("""
+        UPDATE product_listing pl SET brand_name = b.name
+        FROM brands b WHERE b.id = pl.brand_id
+    """)
+    op.execute("UPDATE product_listing SET lang = lang")
+
+    op.execute("CREATE INDEX ix_product_listing_search_vector ON product_listing USING gin (search_vector)")
+    op.execute("CREATE INDEX ix_product_listing_reference_trgm ON product_listing USING gin (reference gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_product_listing_ean_trgm ON product_listing USING gin (ean gin_trgm_ops)")
+
+
+def downgrade() -> None:
+    op.execute("DROP INDEX IF EXISTS ix_product_listing_ean_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_product_listing_reference_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_product_listing_search_vector")
+    op.execute("DROP TRIGGER IF EXISTS brands_listing_name_trigger ON brands")
+    op.execute("DROP FUNCTION IF EXISTS product_listing_brand_name_update()")
+    op.execute("DROP TRIGGER IF EXISTS product_listing_search_vector_trigger ON product_listing")
+    op.execute("DROP FUNCTION IF EXISTS product_listing_search_vector_update()")
+    op.drop_column('product_listing', 'search_vector')
+    op.drop_column('product_listing', 'brand_name')
@@ -0,0 +1,52 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""add order provider payment ref
+
+Revision ID: d2e3f4a5b6c7
+Revises: c1d2e3f4a5b6
+Create Date: 2026-10-17
+
+Indexed copy of payment_info->>'payment_id' (and an index on
+payment_transaction_id) so payment webhooks find their order without
+scanning every order.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2e3f4a5b6c7'
+down_revision: Union[str, None] = 'c1d2e3f4a5b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('orders', sa.Column('provider_payment_ref', sa.String(255), nullable=True))
+
+    # Backfill from the JSON payment info
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("""
+            UPDATE orders
+            SET provider_payment_ref = NULLIF(payment_info->>'payment_id', '')
+            WHERE payment_info IS NOT NULL
+        """)
+    else:
+        op.execute("""
+            UPDATE orders
+            SET provider_payment_ref = NULLIF(CAST(json_extract(payment_info, '$.payment_id') AS TEXT), '')
+            WHERE payment_info IS NOT NULL
+        """)
+
+    op.create_index(op.f('ix_orders_provider_payment_ref'), 'orders', ['provider_payment_ref'], unique=False)
+    op.create_index(op.f('ix_orders_payment_transaction_id'), 'orders', ['payment_transaction_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_orders_payment_transaction_id'), table_name='orders')
+    op.drop_index(op.f('ix_orders_provider_payment_ref'), table_name='orders')
+    op.drop_column('orders', 'provider_payment_ref')
@@ -0,0 +1,65 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""add translation memory and translation jobs
+
+Revision ID: d6e7f8a9b0c1
+Revises: c5d6e7f8a9b0
+Create Date: 2026-10-17
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd6e7f8a9b0c1'
+down_revision: Union[str, None] = 'c5d6e7f8a9b0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'translation_memory',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('source_hash', sa.String(64), nullable=False),
+        sa.Column('source_lang', sa.String(5), nullable=False),
+        sa.Column('target_lang', sa.String(5), nullable=False),
+        sa.Column('source_text', sa.Text(), nullable=False),
+        sa.Column('translated_text', sa.Text(), nullable=False),
+        sa.Column('backend', sa.String(50), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('source_hash', 'source_lang', 'target_lang', name='uq_translation_memory_key')
+    )
+    op.create_index('ix_translation_memory_id', 'translation_memory', ['id'], unique=False)
+
+    op.create_table(
+        'translation_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('entity_type', sa.String(20), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(20), nullable=False, server_default='pending'),
+        sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('error', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_translation_jobs_id', 'translation_jobs', ['id'], unique=False)
+    op.create_index('ix_translation_jobs_entity_id', 'translation_jobs', ['entity_id'], unique=False)
+    op.create_index('ix_translation_jobs_status_id', 'translation_jobs', ['status', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_translation_jobs_status_id', table_name='translation_jobs')
+    op.drop_index('ix_translation_jobs_entity_id', table_name='translation_jobs')
+    op.drop_index('ix_translation_jobs_id', table_name='translation_jobs')
+    op.drop_table('translation_jobs')
+    op.drop_index('ix_translation_memory_id', table_name='translation_memory')
+    op.drop_table('translation_memory')
@@ -0,0 +1,40 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""unique product translation per language
+
+Revision ID: e7f8a9b0c1d2
+Revises: d6e7f8a9b0c1
+Create Date: 2026-10-17
+
+Lets the bulk import upsert translations with ON CONFLICT (product_id, lang).
+Duplicate rows (same product and language) keep the oldest one.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7f8a9b0c1d2'
+down_revision: Union[str, None] = 'd6e7f8a9b0c1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute("""
+        DELETE FROM product_translations t
+        USING product_translations keep
+        WHERE t.product_id = keep.product_id
+          AND t.lang = keep.lang
+          AND t.id > keep.id
+    """)
+    op.create_unique_constraint(
+        'uq_product_translations_product_lang', 'product_translations', ['product_id', 'lang']
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_product_translations_product_lang', 'product_translations', type_='unique')
@@ -0,0 +1,47 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""add warranty registration queue
+
+Revision ID: f4a5b6c7d8e9
+Revises: e3f4a5b6c7d8
+Create Date: 2026-10-17
+
+Pending warranty registrations become a queue processed by a worker:
+idempotency key (one row per order item warranty), attempts, retry time
+and claim time.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a5b6c7d8e9'
+down_revision: Union[str, None] = 'e3f4a5b6c7d8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('warranty_registrations', sa.Column('idempotency_key', sa.String(length=100), nullable=True))
+    op.add_column('warranty_registrations', sa.Column('attempts', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('warranty_registrations', sa.Column('next_attempt_at', sa.DateTime(timezone=True), nullable=True))
+    op.add_column('warranty_registrations', sa.Column('started_at', sa.DateTime(timezone=True), nullable=True))
+    op.create_unique_constraint(
+        'uq_warranty_registrations_idempotency_key', 'warranty_registrations', ['idempotency_key']
+    )
+    op.create_index(
+        'ix_warranty_registrations_status_next_attempt_at', 'warranty_registrations', ['status', 'next_attempt_at']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_warranty_registrations_status_next_attempt_at', table_name='warranty_registrations')
+    op.drop_constraint('uq_warranty_registrations_idempotency_key', 'warranty_registrations', type_='unique')
+    op.drop_column('warranty_registrations', 'started_at')
+    op.drop_column('warranty_registrations', 'next_attempt_at')
+    op.drop_column('warranty_registrations', 'attempts')
+    op.drop_column('warranty_registrations', 'idempotency_key')
@@ -4,7 +4,7 @@
 
 from fastapi import APIRouter, Depends, HTTPException, Header, Query
 from sqlalchemy.orm import Session
-from typing import List
+from typing import List, Optional
 from app.db.session import get_db
 from app.core.config import settings
 from app.schemas.brand_tax import (
@@ -31,14 +31,32 @@ def get_brands_public(
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
     active_only: bool = Query(True),
+    cursor: Optional[str] = Query(None, description="Opaque cursor; pass an empty value to start cursor paging"),
     db: Session = Depends(get_db)
 ):
     """Get all brands with pagination - Public endpoint"""
-    # Get total count
-    total = crud.count_brands(db, active_only=active_only)
+    if cursor is not None:
+        # Keyset paging: follow meta.next_cursor, no total is computed
+        try:
+            brands, next_cursor = crud.get_brands_by_cursor(
+                db, cursor=cursor, limit=limit, active_only=active_only
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        return {
+            "data": brands,
+            "meta": {
+                "limit": limit,
+                "cursor": cursor or None,
+                "next_cursor": next_cursor,
+                "has_next": next_cursor is not None,
+                "has_prev": bool(cursor)
+            }
+        }
     
-    # Get brands for current page
-    brands = crud.get_brands(db, skip=skip, limit=limit, active_only=active_only)
+    # Get brands for current page and total count in one query
+    brands, total = crud.get_brands_page(db, skip=skip, limit=limit, active_only=active_only)
     
     # Calculate pagination metadata
     total_pages = (total + limit - 1) // limit
@@ -78,11 +96,8 @@ def get_tax_classes_public(
     db: Session = Depends(get_db)
 ):
     """Get all tax classes with pagination - Public endpoint"""
-    # Get total count
-    total = crud.count_tax_classes(db, active_only=active_only)
-    
-    # Get tax classes for current page
-    tax_classes = crud.get_tax_classes(db, skip=skip, limit=limit, active_only=active_only)
+    # Get tax classes for current page and total count in one query
+    tax_classes, total = crud.get_tax_classes_page(db, skip=skip, limit=limit, active_only=active_only)
     
     # Calculate pagination metadata
     total_pages = (total + limit - 1) // limit
@@ -138,11 +153,8 @@ def get_brands(
     db: Session = Depends(get_db)
 ):
     """Get all brands with pagination - Public access allowed"""
-    # Get total count
-    total = crud.count_brands(db, active_only=active_only)
-    
-    # Get brands for current page
-    brands = crud.get_brands(db, skip=skip, limit=limit, active_only=active_only)
+    # Get brands for current page and total count in one query
+    brands, total = crud.get_brands_page(db, skip=skip, limit=limit, active_only=active_only)
     
     # Calculate pagination metadata
     total_pages = (total + limit - 1) // limit
@@ -219,11 +231,8 @@ def get_tax_classes(
     db: Session = Depends(get_db)
 ):
     """Get all tax classes with pagination - Public access allowed"""
-    # Get total count
-    total = crud.count_tax_classes(db, active_only=active_only)
-    
-    # Get tax classes for current page
-    tax_classes = crud.get_tax_classes(db, skip=skip, limit=limit, active_only=active_only)
+    # Get tax classes for current page and total count in one query
+    tax_classes, total = crud.get_tax_classes_page(db, skip=skip, limit=limit, active_only=active_only)
     
     # Calculate pagination metadata
     total_pages = (total + limit - 1) // limit
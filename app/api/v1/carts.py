@@ -13,6 +13,7 @@ from app.schemas.cart import (
 )
 from app.crud import cart as crud_cart
 from app.core.security.api_key import verify_api_key
+from app.core.i18n import resolve_translation
 
 router = APIRouter()
 
@@ -175,14 +176,9 @@ def build_cart_response(cart, db: Session) -> dict:
         
         # Get product name from translations (default to Italian)
         product_name = product.reference  # fallback
-        if product.translations:
-            # Try to get Italian translation first
-            italian_translation = next((t for t in product.translations if t.lang == 'it'), None)
-            if italian_translation and italian_translation.title:
-                product_name = italian_translation.title
-            # Fallback to any available translation
-            elif product.translations[0].title:
-                product_name = product.translations[0].title
+        translation = resolve_translation(product.translations, "it", any_fallback=True)
+        if translation and translation.title:
+            product_name = translation.title
         
         items_response.append({
             "id": item.id,
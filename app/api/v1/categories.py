@@ -20,6 +20,8 @@ from app.schemas.category import (
 )
 from app.crud import category as crud_category
 from app.core.security.api_key import verify_api_key
+from app.core.i18n import resolve_translation, SUPPORTED_LANGS
+from app.services.category_tree import category_tree
 
 router = APIRouter()
 
@@ -114,13 +116,13 @@ async def get_all_categories(
             },
         }
     
-    # Get total count
+    # Get categories for current page and total count
     if parent_only:
-        total = crud_category.count_main_categories(db)
-        categories = crud_category.get_main_categories(db, lang, skip=skip, limit=limit)
+        categories, total = crud_category.get_main_categories(db, lang, skip=skip, limit=limit)
     else:
-        total = crud_category.count_all_categories(db, active_only=active_only)
-        categories = crud_category.get_all_categories(db, lang, active_only=active_only, skip=skip, limit=limit)
+        categories, total = crud_category.get_all_categories_page(
+            db, lang, active_only=active_only, skip=skip, limit=limit
+        )
     
     # Format response
     categories_data = [
@@ -189,7 +191,7 @@ async def get_main_categories(
         lang = "it"  # Default to Italian
     
     # Get main categories
-    categories = crud_category.get_main_categories(db, lang)
+    categories, _ = crud_category.get_main_categories(db, lang)
     
     # Format response
     categories_data = [
@@ -197,6 +199,8 @@ async def get_main_categories(
             id=cat.id,
             name=cat.name,
             slug=cat.slug,
+            image=cat.image,
+            icon=cat.icon,
             sort_order=cat.sort_order,
             is_active=cat.is_active,
             parent_id=cat.parent_id,
@@ -214,6 +218,42 @@ async def get_main_categories(
     }
 
 
+@router.get("/v1/categories/tree")
+async def get_category_tree(
+    lang: Optional[str] = Query(
+        default="it",
+        description="Language code: it, en, fr, de, ar"
+    ),
+    active_only: bool = Query(
+        default=True,
+        description="Leave out inactive categories (and everything below them)"
+    ),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the whole category tree, nested
+    
+    - **lang**: Language code (default: it) - Supported: it, en, fr, de, ar
+    - **active_only**: Only active categories (default: true)
+    
+    Served from the in-memory category tree snapshot.
+    Public endpoint - No API Key required
+    """
+    if lang not in SUPPORTED_LANGS:
+        lang = "it"
+    
+    tree, total = category_tree.get(db).tree(lang, active_only)
+    
+    return {
+        "data": tree,
+        "meta": {
+            "total": total,
+            "requested_lang": lang,
+            "resolved_lang": lang
+        }
+    }
+
+
 @router.get(
     "/v1/categories/{category_id}"
 )
@@ -252,15 +292,10 @@ async def get_category_by_id(
     category_name = category.name
     category_slug = category.slug
     
-    if category.translations:
-        translation = next((t for t in category.translations if t.lang == lang), None)
-        if not translation and lang != "it":
-            # Fallback to Italian
-            translation = next((t for t in category.translations if t.lang == "it"), None)
-        
-        if translation:
-            category_name = translation.name
-            category_slug = translation.slug
+    translation = resolve_translation(category.translations, lang)
+    if translation:
+        category_name = translation.name
+        category_slug = translation.slug
     
     return {
         "data": {
@@ -347,7 +382,7 @@ async def get_category_children(
     - Meta information about parent and language
     """
     # Check if parent category exists
-    parent = crud_category.get_category(db, category_id)
+    parent = category_tree.get(db).get(category_id)
     if not parent:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -421,12 +456,9 @@ async def get_category_subcategories(
     - Returns all children under the category
     """
     # Validate parent category exists and is active
-    parent = db.query(Category).filter(
-        Category.id == category_id,
-        Category.is_active == True
-    ).first()
+    parent = category_tree.get(db).get(category_id)
     
-    if not parent:
+    if not parent or not parent.is_active:
         raise HTTPException(
             status_code=404,
             detail=f"Category with ID {category_id} not found or not active"
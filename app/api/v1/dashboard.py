@@ -25,6 +25,7 @@ from app.models.product import Product, ProductTranslation
 from app.models.order import Order
 from app.models.payment import Payment
 from app.core.security.dependencies import get_current_active_user
+from app.crud import product_listing as crud_listing
 
 router = APIRouter()
 
@@ -63,6 +64,27 @@ def get_current_admin_user(
     return user
 
 
+def build_latest_product_items(db: Session, lang: str, limit: int) -> List[DashboardProductItem]:
+    """Latest active products (by created_at) from the product_listing projection"""
+    if lang not in crud_listing.LISTING_LANGS:
+        lang = "it"
+    
+    rows = crud_listing.get_recent_listing(db, lang=lang, limit=limit, order_field="created_at")
+    
+    return [
+        DashboardProductItem(
+            id=row.product_id,
+            title=row.title or f"Product {row.product_id}",
+            sku=row.reference,
+            price=float(row.price_list or 0.0),
+            currency="EUR",
+            image=row.image_url,
+            created_at=row.created_at
+        )
+        for row in rows
+    ]
+
+
 def calculate_percentage_change(current: float, previous: float) -> float:
     """Calculate percentage change between two values"""
     if previous == 0:
@@ -235,52 +257,7 @@ async def get_latest_products(
     Returns the most recently created products with their basic info
     """
     
-    # Query latest products
-    products = db.query(Product).filter(
-        Product.is_active == True
-    ).order_by(desc(Product.created_at)).limit(limit).all()
-    
-    # Build response items
-    items = []
-    for product in products:
-        # Get translation for requested language
-        title = None
-        translation = None
-        
-        if product.translations:
-            # Try requested language
-            translation = next((t for t in product.translations if t.lang == lang), None)
-            # Fallback to Italian
-            if not translation:
-                translation = next((t for t in product.translations if t.lang == "it"), None)
-            # Last fallback
-            if not translation and product.translations:
-                translation = product.translations[0]
-        
-        if translation:
-            title = translation.title
-        else:
-            title = f"Product {product.id}"
-        
-        # Get first image
-        image_url = None
-        if product.images and len(product.images) > 0:
-            # Sort by position and get first
-            sorted_images = sorted(product.images, key=lambda x: x.position or 999)
-            image_url = sorted_images[0].url if sorted_images else None
-        
-        # Get price
-        price = product.price_list if product.price_list else 0.0
-        
-        items.append(DashboardProductItem(
-            id=product.id,
-            title=title,
-            sku=product.reference,
-            price=float(price),
-            currency="EUR",
-            image=image_url,
-            created_at=product.created_at
-        ))
+    items = build_latest_product_items(db, lang, limit)
     
     return DashboardProductsResponse(
         items=items,
@@ -432,33 +409,7 @@ async def get_crm_live_data(
     )
     
     # Get latest products
-    products = db.query(Product).filter(Product.is_active == True).order_by(desc(Product.created_at)).limit(limit_products).all()
-    product_items = []
-    for product in products:
-        title = None
-        translation = next((t for t in product.translations if t.lang == lang), None) if product.translations else None
-        if not translation and product.translations:
-            translation = next((t for t in product.translations if t.lang == "it"), None)
-        if not translation and product.translations:
-            translation = product.translations[0]
-        title = translation.title if translation else f"Product {product.id}"
-        
-        image_url = None
-        if product.images:
-            sorted_images = sorted(product.images, key=lambda x: x.position or 999)
-            image_url = sorted_images[0].url if sorted_images else None
-        
-        price = product.price_list if product.price_list else 0.0
-        
-        product_items.append(DashboardProductItem(
-            id=product.id,
-            title=title,
-            sku=product.reference,
-            price=float(price),
-            currency="EUR",
-            image=image_url,
-            created_at=product.created_at
-        ))
+    product_items = build_latest_product_items(db, lang, limit_products)
     
     # Get latest orders (with payment info)
     orders = db.query(Order).order_by(desc(Order.created_at)).limit(limit_payments).all()
@@ -9,6 +9,8 @@ from datetime import datetime
 from app.db.session import get_db
 from app.schemas.health import HealthResponse
 from app.core.security.api_key import verify_api_key
+from app.core.config import settings
+from app.integrations.http import HTTP2, latency_histograms
 
 router = APIRouter()
 
@@ -35,3 +37,23 @@ async def health_check(
         timestamp=datetime.now(),
         database=db_status
     )
+
+
+@router.get("/health/integrations")
+async def integrations_health(
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Latency of the payment and warranty integrations
+    
+    Request durations since startup per provider endpoint, as cumulative
+    buckets in seconds ("0.5": requests answered within 0.5s), with the
+    number of failed requests (errors, 4xx/5xx answers).
+    
+    **Requirements:**
+    - API Key (in header X-API-Key)
+    """
+    return {
+        "http2": HTTP2 and settings.INTEGRATION_HTTP2,
+        "providers": latency_histograms()
+    }
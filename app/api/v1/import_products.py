@@ -5,24 +5,24 @@
 """
 Product Import API Endpoints
 """
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query
 from sqlalchemy.orm import Session
 from pathlib import Path
-import time
-import tempfile
 import shutil
-from typing import Literal, Optional
+import uuid
+from typing import List, Literal, Optional
 
+from app.core.config import settings
 from app.db.session import get_db
 from app.schemas.import_products import (
-    ImportReport,
-    ImportErrorDetail,
     ProductStatsResponse,
-    EnrichmentReport,
+    ImportJobResponse,
+    ImportJobChunkStats,
 )
-from app.services.product_import import ProductImportService, normalize_ean, is_valid_ean13
-from app.services.product_enrichment import EnrichmentReader
-from app.crud.product_import import import_products_batch, enrich_products_batch
+from app.services.product_import import ProductImportService
+from app.services.import_worker import import_worker
+from app.services.multi_source_import import SOURCE_PRIORITY
+from app.crud import import_job as crud_import_job
 from app.core.security.api_key import verify_api_key
 
 
@@ -44,8 +44,39 @@ ENRICHMENT_DEFAULTS = {
 COMMERCE_ALLOWED_FILES = set(ENRICHMENT_DEFAULTS.values())
 
 
-@router.post("/import/products", response_model=ImportReport, status_code=status.HTTP_200_OK)
-async def import_products(
+def _store_upload(file: UploadFile) -> Path:
+    """Keep an uploaded file until its import job ends"""
+    upload_dir = Path(settings.IMPORT_UPLOAD_DIR)
+    upload_dir.mkdir(parents=True, exist_ok=True)
+    file_path = upload_dir / f"{uuid.uuid4().hex}.xlsx"
+    with open(file_path, "wb") as out:
+        shutil.copyfileobj(file.file, out)
+    return file_path
+
+
+def _job_response(job) -> ImportJobResponse:
+    return ImportJobResponse(
+        id=job.id,
+        kind=job.kind,
+        source=job.source,
+        filename=job.filename,
+        status=job.status,
+        dry_run=job.dry_run,
+        attempts=job.attempts,
+        chunks_done=job.chunks_done,
+        rows_read=job.rows_read,
+        progress=crud_import_job.job_progress(job),
+        chunks=[ImportJobChunkStats.model_validate(chunk) for chunk in job.chunks],
+        report=job.report,
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+@router.post("/import/products", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def import_products(
     source: Literal["effezzeta", "erregame", "dixe", "telefonia", "informatica", "giochi", "cartoleria", "accessori", "commerce_clarity"],
     filename: Optional[str] = None,
     dry_run: bool = False,
@@ -55,17 +86,15 @@ async def import_products(
     _: str = Depends(verify_api_key)
 ):
     """
-    Import products from Excel file
+    Queue a product import from an Excel file
     
     - **source**: Source of the import (effezzeta, erregame, dixe, commerce_clarity)
     - **dry_run**: If True, validates data without saving to database
-    - **verbose_errors**: If True, returns detailed error list (default: False, summary only)
+    - **verbose_errors**: If True, the report has the detailed error list (default: False, summary only)
     - **file**: Excel file to import (optional - uses default file from excel/ folder if not provided)
     
-    Returns import report with statistics, error summary, and sample imports
+    Returns the queued job; poll GET /import/jobs/{job_id} for progress and the import report
     """
-    start_time = time.time()
-
     # Special path: commerce_clarity uses the five fixed EDS files only
     if source == "commerce_clarity":
         if file:
@@ -75,9 +104,6 @@ async def import_products(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"File '{original_name}' is not allowed. Use one of: {sorted(COMMERCE_ALLOWED_FILES)}"
                 )
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp_file:
-                shutil.copyfileobj(file.file, tmp_file)
-                file_path = Path(tmp_file.name)
         else:
             if not filename:
                 raise HTTPException(
@@ -89,279 +115,91 @@ async def import_products(
                     status_code=status.HTTP_400_BAD_REQUEST,
                     detail=f"File '{filename}' is not allowed. Use one of: {sorted(COMMERCE_ALLOWED_FILES)}"
                 )
-            file_path = EXCEL_DIR / filename
-            if not file_path.exists():
-                raise HTTPException(
-                    status_code=status.HTTP_404_NOT_FOUND,
-                    detail=f"File not found: {file_path}"
-                )
-
-        try:
-            reader = EnrichmentReader(file_path)
-            raw_rows = reader.read()
-            total_rows = len(raw_rows)
-
-            valid_rows = []
-            skipped_rows = []
-            for row in raw_rows:
-                row_number = row.get("row_number", 0)
-                raw_ean = row.get("ean")
-                if not raw_ean:
-                    skipped_rows.append({
-                        "row_number": row_number,
-                        "ean": None,
-                        "reason": "missing_ean",
-                        "details": "Product has no EAN code"
-                    })
-                    continue
-
-                ean = normalize_ean(raw_ean)
-                if not is_valid_ean13(ean):
-                    skipped_rows.append({
-                        "row_number": row_number,
-                        "ean": raw_ean,
-                        "reason": "invalid_ean13",
-                        "details": "EAN must be exactly 13 digits"
-                    })
-                    continue
-
-                title = row.get("title")
-                if not title:
-                    skipped_rows.append({
-                        "row_number": row_number,
-                        "ean": ean,
-                        "reason": "missing_title",
-                        "details": "Product has no title"
-                    })
-                    continue
-
-                valid_rows.append({
-                    "ean": ean,
-                    "title": title,
-                    "price": row.get("price"),
-                    "stock": 0,
-                    "brand_name": row.get("brand_name"),
-                    "category_path": [],
-                    "description": row.get("description"),
-                    "image_urls": row.get("image_urls") or [],
-                    "row_number": row_number,
-                })
-
-            chunk_size = ProductImportService.CHUNK_SIZE
-            chunks = [valid_rows[i:i + chunk_size] for i in range(0, len(valid_rows), chunk_size)]
-
-            total_created = 0
-            total_updated = 0
-            total_skipped_dupe = 0
-            total_skipped_manual = 0
-            all_errors = []
-            all_samples = []
-
-            for idx, chunk in enumerate(chunks):
-                stats = import_products_batch(db, chunk, dry_run, batch_index=idx)
-                total_created += stats["created"]
-                total_updated += stats["updated"]
-                total_skipped_dupe += stats.get("skipped_duplicate", 0)
-                total_skipped_manual += stats.get("skipped_manual", 0)
-                all_errors.extend(stats["errors"])
-                all_samples.extend(stats["samples"])
-
-            skipped_errors = [
-                {
-                    "row_number": skip["row_number"],
-                    "ean": skip.get("ean"),
-                    "reason": skip["reason"],
-                    "details": skip.get("details"),
-                }
-                for skip in skipped_rows
-            ]
-            all_errors.extend(skipped_errors)
-
-            errors_summary: dict[str, int] = {}
-            for error in all_errors:
-                reason = error.get("reason", "unknown")
-                errors_summary[reason] = errors_summary.get(reason, 0) + 1
-
-            duration = time.time() - start_time
-
-            invalid_count = errors_summary.get("invalid_ean13", 0)
-            duplicate_count = errors_summary.get("duplicate_ean_in_batch", 0) + errors_summary.get("duplicate_ean_db", 0)
-            manual_count = errors_summary.get("manual_blocked", 0)
-
-            total_skipped = len(skipped_rows) + duplicate_count + manual_count
-
-            report = ImportReport(
-                source=source,
-                total_rows=total_rows,
-                created=total_created,
-                updated=total_updated,
-                skipped=total_skipped,
-                skipped_invalid_ean13=invalid_count,
-                skipped_duplicate=duplicate_count,
-                skipped_manual=manual_count,
-                errors_summary=errors_summary,
-                errors=[ImportErrorDetail(**e) for e in all_errors] if verbose_errors else [],
-                errors_sample=[ImportErrorDetail(**e) for e in all_errors[:20]],
-                sample_imports=all_samples[:5],
-                duration_seconds=round(duration, 2),
-                dry_run=dry_run,
-            )
-
-            return report
-
-        except ValueError as e:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=str(e)
-            )
-        except Exception as e:
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f"Import failed: {str(e)}"
-            )
-        finally:
-            if file and file_path.exists():
-                try:
-                    file_path.unlink()
-                except:
-                    pass
-
-    # Determine file path for the legacy sources
-    if file:
-        # Save uploaded file temporarily
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp_file:
-            shutil.copyfileobj(file.file, tmp_file)
-            file_path = Path(tmp_file.name)
-    else:
+            resolved_name = filename
+    elif not file:
         # Use default file from excel/ folder
-        file_mapping = {
-            "effezzeta": "Listino-prodotti.xlsx",
-            "erregame": "erregame_organized.xlsx",
-            "dixe": "Dixe_organized.xlsx",
-            "telefonia": "Listino Telefonia web.xlsx",
-            "informatica": "Listino INFORMATICA web.xlsx",
-            "giochi": "Listino GIOCHI.xlsx",
-            "cartoleria": "Listino Cartoleria.xlsx",
-            "accessori": "Listino ACCESSORI telefonia.xlsx",
-        }
-
-        resolved_name = file_mapping.get(source)
+        resolved_name = ProductImportService.DEFAULT_FILES.get(source)
         if not resolved_name:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"No default file configured for source: {source}"
             )
 
+    if file:
+        file_path = _store_upload(file)
+        original_name = Path(file.filename or "").name
+    else:
         file_path = EXCEL_DIR / resolved_name
-
+        original_name = resolved_name
         if not file_path.exists():
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"File not found: {file_path}"
             )
-    
-    try:
-        # Initialize import service
-        import_service = ProductImportService(source)
-        
-        # Read Excel file
-        raw_rows = import_service.read_excel_file(file_path)
-        total_rows = len(raw_rows)
-        
-        # Map rows to standard format
-        valid_rows, skipped_rows = import_service.map_rows(raw_rows)
-        
-        # Split into chunks
-        chunks = import_service.chunk_rows(valid_rows)
-        
-        # Process chunks
-        total_created = 0
-        total_updated = 0
-        all_errors = []
-        all_samples = []
-        total_skipped_invalid = 0
-        total_skipped_dupe = 0
-        total_skipped_manual = 0
-        
-        for idx, chunk in enumerate(chunks):
-            stats = import_products_batch(db, chunk, dry_run, batch_index=idx)
-            total_created += stats["created"]
-            total_updated += stats["updated"]
-            total_skipped_invalid += stats.get("skipped_invalid_ean13", 0)
-            total_skipped_dupe += stats.get("skipped_duplicate", 0)
-            total_skipped_manual += stats.get("skipped_manual", 0)
-            all_errors.extend(stats["errors"])
-            all_samples.extend(stats["samples"])
-        
-        # Add skipped rows to errors
-        skipped_errors = [
-            {
-                "row_number": skip["row_number"],
-                "ean": skip.get("ean"),
-                "reason": skip["reason"],
-                "details": skip.get("details")
-            }
-            for skip in skipped_rows
-        ]
-        all_errors.extend(skipped_errors)
-        
-        # Build errors summary
-        errors_summary = {}
-        for error in all_errors:
-            reason = error.get("reason", "unknown")
-            errors_summary[reason] = errors_summary.get(reason, 0) + 1
-        
-        # Calculate duration
-        duration = time.time() - start_time
 
-        invalid_count = errors_summary.get("invalid_ean13", 0)
-        duplicate_count = errors_summary.get("duplicate_ean_in_batch", 0) + errors_summary.get("duplicate_ean_db", 0)
-        manual_count = errors_summary.get("manual_blocked", 0)
-        total_skipped = len(skipped_rows) + duplicate_count + manual_count
-        
-        # Build report
-        report = ImportReport(
-            source=source,
-            total_rows=total_rows,
-            created=total_created,
-            updated=total_updated,
-            skipped=total_skipped,
-            skipped_invalid_ean13=invalid_count,
-            skipped_duplicate=duplicate_count,
-            skipped_manual=manual_count,
-            errors_summary=errors_summary,
-            errors=[ImportErrorDetail(**e) for e in all_errors] if verbose_errors else [],
-            errors_sample=[ImportErrorDetail(**e) for e in all_errors[:20]],  # First 20 errors
-            sample_imports=all_samples[:5],  # First 5 only
-            duration_seconds=round(duration, 2),
-            dry_run=dry_run
-        )
-        
-        return report
-    
-    except ValueError as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=str(e)
-        )
+    job = crud_import_job.create_import_job(
+        db,
+        kind="import",
+        file_path=str(file_path),
+        source=source,
+        filename=original_name,
+        delete_file=bool(file),
+        dry_run=dry_run,
+        verbose_errors=verbose_errors
+    )
+    import_worker.wake()
+    return _job_response(job)
+
+
+@router.post("/import/products/multi", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def import_products_multi(
+    sources: Optional[List[Literal["effezzeta", "erregame", "dixe", "telefonia", "informatica", "giochi", "cartoleria", "accessori", "commerce_clarity"]]] = Query(None),
+    dry_run: bool = False,
+    verbose_errors: bool = False,
+    db: Session = Depends(get_db),
+    _: str = Depends(verify_api_key)
+):
+    """
+    Queue one import of several sources' default files (nightly supplier refresh)
     
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Import failed: {str(e)}"
-        )
+    - **sources**: Sources in priority order (default: every source with a default file,
+      in SOURCE_PRIORITY order). commerce_clarity stands for its five EDS files.
+    - When several files have the same EAN, the highest-priority row wins and its
+      empty fields (price, brand, categories, description, images) are filled from the others.
     
-    finally:
-        # Clean up temporary file if uploaded
-        if file and file_path.exists():
-            try:
-                file_path.unlink()
-            except:
-                pass
+    Workbooks are parsed in parallel processes; the report lists rows and parse time per source.
+    """
+    sources = list(dict.fromkeys(sources or [s for s in SOURCE_PRIORITY if s != "commerce_clarity"]))
+    files = []
+    for source in sources:
+        if source == "commerce_clarity":
+            names = list(ENRICHMENT_DEFAULTS.values())
+        else:
+            names = [ProductImportService.DEFAULT_FILES[source]]
+        for name in names:
+            file_path = EXCEL_DIR / name
+            if not file_path.exists():
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail=f"File not found: {file_path}"
+                )
+            files.append({"source": source, "file_path": str(file_path)})
+
+    job = crud_import_job.create_import_job(
+        db,
+        kind="multi",
+        source="multi",
+        filename=", ".join(Path(f["file_path"]).name for f in files)[:255],
+        sources=files,
+        dry_run=dry_run,
+        verbose_errors=verbose_errors
+    )
+    import_worker.wake()
+    return _job_response(job)
 
 
-@router.post("/import/products/enrich", response_model=EnrichmentReport, status_code=status.HTTP_200_OK)
-async def enrich_products(
+@router.post("/import/products/enrich", response_model=ImportJobResponse, status_code=status.HTTP_202_ACCEPTED)
+def enrich_products(
     filename: Optional[str] = None,
     dry_run: bool = False,
     verbose_errors: bool = False,
@@ -370,20 +208,19 @@ async def enrich_products(
     _: str = Depends(verify_api_key),
 ):
     """
-    Enrich existing products using EAN as the only key.
+    Queue enrichment of existing products using EAN as the only key.
 
     Rules:
     - Skip rows where EAN is missing or not found in DB.
     - Only fill missing fields (title/description/brand/images/price-if-empty).
     - Never touch stock or categories.
-    """
-    start_time = time.time()
 
+    Returns the queued job; its report is an EnrichmentReport.
+    """
     # Determine file path
     if file:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp_file:
-            shutil.copyfileobj(file.file, tmp_file)
-            file_path = Path(tmp_file.name)
+        file_path = _store_upload(file)
+        original_name = Path(file.filename or "").name
     else:
         # Pick default file
         chosen = filename
@@ -394,49 +231,40 @@ async def enrich_products(
             chosen = ENRICHMENT_DEFAULTS[chosen]
 
         file_path = EXCEL_DIR / chosen
+        original_name = chosen
         if not file_path.exists():
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"File not found: {file_path}"
             )
 
-    try:
-        reader = EnrichmentReader(file_path)
-        rows = reader.read()
-        total_rows = len(rows)
-
-        stats = enrich_products_batch(db, rows, dry_run=dry_run, batch_index=0)
-
-        errors_summary: dict[str, int] = {}
-        for err in stats["errors"]:
-            reason = err.get("reason", "unknown")
-            errors_summary[reason] = errors_summary.get(reason, 0) + 1
+    job = crud_import_job.create_import_job(
+        db,
+        kind="enrich",
+        file_path=str(file_path),
+        filename=original_name,
+        delete_file=bool(file),
+        dry_run=dry_run,
+        verbose_errors=verbose_errors
+    )
+    import_worker.wake()
+    return _job_response(job)
 
-        duration = time.time() - start_time
 
-        return EnrichmentReport(
-            total_rows=total_rows,
-            matched=stats["matched"],
-            skipped=stats["skipped"],
-            errors=len(stats["errors"]),
-            errors_summary=errors_summary,
-            matched_samples=stats.get("matched_samples", [])[:5],
-            skipped_samples=stats.get("skipped_samples", [])[:5],
-            errors_sample=[ImportErrorDetail(**e) for e in stats["errors"][:20]] if verbose_errors else [],
-            duration_seconds=round(duration, 2),
-            dry_run=dry_run,
+@router.get("/import/jobs/{job_id}", response_model=ImportJobResponse)
+def get_import_job(
+    job_id: int,
+    db: Session = Depends(get_db),
+    _: str = Depends(verify_api_key)
+):
+    """Import job status, live progress, per-chunk statistics and (when done) the report"""
+    job = crud_import_job.get_import_job(db, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Import job {job_id} not found"
         )
-
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=f"Enrichment failed: {str(e)}")
-    finally:
-        if file and file_path.exists():
-            try:
-                file_path.unlink()
-            except:
-                pass
+    return _job_response(job)
 
 
 @router.get("/admin/stats/products", response_model=ProductStatsResponse, status_code=status.HTTP_200_OK)
@@ -2,7 +2,8 @@
 # © 2026 Muthana. All rights reserved.
 # Unauthorized copying or distribution is prohibited.
 
-from fastapi import APIRouter, Depends, HTTPException, status, Header, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Header, Query, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
 from typing import Optional, List
 from datetime import datetime
@@ -16,6 +17,9 @@ from app.schemas.order import (
 )
 from app.crud.order import crud_order
 from app.crud import cart as crud_cart
+from app.crud.warranty_registration import crud_warranty_registration
+from app.crud.payment_reconciliation import reconcile_payments
+from app.services.payment_reconciliation import check_payment
 from app.core.security.api_key import verify_api_key
 from app.core.security.dependencies import get_current_active_user
 from app.models.user import User
@@ -114,12 +118,28 @@ async def create_order_from_cart(
     - Success message with order ID
     - Or error message with failure reason
     """
-    # Create order directly (no cart needed)
+    # Auto-verify payment status at order creation; if it fails the order
+    # stays pending until the webhook or the reconciliation updates it
+    payment_status = "pending"
     try:
-        order = crud_order.create_direct(
+        payment_status, _ = await check_payment(
+            order_data.payment_info.payment_type, order_data.payment_info.payment_id
+        )
+        payment_status = payment_status or "pending"
+    except Exception as e:
+        import logging
+        logging.getLogger(__name__).warning(
+            f"Failed to verify payment {order_data.payment_info.payment_id} at order creation: {str(e)}"
+        )
+    
+    # Create order directly (no cart needed); in a thread, as stock row locks may wait
+    try:
+        order = await run_in_threadpool(
+            crud_order.create_direct,
             db=db,
             order_data=order_data,
-            user_id=order_data.user_id
+            user_id=order_data.user_id,
+            payment_status=payment_status
         )
         
         return OrderCreateResponse(
@@ -263,7 +283,7 @@ async def get_payment_url(
             cancel_url = f"{settings.FRONTEND_URL}/payment-cancel"
             
             # Create PayPlug payment
-            payment_result = payplug_service.create_payment(
+            payment_result = await payplug_service.create_payment(
             amount=float(request.total),
             order_id=f"temp_{request.user_id}_{int(datetime.now().timestamp())}",
             customer_email=user_email,
@@ -296,7 +316,7 @@ async def get_payment_url(
             cancel_url = f"{base_url}/api/orders/payment/cancel"
             
             # Create PayPal payment
-            payment_result = paypal_service.create_payment(
+            payment_result = await paypal_service.create_payment(
                 amount=request.total,
                 order_id=request.user_id,
                 customer_email=user_email or "test@example.com",
@@ -344,7 +364,7 @@ async def get_payment_url(
             ]
             
             # Create Floa payment
-            payment_result = floa_service.create_payment(
+            payment_result = await floa_service.create_payment(
                 amount=request.total,
                 order_id=request.user_id,
                 customer_email=user_email or "test@example.com",
@@ -440,7 +460,7 @@ async def verify_payment_status(
                 )
             
             # Retrieve payment details from PayPlug
-            payment = payplug_service.retrieve_payment(payment_id)
+            payment = await payplug_service.retrieve_payment(payment_id)
             
             if not payment:
                 raise HTTPException(
@@ -449,52 +469,36 @@ async def verify_payment_status(
                 )
             
             # Determine status
-            is_paid = payment.is_paid
+            is_paid = bool(payment.get('is_paid'))
             if is_paid:
                 status_text = "completed"
-            elif payment.failure:
+            elif payment.get('failure'):
                 status_text = "failed"
             else:
                 status_text = "pending"
             
             # Get timestamps
             from datetime import datetime
-            created_at = datetime.fromtimestamp(payment.created_at).isoformat() if payment.created_at else None
-            paid_at = datetime.fromtimestamp(payment.paid_at).isoformat() if hasattr(payment, 'paid_at') and payment.paid_at else None
+            created_at = datetime.fromtimestamp(payment['created_at']).isoformat() if payment.get('created_at') else None
+            paid_at = datetime.fromtimestamp(payment['paid_at']).isoformat() if payment.get('paid_at') else None
             
             # Get customer email
-            customer_email = None
-            try:
-                if hasattr(payment, 'customer') and payment.customer:
-                    if isinstance(payment.customer, dict):
-                        customer_email = payment.customer.get('email')
-                    elif hasattr(payment.customer, 'email'):
-                        customer_email = payment.customer.email
-            except (TypeError, KeyError, AttributeError):
-                customer_email = None
+            customer = payment.get('billing') or payment.get('customer') or {}
+            customer_email = customer.get('email') if isinstance(customer, dict) else None
             
             # Get transaction number
-            transaction_number = None
-            try:
-                if hasattr(payment, 'authorization') and payment.authorization:
-                    if isinstance(payment.authorization, dict):
-                        transaction_number = payment.authorization.get('authorization_id') or payment.authorization.get('id')
-                    elif hasattr(payment.authorization, 'authorization_id'):
-                        transaction_number = payment.authorization.authorization_id
-                    elif hasattr(payment.authorization, 'id'):
-                        transaction_number = payment.authorization.id
-                
-                if not transaction_number and hasattr(payment, 'card') and payment.card:
-                    if isinstance(payment.card, dict):
-                        transaction_number = payment.card.get('id') or payment.card.get('transaction_id')
-            except (TypeError, KeyError, AttributeError):
-                transaction_number = None
+            authorization = payment.get('authorization') or {}
+            card = payment.get('card') or {}
+            transaction_number = (
+                authorization.get('authorization_id') or authorization.get('id')
+                or card.get('id') or card.get('transaction_id')
+            )
             
             # Build response
             response_data = {
-                "payment_id": payment.id,
+                "payment_id": payment['id'],
                 "status": status_text,
-                "amount": payment.amount / 100,
+                "amount": payment['amount'] / 100,
                 "is_paid": is_paid,
             }
             
@@ -507,7 +511,7 @@ async def verify_payment_status(
                 )
             
             # Get deal status from Floa
-            deal = floa_service.get_deal_status(payment_id)
+            deal = await floa_service.get_deal_status(payment_id)
             
             if not deal:
                 raise HTTPException(
@@ -586,7 +590,7 @@ async def verify_payment_status(
                 )
             
             # Get order details from PayPal
-            order = paypal_service.get_order_details(payment_id)
+            order = await paypal_service.get_order_details(payment_id)
             
             if not order:
                 raise HTTPException(
@@ -668,24 +672,8 @@ async def verify_payment_status(
         # AUTO-UPDATE ORDER IN DATABASE
         # ========================================
         # Find order with this payment_id and update its status
-        from app.models.order import Order
-        from app.api.v1.webhooks import auto_register_warranties
-        
-        # Try to find order by payment_transaction_id first
-        order = db.query(Order).filter(
-            Order.payment_transaction_id == payment_id
-        ).first()
-        
-        # If not found, search in payment_info JSON field
-        if not order:
-            all_orders = db.query(Order).filter(
-                Order.payment_info.isnot(None)
-            ).all()
-            
-            for o in all_orders:
-                if isinstance(o.payment_info, dict) and o.payment_info.get('payment_id') == payment_id:
-                    order = o
-                    break
+        # By payment_transaction_id, else by payment_info payment id
+        order = crud_order.get_by_payment_ref(db, payment_id)
         
         if order:
             logger.info(f"Found order {order.id} for payment {payment_id}, updating status")
@@ -698,8 +686,8 @@ async def verify_payment_status(
                 order.status = 'confirmed'
                 order.payment_transaction_id = payment_id
                 
-                # Auto-register warranties if payment successful
-                await auto_register_warranties(db, order)
+                # Queue warranty registrations if payment successful
+                crud_warranty_registration.enqueue_for_order(db, order)
                 
                 logger.info(f"Order {order.id} payment completed: {payment_id}")
                 
@@ -733,7 +721,7 @@ async def verify_payment_status(
 
 
 @router.post("/guest/create-from-cart", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
-async def create_order_from_cart_guest(
+def create_order_from_cart_guest(
     order_data: OrderCreate,
     session_id: str = Header(..., alias="X-Session-ID"),
     db: Session = Depends(get_db),
@@ -929,12 +917,14 @@ async def get_order_guest(
 
 @router.get("/admin/all", response_model=List[OrderListResponse])
 async def get_all_orders_admin(
+    http_response: Response,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     status: Optional[str] = Query(None, description="Filter by order status"),
     payment_status: Optional[str] = Query(None, description="Filter by payment status"),
     shipping_status: Optional[str] = Query(None, description="Filter by shipping status"),
     user_type: Optional[str] = Query(None, description="Filter by user type (customer/company/guest)"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor; pass an empty value to start cursor paging"),
     db: Session = Depends(get_db),
     api_key: str = Depends(verify_api_key)
 ):
@@ -952,6 +942,8 @@ async def get_all_orders_admin(
     - payment_status: Filter by payment (pending/completed/failed/refunded)
     - shipping_status: Filter by shipping (pending/shipped/delivered)
     - user_type: Filter by user type (customer/company/guest)
+    - cursor: Keyset paging (newest first) instead of skip. Send `cursor=` for the first
+      page, then the value of the `X-Next-Cursor` response header.
     
     **Example Request:**
     ```
@@ -959,18 +951,28 @@ async def get_all_orders_admin(
     ```
     
     **Returns:**
-    List of all orders (filtered)
+    List of all orders (filtered).
+    The total number of matching orders is sent in the `X-Total-Count` header
+    (offset paging only).
     """
-    orders = crud_order.get_multi(
-        db,
-        skip=skip,
-        limit=limit,
+    filters = dict(
         status=status,
         payment_status=payment_status,
         shipping_status=shipping_status,
         user_type=user_type
     )
     
+    if cursor is not None:
+        try:
+            orders, next_cursor = crud_order.get_multi_by_cursor(db, cursor=cursor, limit=limit, **filters)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if next_cursor:
+            http_response.headers["X-Next-Cursor"] = next_cursor
+    else:
+        orders, total = crud_order.get_multi_with_total(db, skip=skip, limit=limit, **filters)
+        http_response.headers["X-Total-Count"] = str(total)
+    
     # Build response
     response = []
     for order in orders:
@@ -1106,8 +1108,6 @@ async def sync_payment_status(
     import logging
     from app.integrations.paypal import paypal_service
     from app.integrations.floa import floa_service
-    from app.api.v1.webhooks import auto_register_warranties
-    
     logger = logging.getLogger(__name__)
     
     # Get order
@@ -1122,12 +1122,7 @@ async def sync_payment_status(
     payment_method = order.payment_method
     
     # Get payment_id from order
-    payment_id = None
-    if order.payment_info and isinstance(order.payment_info, dict):
-        payment_id = order.payment_info.get('payment_id')
-    
-    if not payment_id:
-        payment_id = order.payment_transaction_id
+    payment_id = order.provider_payment_ref or order.payment_transaction_id
     
     if not payment_id:
         raise HTTPException(
@@ -1145,7 +1140,7 @@ async def sync_payment_status(
         # Check payment status based on method
         if payment_method and payment_method.lower() == 'paypal':
             # Get PayPal order details
-            paypal_order = paypal_service.get_order_details(payment_id)
+            paypal_order = await paypal_service.get_order_details(payment_id)
             
             if not paypal_order:
                 raise HTTPException(
@@ -1164,8 +1159,8 @@ async def sync_payment_status(
                 message = "Payment confirmed (COMPLETED)"
                 synced = True
                 
-                # Auto-register warranties
-                await auto_register_warranties(db, order)
+                # Queue warranty registrations
+                crud_warranty_registration.enqueue_for_order(db, order)
                 
             elif order_status == 'APPROVED':
                 order.payment_status = 'completed'
@@ -1174,8 +1169,8 @@ async def sync_payment_status(
                 message = "Payment confirmed (APPROVED)"
                 synced = True
                 
-                # Auto-register warranties
-                await auto_register_warranties(db, order)
+                # Queue warranty registrations
+                crud_warranty_registration.enqueue_for_order(db, order)
                 
             elif order_status in ['VOIDED', 'CANCELLED']:
                 order.payment_status = 'failed'
@@ -1188,7 +1183,7 @@ async def sync_payment_status(
         
         elif payment_method and payment_method.lower() == 'floa':
             # Get Floa deal details
-            deal = floa_service.get_deal_status(payment_id)
+            deal = await floa_service.get_deal_status(payment_id)
             
             if not deal:
                 raise HTTPException(
@@ -1213,8 +1208,8 @@ async def sync_payment_status(
                 message = "Payment confirmed (APPROVED)"
                 synced = True
                 
-                # Auto-register warranties
-                await auto_register_warranties(db, order)
+                # Queue warranty registrations
+                crud_warranty_registration.enqueue_for_order(db, order)
                 
             elif deal_status == 'DRAFT' and is_integration and len(installments) > 0:
                 # Integration environment - DRAFT with installments means approved
@@ -1224,8 +1219,8 @@ async def sync_payment_status(
                 message = "Payment confirmed (DRAFT with installments - integration env)"
                 synced = True
                 
-                # Auto-register warranties
-                await auto_register_warranties(db, order)
+                # Queue warranty registrations
+                crud_warranty_registration.enqueue_for_order(db, order)
                 
             elif deal_status in ['CANCELLED', 'REJECTED']:
                 order.payment_status = 'failed'
@@ -1268,7 +1263,8 @@ async def sync_payment_status(
 
 
 @router.post("/admin/sync-all-pending-payments")
-async def sync_all_pending_payments(
+def sync_all_pending_payments(
+    recheck_minutes: int = Query(0, ge=0, description="Only orders not checked for this many minutes (0 = all)"),
     db: Session = Depends(get_db),
     api_key: str = Depends(verify_api_key)
 ):
@@ -1278,6 +1274,11 @@ async def sync_all_pending_payments(
     Checks all orders with payment_status='pending' and updates from gateways.
     Useful for dashboard initial load or bulk sync.
     
+    Gateways are queried concurrently (PayPal and Floa, each with its own
+    limit) and the status changes are written batch by batch. Every checked
+    order gets payment_checked_at, so recheck_minutes can skip orders the
+    scheduled reconciliation has just checked.
+    
     **Requirements:**
     - API Key (in header X-API-Key)
     
@@ -1292,157 +1293,7 @@ async def sync_all_pending_payments(
     }
     ```
     """
-    import logging
-    from app.integrations.paypal import paypal_service
-    from app.integrations.floa import floa_service
-    from app.api.v1.webhooks import auto_register_warranties
-    from app.models.order import Order
-    
-    logger = logging.getLogger(__name__)
-    
-    # Get all pending orders with payment info
-    pending_orders = db.query(Order).filter(
-        Order.payment_status == 'pending',
-        Order.payment_info.isnot(None)
-    ).all()
-    
-    total_checked = 0
-    updated = 0
-    failed = 0
-    skipped = 0
-    results = []
-    
-    for order in pending_orders:
-        total_checked += 1
-        
-        # Get payment_id
-        payment_id = None
-        if order.payment_info and isinstance(order.payment_info, dict):
-            payment_id = order.payment_info.get('payment_id')
-        
-        if not payment_id:
-            payment_id = order.payment_transaction_id
-        
-        if not payment_id:
-            skipped += 1
-            results.append({
-                "order_id": order.id,
-                "status": "skipped",
-                "message": "No payment ID"
-            })
-            continue
-        
-        payment_method = order.payment_method
-        if not payment_method:
-            skipped += 1
-            results.append({
-                "order_id": order.id,
-                "payment_id": payment_id,
-                "status": "skipped",
-                "message": "No payment method"
-            })
-            continue
-        
-        try:
-            synced = False
-            message = "No change"
-            
-            # Check based on payment method
-            if payment_method.lower() == 'paypal':
-                paypal_order = paypal_service.get_order_details(payment_id)
-                
-                if paypal_order:
-                    order_status = paypal_order.get('status', 'UNKNOWN')
-                    
-                    if order_status in ['COMPLETED', 'APPROVED']:
-                        order.payment_status = 'completed'
-                        order.status = 'confirmed'
-                        await auto_register_warranties(db, order)
-                        message = f"Confirmed ({order_status})"
-                        synced = True
-                    elif order_status in ['VOIDED', 'CANCELLED']:
-                        order.payment_status = 'failed'
-                        order.status = 'cancelled'
-                        message = f"Failed ({order_status})"
-                        synced = True
-                else:
-                    message = "Payment not found"
-            
-            elif payment_method.lower() == 'floa':
-                deal = floa_service.get_deal_status(payment_id)
-                
-                if deal:
-                    deal_status = deal.get('dealStatus', 'UNKNOWN')
-                    installments = deal.get('installmentsList', [])
-                    is_integration = 'live-int' in floa_service.base_url
-                    
-                    if deal_status == 'APPROVED':
-                        order.payment_status = 'completed'
-                        order.status = 'confirmed'
-                        await auto_register_warranties(db, order)
-                        message = f"Confirmed (APPROVED)"
-                        synced = True
-                    elif deal_status == 'DRAFT' and is_integration and len(installments) > 0:
-                        order.payment_status = 'completed'
-                        order.status = 'confirmed'
-                        await auto_register_warranties(db, order)
-                        message = f"Confirmed (DRAFT-integration)"
-                        synced = True
-                    elif deal_status in ['CANCELLED', 'REJECTED']:
-                        order.payment_status = 'failed'
-                        order.status = 'cancelled'
-                        message = f"Failed ({deal_status})"
-                        synced = True
-                else:
-                    message = "Payment not found"
-            
-            elif payment_method.lower() == 'payplug':
-                # PayPlug already has working webhook, skip
-                skipped += 1
-                message = "PayPlug has webhook (skipped)"
-            
-            else:
-                skipped += 1
-                message = f"Unsupported method: {payment_method}"
-            
-            if synced:
-                db.commit()
-                db.refresh(order)
-                updated += 1
-                results.append({
-                    "order_id": order.id,
-                    "payment_id": payment_id,
-                    "payment_method": payment_method,
-                    "status": "updated",
-                    "message": message
-                })
-            else:
-                results.append({
-                    "order_id": order.id,
-                    "payment_id": payment_id,
-                    "payment_method": payment_method,
-                    "status": "no_change",
-                    "message": message
-                })
-        
-        except Exception as e:
-            failed += 1
-            logger.error(f"Failed to sync order {order.id}: {str(e)}")
-            results.append({
-                "order_id": order.id,
-                "payment_id": payment_id,
-                "payment_method": payment_method,
-                "status": "error",
-                "message": str(e)
-            })
-    
-    return {
-        "total_checked": total_checked,
-        "updated": updated,
-        "failed": failed,
-        "skipped": skipped,
-        "results": results
-    }
+    return reconcile_payments(db, recheck_minutes=recheck_minutes)
 
 
 @router.get("/admin/statistics/overview", response_model=OrderStatsResponse)
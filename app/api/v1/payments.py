@@ -2,7 +2,7 @@
 # © 2026 Muthana. All rights reserved.
 # Unauthorized copying or distribution is prohibited.
 
-from fastapi import APIRouter, Depends, HTTPException, status, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from sqlalchemy.orm import Session
 from typing import Optional, List
 
@@ -216,11 +216,13 @@ async def get_order_payments(
 
 @router.get("/admin/payments", response_model=List[PaymentListItem])
 async def get_all_payments(
+    http_response: Response,
     skip: int = 0,
     limit: int = 100,
     provider: Optional[str] = None,
     status: Optional[str] = None,
     is_test: Optional[bool] = None,
+    cursor: Optional[str] = None,
     current_admin: dict = Depends(get_current_admin_user),
     db: Session = Depends(get_db),
     api_key_valid: bool = Depends(verify_api_key)
@@ -229,8 +231,27 @@ async def get_all_payments(
     Get all payments (Admin)
     
     Supports filtering by provider, status, and test mode.
+    
+    Pass `cursor=` (empty) to switch to keyset paging, newest first; the cursor
+    for the next page is returned in the `X-Next-Cursor` header.
     """
     
+    if cursor is not None:
+        try:
+            payments, next_cursor = crud_payment.get_multi_by_cursor(
+                db,
+                cursor=cursor,
+                limit=limit,
+                provider=provider,
+                status=status,
+                is_test=is_test
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if next_cursor:
+            http_response.headers["X-Next-Cursor"] = next_cursor
+        return payments
+    
     payments = crud_payment.get_multi(
         db,
         skip=skip,
@@ -8,8 +8,10 @@ from sqlalchemy import func
 from typing import Optional, Dict, Any
 from collections import defaultdict
 import re
+import time
 from app.db.session import get_db
 from app.core.config import settings
+from app.core.i18n import resolve_translation
 from app.schemas.product import (
     ProductCreate, ProductUpdate, ProductResponse, ProductResponseFull,
     StockUpdateInput, StockUpdateResponse
@@ -21,7 +23,11 @@ from app.schemas.product_base import (
 )
 from app.schemas.brand_tax import BrandSimple, TaxClassSimple
 from app.crud import product as crud_product
-from app.models.product import Product, ProductTranslation
+from app.crud import product_listing as crud_listing
+from app.crud import product_search
+from app.crud import translation as crud_translation
+from app.services.suggest_index import suggest_index
+from app.models.product import Product
 from app.models.category import Category
 
 
@@ -52,15 +58,8 @@ def build_product_response(product: Product, lang: str) -> Dict[str, Any]:
     """Build product response based on requested language"""
     
     # Get translation for requested language
-    translation = None
-    if product.translations:
-        translation = next((t for t in product.translations if t.lang == lang), None)
-        if not translation:
-            # Fallback to Italian
-            translation = next((t for t in product.translations if t.lang == "it"), None)
-        if not translation:
-            # Last fallback: use first available
-            translation = product.translations[0] if product.translations else None
+    # Fallback to Italian, then to the first available
+    translation = resolve_translation(product.translations, lang, any_fallback=True)
     
     if not translation:
         raise HTTPException(status_code=404, detail="Product translation not found")
@@ -69,11 +68,8 @@ def build_product_response(product: Product, lang: str) -> Dict[str, Any]:
     images = []
     if product.images:
         for img in product.images:
-            alt_text = ""
-            if img.alt_texts:
-                alt_text = next((alt.alt_text for alt in img.alt_texts if alt.lang == lang), "")
-                if not alt_text:
-                    alt_text = next((alt.alt_text for alt in img.alt_texts if alt.lang == "it"), "")
+            alt = resolve_translation(img.alt_texts, lang)
+            alt_text = (alt.alt_text if alt else "") or ""
             
             images.append(ProductImageResponse(
                 url=img.url,
@@ -85,11 +81,7 @@ def build_product_response(product: Product, lang: str) -> Dict[str, Any]:
     features = []
     if product.features:
         for feat in product.features:
-            feat_trans = None
-            if feat.translations:
-                feat_trans = next((t for t in feat.translations if t.lang == lang), None)
-                if not feat_trans:
-                    feat_trans = next((t for t in feat.translations if t.lang == "it"), None)
+            feat_trans = resolve_translation(feat.translations, lang)
             
             if feat_trans:
                 features.append(ProductFeatureResponse(
@@ -101,11 +93,7 @@ def build_product_response(product: Product, lang: str) -> Dict[str, Any]:
     attributes = []
     if product.attributes:
         for attr in product.attributes:
-            attr_trans = None
-            if attr.translations:
-                attr_trans = next((t for t in attr.translations if t.lang == lang), None)
-                if not attr_trans:
-                    attr_trans = next((t for t in attr.translations if t.lang == "it"), None)
+            attr_trans = resolve_translation(attr.translations, lang)
             
             if attr_trans:
                 attributes.append(ProductAttributeResponse(
@@ -118,11 +106,7 @@ def build_product_response(product: Product, lang: str) -> Dict[str, Any]:
     variant_attributes = []
     if product.variant_attributes:
         for var_attr in product.variant_attributes:
-            var_attr_trans = None
-            if var_attr.translations:
-                var_attr_trans = next((t for t in var_attr.translations if t.lang == lang), None)
-                if not var_attr_trans:
-                    var_attr_trans = next((t for t in var_attr.translations if t.lang == "it"), None)
+            var_attr_trans = resolve_translation(var_attr.translations, lang)
             
             if var_attr_trans:
                 # Extract unique options from variants
@@ -154,11 +138,8 @@ def build_product_response(product: Product, lang: str) -> Dict[str, Any]:
                 variant_images = []
                 if variant.images:
                     for img in variant.images:
-                        alt_text = ""
-                        if img.alt_texts:
-                            alt_text = next((alt.alt_text for alt in img.alt_texts if alt.lang == lang), "")
-                            if not alt_text:
-                                alt_text = next((alt.alt_text for alt in img.alt_texts if alt.lang == "it"), "")
+                        alt = resolve_translation(img.alt_texts, lang)
+                        alt_text = (alt.alt_text if alt else "") or ""
                         
                         variant_images.append(ProductImageResponse(
                             url=img.url,
@@ -206,11 +187,7 @@ def build_product_response(product: Product, lang: str) -> Dict[str, Any]:
     categories = []
     if product.categories:
         for cat in product.categories:
-            cat_trans = None
-            if cat.translations:
-                cat_trans = next((t for t in cat.translations if t.lang == lang), None)
-                if not cat_trans:
-                    cat_trans = next((t for t in cat.translations if t.lang == "it"), None)
+            cat_trans = resolve_translation(cat.translations, lang)
             
             if cat_trans:
                 categories.append(CategorySimple(
@@ -300,11 +277,7 @@ def build_product_response(product: Product, lang: str) -> Dict[str, Any]:
         shipping_services = []
         if product.allowed_shipping_services:
             for service in product.allowed_shipping_services:
-                service_trans = None
-                if service.translations:
-                    service_trans = next((t for t in service.translations if t.lang == lang), None)
-                    if not service_trans:
-                        service_trans = next((t for t in service.translations if t.lang == "it"), None)
+                service_trans = resolve_translation(service.translations, lang)
                 
                 if service_trans:
                     shipping_services.append({
@@ -321,11 +294,7 @@ def build_product_response(product: Product, lang: str) -> Dict[str, Any]:
         warranties = []
         if product.allowed_warranties:
             for warranty in product.allowed_warranties:
-                warranty_trans = None
-                if warranty.translations:
-                    warranty_trans = next((t for t in warranty.translations if t.lang == lang), None)
-                    if not warranty_trans:
-                        warranty_trans = next((t for t in warranty.translations if t.lang == "it"), None)
+                warranty_trans = resolve_translation(warranty.translations, lang)
                 
                 if warranty_trans:
                     warranties.append({
@@ -416,6 +385,37 @@ def build_product_response(product: Product, lang: str) -> Dict[str, Any]:
 
 # ============= Endpoints =============
 
+def build_search_result(row) -> Dict[str, Any]:
+    """Compact search result from a product_listing row"""
+    return {
+        "id": row.product_id,
+        "reference": row.reference,
+        "ean": row.ean,
+        "title": row.title,
+        "sub_title": row.sub_title,
+        "is_active": row.is_active,
+        "stock_quantity": row.stock_quantity,
+        "stock_status": row.stock_status,
+        "price_list": row.price_list,
+        "currency": row.currency,
+        "brand_id": row.brand_id,
+        "product_type": row.product_type
+    }
+
+
+def build_search_meta(total: int, skip: int, limit: int) -> Dict[str, Any]:
+    """Pagination metadata for search responses"""
+    return {
+        "total": total,
+        "skip": skip,
+        "limit": limit,
+        "page": (skip // limit) + 1,
+        "total_pages": (total + limit - 1) // limit,
+        "has_next": skip + limit < total,
+        "has_prev": skip > 0
+    }
+
+
 @router.post("/admin/products", response_model=dict, status_code=201)
 def create_product(
     product: ProductCreate,
@@ -458,6 +458,7 @@ def get_all_products(
     active_only: bool = Query(True),
     search: Optional[str] = Query(None),
     lang: str = Query("it", regex="^(it|en|fr|de|ar)$"),
+    cursor: Optional[str] = Query(None, description="Opaque cursor; pass an empty value to start cursor paging"),
     db: Session = Depends(get_db)
 ):
     """
@@ -469,14 +470,14 @@ def get_all_products(
     - **category_id**: Filter by category ID
     - **brand_id**: Filter by brand ID
     - **active_only**: Show only active products - default: true
-    - **search**: Search by product ID or reference
+    - **search**: Search by product ID, EAN, reference or title/brand words (ranked)
     - **lang**: Language code (it, en, fr, de, ar) - default: it
+    - **cursor**: Keyset paging instead of skip. Send `cursor=` for the first page, then
+      the `meta.next_cursor` of the previous response. No total is computed in this mode.
     
     Public endpoint - No API Key required
     """
-    # Get total count
-    total = crud_product.count_products(
-        db=db,
+    filters = dict(
         product_type=product_type,
         category_id=category_id,
         brand_id=brand_id,
@@ -484,109 +485,72 @@ def get_all_products(
         search=search
     )
     
-    # Get products for current page
-    products = crud_product.get_products(
-        db=db,
-        skip=skip,
-        limit=limit,
-        product_type=product_type,
-        category_id=category_id,
-        brand_id=brand_id,
-        active_only=active_only,
-        search=search
-    )
+    # Product cards come from the product_listing projection (one indexed query)
+    next_cursor = None
+    if cursor is not None:
+        # Keyset page - cost does not grow with depth
+        try:
+            rows, next_cursor = crud_listing.get_listing_by_cursor(
+                db, lang=lang, cursor=cursor, limit=limit, **filters
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+    else:
+        # Get products for current page and total count in one query
+        rows, total = crud_listing.get_listing_page(
+            db, lang=lang, skip=skip, limit=limit, **filters
+        )
     
     # Build simple product list
     products_list = []
-    for product in products:
-        # Get translation for requested language
-        translation = next((t for t in product.translations if t.lang == lang), None)
-        if not translation:
-            translation = next((t for t in product.translations if t.lang == "it"), product.translations[0] if product.translations else None)
+    for row in rows:
+        if row.title is None:
+            continue
         
-        if translation:
-            # Get first image
-            first_image = None
-            if product.images:
-                img = product.images[0]
-                alt_text = next((alt.alt_text for alt in img.alt_texts if alt.lang == lang), "")
-                first_image = img.url
-            
-            # Build tax
-            tax_data = None
-            if product.tax_class:
-                tax_data = {
-                    "id": product.tax_class.id,
-                    "name": product.tax_class.name,
-                    "rate": product.tax_class.rate,
-                    "included_in_price": product.tax_included_in_price
-                }
-            
-            # Calculate discount - Get best discount based on priority
-            discount_percentage = "0"
-            if product.discounts:
-                active_discounts = [d for d in product.discounts if d.is_active]
-                if active_discounts:
-                    # Sort by priority (desc) then by discount_value (desc)
-                    # Higher priority wins, if equal priority then higher discount wins
-                    best_discount = max(active_discounts, 
-                                      key=lambda d: (d.priority, d.discount_value))
-                    
-                    if best_discount.discount_type == "percentage":
-                        discount_percentage = f"{int(best_discount.discount_value)}%"
-                    elif best_discount.discount_type == "amount" and product.price_list and product.price_list > 0:
-                        percentage = (best_discount.discount_value / product.price_list) * 100
-                        discount_percentage = f"{int(percentage)}%"
-            
-            # Build features
-            features_list = []
-            if product.features:
-                for feat in product.features:
-                    feat_trans = next((t for t in feat.translations if t.lang == lang), None)
-                    if not feat_trans:
-                        feat_trans = next((t for t in feat.translations if t.lang == "it"), None)
-                    if feat_trans:
-                        features_list.append({
-                            "name": feat_trans.name,
-                            "value": feat_trans.value
-                        })
-            
-            # Build attributes
-            attributes_list = []
-            if product.attributes:
-                for attr in product.attributes:
-                    attr_trans = next((t for t in attr.translations if t.lang == lang), None)
-                    if not attr_trans:
-                        attr_trans = next((t for t in attr.translations if t.lang == "it"), None)
-                    if attr_trans:
-                        attributes_list.append({
-                            "code": attr.code,
-                            "name": attr_trans.name,
-                            "value": attr_trans.value
-                        })
-            
-            products_list.append({
-                "id": product.id,
-                "reference": product.reference,
-                "product_type": product.product_type.value,
-                "title": translation.title,
-                "simple_description": strip_html_tags(translation.simple_description or ""),
-                "image": first_image,
-                "is_active": product.is_active,
-                "date_add": product.date_add,
-                "tax": tax_data,
-                "price": {
-                    "list": product.price_list or 0.0,
-                    "currency": product.currency or "EUR",
-                    "discounts": discount_percentage
-                },
-                "stock": {
-                    "status": product.stock_status.value,
-                    "quantity": product.stock_quantity or 0
-                },
-                "features": features_list,
-                "attributes": attributes_list
-            })
+        tax_data = None
+        if row.tax_class_id:
+            tax_data = {
+                "id": row.tax_class_id,
+                "name": row.tax_name,
+                "rate": row.tax_rate,
+                "included_in_price": row.tax_included_in_price
+            }
+        
+        products_list.append({
+            "id": row.product_id,
+            "reference": row.reference,
+            "product_type": row.product_type,
+            "title": row.title,
+            "simple_description": strip_html_tags(row.simple_description or ""),
+            "image": row.image_url,
+            "is_active": row.is_active,
+            "date_add": row.date_add,
+            "tax": tax_data,
+            "price": {
+                "list": row.price_list or 0.0,
+                "currency": row.currency or "EUR",
+                "discounts": row.discount_label
+            },
+            "stock": {
+                "status": row.stock_status,
+                "quantity": row.stock_quantity or 0
+            },
+            "features": row.features or [],
+            "attributes": row.attributes or []
+        })
+    
+    if cursor is not None:
+        return {
+            "data": products_list,
+            "meta": {
+                "limit": limit,
+                "cursor": cursor or None,
+                "next_cursor": next_cursor,
+                "has_next": next_cursor is not None,
+                "has_prev": bool(cursor),
+                "lang": lang
+            }
+        }
     
     # Calculate pagination metadata
     total_pages = (total + limit - 1) // limit  # Ceiling division
@@ -607,6 +571,63 @@ def get_all_products(
     }
 
 
+@router.get("/v1/products/search")
+def quick_search_products(
+    q: str = Query(..., min_length=1, description="Search term (ID, EAN, title, brand or reference)"),
+    lang: str = Query("it", regex="^(it|en|fr|de|ar)$"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """
+    Quick search for products, best matches first
+    
+    - **q**: Search term (product ID, EAN, reference, or words of the title/brand/description;
+      the last word may be incomplete)
+    - **lang**: Language code for translations - default: it
+    - **skip**: Number of results to skip (pagination) - default: 0
+    - **limit**: Maximum results - default: 10
+    
+    Public endpoint - No API Key required
+    """
+    rows, total = product_search.search_products(db, q, lang=lang, skip=skip, limit=limit)
+    
+    return {
+        "total": total,
+        "search_term": q,
+        "search_type": "id" if q.strip().isdigit() else "title_or_reference",
+        "lang": lang,
+        "results": [build_search_result(row) for row in rows],
+        "meta": build_search_meta(total, skip, limit)
+    }
+
+
+@router.get("/v1/products/suggest")
+def suggest_products(
+    q: str = Query(..., min_length=1, description="Text typed so far"),
+    lang: str = Query("it", regex="^(it|en|fr|de|ar)$"),
+    limit: int = Query(8, ge=1, le=20)
+):
+    """
+    Type-ahead suggestions for the search box, served from memory
+    
+    - **q**: Prefix of a title word, reference, EAN or brand name
+    - **lang**: Language code for titles - default: it
+    - **limit**: Maximum products and brands - default: 8
+    
+    Public endpoint - No API Key required
+    """
+    started = time.perf_counter()
+    suggestions = suggest_index.suggest(q, lang=lang, limit=limit)
+    
+    return {
+        "q": q,
+        "lang": lang,
+        **suggestions,
+        "took_ms": round((time.perf_counter() - started) * 1000, 3)
+    }
+
+
 @router.get("/v1/products/recent")
 def get_recent_products(
     db: Session = Depends(get_db),
@@ -834,6 +855,26 @@ def update_variant_stock(
     }
 
 
+@router.post("/admin/products/listing/rebuild")
+def rebuild_product_listing(
+    db: Session = Depends(get_db),
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Rebuild the product_listing projection for every product
+    
+    The API fills an empty table when it starts; use this to repair it.
+    
+    Requires X-API-Key header for authentication
+    """
+    result = crud_listing.rebuild_product_listing(db)
+    return {
+        "success": True,
+        "products": result["products"],
+        "rows": result["rows"]
+    }
+
+
 @router.post("/admin/products/process-duplicates-and-categorize")
 def process_duplicates_and_categorize(
     db: Session = Depends(get_db),
@@ -877,7 +918,7 @@ def process_duplicates_and_categorize(
                 by_ref[product.reference.strip()].append(product)
             
             # Get Italian translation for name comparison
-            translation = next((t for t in product.translations if t.lang == "it"), None)
+            translation = resolve_translation(product.translations, "it")
             if translation and translation.title:
                 by_name[translation.title.strip().lower()].append(product)
         
@@ -912,7 +953,7 @@ def process_duplicates_and_categorize(
         def score_product(p):
             score = 0
             score += len(p.images) * 10
-            translation = next((t for t in p.translations if t.lang == "it"), None)
+            translation = resolve_translation(p.translations, "it")
             if translation:
                 score += len(translation.simple_description or '') / 100
             score += len(p.features) * 5
@@ -961,7 +1002,7 @@ def process_duplicates_and_categorize(
         furniture = []
         
         for product in all_products:
-            translation = next((t for t in product.translations if t.lang == "it"), None)
+            translation = resolve_translation(product.translations, "it")
             if not translation:
                 continue
             
@@ -989,6 +1030,7 @@ def process_duplicates_and_categorize(
         
         # Step 7: Update electronics only
         updated_count = 0
+        updated_ids = []
         for product in electronics:
             try:
                 old_categories = product.categories
@@ -1018,6 +1060,7 @@ def process_duplicates_and_categorize(
                         if new_cat:
                             product.categories.append(new_cat)
                     updated_count += 1
+                    updated_ids.append(product.id)
                     
             except Exception as e:
                 report['errors'].append(f"Failed to update product {product.id}: {str(e)}")
@@ -1025,6 +1068,9 @@ def process_duplicates_and_categorize(
         db.commit()
         report['electronics_updated'] = updated_count
         
+        # Update listing projection (deleted products just lose their rows)
+        crud_listing.refresh_product_listing(db, deleted_ids + updated_ids)
+        
         return {
             "success": True,
             "message": "Processing completed",
@@ -1040,155 +1086,80 @@ def process_duplicates_and_categorize(
 def search_products_by_title(
     title: str = Query(..., min_length=1, description="Search term for product title"),
     lang: str = Query("it", regex="^(it|en|fr|de|ar)$"),
+    skip: int = Query(0, ge=0),
     limit: int = Query(20, ge=1, le=100),
     db: Session = Depends(get_db),
     api_key: str = Depends(verify_api_key)
 ):
     """
-    Search products by title (case-insensitive partial match)
+    Search products by title, best matches first
     
-    - **title**: Search term
+    - **title**: Search term (words of the title/brand/description, or reference/EAN)
     - **lang**: Language code for translations - default: it
+    - **skip**: Number of results to skip (pagination) - default: 0
     - **limit**: Maximum results - default: 20
     
     Requires X-API-Key header for authentication
     """
-    
-    # Search in translations
-    translations = db.query(ProductTranslation).filter(
-        ProductTranslation.lang == lang,
-        ProductTranslation.title.ilike(f'%{title}%')
-    ).limit(limit).all()
-    
-    results = []
-    for trans in translations:
-        product = db.query(Product).filter(Product.id == trans.product_id).first()
-        if product:
-            results.append({
-                "id": product.id,
-                "reference": product.reference,
-                "ean": product.ean,
-                "title": trans.title,
-                "sub_title": trans.sub_title,
-                "is_active": product.is_active,
-                "stock_quantity": product.stock_quantity,
-                "stock_status": product.stock_status.value if product.stock_status else None,
-                "price_list": product.price_list,
-                "currency": product.currency,
-                "brand_id": product.brand_id,
-                "product_type": product.product_type.value if product.product_type else None
-            })
+    rows, total = product_search.search_products(db, title, lang=lang, skip=skip, limit=limit)
     
     return {
-        "total": len(results),
+        "total": total,
         "search_term": title,
         "lang": lang,
-        "results": results
+        "results": [build_search_result(row) for row in rows],
+        "meta": build_search_meta(total, skip, limit)
     }
 
 
-@router.get("/v1/products/search")
-def quick_search_products(
-    q: str = Query(..., min_length=1, description="Search term (ID, title, or reference)"),
-    lang: str = Query("it", regex="^(it|en|fr|de|ar)$"),
-    limit: int = Query(10, ge=1, le=50),
-    db: Session = Depends(get_db)
+@router.get("/admin/products/suggest/stats")
+def get_suggest_index_stats(
+    api_key: str = Depends(verify_api_key)
 ):
     """
-    Quick search for products by ID, title, or reference
+    Memory usage of the in-memory autocomplete index
     
-    - **q**: Search term (product ID, title, or reference)
-    - **lang**: Language code for translations - default: it
-    - **limit**: Maximum results - default: 10
-    
-    Public endpoint - No API Key required
+    Requires X-API-Key header for authentication
+    """
+    return suggest_index.memory_report()
+
+
+@router.post("/admin/products/suggest/reload")
+def reload_suggest_index(
+    db: Session = Depends(get_db),
+    api_key: str = Depends(verify_api_key)
+):
     """
+    Rebuild the autocomplete index from the database
     
-    results = []
-    search_type = None
-    
-    # Check if search term is a number (ID search)
-    if q.isdigit():
-        search_type = "id"
-        product = db.query(Product).filter(Product.id == int(q)).first()
-        if product:
-            translation = next((t for t in product.translations if t.lang == lang), None)
-            if not translation and product.translations:
-                translation = product.translations[0]
-            
-            if translation:
-                results.append({
-                    "id": product.id,
-                    "reference": product.reference,
-                    "ean": product.ean,
-                    "title": translation.title,
-                    "sub_title": translation.sub_title,
-                    "is_active": product.is_active,
-                    "stock_quantity": product.stock_quantity,
-                    "stock_status": product.stock_status.value if product.stock_status else None,
-                    "price_list": product.price_list,
-                    "currency": product.currency,
-                    "brand_id": product.brand_id,
-                    "product_type": product.product_type.value if product.product_type else None
-                })
-    else:
-        # Search by title
-        search_type = "title_or_reference"
-        translations = db.query(ProductTranslation).filter(
-            ProductTranslation.lang == lang,
-            ProductTranslation.title.ilike(f'%{q}%')
-        ).limit(limit).all()
-        
-        for trans in translations:
-            product = db.query(Product).filter(Product.id == trans.product_id).first()
-            if product:
-                results.append({
-                    "id": product.id,
-                    "reference": product.reference,
-                    "ean": product.ean,
-                    "title": trans.title,
-                    "sub_title": trans.sub_title,
-                    "is_active": product.is_active,
-                    "stock_quantity": product.stock_quantity,
-                    "stock_status": product.stock_status.value if product.stock_status else None,
-                    "price_list": product.price_list,
-                    "currency": product.currency,
-                    "brand_id": product.brand_id,
-                    "product_type": product.product_type.value if product.product_type else None
-                })
-        
-        # If no results from title search, search by reference
-        if not results:
-            products = db.query(Product).filter(
-                Product.reference.ilike(f'%{q}%')
-            ).limit(limit).all()
-            
-            for product in products:
-                translation = next((t for t in product.translations if t.lang == lang), None)
-                if not translation and product.translations:
-                    translation = product.translations[0]
-                
-                if translation:
-                    results.append({
-                        "id": product.id,
-                        "reference": product.reference,
-                        "ean": product.ean,
-                        "title": translation.title,
-                        "sub_title": translation.sub_title,
-                        "is_active": product.is_active,
-                        "stock_quantity": product.stock_quantity,
-                        "stock_status": product.stock_status.value if product.stock_status else None,
-                        "price_list": product.price_list,
-                        "currency": product.currency,
-                        "brand_id": product.brand_id,
-                        "product_type": product.product_type.value if product.product_type else None
-                    })
+    Requires X-API-Key header for authentication
+    """
+    result = suggest_index.load(db)
+    return {"success": True, **result, "memory": suggest_index.memory_report()}
+
+
+@router.get("/admin/translations/jobs")
+def get_translation_jobs_stats(
+    db: Session = Depends(get_db),
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Machine translation queue status (jobs per status)
     
-    return {
-        "total": len(results),
-        "search_term": q,
-        "search_type": search_type,
-        "lang": lang,
-        "results": results
-    }
+    Requires X-API-Key header for authentication
+    """
+    return {"jobs": crud_translation.get_translation_job_stats(db)}
+
 
+@router.post("/admin/translations/process")
+def process_translation_jobs(
+    limit: int = Query(20, ge=1, le=200),
+    db: Session = Depends(get_db),
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Translate one batch of queued products/categories now, without waiting for the worker
+    
+    Requires X-API-Key header for authentication
+    """
+    return crud_translation.process_translation_jobs(db, limit=limit)
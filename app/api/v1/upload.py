@@ -3,13 +3,20 @@
 # Unauthorized copying or distribution is prohibited.
 
 from fastapi import APIRouter, Depends, HTTPException, Header, File, UploadFile, Form
-from typing import List, Optional
+from sqlalchemy.orm import Session
+from typing import Any, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 import cloudinary
 import cloudinary.uploader
 import cloudinary.utils
+import asyncio
+import os
 import time
 import hashlib
 from app.core.config import settings
+from app.db.session import get_db
+from app.crud.image_ingestion import queue_product_images, get_image_ingestion_stats
+from app.services.image_ingestion import image_ingestion_worker
 
 router = APIRouter()
 
@@ -89,6 +96,54 @@ async def generate_upload_signature(
         raise HTTPException(status_code=500, detail=f"Failed to generate signature: {str(e)}")
 
 
+# Blocking Cloudinary calls run here, never on the event loop
+upload_pool = ThreadPoolExecutor(max_workers=settings.UPLOAD_THREADS, thread_name_prefix="cloudinary-upload")
+
+
+def file_size(file: UploadFile) -> int:
+    """Size of an uploaded file without reading it into memory"""
+    file.file.seek(0, os.SEEK_END)
+    size = file.file.tell()
+    file.file.seek(0)
+    return size
+
+
+def _cloudinary_upload(file: UploadFile, folder: str) -> Dict[str, Any]:
+    """Upload the spooled file (streamed from disk by the SDK) and time it"""
+    started = time.perf_counter()
+    result = cloudinary.uploader.upload(
+        file.file,
+        folder=f"onebby/{folder}",
+        resource_type="image",
+        transformation=[
+            {"quality": "auto"},
+            {"fetch_format": "auto"}
+        ]
+    )
+    return {
+        "filename": file.filename,
+        "url": result["secure_url"],
+        "public_id": result["public_id"],
+        "width": result.get("width"),
+        "height": result.get("height"),
+        "format": result.get("format"),
+        "size": result.get("bytes"),
+        "duration_ms": int((time.perf_counter() - started) * 1000)
+    }
+
+
+async def upload_to_cloudinary(file: UploadFile, folder: str) -> Dict[str, Any]:
+    """Validate a file and upload it in the upload thread pool"""
+    validate_image(file)
+    if file_size(file) > MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File too large. Maximum size: {MAX_FILE_SIZE / (1024*1024)}MB"
+        )
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(upload_pool, _cloudinary_upload, file, folder)
+
+
 @router.post("/admin/upload/image")
 async def upload_image(
     file: UploadFile = File(...),
@@ -103,41 +158,15 @@ async def upload_image(
     
     Supported folders: products, brands, categories, banners, logos, deliveries, warranties, discounts
     """
-    validate_image(file)
-    
     try:
-        # Read file content
-        contents = await file.read()
-        
-        # Check file size
-        if len(contents) > MAX_FILE_SIZE:
-            raise HTTPException(
-                status_code=400,
-                detail=f"File too large. Maximum size: {MAX_FILE_SIZE / (1024*1024)}MB"
-            )
-        
-        # Upload to Cloudinary
-        result = cloudinary.uploader.upload(
-            contents,
-            folder=f"onebby/{folder}",
-            resource_type="image",
-            transformation=[
-                {"quality": "auto"},
-                {"fetch_format": "auto"}
-            ]
-        )
-        
-        return {
-            "url": result["secure_url"],
-            "public_id": result["public_id"],
-            "width": result.get("width"),
-            "height": result.get("height"),
-            "format": result.get("format"),
-            "size": result.get("bytes")
-        }
-        
+        result = await upload_to_cloudinary(file, folder)
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
+    
+    result.pop("filename")
+    return result
 
 
 @router.post("/admin/upload/images")
@@ -151,65 +180,34 @@ async def upload_multiple_images(
     
     - **files**: List of image files (JPG, PNG, WebP, SVG)
     - **folder**: Folder name in Cloudinary (default: products)
+    
+    Files are uploaded concurrently; each result has its upload time (duration_ms).
     """
     if len(files) > 10:
         raise HTTPException(status_code=400, detail="Maximum 10 images allowed")
     
+    started = time.perf_counter()
+    results = await asyncio.gather(
+        *(upload_to_cloudinary(file, folder) for file in files),
+        return_exceptions=True
+    )
+    
     uploaded_images = []
     errors = []
-    
-    for file in files:
-        try:
-            validate_image(file)
-            
-            # Read file content
-            contents = await file.read()
-            
-            # Check file size
-            if len(contents) > MAX_FILE_SIZE:
-                errors.append({
-                    "filename": file.filename,
-                    "error": f"File too large. Maximum size: {MAX_FILE_SIZE / (1024*1024)}MB"
-                })
-                continue
-            
-            # Upload to Cloudinary
-            result = cloudinary.uploader.upload(
-                contents,
-                folder=f"onebby/{folder}",
-                resource_type="image",
-                transformation=[
-                    {"quality": "auto"},
-                    {"fetch_format": "auto"}
-                ]
-            )
-            
-            uploaded_images.append({
-                "filename": file.filename,
-                "url": result["secure_url"],
-                "public_id": result["public_id"],
-                "width": result.get("width"),
-                "height": result.get("height"),
-                "format": result.get("format"),
-                "size": result.get("bytes")
-            })
-            
-        except HTTPException as e:
-            errors.append({
-                "filename": file.filename,
-                "error": e.detail
-            })
-        except Exception as e:
-            errors.append({
-                "filename": file.filename,
-                "error": str(e)
-            })
+    for file, result in zip(files, results):
+        if isinstance(result, HTTPException):
+            errors.append({"filename": file.filename, "error": result.detail})
+        elif isinstance(result, Exception):
+            errors.append({"filename": file.filename, "error": str(result)})
+        else:
+            uploaded_images.append(result)
     
     return {
         "uploaded": uploaded_images,
         "errors": errors,
         "total_uploaded": len(uploaded_images),
-        "total_errors": len(errors)
+        "total_errors": len(errors),
+        "duration_ms": int((time.perf_counter() - started) * 1000)
     }
 
 
@@ -233,3 +231,30 @@ def delete_image(
             
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Delete failed: {str(e)}")
+
+
+@router.post("/admin/images/ingest")
+def ingest_supplier_images(
+    db: Session = Depends(get_db),
+    api_key: str = Depends(verify_api_key)
+):
+    """
+    Queue supplier image URLs of products for copying to Cloudinary
+
+    New URLs are downloaded, deduplicated by content and uploaded by the
+    image ingestion worker, then product images point to Cloudinary.
+    Returns the number of URLs queued and the counts per status.
+    """
+    queued = queue_product_images(db)
+    if settings.IMAGE_INGESTION_ENABLED:
+        image_ingestion_worker.wake()
+    return {"queued": queued, "status": get_image_ingestion_stats(db)}
+
+
+@router.get("/admin/images/ingest")
+def get_supplier_image_ingestion(
+    db: Session = Depends(get_db),
+    api_key: str = Depends(verify_api_key)
+):
+    """Counts of supplier image URLs per ingestion status (pending, running, done, failed)"""
+    return {"status": get_image_ingestion_stats(db)}
@@ -20,7 +20,6 @@ from app.models.product import Product
 from app.models.warranty import Warranty
 from app.core.security.api_key import verify_api_key
 from app.core.security.dependencies import get_current_active_user
-from app.services.garanzia3_service import garanzia3_service
 
 router = APIRouter()
 
@@ -124,58 +123,26 @@ async def register_warranty(
                     detail="Warranty already registered for this product"
                 )
     
-    # Create registration record
+    # Create registration record, claimed: registered here rather than by the worker
     registration = crud_warranty_registration.create(
         db,
-        registration_in=registration_in
+        registration_in=registration_in,
+        claimed=True
     )
     
     # Call Garanzia3 API
-    try:
-        result = await garanzia3_service.register_warranty(
-            ean13=registration.product_ean13,
-            customer_name=registration.customer_name,
-            customer_lastname=registration.customer_lastname,
-            customer_email=registration.customer_email,
-            customer_phone=registration.customer_phone
-        )
-        
-        if result['success']:
-            # Update registration with success
-            registration = crud_warranty_registration.update_status(
-                db,
-                id=registration.id,
-                status='registered',
-                g3_transaction_id=result['transaction'],
-                g3_pin=result['pin'],
-                g3_response=result.get('raw_response')
-            )
-        else:
-            # Update registration with failure
-            registration = crud_warranty_registration.update_status(
-                db,
-                id=registration.id,
-                status='failed',
-                error_message=result['error'],
-                error_code='G3_API_ERROR'
-            )
-            raise HTTPException(
-                status_code=status.HTTP_502_BAD_GATEWAY,
-                detail=f"Failed to register warranty with Garanzia3: {result['error']}"
-            )
+    await crud_warranty_registration.register_now(db, [registration])
+    db.refresh(registration)
     
-    except Exception as e:
-        # Update registration with failure
-        crud_warranty_registration.update_status(
-            db,
-            id=registration.id,
-            status='failed',
-            error_message=str(e),
-            error_code='SYSTEM_ERROR'
+    if registration.status == 'pending':
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Garanzia3 unavailable, registration will be retried: {registration.error_message}"
         )
+    if registration.status != 'registered':
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to register warranty: {str(e)}"
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail=f"Failed to register warranty with Garanzia3: {registration.error_message}"
         )
     
     return registration
@@ -307,6 +274,11 @@ async def admin_retry_registration(
     
     This endpoint allows admins to retry registrations that failed
     due to API errors or timeouts.
+    
+    The registration is queued again and registered at once through the
+    same path as the registration worker. Timeouts and interrupted
+    registrations are never retried automatically (Garanzia3 may have
+    created the contract), only here.
     """
     
     # Get registration
@@ -324,53 +296,12 @@ async def admin_retry_registration(
             detail=f"Cannot retry registration with status: {registration.status}"
         )
     
-    # Reset to pending
-    registration = crud_warranty_registration.update_status(
-        db,
-        id=registration.id,
-        status='pending',
-        error_message=None,
-        error_code=None
-    )
-    
-    # Call Garanzia3 API
-    try:
-        result = await garanzia3_service.register_warranty(
-            ean13=registration.product_ean13,
-            customer_name=registration.customer_name,
-            customer_lastname=registration.customer_lastname,
-            customer_email=registration.customer_email,
-            customer_phone=registration.customer_phone
-        )
-        
-        if result['success']:
-            # Update registration with success
-            registration = crud_warranty_registration.update_status(
-                db,
-                id=registration.id,
-                status='registered',
-                g3_transaction_id=result['transaction'],
-                g3_pin=result['pin'],
-                g3_response=result.get('raw_response')
-            )
-        else:
-            # Update registration with failure
-            registration = crud_warranty_registration.update_status(
-                db,
-                id=registration.id,
-                status='failed',
-                error_message=result['error'],
-                error_code='G3_API_ERROR'
-            )
-    
-    except Exception as e:
-        # Update registration with failure
-        registration = crud_warranty_registration.update_status(
-            db,
-            id=registration.id,
-            status='failed',
-            error_message=str(e),
-            error_code='SYSTEM_ERROR'
-        )
+    # Back in the queue, then registered the way the worker does it
+    crud_warranty_registration.requeue(db, id=registration.id)
+    claimed = crud_warranty_registration.claim_due(db, limit=1, ids=[registration.id])
+    if claimed:
+        await crud_warranty_registration.register_now(db, claimed)
+    # Otherwise the worker has just claimed it
     
+    db.refresh(registration)
     return registration
@@ -12,9 +12,7 @@ from app.crud.payment import crud_payment
 from app.crud.order import crud_order
 from app.crud.warranty_registration import crud_warranty_registration
 from app.schemas.payment import PaymentUpdate
-from app.schemas.warranty_registration import WarrantyRegistrationCreate
 from app.services.payment import PaymentFactory, PaymentProviderError
-from app.services.garanzia3_service import garanzia3_service
 from app.core.security.api_key import verify_api_key
 from app.integrations.payplug import payplug_service
 from loguru import logger
@@ -22,144 +20,6 @@ from loguru import logger
 router = APIRouter()
 
 
-async def auto_register_warranties(db: Session, order):
-    """
-    Automatically register warranties for order items after successful payment
-    
-    Args:
-        db: Database session
-        order: Order object
-        
-    This function:
-    1. Checks order items for warranty products
-    2. Extracts customer info from order
-    3. Registers each warranty with Garanzia3
-    4. Creates WarrantyRegistration records
-    """
-    
-    # Check if order has items
-    if not hasattr(order, 'items') or not order.items:
-        return
-    
-    # Get customer address for contact info
-    customer_address = order.billing_address
-    if not customer_address:
-        # No address, cannot register
-        return
-    
-    # Extract customer info
-    customer_name = customer_address.get('name') or customer_address.get('first_name') or "Customer"
-    customer_lastname = customer_address.get('last_name') or "Customer"
-    
-    # Get email from customer_info (preserved at order time)
-    customer_email = order.customer_info.get('email', '')
-    customer_phone = customer_address.get('phone', '')
-    
-    # Process each order item
-    for item in order.items:
-        # Check if item has warranty option (stored as JSON)
-        if not item.warranty_option or not isinstance(item.warranty_option, dict):
-            continue
-        
-        # Extract warranty info from JSON
-        warranty_id = item.warranty_option.get('id')
-        if not warranty_id:
-            continue
-        
-        # Get product for EAN13
-        product = item.product
-        if not product:
-            continue
-        
-        # Get product EAN13 (required for Garanzia3)
-        # Try multiple sources in order of preference:
-        # 1. product_ean13 field from OrderItem
-        # 2. product.ean13 from Product model
-        # 3. product_sku from OrderItem (fallback - SKU is often the same as EAN13)
-        product_ean13 = None
-        
-        if hasattr(item, 'product_ean13') and item.product_ean13:
-            product_ean13 = item.product_ean13
-        elif hasattr(product, 'ean13') and product.ean13:
-            product_ean13 = product.ean13
-        elif hasattr(item, 'product_sku') and item.product_sku:
-            # Use SKU as fallback (often SKU = EAN13 in product databases)
-            product_ean13 = item.product_sku
-        
-        # Skip if no EAN13 found from any source
-        if not product_ean13:
-            continue
-        
-        # Check if warranty already registered for this item
-        existing = crud_warranty_registration.get_by_order(db, order_id=order.id)
-        already_registered = any(
-            reg.product_id == item.product_id and reg.warranty_id == warranty_id and reg.status == 'registered'
-            for reg in existing
-        )
-        
-        if already_registered:
-            continue
-        
-        # Create warranty registration record
-        registration_data = WarrantyRegistrationCreate(
-            order_id=order.id,
-            product_id=item.product_id,
-            warranty_id=warranty_id,
-            customer_name=customer_name,
-            customer_lastname=customer_lastname,
-            customer_email=customer_email,
-            customer_phone=customer_phone,
-            product_ean13=product_ean13,
-            product_name=item.product_title  # Use product title from order item
-        )
-        
-        registration = crud_warranty_registration.create(
-            db,
-            registration_in=registration_data,
-            is_test=False  # Production registration
-        )
-        
-        # Call Garanzia3 API
-        try:
-            result = await garanzia3_service.register_warranty(
-                ean13=product_ean13,
-                customer_name=customer_name,
-                customer_lastname=customer_lastname,
-                customer_email=customer_email,
-                customer_phone=customer_phone
-            )
-            
-            if result['success']:
-                # Update registration with success
-                crud_warranty_registration.update_status(
-                    db,
-                    id=registration.id,
-                    status='registered',
-                    g3_transaction_id=result['transaction'],
-                    g3_pin=result['pin'],
-                    g3_response=result.get('raw_response')
-                )
-            else:
-                # Update registration with failure
-                crud_warranty_registration.update_status(
-                    db,
-                    id=registration.id,
-                    status='failed',
-                    error_message=result['error'],
-                    error_code='G3_API_ERROR'
-                )
-        
-        except Exception as e:
-            # Update registration with failure
-            crud_warranty_registration.update_status(
-                db,
-                id=registration.id,
-                status='failed',
-                error_message=str(e),
-                error_code='SYSTEM_ERROR'
-            )
-
-
 @router.post("/payment/{provider}")
 async def payment_webhook(
     provider: str,
@@ -257,8 +117,8 @@ async def payment_webhook(
             order.status = 'completed'  # Changed from 'confirmed' to match warranty registration check
             order.payment_transaction_id = updated_payment.provider_transaction_id
             
-            # Auto-register warranties if order has warranty products
-            await auto_register_warranties(db, order)
+            # Queue warranty registrations if order has warranty products
+            crud_warranty_registration.enqueue_for_order(db, order)
             
             # TODO: Send order confirmation email
             # TODO: Notify admin
@@ -447,13 +307,16 @@ async def payplug_webhook(
             )
         
         # Process webhook
-        payment_info = payplug_service.process_webhook(resource_id)
+        payment_info = await payplug_service.process_webhook(resource_id)
         
-        # Get order ID
+        # Get order ID (metadata, else the order created with this payment)
         order_id = payment_info.get('order_id')
         if not order_id:
-            logger.error(f"No order ID in payment metadata for payment {resource_id}")
-            return {"status": "ok", "message": "No order ID found"}
+            order = crud_order.get_by_payment_ref(db, resource_id)
+            if not order:
+                logger.error(f"No order ID in payment metadata for payment {resource_id}")
+                return {"status": "ok", "message": "No order ID found"}
+            order_id = order.id
         
         # Get order
         order = crud_order.get(db, id=int(order_id))
@@ -473,8 +336,8 @@ async def payplug_webhook(
             
             logger.info(f"Order {order_id} payment completed successfully")
             
-            # Auto-register warranties if payment successful
-            await auto_register_warranties(db, order)
+            # Queue warranty registrations if payment successful
+            crud_warranty_registration.enqueue_for_order(db, order)
             
         elif payment_info['status'] == 'failed':
             # Payment failed
@@ -563,21 +426,23 @@ async def floa_webhook(
             logger.error("Missing dealReference or merchantReference in Floa webhook")
             return {"status": "error", "message": "Missing required fields"}
         
-        # Extract order ID from merchantReference
+        # Order created with this deal, else the order ID of merchantReference
+        order = crud_order.get_by_payment_ref(db, deal_reference)
+        if order:
+            order_id = order.id
         # Format: ORD{order_id}_{timestamp}
-        if merchant_reference.startswith("ORD"):
+        elif merchant_reference.startswith("ORD"):
             try:
                 order_id_str = merchant_reference[3:].split('_')[0]
                 order_id = int(order_id_str)
             except (IndexError, ValueError):
                 logger.error(f"Invalid merchantReference format: {merchant_reference}")
                 return {"status": "error", "message": "Invalid merchantReference format"}
+            order = crud_order.get(db, id=order_id)
         else:
             logger.error(f"Unknown merchantReference format: {merchant_reference}")
             return {"status": "error", "message": "Unknown merchantReference format"}
         
-        # Get order
-        order = crud_order.get(db, id=order_id)
         if not order:
             logger.error(f"Order {order_id} not found for Floa deal {deal_reference}")
             raise HTTPException(
@@ -595,8 +460,8 @@ async def floa_webhook(
             
             logger.info(f"Order {order_id} Floa payment completed (deal: {deal_reference})")
             
-            # Auto-register warranties if payment successful
-            await auto_register_warranties(db, order)
+            # Queue warranty registrations if payment successful
+            crud_warranty_registration.enqueue_for_order(db, order)
             
         elif deal_status == 'APPROVED':
             # Floa approved the payment - treat as successful
@@ -606,8 +471,8 @@ async def floa_webhook(
             
             logger.info(f"Order {order_id} Floa payment approved (deal: {deal_reference})")
             
-            # Auto-register warranties if payment approved
-            await auto_register_warranties(db, order)
+            # Queue warranty registrations if payment approved
+            crud_warranty_registration.enqueue_for_order(db, order)
             
         elif deal_status in ['CANCELLED', 'REFUSED', 'EXPIRED']:
             # Payment failed/cancelled
@@ -709,24 +574,8 @@ async def paypal_webhook(
         
         logger.info(f"PayPal webhook - Event: {event_type}, Order: {order_id}, Status: {payment_status}")
         
-        # Find order in database by payment_transaction_id or payment_info
-        from app.models.order import Order
-        
-        # Try to find order by payment_transaction_id first
-        order = db.query(Order).filter(
-            Order.payment_transaction_id == order_id
-        ).first()
-        
-        # If not found, search in payment_info JSON field
-        if not order:
-            all_orders = db.query(Order).filter(
-                Order.payment_info.isnot(None)
-            ).all()
-            
-            for o in all_orders:
-                if isinstance(o.payment_info, dict) and o.payment_info.get('payment_id') == order_id:
-                    order = o
-                    break
+        # Find order by payment_transaction_id or payment_info payment id
+        order = crud_order.get_by_payment_ref(db, order_id)
         
         if not order:
             logger.warning(f"Order not found for PayPal payment {order_id}")
@@ -745,8 +594,8 @@ async def paypal_webhook(
             
             logger.info(f"Order {order.id} PayPal payment completed (order: {order_id})")
             
-            # Auto-register warranties if payment successful
-            await auto_register_warranties(db, order)
+            # Queue warranty registrations if payment successful
+            crud_warranty_registration.enqueue_for_order(db, order)
             
         elif payment_status in ['VOIDED', 'CANCELLED', 'DECLINED']:
             # Payment failed/cancelled
@@ -43,6 +43,7 @@ class Settings(BaseSettings):
     PAYPLUG_SECRET_KEY: Optional[str] = None
     PAYPLUG_MODE: str = "test"  # test or live
     PAYPLUG_WEBHOOK_URL: Optional[str] = None  # Full webhook URL
+    PAYPLUG_BASE_URL: str = "https://api.payplug.com"
     
     # PayPal Payment Configuration
     PAYPAL_CLIENT_ID: Optional[str] = None
@@ -74,11 +75,71 @@ class Settings(BaseSettings):
     GARANZIA3_TOKEN: Optional[str] = None  # Authentication token
     GARANZIA3_MODE: str = "test"  # test or production
     GARANZIA3_TIMEOUT: int = 30  # API timeout in seconds
+    WARRANTY_REGISTRATION_ENABLED: bool = False  # Queue worker in the API process (enabled by the deployment)
+    WARRANTY_REGISTRATION_INTERVAL: int = 30  # Seconds between queue polls (new rows wake it at once)
+    WARRANTY_REGISTRATION_BATCH_SIZE: int = 50  # Registrations claimed per batch
+    WARRANTY_REGISTRATION_CONCURRENCY: int = 4  # Garanzia3 calls in flight
+    WARRANTY_REGISTRATION_MAX_ATTEMPTS: int = 5  # Then the registration is failed
+    WARRANTY_REGISTRATION_BACKOFF: int = 60  # Seconds before the first retry, doubled each time
+    
+    # Machine Translation Configuration
+    TRANSLATION_BACKEND: str = "google"  # google or stub
+    TRANSLATION_WORKER_ENABLED: bool = False  # Background worker in the API process (enabled by the deployment)
+    TRANSLATION_WORKER_INTERVAL: int = 5  # Seconds between queue polls
+    TRANSLATION_BATCH_SIZE: int = 20  # Jobs translated together
+    TRANSLATION_MAX_ATTEMPTS: int = 3  # Then the source text is kept
+    
+    # Background Product Imports
+    IMPORT_WORKER_ENABLED: bool = False  # Import worker threads in the API process (enabled by the deployment)
+    IMPORT_WORKER_THREADS: int = 2  # Jobs run in parallel
+    IMPORT_WORKER_INTERVAL: int = 5  # Seconds between queue polls
+    IMPORT_UPLOAD_DIR: str = "uploads/imports"  # Uploaded files kept until their job ends
+    IMPORT_JOB_STALE_SECONDS: int = 600  # Running job without a committed chunk for this long is resumed
+    IMPORT_JOB_MAX_ATTEMPTS: int = 3
+    IMPORT_PARSE_PROCESSES: int = 0  # Workbooks parsed in parallel by multi-source imports (0 = one per CPU)
+    
+    # Supplier Image Ingestion (copy image_urls to Cloudinary)
+    IMAGE_INGESTION_ENABLED: bool = False  # Background worker in the API process (enabled by the deployment)
+    IMAGE_INGESTION_INTERVAL: int = 60  # Seconds between scans for new supplier URLs
+    IMAGE_INGESTION_BATCH_SIZE: int = 100  # Source URLs claimed per batch
+    IMAGE_INGESTION_CONCURRENCY: int = 16  # Downloads in flight
+    IMAGE_INGESTION_PER_HOST: int = 4  # Downloads in flight per host
+    IMAGE_INGESTION_HOST_RATE: float = 5.0  # Requests per second per host
+    IMAGE_INGESTION_UPLOADS: int = 4  # Cloudinary uploads in flight
+    IMAGE_INGESTION_TIMEOUT: int = 20  # Download timeout in seconds
+    IMAGE_INGESTION_MAX_BYTES: int = 10 * 1024 * 1024
+    IMAGE_INGESTION_MAX_ATTEMPTS: int = 3  # Then the source URL is kept
+    
+    # Public catalogue response cache
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_TTL: int = 300  # Seconds; catalogue writes invalidate at once anyway
+    RESPONSE_CACHE_MAX_ENTRIES: int = 5000  # In-process backend (LRU)
+    RESPONSE_CACHE_REDIS_URL: Optional[str] = None  # Shared backend for all workers
+    CATEGORY_TREE_MAX_AGE: int = 60  # Seconds; writes in this process rebuild at once
+    
+    # Pending payment reconciliation with PayPal / Floa
+    PAYMENT_RECONCILIATION_ENABLED: bool = False  # Background worker in the API process (enabled by the deployment)
+    PAYMENT_RECONCILIATION_INTERVAL: int = 300  # Seconds between runs
+    PAYMENT_RECONCILIATION_RECHECK_MINUTES: int = 15  # An order is checked again after this
+    PAYMENT_RECONCILIATION_BATCH_SIZE: int = 200  # Orders per transaction
+    PAYMENT_RECONCILIATION_PAYPAL_CONCURRENCY: int = 8  # PayPal requests in flight
+    PAYMENT_RECONCILIATION_FLOA_CONCURRENCY: int = 4  # Floa requests in flight
+    
+    # HTTP clients of the PayPal / Floa / PayPlug / Garanzia3 integrations
+    INTEGRATION_HTTP_CONNECT_TIMEOUT: float = 5.0  # Seconds
+    INTEGRATION_HTTP_READ_TIMEOUT: float = 20.0  # Seconds (Garanzia3 uses GARANZIA3_TIMEOUT)
+    INTEGRATION_HTTP_MAX_CONNECTIONS: int = 20  # Per provider
+    INTEGRATION_HTTP_KEEPALIVE_CONNECTIONS: int = 10  # Idle connections kept per provider
+    INTEGRATION_HTTP_KEEPALIVE_EXPIRY: float = 60.0  # Seconds an idle connection is kept
+    INTEGRATION_HTTP2: bool = True  # Needs h2 (httpx[http2] in requirements.txt)
+    INTEGRATION_HTTP_RETRIES: int = 3  # Idempotent requests, on timeouts, 429 and 5xx
+    INTEGRATION_HTTP_BACKOFF: float = 0.5  # Seconds, doubled on each retry (full jitter)
     
     # Cloudinary Configuration (required for image uploads)
     CLOUDINARY_CLOUD_NAME: str
     CLOUDINARY_API_KEY: str
     CLOUDINARY_API_SECRET: str
+    UPLOAD_THREADS: int = 8  # Concurrent Cloudinary uploads per process
     
     class Config:
         env_file = ".env"
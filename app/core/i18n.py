@@ -0,0 +1,53 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Translation resolution
+One fallback policy for every translated entity: requested language, then Italian
+(optionally then the first available translation).
+
+Pair resolve_translation with loaders restricted to fallback_langs(lang), e.g.
+    selectinload(Product.features).selectinload(
+        ProductFeature.translations.and_(ProductFeatureTranslation.lang.in_(fallback_langs(lang)))
+    )
+so each collection holds at most two rows and is scanned once.
+"""
+from typing import Any, Iterable, List, Optional
+
+
+SUPPORTED_LANGS = ["it", "en", "fr", "de", "ar"]
+FALLBACK_LANG = "it"
+
+
+def fallback_langs(lang: str) -> List[str]:
+    """Languages needed to resolve `lang`: itself and the fallback"""
+    if lang == FALLBACK_LANG:
+        return [FALLBACK_LANG]
+    return [lang, FALLBACK_LANG]
+
+
+def resolve_translation(translations: Optional[Iterable[Any]], lang: str, any_fallback: bool = False):
+    """
+    Translation for `lang`, falling back to Italian
+
+    Single pass over the collection. With `any_fallback` the first translation
+    is returned when neither language exists. Returns None if nothing matches.
+    """
+    if not translations:
+        return None
+
+    fallback = None
+    first = None
+    for translation in translations:
+        translation_lang = translation.lang
+        if translation_lang == lang:
+            return translation
+        if fallback is None and translation_lang == FALLBACK_LANG:
+            fallback = translation
+        if first is None:
+            first = translation
+
+    if fallback is None and any_fallback:
+        return first
+    return fallback
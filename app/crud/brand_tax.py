@@ -2,12 +2,17 @@
 # © 2026 Muthana. All rights reserved.
 # Unauthorized copying or distribution is prohibited.
 
-from typing import Optional, List
+from typing import Optional, List, Tuple
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 from slugify import slugify
 from app.models.brand import Brand
+from app.models.product import Product
 from app.models.tax_class import TaxClass
 from app.schemas.brand_tax import BrandCreate, BrandUpdate, TaxClassCreate, TaxClassUpdate
+from app.crud.pagination import paginate_with_total, paginate_keyset
+from app.crud.product_listing import refresh_product_listing
+from app.services.suggest_index import suggest_index
 
 
 # ============= Brand CRUD =============
@@ -32,6 +37,11 @@ def count_brands(db: Session, active_only: bool = False) -> int:
     return query.count()
 
 
+def _brand_order():
+    """Listing order of brands, shared by offset and cursor pages (no sort_order counts as 0)"""
+    return [func.coalesce(Brand.sort_order, 0), Brand.id]
+
+
 def get_brands(db: Session, skip: int = 0, limit: int = 100, active_only: bool = False) -> List[Brand]:
     """Get all brands"""
     query = db.query(Brand)
@@ -42,6 +52,28 @@ def get_brands(db: Session, skip: int = 0, limit: int = 100, active_only: bool =
     return query.order_by(Brand.sort_order).offset(skip).limit(limit).all()
 
 
+def get_brands_page(db: Session, skip: int = 0, limit: int = 100, active_only: bool = False) -> Tuple[List[Brand], int]:
+    """Get one page of brands and the total count in a single query"""
+    query = db.query(Brand)
+    
+    if active_only:
+        query = query.filter(Brand.is_active == True)
+    
+    return paginate_with_total(query.order_by(*_brand_order()), skip, limit)
+
+
+def get_brands_by_cursor(
+    db: Session, cursor: Optional[str] = None, limit: int = 100, active_only: bool = False
+) -> Tuple[List[Brand], Optional[str]]:
+    """Get the page of brands after `cursor` (keyset on sort_order, id)"""
+    query = db.query(Brand)
+    
+    if active_only:
+        query = query.filter(Brand.is_active == True)
+    
+    return paginate_keyset(query, _brand_order(), cursor, limit)
+
+
 def create_brand(db: Session, brand: BrandCreate) -> Brand:
     """Create a new brand"""
     # Generate slug if not provided
@@ -59,6 +91,7 @@ def create_brand(db: Session, brand: BrandCreate) -> Brand:
     db.add(db_brand)
     db.commit()
     db.refresh(db_brand)
+    suggest_index.update_brand(db_brand)
     
     return db_brand
 
@@ -78,8 +111,14 @@ def update_brand(db: Session, brand_id: int, brand: BrandUpdate) -> Optional[Bra
     for field, value in update_data.items():
         setattr(db_brand, field, value)
     
+    # Listing rows carry the brand name
+    db.flush()
+    refresh_product_listing(
+        db, [pid for (pid,) in db.query(Product.id).filter(Product.brand_id == brand_id)], commit=False
+    )
     db.commit()
     db.refresh(db_brand)
+    suggest_index.update_brand(db_brand)
     return db_brand
 
 
@@ -91,6 +130,7 @@ def delete_brand(db: Session, brand_id: int) -> bool:
     
     db.delete(db_brand)
     db.commit()
+    suggest_index.remove_brand(brand_id)
     return True
 
 
@@ -121,6 +161,16 @@ def get_tax_classes(db: Session, skip: int = 0, limit: int = 100, active_only: b
     return query.offset(skip).limit(limit).all()
 
 
+def get_tax_classes_page(db: Session, skip: int = 0, limit: int = 100, active_only: bool = False) -> Tuple[List[TaxClass], int]:
+    """Get one page of tax classes and the total count in a single query"""
+    query = db.query(TaxClass)
+    
+    if active_only:
+        query = query.filter(TaxClass.is_active == True)
+    
+    return paginate_with_total(query.order_by(TaxClass.id), skip, limit)
+
+
 def create_tax_class(db: Session, tax_class: TaxClassCreate) -> TaxClass:
     """Create a new tax class"""
     db_tax_class = TaxClass(
@@ -147,6 +197,11 @@ def update_tax_class(db: Session, tax_class_id: int, tax_class: TaxClassUpdate)
     for field, value in update_data.items():
         setattr(db_tax_class, field, value)
     
+    # Listing rows carry the tax name and rate
+    db.flush()
+    refresh_product_listing(
+        db, [pid for (pid,) in db.query(Product.id).filter(Product.tax_class_id == tax_class_id)], commit=False
+    )
     db.commit()
     db.refresh(db_tax_class)
     return db_tax_class
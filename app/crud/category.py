@@ -3,12 +3,14 @@
 # Unauthorized copying or distribution is prohibited.
 
 from typing import Optional, List, Tuple
-from sqlalchemy import or_, and_
-from sqlalchemy.orm import Session, joinedload, aliased
+from sqlalchemy.orm import Session, joinedload, selectinload
 from slugify import slugify
-from deep_translator import GoogleTranslator
 from app.models.category import Category, CategoryTranslation
 from app.schemas.category import CategoryCreate, CategoryUpdate
+from app.crud.pagination import paginate_with_total
+from app.crud.translation import enqueue_translation_job
+from app.services.translation.worker import translation_worker
+from app.services.category_tree import CategoryView, category_tree
 
 
 def get_category(db: Session, category_id: int) -> Optional[Category]:
@@ -33,42 +35,51 @@ def get_categories(db: Session, skip: int = 0, limit: int = 100, parent_id: Opti
     return query.offset(skip).limit(limit).all()
 
 
-def get_all_categories(
-    db: Session, 
-    lang: Optional[str] = None, 
-    active_only: bool = True,
-    skip: int = 0,
-    limit: int = 100
-) -> List[Category]:
-    """Get all categories (main and children) with optional translation and pagination"""
+def _all_categories_query(db: Session, active_only: bool = True):
+    """Base query for all categories (main and children) in listing order"""
     # Allow max depth=3 (parent + child + grandson). No filtering by depth.
-    query = (
-        db.query(Category)
-        .options(joinedload(Category.children))
-    )
+    query = db.query(Category)
     
     if active_only:
         query = query.filter(Category.is_active == True)
     
-    categories = query.order_by(
+    return query.order_by(
         Category.parent_id.nulls_first(), 
         Category.sort_order,
         Category.id
-    ).offset(skip).limit(limit).all()
+    )
+
+
+def _apply_category_translations(db: Session, categories: List[Category], lang: Optional[str]):
+    """Override name/slug with the translation for `lang` (one query for the whole page)"""
+    if not lang or not categories:
+        return
     
-    # If language is specified, load translated names
-    if lang and categories:
-        for category in categories:
-            translation = db.query(CategoryTranslation).filter(
-                CategoryTranslation.category_id == category.id,
-                CategoryTranslation.lang == lang
-            ).first()
-            
-            if translation:
-                category.name = translation.name
-                category.slug = translation.slug
+    translations = db.query(CategoryTranslation).filter(
+        CategoryTranslation.category_id.in_([c.id for c in categories]),
+        CategoryTranslation.lang == lang
+    ).all()
+    by_category = {t.category_id: t for t in translations}
     
-    return categories
+    for category in categories:
+        translation = by_category.get(category.id)
+        if translation:
+            category.name = translation.name
+            category.slug = translation.slug
+
+
+def get_all_categories_page(
+    db: Session,
+    lang: Optional[str] = None,
+    active_only: bool = True,
+    skip: int = 0,
+    limit: int = 100
+) -> Tuple[List[Category], int]:
+    """Get one page of all categories and the total count in a single query"""
+    query = _all_categories_query(db, active_only).options(selectinload(Category.children))
+    categories, total = paginate_with_total(query, skip, limit)
+    _apply_category_translations(db, categories, lang)
+    return categories, total
 
 
 def search_categories(
@@ -78,84 +89,13 @@ def search_categories(
     active_only: bool = True,
     parent_only: bool = False,
     limit: int = 5000,
-) -> Tuple[List[Category], int]:
+) -> Tuple[List[CategoryView], int]:
     """Search categories by name/slug (and translation for requested lang).
 
-    Returns (categories, total_matches). Uses an ID subquery to avoid duplicate rows
-    when joining translations.
+    Returns (categories, total_matches), matched in the category tree snapshot.
     """
-    q = (q or "").strip()
-    if not q:
-        return ([], 0)
-
-    like = f"%{q}%"
-
-    # Allow max depth=3 (parent + child + grandson). No filtering by depth.
-    # Build an ID query first (stable ordering, distinct IDs)
-    join_cond = (CategoryTranslation.category_id == Category.id)
-    if lang:
-        join_cond = and_(join_cond, CategoryTranslation.lang == lang)
-
-    ids_query = (
-        db.query(Category.id, Category.parent_id, Category.sort_order)
-        .outerjoin(CategoryTranslation, join_cond)
-    )
-
-    if active_only:
-        ids_query = ids_query.filter(Category.is_active == True)
-
-    if parent_only:
-        ids_query = ids_query.filter(Category.parent_id == None)
-
-    ids_query = ids_query.filter(
-        or_(
-            Category.name.ilike(like),
-            Category.slug.ilike(like),
-            CategoryTranslation.name.ilike(like),
-            CategoryTranslation.slug.ilike(like),
-        )
-    )
-
-    ids_query = ids_query.distinct().order_by(
-        Category.parent_id.nulls_first(),
-        Category.sort_order,
-        Category.id,
-    )
-
-    total = ids_query.count()
-    ids = [row[0] for row in ids_query.limit(limit).all()]
-
-    if not ids:
-        return ([], total)
-
-    categories = db.query(Category).options(joinedload(Category.children)).filter(Category.id.in_(ids)).all()
-
-    # Preserve ordering from ids_query
-    order_index = {category_id: idx for idx, category_id in enumerate(ids)}
-    categories.sort(key=lambda c: order_index.get(c.id, 10**9))
-
-    # Apply translation override for response language
-    if lang and categories:
-        for category in categories:
-            translation = db.query(CategoryTranslation).filter(
-                CategoryTranslation.category_id == category.id,
-                CategoryTranslation.lang == lang,
-            ).first()
-            if translation:
-                category.name = translation.name
-                category.slug = translation.slug
-
-    return (categories, total)
-
-
-def count_all_categories(db: Session, active_only: bool = True) -> int:
-    """Count total categories (all levels, no depth restriction)"""
-    query = db.query(Category)
-    
-    if active_only:
-        query = query.filter(Category.is_active == True)
-    
-    return query.count()
+    matches = category_tree.get(db).search(q, lang=lang, active_only=active_only, parent_only=parent_only)
+    return ([node.view(lang) for node in matches[:limit]], len(matches))
 
 
 def get_main_categories(
@@ -163,93 +103,32 @@ def get_main_categories(
     lang: Optional[str] = None,
     skip: int = 0,
     limit: int = 100
-) -> List[Category]:
-    """Get all main categories (parent_id = null) with optional translation and pagination"""
-    categories = db.query(Category).options(
-        joinedload(Category.children)
-    ).filter(
-        Category.parent_id == None,
-        Category.is_active == True
-    ).order_by(Category.sort_order, Category.id).offset(skip).limit(limit).all()
-    
-    # If language is specified, load translated names
-    if lang and categories:
-        for category in categories:
-            translation = db.query(CategoryTranslation).filter(
-                CategoryTranslation.category_id == category.id,
-                CategoryTranslation.lang == lang
-            ).first()
-            
-            if translation:
-                category.name = translation.name
-                category.slug = translation.slug
-    
-    return categories
-
-
-def count_main_categories(db: Session) -> int:
-    """Count main categories (parent_id = null)"""
-    return db.query(Category).filter(
-        Category.parent_id == None,
-        Category.is_active == True
-    ).count()
+) -> Tuple[List[CategoryView], int]:
+    """Get one page of the active main categories (parent_id = null) and their total"""
+    categories = category_tree.get(db).main_categories()
+    return [node.view(lang) for node in categories[skip:skip + limit]], len(categories)
 
 
 def get_category_children(
     db: Session, 
     parent_id: int, 
     lang: Optional[str] = None
-) -> List[Category]:
-    """Get children categories of a parent category"""
+) -> List[CategoryView]:
+    """Get active children categories of a parent category"""
     # Allow 3-level hierarchy as per prezzoforte_category_tree.xlsx:
     # Parent (level 1) → Child (level 2) → Grandson (level 3)
     # No depth limit enforced - let the tree structure be flexible
-    
-    children = db.query(Category).filter(
-        Category.parent_id == parent_id,
-        Category.is_active == True
-    ).order_by(Category.sort_order, Category.id).all()
-
-    # If language is specified, load translated names
-    if lang and children:
-        for child in children:
-            translation = db.query(CategoryTranslation).filter(
-                CategoryTranslation.category_id == child.id,
-                CategoryTranslation.lang == lang
-            ).first()
-            
-            if translation:
-                child.name = translation.name
-                child.slug = translation.slug
-    
-    return children
+    return [node.view(lang) for node in category_tree.get(db).children(parent_id)]
 
 
 def get_category_grandchildren(
     db: Session, 
     parent_id: int, 
     lang: Optional[str] = None
-) -> List[Category]:
+) -> List[CategoryView]:
     """Get all subcategories (children) of a category - works for any level"""
     # Just return direct children - same as get_category_children
-    children = db.query(Category).filter(
-        Category.parent_id == parent_id,
-        Category.is_active == True
-    ).order_by(Category.sort_order, Category.id).all()
-    
-    # If language is specified, load translated names
-    if lang and children:
-        for child in children:
-            translation = db.query(CategoryTranslation).filter(
-                CategoryTranslation.category_id == child.id,
-                CategoryTranslation.lang == lang
-            ).first()
-            
-            if translation:
-                child.name = translation.name
-                child.slug = translation.slug
-    
-    return children
+    return get_category_children(db, parent_id, lang)
 
 
 def create_category(db: Session, category: CategoryCreate) -> Category:
@@ -287,64 +166,23 @@ def create_category(db: Session, category: CategoryCreate) -> Category:
 
 
 def create_default_translations(db: Session, category: Category):
-    """Create automatic translations for a category using Google Translate"""
-    # Language mappings
-    languages = {
-        "it": "it",  # Italian (source language)
-        "en": "en",  # English
-        "fr": "fr",  # French
-        "de": "de",  # German
-        "ar": "ar"   # Arabic
-    }
-    
-    translations_created = []
-    for lang_code, target_lang in languages.items():
-        try:
-            if lang_code == "it":
-                # Italian is the source, use original name
-                translated_name = category.name
-                translated_slug = category.slug
-            else:
-                # Translate to target language using GoogleTranslator
-                try:
-                    translated_name = GoogleTranslator(
-                        source='it',
-                        target=target_lang
-                    ).translate(category.name)
-                except Exception as trans_error:
-                    # If translation fails, use original name
-                    translated_name = category.name
-                
-                # For Arabic, keep the Arabic text in slug (don't transliterate)
-                if lang_code == "ar":
-                    translated_slug = translated_name.replace(" ", "-").lower()
-                else:
-                    translated_slug = slugify(translated_name)
-            
-            # Create translation record
-            translation = CategoryTranslation(
-                category_id=category.id,
-                lang=lang_code,
-                name=translated_name,
-                slug=translated_slug,
-                description=None  # Empty for now, can be updated later
-            )
-            db.add(translation)
-            translations_created.append(lang_code)
-        
-        except Exception as e:
-            # Fallback to original name if translation fails
-            translation = CategoryTranslation(
-                category_id=category.id,
-                lang=lang_code,
-                name=category.name,
-                slug=category.slug,
-                description=None
-            )
-            db.add(translation)
-            translations_created.append(f"{lang_code} (fallback)")
+    """
+    Create the Italian translation of a new category
     
+    The other languages are machine-translated in the background
+    (see app.crud.translation).
+    """
+    translation = CategoryTranslation(
+        category_id=category.id,
+        lang="it",
+        name=category.name,
+        slug=category.slug,
+        description=None  # Empty for now, can be updated later
+    )
+    db.add(translation)
+    enqueue_translation_job(db, "category", category.id)
     db.commit()
+    translation_worker.wake()
     
     # Reload category with translations
     db.refresh(category)
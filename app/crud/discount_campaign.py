@@ -10,6 +10,9 @@ from app.models.discount_campaign import DiscountCampaign, TargetTypeEnum
 from app.models.product import Product, ProductDiscount, ProductTranslation, ProductImage
 from app.models.category import Category
 from app.schemas.discount_campaign import DiscountCampaignCreate, DiscountCampaignUpdate
+from app.crud.product_listing import refresh_product_listing
+from app.core.i18n import resolve_translation
+from app.services.category_tree import category_tree
 
 
 # ============= Campaign CRUD =============
@@ -53,11 +56,18 @@ def update_expired_campaigns(db: Session) -> dict:
     ).all()
     
     updated_count = 0
+    affected_product_ids = set()
     
     for campaign in expired_campaigns:
         # Update campaign status
         campaign.is_active = False
         
+        affected_product_ids.update(
+            pid for (pid,) in db.query(ProductDiscount.product_id).filter(
+                ProductDiscount.campaign_id == campaign.id
+            ).all()
+        )
+        
         # Update all product discounts for this campaign
         db.query(ProductDiscount).filter(
             ProductDiscount.campaign_id == campaign.id
@@ -67,6 +77,7 @@ def update_expired_campaigns(db: Session) -> dict:
     
     if updated_count > 0:
         db.commit()
+        refresh_product_listing(db, affected_product_ids)
     
     return {
         "success": True,
@@ -127,6 +138,12 @@ def delete_campaign(db: Session, campaign_id: int) -> bool:
     if not db_campaign:
         return False
     
+    affected_product_ids = [
+        pid for (pid,) in db.query(ProductDiscount.product_id).filter(
+            ProductDiscount.campaign_id == campaign_id
+        ).all()
+    ]
+    
     # First, delete all product discounts linked to this campaign
     db.query(ProductDiscount).filter(
         ProductDiscount.campaign_id == campaign_id
@@ -135,6 +152,7 @@ def delete_campaign(db: Session, campaign_id: int) -> bool:
     # Then delete the campaign itself
     db.delete(db_campaign)
     db.commit()
+    refresh_product_listing(db, affected_product_ids)
     return True
 
 
@@ -144,6 +162,7 @@ def apply_active_campaigns_to_product(db: Session, product_id: int, category_ids
     """
     Automatically apply active campaigns to a product based on its categories, brand, or "ALL" campaigns
     This should be called when creating or updating a product to ensure discounts are applied
+    (the caller refreshes the product listing projection afterwards)
     
     Args:
         db: Database session
@@ -185,21 +204,10 @@ def apply_active_campaigns_to_product(db: Session, product_id: int, category_ids
         elif campaign.target_type == TargetTypeEnum.CATEGORY:
             if campaign.target_ids and len(campaign.target_ids) > 0:
                 campaign_category_id = campaign.target_ids[0]
+                tree = category_tree.get(db)
                 
-                # Get all subcategories recursively
-                def get_all_subcategory_ids(cat_id, db_session):
-                    """Recursively get all subcategory IDs"""
-                    from app.models.category import Category
-                    category_ids_list = [cat_id]
-                    children = db_session.query(Category).filter(Category.parent_id == cat_id).all()
-                    for child in children:
-                        category_ids_list.extend(get_all_subcategory_ids(child.id, db_session))
-                    return category_ids_list
-                
-                all_campaign_category_ids = get_all_subcategory_ids(campaign_category_id, db)
-                
-                # Check if product is in any of the campaign categories
-                if any(cat_id in all_campaign_category_ids for cat_id in category_ids):
+                # Check if product is in the campaign category or any of its subcategories
+                if any(tree.is_descendant(cat_id, campaign_category_id) for cat_id in category_ids):
                     should_apply = True
         
         elif campaign.target_type == TargetTypeEnum.BRAND:
@@ -280,17 +288,8 @@ def apply_campaign_to_products(db: Session, campaign_id: int) -> dict:
         
         category_id = campaign.target_ids[0]
         
-        # Get all subcategories recursively
-        def get_all_subcategory_ids(cat_id, db_session):
-            """Recursively get all subcategory IDs"""
-            from app.models.category import Category
-            category_ids = [cat_id]
-            children = db_session.query(Category).filter(Category.parent_id == cat_id).all()
-            for child in children:
-                category_ids.extend(get_all_subcategory_ids(child.id, db_session))
-            return category_ids
-        
-        all_category_ids = get_all_subcategory_ids(category_id, db)
+        # The category and all its subcategories
+        all_category_ids = category_tree.get(db).subtree_ids(category_id)
         
         # Get products from all categories (parent + all subcategories)
         products = db.query(Product).join(Product.categories).filter(
@@ -347,6 +346,7 @@ def apply_campaign_to_products(db: Session, campaign_id: int) -> dict:
         products_updated += 1
     
     db.commit()
+    refresh_product_listing(db, [product.id for product in products])
     
     return {
         "success": True,
@@ -373,17 +373,8 @@ def remove_campaign_discounts(db: Session, campaign_id: int) -> dict:
     elif campaign.target_type == TargetTypeEnum.CATEGORY:
         category_id = campaign.target_ids[0]
         
-        # Get all subcategories recursively
-        def get_all_subcategory_ids(cat_id, db_session):
-            """Recursively get all subcategory IDs"""
-            from app.models.category import Category
-            category_ids = [cat_id]
-            children = db_session.query(Category).filter(Category.parent_id == cat_id).all()
-            for child in children:
-                category_ids.extend(get_all_subcategory_ids(child.id, db_session))
-            return category_ids
-        
-        all_category_ids = get_all_subcategory_ids(category_id, db)
+        # The category and all its subcategories
+        all_category_ids = category_tree.get(db).subtree_ids(category_id)
         
         # Get products from all categories (parent + all subcategories)
         products = db.query(Product).join(Product.categories).filter(
@@ -395,6 +386,7 @@ def remove_campaign_discounts(db: Session, campaign_id: int) -> dict:
     
     # Remove discounts
     products_updated = 0
+    affected_product_ids = []
     for product in products:
         discounts = db.query(ProductDiscount).filter(
             ProductDiscount.product_id == product.id
@@ -405,8 +397,10 @@ def remove_campaign_discounts(db: Session, campaign_id: int) -> dict:
         
         if discounts:
             products_updated += 1
+            affected_product_ids.append(product.id)
     
     db.commit()
+    refresh_product_listing(db, affected_product_ids)
     
     return {
         "success": True,
@@ -487,11 +481,9 @@ def get_campaign_products(
         
         # Get product title (prefer Italian)
         title = "Untitled"
-        it_translation = next((t for t in product.translations if t.lang == "it"), None)
-        if it_translation:
-            title = it_translation.title
-        elif product.translations:
-            title = product.translations[0].title
+        translation = resolve_translation(product.translations, "it", any_fallback=True)
+        if translation:
+            title = translation.title
         
         # Get first image
         image = None
@@ -630,11 +622,9 @@ def get_all_discounted_products(
         
         # Get product title
         title = "Untitled"
-        it_translation = next((t for t in product.translations if t.lang == "it"), None)
-        if it_translation:
-            title = it_translation.title
-        elif product.translations:
-            title = product.translations[0].title
+        translation = resolve_translation(product.translations, "it", any_fallback=True)
+        if translation:
+            title = translation.title
         
         # Get campaign info
         campaign = db.query(DiscountCampaign).filter(
@@ -753,11 +743,9 @@ def get_highest_discount_products(db: Session) -> dict:
         
         # Get product title
         title = "Untitled"
-        it_translation = next((t for t in product.translations if t.lang == "it"), None)
-        if it_translation:
-            title = it_translation.title
-        elif product.translations:
-            title = product.translations[0].title
+        translation = resolve_translation(product.translations, "it", any_fallback=True)
+        if translation:
+            title = translation.title
         
         # Get campaign info
         campaign = db.query(DiscountCampaign).filter(
@@ -0,0 +1,225 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Supplier image ingestion
+Queue and process copies of supplier image URLs to Cloudinary
+
+queue_product_images adds one ImageIngestion per distinct supplier URL of
+product_images. run_image_ingestion claims a batch, downloads it
+concurrently and uploads each distinct image (by content hash) once; images
+already uploaded for another URL are reused. Product images are then
+pointed at the Cloudinary URL. Each batch commits its progress, so an
+interrupted run continues with the URLs still pending.
+"""
+import asyncio
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from loguru import logger
+from sqlalchemy import bindparam, func, literal, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.dialect import dialect_insert
+from app.models.image_ingestion import ImageIngestion
+from app.models.product import ProductImage
+from app.crud.product_listing import refresh_product_listing
+from app.services.image_ingestion import CLOUDINARY_PREFIX, ImageUploader, download_images
+
+
+RUNNING_TIMEOUT = timedelta(minutes=10)  # Running rows older than this were abandoned
+
+
+# ============= Queue =============
+
+def queue_product_images(db: Session) -> int:
+    """
+    Queue every supplier image URL not seen before; returns the number queued
+    Product images still using an already ingested URL are rewritten too.
+    """
+    source = select(
+        ProductImage.url, literal("pending"), literal(0)
+    ).where(
+        ProductImage.url.like("http%"),
+        ProductImage.url.notlike(f"{CLOUDINARY_PREFIX}%")
+    ).distinct()
+    stmt = dialect_insert(db)(ImageIngestion.__table__).from_select(
+        ["source_url", "status", "attempts"], source
+    ).on_conflict_do_nothing(index_elements=["source_url"])
+    queued = db.execute(stmt).rowcount or 0
+
+    done = dict(
+        db.query(ImageIngestion.source_url, ImageIngestion.cdn_url).join(
+            ProductImage, ProductImage.url == ImageIngestion.source_url
+        ).filter(ImageIngestion.status == "done").distinct()
+    )
+    _, product_ids = _rewrite_product_images(db, done)
+    db.commit()
+
+    if product_ids:
+        refresh_product_listing(db, product_ids)
+    return queued
+
+
+def claim_image_ingestions(db: Session, limit: int) -> List[ImageIngestion]:
+    """
+    Mark up to `limit` pending URLs as running and return them
+
+    Uses SKIP LOCKED on PostgreSQL so several workers never claim the same URL.
+    Rows left running by a crashed worker are claimed again after RUNNING_TIMEOUT.
+    """
+    now = datetime.now(timezone.utc)
+    db.query(ImageIngestion).filter(
+        ImageIngestion.status == "running",
+        ImageIngestion.started_at < now - RUNNING_TIMEOUT
+    ).update({"status": "pending"}, synchronize_session=False)
+
+    rows = db.query(ImageIngestion).filter(
+        ImageIngestion.status == "pending"
+    ).order_by(ImageIngestion.id).limit(limit).with_for_update(skip_locked=True).all()
+
+    for row in rows:
+        row.status = "running"
+        row.started_at = now
+        row.attempts = (row.attempts or 0) + 1
+    db.commit()
+
+    return rows
+
+
+def get_image_ingestion_stats(db: Session) -> Dict[str, int]:
+    """Number of source URLs per status"""
+    rows = db.query(ImageIngestion.status, func.count(ImageIngestion.id)).group_by(ImageIngestion.status).all()
+    return {status: count for status, count in rows}
+
+
+# ============= Processing =============
+
+def _rewrite_product_images(db: Session, urls: Dict[str, str]) -> Tuple[int, List[int]]:
+    """Point product images at their new URL ({source_url: cdn_url}); returns (images, product ids)"""
+    if not urls:
+        return 0, []
+    images = db.query(ProductImage.id, ProductImage.product_id, ProductImage.url).filter(
+        ProductImage.url.in_(list(urls))
+    ).all()
+    if images:
+        table = ProductImage.__table__
+        db.execute(
+            table.update().where(table.c.id == bindparam("image_id")).values(url=bindparam("new_url")),
+            [{"image_id": image_id, "new_url": urls[url]} for image_id, _, url in images]
+        )
+    return len(images), list({product_id for _, product_id, _ in images})
+
+
+def _upload_all(uploader: ImageUploader, images: Dict[str, bytes]) -> Dict[str, Any]:
+    """Upload {content hash: bytes} in parallel; returns {hash: result or exception}"""
+    if not images:
+        return {}
+    with ThreadPoolExecutor(max_workers=min(len(images), settings.IMAGE_INGESTION_UPLOADS)) as pool:
+        futures = {content_hash: pool.submit(uploader.upload, data, content_hash) for content_hash, data in images.items()}
+    results = {}
+    for content_hash, future in futures.items():
+        try:
+            results[content_hash] = future.result()
+        except Exception as e:
+            results[content_hash] = e
+    return results
+
+
+def _error_text(error: Exception) -> str:
+    return str(error) or error.__class__.__name__
+
+
+def run_image_ingestion(
+    db: Session,
+    uploader: ImageUploader,
+    limit: Optional[int] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None
+) -> Dict[str, int]:
+    """
+    Claim and process one batch of source URLs
+
+    Failed URLs go back to pending until IMAGE_INGESTION_MAX_ATTEMPTS, then they
+    are failed and their product images keep the supplier URL.
+    Returns counters for the batch.
+    """
+    batch = claim_image_ingestions(db, limit or settings.IMAGE_INGESTION_BATCH_SIZE)
+    stats = {"claimed": len(batch), "downloaded": 0, "uploaded": 0, "reused": 0, "rewritten": 0, "retried": 0, "failed": 0}
+    if not batch:
+        return stats
+
+    downloads = asyncio.run(download_images([row.source_url for row in batch], transport=transport))
+    hashes = {
+        row.id: hashlib.sha256(downloads[row.source_url]).hexdigest()
+        for row in batch if isinstance(downloads[row.source_url], bytes)
+    }
+    stats["downloaded"] = len(hashes)
+
+    # Content already on Cloudinary (uploaded for another URL)
+    known = {}
+    if hashes:
+        for content_hash, cdn_url, public_id in db.query(
+            ImageIngestion.content_hash, ImageIngestion.cdn_url, ImageIngestion.public_id
+        ).filter(
+            ImageIngestion.content_hash.in_(set(hashes.values())),
+            ImageIngestion.status == "done"
+        ):
+            known[content_hash] = {"url": cdn_url, "public_id": public_id}
+
+    to_upload = {}
+    for row in batch:
+        content_hash = hashes.get(row.id)
+        if content_hash and content_hash not in known and content_hash not in to_upload:
+            to_upload[content_hash] = downloads[row.source_url]
+    uploaded = _upload_all(uploader, to_upload)
+    stats["uploaded"] = sum(1 for result in uploaded.values() if not isinstance(result, Exception))
+    del to_upload
+
+    now = datetime.now(timezone.utc)
+    new_urls = {}
+    for row in batch:
+        download = downloads[row.source_url]
+        content_hash = hashes.get(row.id)
+        asset = known.get(content_hash) or uploaded.get(content_hash)
+        if isinstance(download, Exception):
+            error = f"Download failed: {_error_text(download)}"
+        elif isinstance(asset, Exception):
+            error = f"Upload failed: {_error_text(asset)}"
+        else:
+            error = None
+
+        if error:
+            row.error = error
+            if row.attempts >= settings.IMAGE_INGESTION_MAX_ATTEMPTS:
+                row.status = "failed"
+                row.finished_at = now
+                stats["failed"] += 1
+            else:
+                row.status = "pending"
+                stats["retried"] += 1
+            continue
+
+        if content_hash in known:
+            stats["reused"] += 1
+        row.status = "done"
+        row.content_hash = content_hash
+        row.cdn_url = asset["url"]
+        row.public_id = asset["public_id"]
+        row.bytes = len(download)
+        row.error = None
+        row.finished_at = now
+        new_urls[row.source_url] = asset["url"]
+
+    stats["rewritten"], product_ids = _rewrite_product_images(db, new_urls)
+    db.commit()
+
+    if product_ids:
+        refresh_product_listing(db, product_ids)
+    if stats["failed"]:
+        logger.warning(f"Image ingestion: {stats['failed']} source URLs failed permanently")
+    return stats
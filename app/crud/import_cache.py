@@ -0,0 +1,282 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Import-scoped brand and category lookups
+
+One ImportCaches lives for a whole import. It loads every brand and every
+category with one query each the first time it is used, resolves brand names
+and category paths in memory, and creates what is missing once per distinct
+key with multi-row inserts (categories level by level). Entries created in a
+chunk that is rolled back are dropped again (rollback()).
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from slugify import slugify
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from app.db.dialect import dialect_insert
+from app.models.brand import Brand
+from app.models.category import Category, CategoryTranslation
+
+
+COUNTERS = (
+    "brand_hits",
+    "brand_misses",
+    "brands_created",
+    "category_hits",
+    "category_misses",
+    "categories_created",
+)
+
+
+def normalize_brand(name) -> str:
+    return " ".join(str(name).split()).lower() if name else ""
+
+
+def clean_path(path: Optional[Iterable[str]]) -> Tuple[str, ...]:
+    """Category path without empty segments"""
+    return tuple(str(name).strip() for name in path or () if name and str(name).strip())
+
+
+class ImportCaches:
+    """Normalized brand name -> id and category path -> leaf id for one import"""
+
+    def __init__(self):
+        self.loaded = False
+        self._brand_by_name: Dict[str, int] = {}
+        self._brand_by_slug: Dict[str, int] = {}
+        self._category_by_slug: Dict[Tuple[Optional[int], str], int] = {}  # (parent_id, slug) -> id
+        self._category_by_name: Dict[Tuple[Optional[int], str], int] = {}  # (parent_id, slugify(name)) -> id
+        self._category_names: Dict[int, str] = {}
+        self._category_slugs: set = set()
+        self._paths: Dict[Tuple[str, ...], int] = {}
+        self._pending: List[Tuple[dict, object]] = []  # Entries created since the last commit
+        self.counters = dict.fromkeys(COUNTERS, 0)
+
+    # ============= Loading / Transactions =============
+
+    def load(self, db: Session):
+        """Preload all brands and categories (one query each)"""
+        for brand_id, name, slug in db.query(Brand.id, Brand.name, Brand.slug):
+            self._brand_by_name.setdefault(normalize_brand(name), brand_id)
+            if slug:
+                self._brand_by_slug.setdefault(slug, brand_id)
+
+        for category_id, parent_id, name, slug in db.query(
+            Category.id, Category.parent_id, Category.name, Category.slug
+        ).order_by(Category.id):
+            self._add_category(category_id, parent_id, name, slug, pending=False)
+        self.loaded = True
+
+    def commit(self):
+        """The chunk was committed: keep its creations"""
+        self._pending = []
+
+    def rollback(self):
+        """The chunk was rolled back: forget its creations"""
+        for mapping, key in reversed(self._pending):
+            mapping.pop(key, None)
+        self._pending = []
+        self._paths = {path: leaf for path, leaf in self._paths.items() if leaf in self._category_names}
+
+    def take_counters(self) -> Dict[str, int]:
+        """Counters since the last call (per chunk)"""
+        counters = self.counters
+        self.counters = dict.fromkeys(COUNTERS, 0)
+        return counters
+
+    def _remember(self, mapping: dict, key, value, pending: bool = True):
+        if key in mapping:
+            return
+        mapping[key] = value
+        if pending:
+            self._pending.append((mapping, key))
+
+    # ============= Brands =============
+
+    def resolve_brands(self, db: Session, names: Iterable[str], create: bool = True) -> Dict[str, int]:
+        """
+        Brand id per normalized name (one lookup per row: hits and misses are counted)
+        Missing brands are created once per distinct name unless `create` is False.
+        """
+        if not self.loaded:
+            self.load(db)
+
+        missing: Dict[str, str] = {}
+        for name in names:
+            key = normalize_brand(name)
+            if not key:
+                continue
+            if key in self._brand_by_name or key in missing:
+                self.counters["brand_hits" if key in self._brand_by_name else "brand_misses"] += 1
+                continue
+            brand_id = self._brand_by_slug.get(slugify(key))
+            if brand_id:
+                # Same slug as an existing brand (e.g. "L'Oreal" / "L Oreal")
+                self._remember(self._brand_by_name, key, brand_id, pending=False)
+                self.counters["brand_hits"] += 1
+                continue
+            missing[key] = " ".join(str(name).split())
+            self.counters["brand_misses"] += 1
+
+        if missing and create:
+            self._create_brands(db, missing)
+        return self._brand_by_name
+
+    def _create_brands(self, db: Session, missing: Dict[str, str]):
+        by_slug: Dict[str, List[str]] = {}
+        for key, name in missing.items():
+            by_slug.setdefault(slugify(name) or key, []).append(key)
+
+        brands = Brand.__table__
+        rows = [
+            {"name": missing[keys[0]], "slug": slug, "is_active": True, "sort_order": 0}
+            for slug, keys in by_slug.items()
+        ]
+        stmt = dialect_insert(db)(brands).on_conflict_do_nothing().returning(brands.c.id, brands.c.slug)
+        created = {slug: brand_id for brand_id, slug in db.execute(stmt, rows)}
+        self.counters["brands_created"] += len(created)
+
+        # Rows skipped by ON CONFLICT were created meanwhile by someone else
+        unresolved = [slug for slug in by_slug if slug not in created]
+        if unresolved:
+            names = [key for slug in unresolved for key in by_slug[slug]]
+            for brand_id, name, slug in db.query(Brand.id, Brand.name, Brand.slug).filter(
+                or_(Brand.slug.in_(unresolved), func.lower(Brand.name).in_(names))
+            ):
+                created.setdefault(slug, brand_id)
+                self._remember(self._brand_by_name, normalize_brand(name), brand_id)
+
+        for slug, keys in by_slug.items():
+            brand_id = created.get(slug)
+            if brand_id:
+                self._remember(self._brand_by_slug, slug, brand_id)
+                for key in keys:
+                    self._remember(self._brand_by_name, key, brand_id)
+
+    # ============= Categories =============
+
+    def _add_category(self, category_id: int, parent_id: Optional[int], name: str, slug: str, pending: bool = True):
+        self._remember(self._category_names, category_id, name, pending)
+        self._remember(self._category_by_slug, (parent_id, slug), category_id, pending)
+        self._remember(self._category_by_name, (parent_id, slugify(name)), category_id, pending)
+        if slug not in self._category_slugs:
+            self._category_slugs.add(slug)
+            if pending:
+                self._pending.append((_SetProxy(self._category_slugs), slug))
+
+    def _child_slug(self, parent_id: Optional[int], name: str) -> str:
+        """Slug rule of get_or_create_category_path: root slug, or parent name + name"""
+        if parent_id is None:
+            return slugify(name)
+        return f"{slugify(self._category_names[parent_id])}-{slugify(name)}"
+
+    def _find_child(self, parent_id: Optional[int], name: str) -> Optional[int]:
+        return (
+            self._category_by_slug.get((parent_id, self._child_slug(parent_id, name)))
+            or self._category_by_name.get((parent_id, slugify(name)))
+        )
+
+    def _walk(self, path: Tuple[str, ...]) -> Optional[int]:
+        """Leaf id of a path that exists entirely in the loaded tree (memoized)"""
+        category_id = None
+        for name in path:
+            category_id = self._find_child(category_id, name)
+            if category_id is None:
+                return None
+        self._remember(self._paths, path, category_id, pending=False)
+        return category_id
+
+    def resolve_paths(self, db: Session, paths: Iterable[Iterable[str]], create: bool = True) -> Dict[Tuple[str, ...], int]:
+        """
+        Leaf category id per cleaned path (one lookup per row: hits and misses are counted)
+        Missing categories are created level by level, once per distinct node.
+        """
+        if not self.loaded:
+            self.load(db)
+
+        unresolved = []
+        for path in paths:
+            path = clean_path(path)
+            if not path:
+                continue
+            if path in self._paths or self._walk(path):
+                self.counters["category_hits"] += 1
+            else:
+                self.counters["category_misses"] += 1
+                if path not in unresolved:
+                    unresolved.append(path)
+
+        # Walk all unresolved paths one level at a time
+        parents: Dict[Tuple[str, ...], Optional[int]] = {path: None for path in unresolved}
+        depth = 0
+        while parents:
+            to_create: Dict[Tuple[Optional[int], str], str] = {}
+            for path, parent_id in parents.items():
+                if self._find_child(parent_id, path[depth]) is None:
+                    to_create.setdefault((parent_id, self._child_slug(parent_id, path[depth])), path[depth])
+
+            if to_create:
+                if not create:
+                    parents = {
+                        path: parent_id for path, parent_id in parents.items()
+                        if self._find_child(parent_id, path[depth]) is not None
+                    }
+                else:
+                    self._create_categories(db, to_create)
+
+            next_parents = {}
+            for path, parent_id in parents.items():
+                category_id = self._find_child(parent_id, path[depth])
+                if depth + 1 == len(path):
+                    self._remember(self._paths, path, category_id)
+                else:
+                    next_parents[path] = category_id
+            parents = next_parents
+            depth += 1
+
+        return self._paths
+
+    def _create_categories(self, db: Session, to_create: Dict[Tuple[Optional[int], str], str]):
+        """Insert one level of categories (and their Italian translations)"""
+        rows = []
+        for (parent_id, slug), name in to_create.items():
+            unique_slug = slug
+            suffix = 1
+            while unique_slug in self._category_slugs:
+                # Slugs are unique across parents
+                unique_slug = f"{slug}-{suffix}"
+                suffix += 1
+            self._category_slugs.add(unique_slug)
+            rows.append({"name": name, "slug": unique_slug, "is_active": True, "sort_order": 0, "parent_id": parent_id})
+
+        categories = Category.__table__
+        stmt = dialect_insert(db)(categories).returning(categories.c.id, categories.c.slug)
+        ids = {slug: category_id for category_id, slug in db.execute(stmt, rows)}
+        self.counters["categories_created"] += len(ids)
+
+        for row in rows:
+            category_id = ids[row["slug"]]
+            self._category_slugs.discard(row["slug"])
+            self._add_category(category_id, row["parent_id"], row["name"], row["slug"])
+            # The lookup key of the requested slug also points at a suffixed slug
+            self._remember(self._category_by_slug, (row["parent_id"], self._child_slug(row["parent_id"], row["name"])), category_id)
+
+        db.execute(CategoryTranslation.__table__.insert(), [
+            {"category_id": ids[row["slug"]], "lang": "it", "name": row["name"], "slug": row["slug"], "description": None}
+            for row in rows
+        ])
+
+
+class _SetProxy:
+    """Lets rollback() remove a slug from the slug set like a dict key"""
+
+    def __init__(self, target: set):
+        self._target = target
+
+    def pop(self, key, default=None):
+        self._target.discard(key)
+        return default
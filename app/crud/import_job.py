@@ -0,0 +1,270 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Background import jobs
+Queue, claim and run product imports and enrichments chunk by chunk
+
+The API only stores an ImportJob; the import worker claims it and streams the
+file through import_products_bulk / enrich_products_bulk. Each chunk commits
+its products first and then the job progress (chunks_done, running totals), so
+after a crash the job resumes at the first chunk whose progress was not
+committed. Re-running that chunk is safe: the upsert is keyed by EAN.
+Dry runs validate every chunk against one ImportSnapshot loaded at the start.
+"""
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from loguru import logger
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.import_job import ImportJob, ImportJobChunk
+from app.schemas.import_products import ImportReport, ImportErrorDetail, EnrichmentReport
+from app.services.product_import import ProductImportService, ImportTotals, import_in_chunks
+from app.services.product_enrichment import EnrichmentReader, EnrichmentTotals, to_import_rows
+from app.services.multi_source_import import iter_multi_source_rows
+from app.crud.product_import import import_products_bulk, enrich_products_bulk, ImportSnapshot, validate_products
+from app.crud.import_cache import ImportCaches
+
+
+# ============= Queue =============
+
+def create_import_job(
+    db: Session,
+    kind: str,
+    file_path: Optional[str] = None,
+    source: Optional[str] = None,
+    filename: Optional[str] = None,
+    delete_file: bool = False,
+    dry_run: bool = False,
+    verbose_errors: bool = False,
+    sources: Optional[List[Dict[str, str]]] = None
+) -> ImportJob:
+    """
+    Queue an import ("import") or enrichment ("enrich") of an Excel file, or a
+    multi-source import ("multi") of `sources` ([{"source", "file_path"}], highest priority first)
+    """
+    job = ImportJob(
+        kind=kind,
+        source=source,
+        filename=filename,
+        file_path=file_path,
+        sources=sources,
+        delete_file=delete_file,
+        dry_run=dry_run,
+        verbose_errors=verbose_errors,
+        chunk_size=ProductImportService.CHUNK_SIZE,
+        status="pending",
+        attempts=0,
+        chunks_done=0,
+        rows_read=0
+    )
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def get_import_job(db: Session, job_id: int) -> Optional[ImportJob]:
+    return db.query(ImportJob).filter(ImportJob.id == job_id).first()
+
+
+def claim_import_job(db: Session) -> Optional[ImportJob]:
+    """
+    Mark the oldest runnable job as running and return it
+
+    Runnable: pending, or running without a committed chunk for
+    IMPORT_JOB_STALE_SECONDS (its process died). Uses SKIP LOCKED on PostgreSQL
+    so two workers never claim the same job.
+    """
+    now = datetime.now(timezone.utc)
+    stale = now - timedelta(seconds=settings.IMPORT_JOB_STALE_SECONDS)
+    job = db.query(ImportJob).filter(
+        or_(
+            ImportJob.status == "pending",
+            and_(ImportJob.status == "running", ImportJob.heartbeat_at < stale)
+        )
+    ).order_by(ImportJob.id).limit(1).with_for_update(skip_locked=True).first()
+
+    if not job:
+        db.commit()
+        return None
+
+    if job.status == "running":
+        logger.warning(f"Resuming import job {job.id} at chunk {job.chunks_done}")
+    job.status = "running"
+    job.attempts = (job.attempts or 0) + 1
+    job.started_at = job.started_at or now
+    job.heartbeat_at = now
+    db.commit()
+    return job
+
+
+# ============= Reports =============
+
+def build_import_report(source: str, totals: ImportTotals, duration: float, dry_run: bool) -> ImportReport:
+    return ImportReport(
+        source=source,
+        total_rows=totals.total_rows,
+        created=totals.created,
+        updated=totals.updated,
+        skipped=totals.skipped,
+        skipped_invalid_ean13=totals.skipped_invalid_ean13,
+        skipped_duplicate=totals.skipped_duplicate,
+        skipped_manual=totals.skipped_manual,
+        skipped_unchanged=totals.skipped_unchanged,
+        errors_summary=totals.errors_summary,
+        errors=[ImportErrorDetail(**e) for e in totals.errors],  # Only kept with verbose_errors
+        errors_sample=[ImportErrorDetail(**e) for e in totals.errors_sample],  # First 20 errors
+        sample_imports=totals.samples,  # First 5 only
+        sources=totals.sources,
+        parse_seconds=totals.parse_seconds,
+        cache_stats=totals.cache,
+        duration_seconds=round(duration, 2),
+        dry_run=dry_run,
+    )
+
+
+def build_enrichment_report(totals: EnrichmentTotals, duration: float, dry_run: bool) -> EnrichmentReport:
+    return EnrichmentReport(
+        total_rows=totals.total_rows,
+        matched=totals.matched,
+        skipped=totals.skipped,
+        errors=totals.errors,
+        errors_summary=totals.errors_summary,
+        matched_samples=totals.matched_samples,
+        skipped_samples=totals.skipped_samples,
+        errors_sample=[ImportErrorDetail(**e) for e in totals.errors_sample],  # Only kept with verbose_errors
+        duration_seconds=round(duration, 2),
+        dry_run=dry_run,
+    )
+
+
+def job_progress(job: ImportJob) -> Dict[str, Any]:
+    """Counters of the running totals (without samples and error lists)"""
+    return {
+        key: value for key, value in (job.totals or {}).items()
+        if key != "keep_errors" and isinstance(value, (int, dict))
+    }
+
+
+# ============= Running =============
+
+def _job_rows(job: ImportJob, totals) -> Iterator[Dict[str, Any]]:
+    """Row stream of the job's file, in the format its batch function expects"""
+    if job.kind == "enrich":
+        return totals.count_rows(EnrichmentReader(Path(job.file_path)).iter_rows())
+    if job.kind == "multi":
+        files = [(entry["source"], entry["file_path"]) for entry in job.sources]
+        return iter_multi_source_rows(files, totals, settings.IMPORT_PARSE_PROCESSES or None)
+    if job.source == "commerce_clarity":
+        reader = EnrichmentReader(Path(job.file_path))
+        return to_import_rows(totals.count_rows(reader.iter_rows()), totals.add_skipped)
+    service = ProductImportService(job.source)
+    return service.iter_mapped_rows(totals.count_rows(service.iter_excel_rows(Path(job.file_path))), totals.add_skipped)
+
+
+def _finish(job: ImportJob, status: str):
+    job.status = status
+    job.finished_at = datetime.now(timezone.utc)
+    if job.delete_file and job.file_path:
+        try:
+            Path(job.file_path).unlink(missing_ok=True)
+        except OSError:
+            pass
+
+
+def run_import_job(db: Session, job: ImportJob) -> ImportJob:
+    """
+    Import the chunks of a claimed job that are not done yet
+
+    On error the job goes back to pending (resumed by the next claim) until
+    IMPORT_JOB_MAX_ATTEMPTS, then it is failed.
+    """
+    caches = ImportCaches()  # Brands and category paths, loaded once per run
+    if job.kind == "enrich":
+        totals = EnrichmentTotals(keep_errors=job.verbose_errors)
+
+        def batch(db, chunk, dry_run, batch_index):
+            return enrich_products_bulk(db, chunk, dry_run, batch_index=batch_index, caches=caches)
+    else:
+        totals = ImportTotals(keep_errors=job.verbose_errors)
+        snapshot = ImportSnapshot.load(db, caches=caches) if job.dry_run else None
+
+        def batch(db, chunk, dry_run, batch_index):
+            if snapshot:
+                # Dry run: validated in memory, the catalog is never touched
+                return validate_products(snapshot, chunk, batch_index)
+            return import_products_bulk(db, chunk, dry_run, batch_index=batch_index, caches=caches)
+    if job.chunks_done and job.totals:
+        totals.restore(job.totals)
+
+    def import_chunk(chunk, idx):
+        started = time.perf_counter()
+        stats = batch(db, chunk, job.dry_run, batch_index=idx)
+        stats["duration_ms"] = int((time.perf_counter() - started) * 1000)
+        return stats
+
+    def on_chunk(idx, chunk, stats):
+        if "skipped" in stats:
+            skipped = stats["skipped"]
+        else:
+            skipped = (
+                stats["skipped_invalid_ean13"] + stats["skipped_duplicate"]
+                + stats["skipped_manual"] + stats.get("skipped_unchanged", 0)
+            )
+        db.add(ImportJobChunk(
+            job_id=job.id,
+            chunk_index=idx,
+            rows=len(chunk),
+            created=stats.get("created", 0),
+            updated=stats.get("updated", stats.get("matched", 0)),
+            skipped=skipped,
+            errors=len(stats["errors"]),
+            duration_ms=stats["duration_ms"]
+        ))
+        job.chunks_done = idx + 1
+        job.rows_read = totals.total_rows
+        job.totals = totals.snapshot()
+        job.heartbeat_at = datetime.now(timezone.utc)
+        db.commit()
+
+    try:
+        import_in_chunks(
+            _job_rows(job, totals), import_chunk, totals,
+            chunk_size=job.chunk_size, start_chunk=job.chunks_done, on_chunk=on_chunk
+        )
+    except Exception as e:
+        db.rollback()
+        logger.error(f"Import job {job.id} failed at chunk {job.chunks_done}: {str(e)}")
+        job.error = str(e)
+        if job.attempts >= settings.IMPORT_JOB_MAX_ATTEMPTS:
+            _finish(job, "failed")
+        else:
+            job.status = "pending"
+        db.commit()
+        return job
+
+    started_at = job.started_at
+    if started_at.tzinfo is None:
+        started_at = started_at.replace(tzinfo=timezone.utc)
+    duration = (datetime.now(timezone.utc) - started_at).total_seconds()
+
+    if job.kind == "enrich":
+        report = build_enrichment_report(totals, duration, job.dry_run)
+    else:
+        report = build_import_report(job.source or job.kind, totals, duration, job.dry_run)
+
+    job.rows_read = totals.total_rows
+    job.totals = totals.snapshot()
+    job.report = report.model_dump(mode="json")
+    job.error = None
+    _finish(job, "done")
+    db.commit()
+    logger.info(f"Import job {job.id} done: {job_progress(job)}")
+    return job
@@ -2,8 +2,8 @@
 # © 2026 Muthana. All rights reserved.
 # Unauthorized copying or distribution is prohibited.
 
-from typing import Optional, List, Dict, Any
-from sqlalchemy.orm import Session
+from typing import Optional, List, Dict, Any, Tuple
+from sqlalchemy.orm import Session, selectinload
 from sqlalchemy import func, and_, or_
 from decimal import Decimal
 from datetime import datetime
@@ -15,6 +15,9 @@ from app.models.product import Product
 from app.models.product_variant import ProductVariant
 from app.models.address import Address
 from app.schemas.order import OrderCreate, OrderUpdate
+from app.crud.pagination import paginate_with_total, paginate_keyset
+from app.crud.product_listing import refresh_product_listing
+from app.crud.stock_reservation import InsufficientStockError, reserve_stock
 
 
 class CRUDOrder:
@@ -24,6 +27,19 @@ class CRUDOrder:
         """Get order by ID"""
         return db.query(Order).filter(Order.id == id).first()
     
+    def get_by_payment_ref(self, db: Session, payment_ref: Any) -> Optional[Order]:
+        """
+        Get order by payment gateway id (indexed lookups)
+        
+        Matches the captured transaction id first, then the payment id
+        given at checkout (payment_info["payment_id"]).
+        """
+        if payment_ref in (None, ""):
+            return None
+        payment_ref = str(payment_ref)
+        return db.query(Order).filter(Order.payment_transaction_id == payment_ref).first() \
+            or db.query(Order).filter(Order.provider_payment_ref == payment_ref).first()
+    
     def get_by_user(
         self, 
         db: Session, 
@@ -64,8 +80,70 @@ class CRUDOrder:
         Returns:
             List of orders
         """
-        query = db.query(Order)
+        query = self._filter_query(db.query(Order), status, payment_status, shipping_status, user_type)
+        
+        return query.order_by(Order.created_at.desc())\
+            .offset(skip)\
+            .limit(limit)\
+            .all()
+    
+    def get_multi_with_total(
+        self,
+        db: Session,
+        skip: int = 0,
+        limit: int = 100,
+        status: Optional[str] = None,
+        payment_status: Optional[str] = None,
+        shipping_status: Optional[str] = None,
+        user_type: Optional[str] = None
+    ) -> Tuple[List[Order], int]:
+        """
+        Get one page of orders and the total count of matching orders in a single query
         
+        Same filters and ordering as get_multi.
+        
+        Returns:
+            (orders, total)
+        """
+        query = self._filter_query(db.query(Order), status, payment_status, shipping_status, user_type)
+        query = query.options(selectinload(Order.items))\
+            .order_by(Order.created_at.desc(), Order.id.desc())
+        return paginate_with_total(query, skip, limit)
+    
+    def get_multi_by_cursor(
+        self,
+        db: Session,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        status: Optional[str] = None,
+        payment_status: Optional[str] = None,
+        shipping_status: Optional[str] = None,
+        user_type: Optional[str] = None
+    ) -> Tuple[List[Order], Optional[str]]:
+        """
+        Get the page of orders after `cursor`, newest first (keyset on Order.id)
+        
+        Same filters as get_multi.
+        
+        Returns:
+            (orders, next_cursor) - next_cursor is None on the last page
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = self._filter_query(db.query(Order), status, payment_status, shipping_status, user_type)
+        query = query.options(selectinload(Order.items))
+        return paginate_keyset(query, [Order.id], cursor, limit, descending=True)
+    
+    def _filter_query(
+        self,
+        query,
+        status: Optional[str] = None,
+        payment_status: Optional[str] = None,
+        shipping_status: Optional[str] = None,
+        user_type: Optional[str] = None
+    ):
+        """Apply the shared order list filters to a query"""
         if status:
             query = query.filter(Order.status == status)
         if payment_status:
@@ -75,10 +153,7 @@ class CRUDOrder:
         if user_type:
             query = query.filter(Order.user_type == user_type)
         
-        return query.order_by(Order.created_at.desc())\
-            .offset(skip)\
-            .limit(limit)\
-            .all()
+        return query
     
     def count(
         self,
@@ -121,10 +196,23 @@ class CRUDOrder:
         
         Returns:
             Created Order object
+        
+        Raises:
+            ValueError: If the cart is empty
+            InsufficientStockError: If items are short of stock
         """
         if not cart or not cart.items:
             raise ValueError("Cannot create order from empty cart")
         
+        # Take the stock of the items (variant stock for variants)
+        shortfalls = reserve_stock(db, [
+            (cart_item.product_id, cart_item.product_variant_id, cart_item.quantity)
+            for cart_item in cart.items if cart_item.product
+        ])
+        if shortfalls:
+            db.rollback()
+            raise InsufficientStockError(shortfalls)
+        
         # Determine user type
         if user_id:
             user = db.query(User).filter(User.id == user_id).first()
@@ -248,6 +336,9 @@ class CRUDOrder:
             db.add(order_item)
         
         db.commit()
+        
+        # Listing stock of the products
+        refresh_product_listing(db, [cart_item.product_id for cart_item in cart.items])
         db.refresh(order)
         
         return order
@@ -534,7 +625,8 @@ class CRUDOrder:
         self,
         db: Session,
         order_data,  # OrderCreateDirect schema
-        user_id: int
+        user_id: int,
+        payment_status: str = "pending"
     ) -> Order:
         """
         Create an order directly from items (new API format)
@@ -546,12 +638,14 @@ class CRUDOrder:
             db: Database session
             order_data: OrderCreateDirect schema with items and payment info
             user_id: User ID (required - no guest users)
+            payment_status: Status reported by the payment gateway
         
         Returns:
             Created Order object
         
         Raises:
             ValueError: If validation fails
+            InsufficientStockError: If items are short of stock
         """
         # 1. Validate user exists
         user = db.query(User).filter(User.id == user_id).first()
@@ -610,19 +704,21 @@ class CRUDOrder:
         total_warranty = Decimal('0.00')
         total_shipping = Decimal('0.00')
         
+        # All products in one query
+        products = {
+            product.id: product
+            for product in db.query(Product).options(
+                selectinload(Product.translations),
+                selectinload(Product.images)
+            ).filter(Product.id.in_({item.product_id for item in order_data.items}))
+        }
+        
         for item in order_data.items:
             # Check product exists
-            product = db.query(Product).filter(Product.id == item.product_id).first()
+            product = products.get(item.product_id)
             if not product:
                 raise ValueError(f"Product with ID {item.product_id} not found")
             
-            # Check stock availability
-            if product.stock_quantity < item.qty:
-                raise ValueError(
-                    f"Insufficient stock for product {item.product_id}. "
-                    f"Available: {product.stock_quantity}, Requested: {item.qty}"
-                )
-            
             # Get product details
             product_title = "Unknown Product"
             if product.translations and len(product.translations) > 0:
@@ -674,6 +770,12 @@ class CRUDOrder:
                 "delivery_option": delivery_option
             })
         
+        # 5.1 Take the stock of all items (locked, nothing taken if one is short)
+        shortfalls = reserve_stock(db, [(item.product_id, None, item.qty) for item in order_data.items])
+        if shortfalls:
+            db.rollback()
+            raise InsufficientStockError(shortfalls)
+        
         # 6. Use totals from request body (frontend already calculated them)
         subtotal = order_data.total.sub_total
         total_warranty = order_data.total.warranty
@@ -692,55 +794,9 @@ class CRUDOrder:
             "payment_id": order_data.payment_info.payment_id
         }
         
-        # 7.1 Check payment status from payment gateway
-        payment_status = "pending"
-        payment_transaction_id = None
-        
-        payment_id = order_data.payment_info.payment_id
-        payment_type = order_data.payment_info.payment_type.lower()
-        
-        # Auto-verify payment status at order creation
-        try:
-            if payment_type == 'paypal':
-                from app.integrations.paypal import paypal_service
-                paypal_order = paypal_service.get_order_details(payment_id)
-                
-                if paypal_order:
-                    order_status = paypal_order.get('status', 'UNKNOWN')
-                    if order_status in ['COMPLETED', 'APPROVED']:
-                        payment_status = "completed"
-                        payment_transaction_id = payment_id
-                    elif order_status in ['VOIDED', 'CANCELLED']:
-                        payment_status = "failed"
-            
-            elif payment_type == 'floa':
-                from app.integrations.floa import floa_service
-                from app.core.config import settings
-                
-                deal = floa_service.get_deal_status(payment_id)
-                
-                if deal:
-                    deal_status = deal.get('dealStatus', 'UNKNOWN')
-                    installments = deal.get('installmentsList', [])
-                    is_integration = 'live-int' in settings.FLOA_BASE_URL
-                    
-                    if deal_status == 'APPROVED':
-                        payment_status = "completed"
-                        payment_transaction_id = payment_id
-                    elif deal_status == 'DRAFT' and is_integration and len(installments) > 0:
-                        payment_status = "completed"
-                        payment_transaction_id = payment_id
-                    elif deal_status in ['CANCELLED', 'REJECTED']:
-                        payment_status = "failed"
-            
-            # PayPlug uses webhook, keep as pending
-            
-        except Exception as e:
-            # If verification fails, keep as pending
-            # Will be updated by webhook or manual sync
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.warning(f"Failed to verify payment {payment_id} at order creation: {str(e)}")
+        # 7.1 Payment status checked with the gateway by the caller
+        # (PayPlug uses webhook, stays pending)
+        payment_transaction_id = order_data.payment_info.payment_id if payment_status == "completed" else None
         
         # 8. Create Order
         order = Order(
@@ -789,28 +845,16 @@ class CRUDOrder:
                 variant_attributes=None
             )
             db.add(order_item)
-            
-            # 10. Update product stock
-            item_data["product"].stock_quantity -= item_data["quantity"]
         
-        # 11. If payment is completed, auto-register warranties
+        # 10. If payment is completed, queue warranty registrations (same transaction)
         if payment_status == "completed":
-            try:
-                # Import here to avoid circular dependency
-                import asyncio
-                from app.api.v1.webhooks import auto_register_warranties
-                
-                # Run async function in sync context
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
-                loop.run_until_complete(auto_register_warranties(db, order))
-                loop.close()
-            except Exception as e:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"Failed to auto-register warranties for order {order.id}: {str(e)}")
+            from app.crud.warranty_registration import crud_warranty_registration
+            crud_warranty_registration.enqueue_for_order(db, order)
         
         db.commit()
+        
+        # 11. Listing stock of the products
+        refresh_product_listing(db, [item.product_id for item in order_data.items])
         db.refresh(order)
         
         return order
@@ -0,0 +1,121 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+import base64
+import json
+from typing import Any, List, Optional, Sequence, Tuple
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import Query
+
+
+def paginate_with_total(query: Query, skip: int = 0, limit: int = 100) -> Tuple[List[Any], int]:
+    """
+    Fetch one page and the total number of matching rows in a single round-trip
+
+    The total is computed with COUNT(*) OVER() next to the page rows, so the
+    filters and joins of `query` run once. The query must already be ordered.
+    Only when the page is empty (skip past the end) a plain count is issued.
+
+    Returns:
+        (items, total)
+    """
+    rows = (
+        query.add_columns(func.count().over().label("total_count"))
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+    if rows:
+        return [row[0] for row in rows], rows[0][-1]
+
+    if skip == 0:
+        return [], 0
+
+    return [], query.order_by(None).count()
+
+
+# ============= Keyset (cursor) pagination =============
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """Encode the sort key values of the last row into an opaque cursor"""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _key_type(key: Any) -> Any:
+    """Python type of a sort key column, None when SQLAlchemy does not know it"""
+    try:
+        python_type = key.type.python_type
+    except (AttributeError, NotImplementedError):
+        return None
+    # JSON has no separate float for whole numbers
+    return (int, float) if python_type is float else python_type
+
+
+def decode_cursor(cursor: str, keys: Sequence[Any]) -> List[Any]:
+    """
+    Decode a cursor produced by encode_cursor for the sort `keys`
+
+    Raises ValueError if it is malformed or its values do not match the key
+    types (e.g. a string for an integer id).
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError("Invalid cursor")
+
+    for key, value in zip(keys, values):
+        expected = _key_type(key)
+        # bool is an int subclass, but never a valid key value
+        if isinstance(value, bool) or (expected is not None and not isinstance(value, expected)):
+            raise ValueError("Invalid cursor")
+
+    return values
+
+
+def paginate_keyset(
+    query: Query,
+    keys: Sequence[Any],
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    descending: bool = False
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    Fetch the page that follows `cursor`, ordered by `keys`
+
+    `keys` are column expressions whose combination is unique (the last one is
+    normally the primary key). Rows are located with a row-value comparison
+    on the keys instead of OFFSET, so deep pages cost the same as the first one.
+    An empty or missing cursor returns the first page.
+
+    Returns:
+        (items, next_cursor) - next_cursor is None on the last page
+    """
+    if cursor:
+        values = decode_cursor(cursor, keys)
+        if descending:
+            query = query.filter(tuple_(*keys) < tuple_(*values))
+        else:
+            query = query.filter(tuple_(*keys) > tuple_(*values))
+
+    order = [key.desc() if descending else key.asc() for key in keys]
+    rows = (
+        query.add_columns(*keys)
+        .order_by(None)
+        .order_by(*order)
+        .limit(limit + 1)
+        .all()
+    )
+
+    items = [row[0] for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        next_cursor = encode_cursor(rows[limit - 1][1:])
+
+    return items, next_cursor
@@ -4,13 +4,14 @@
 
 from sqlalchemy.orm import Session
 from sqlalchemy import and_
-from typing import Optional, List
+from typing import Optional, List, Tuple
 from datetime import datetime
 
 from app.models.payment import Payment
 from app.models.order import Order
 from app.schemas.payment import PaymentCreate, PaymentUpdate
 from app.services.payment import PaymentFactory, PaymentProviderError
+from app.crud.pagination import paginate_keyset
 
 
 class CRUDPayment:
@@ -191,8 +192,42 @@ class CRUDPayment:
             List of Payment objects
         """
         
-        query = db.query(Payment)
+        query = self._filter_query(db.query(Payment), provider, status, is_test)
         
+        return query.order_by(Payment.created_at.desc()).offset(skip).limit(limit).all()
+    
+    def get_multi_by_cursor(
+        self,
+        db: Session,
+        *,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        provider: Optional[str] = None,
+        status: Optional[str] = None,
+        is_test: Optional[bool] = None
+    ) -> Tuple[List[Payment], Optional[str]]:
+        """
+        Get the page of payments after `cursor`, newest first (keyset on Payment.id)
+        
+        Same filters as get_multi.
+        
+        Returns:
+            (payments, next_cursor) - next_cursor is None on the last page
+        
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        query = self._filter_query(db.query(Payment), provider, status, is_test)
+        return paginate_keyset(query, [Payment.id], cursor, limit, descending=True)
+    
+    def _filter_query(
+        self,
+        query,
+        provider: Optional[str] = None,
+        status: Optional[str] = None,
+        is_test: Optional[bool] = None
+    ):
+        """Apply the shared payment list filters to a query"""
         if provider:
             query = query.filter(Payment.provider == provider)
         
@@ -202,7 +237,7 @@ class CRUDPayment:
         if is_test is not None:
             query = query.filter(Payment.is_test == is_test)
         
-        return query.order_by(Payment.created_at.desc()).offset(skip).limit(limit).all()
+        return query
     
     def update(
         self,
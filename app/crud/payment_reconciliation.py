@@ -0,0 +1,155 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Pending payment reconciliation
+Which orders are due for a gateway check, and their batched status updates
+
+claim_due_orders picks pending orders last checked before a cutoff and
+stamps payment_checked_at (the checkpoint), so other workers and the next
+runs skip them. run_payment_reconciliation checks one batch through
+app.services.payment_reconciliation and writes all status transitions, with
+the warranty registrations of confirmed orders, in one transaction; a
+payment settled meanwhile (webhook) is left alone.
+"""
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import case, or_
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.crud.warranty_registration import crud_warranty_registration
+from app.integrations.http import run_sync
+from app.models.order import Order
+from app.services.payment_reconciliation import RECONCILED_METHODS, check_payments
+
+
+# payment_status -> order status
+ORDER_STATUS = {"completed": "confirmed", "failed": "cancelled"}
+
+
+def claim_due_orders(db: Session, cutoff: datetime, limit: int) -> List[Order]:
+    """
+    Pending orders not checked since `cutoff`, marked as checked now
+
+    Uses SKIP LOCKED on PostgreSQL so several workers never check the same order.
+    """
+    orders = db.query(Order).filter(
+        Order.payment_status == "pending",
+        Order.payment_info.isnot(None),
+        or_(Order.payment_checked_at.is_(None), Order.payment_checked_at < cutoff)
+    ).order_by(
+        Order.payment_checked_at.nulls_first(), Order.id
+    ).limit(limit).with_for_update(skip_locked=True).all()
+
+    now = datetime.now(timezone.utc)
+    for order in orders:
+        order.payment_checked_at = now
+    db.commit()
+
+    return orders
+
+
+def run_payment_reconciliation(
+    db: Session,
+    cutoff: datetime,
+    limit: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Claim and check one batch of pending orders
+
+    Returns counters (total_checked, updated, failed, skipped) and one result
+    per order. Must not run inside an event loop (use a worker thread).
+    """
+    orders = claim_due_orders(db, cutoff, limit or settings.PAYMENT_RECONCILIATION_BATCH_SIZE)
+    stats = {"total_checked": len(orders), "updated": 0, "failed": 0, "skipped": 0, "results": []}
+
+    to_check = []
+    for order in orders:
+        payment_id = order.provider_payment_ref or order.payment_transaction_id
+        method = (order.payment_method or "").lower()
+        result = {"order_id": order.id, "payment_id": payment_id, "payment_method": order.payment_method}
+        stats["results"].append(result)
+
+        if not payment_id:
+            result.update(status="skipped", message="No payment ID")
+        elif not method:
+            result.update(status="skipped", message="No payment method")
+        elif method == "payplug":
+            result.update(status="skipped", message="PayPlug has webhook (skipped)")
+        elif method not in RECONCILED_METHODS:
+            result.update(status="skipped", message=f"Unsupported method: {order.payment_method}")
+        else:
+            to_check.append((order.id, method, payment_id))
+            continue
+        stats["skipped"] += 1
+
+    checks = run_sync(check_payments(to_check)) if to_check else {}
+
+    transitions = {}  # order_id -> new payment_status
+    for result in stats["results"]:
+        if result["order_id"] not in checks:
+            continue
+        outcome = checks[result["order_id"]]
+        if isinstance(outcome, Exception):
+            stats["failed"] += 1
+            result.update(status="error", message=str(outcome) or outcome.__class__.__name__)
+            continue
+        payment_status, message = outcome
+        result.update(status="updated" if payment_status else "no_change", message=message)
+        if payment_status:
+            transitions[result["order_id"]] = payment_status
+
+    # All transitions of the batch in one statement; orders settled meanwhile
+    # (webhook) are left alone and not counted
+    if transitions:
+        table = Order.__table__
+        statuses = {order_id: ORDER_STATUS[value] for order_id, value in transitions.items()}
+        updated = set(db.execute(
+            table.update().where(
+                table.c.id.in_(list(transitions)),
+                table.c.payment_status == "pending"
+            ).values(
+                payment_status=case(transitions, value=table.c.id),
+                status=case(statuses, value=table.c.id)
+            ).returning(table.c.id)
+        ).scalars())
+        for result in stats["results"]:
+            if result.get("status") == "updated" and result["order_id"] not in updated:
+                result.update(status="no_change", message=f"{result['message']}, already settled")
+        # Warranty registrations queued with the status change
+        completed = [order_id for order_id in updated if transitions[order_id] == "completed"]
+        if completed:
+            for order in db.query(Order).filter(Order.id.in_(completed)).all():
+                crud_warranty_registration.enqueue_for_order(db, order)
+        db.commit()
+        stats["updated"] = len(updated)
+
+    return stats
+
+
+def reconcile_payments(
+    db: Session,
+    recheck_minutes: Optional[int] = None,
+    stop: Optional[threading.Event] = None
+) -> Dict[str, Any]:
+    """
+    Check every pending order not checked for `recheck_minutes`, batch by batch
+    (0 checks them all); returns the summed counters and results
+    """
+    if recheck_minutes is None:
+        recheck_minutes = settings.PAYMENT_RECONCILIATION_RECHECK_MINUTES
+    # Fixed for the run: orders claimed by this run are never due again in it
+    cutoff = datetime.now(timezone.utc) - timedelta(minutes=recheck_minutes)
+
+    totals = {"total_checked": 0, "updated": 0, "failed": 0, "skipped": 0, "results": []}
+    while not (stop and stop.is_set()):
+        stats = run_payment_reconciliation(db, cutoff)
+        for key, value in stats.items():
+            totals[key] += value
+        if stats["total_checked"] < settings.PAYMENT_RECONCILIATION_BATCH_SIZE:
+            break
+    return totals
@@ -3,8 +3,7 @@
 # Unauthorized copying or distribution is prohibited.
 
 from typing import Optional, List, Dict
-from sqlalchemy.orm import Session, joinedload
-from deep_translator import GoogleTranslator
+from sqlalchemy.orm import Session, joinedload, selectinload
 from datetime import datetime
 
 from app.models.product import (
@@ -18,38 +17,27 @@ from app.models.product_variant import ProductVariant, ProductVariantImage, Prod
 from app.models.category import Category, CategoryTranslation
 from app.models.brand import Brand
 from app.models.tax_class import TaxClass
+from app.core.i18n import resolve_translation, fallback_langs
+from app.crud.product_listing import refresh_product_listing
+from app.crud.translation import enqueue_translation_job
+from app.services.translation.worker import translation_worker
 from app.schemas.product import ProductCreate, ProductUpdate, StockUpdateInput
 
 
 # ============= Helper Functions =============
 
-def create_automatic_translation(text: str, target_lang: str) -> str:
-    """Translate text from Italian to target language"""
-    if target_lang == "it":
-        return text
-    
-    try:
-        translated = GoogleTranslator(source='it', target=target_lang).translate(text)
-        return translated
-    except Exception as e:
-        # Fallback to original text if translation fails
-        return text
-
-
 def create_product_translations(db: Session, product: Product, translations_data: List[dict]):
-    """Create product translations with automatic translation for missing languages"""
+    """
+    Create the provided product translations
+    
+    Missing languages are machine-translated in the background from the
+    Italian (or first) translation - see app.crud.translation.
+    """
     languages = ["it", "en", "fr", "de", "ar"]
     provided_langs = {t["lang"]: t for t in translations_data}
     
-    # Get Italian (source) translation
-    it_translation = provided_langs.get("it")
-    if not it_translation:
-        # Use first available translation as source
-        it_translation = translations_data[0]
-    
     for lang in languages:
         if lang in provided_langs:
-            # Use provided translation
             trans_data = provided_langs[lang]
             translation = ProductTranslation(
                 product_id=product.id,
@@ -59,20 +47,13 @@ def create_product_translations(db: Session, product: Product, translations_data
                 simple_description=trans_data.get("simple_description"),
                 meta_description=trans_data.get("meta_description")
             )
-        else:
-            # Auto-translate from Italian
-            translation = ProductTranslation(
-                product_id=product.id,
-                lang=lang,
-                title=create_automatic_translation(it_translation["title"], lang),
-                sub_title=create_automatic_translation(it_translation.get("sub_title", ""), lang) if it_translation.get("sub_title") else None,
-                simple_description=create_automatic_translation(it_translation.get("simple_description", ""), lang) if it_translation.get("simple_description") else None,
-                meta_description=create_automatic_translation(it_translation.get("meta_description", ""), lang) if it_translation.get("meta_description") else None
-            )
-        
-        db.add(translation)
+            db.add(translation)
+    
+    if any(lang not in provided_langs for lang in languages):
+        enqueue_translation_job(db, "product", product.id)
     
     db.commit()
+    translation_worker.wake()
 
 
 def create_product_images(db: Session, product_id: int, images_data: List[dict], is_variant: bool = False, variant_id: Optional[int] = None):
@@ -239,20 +220,44 @@ def create_product_variants(db: Session, product: Product, variants_data: List[d
 # ============= Main CRUD Functions =============
 
 def get_product(db: Session, product_id: int, lang: Optional[str] = None) -> Optional[Product]:
-    """Get product by ID with all relationships"""
-    from app.models.delivery import Delivery
+    """
+    Get product by ID with all relationships
+    
+    Collections are loaded with one SELECT ... IN each (no row explosion on
+    products with many features/images). With `lang`, the nested translations
+    are limited to that language plus the "it" fallback.
+    """
+    def translations(relationship, model):
+        if lang is None:
+            return relationship
+        return relationship.and_(model.lang.in_(fallback_langs(lang)))
+    
     product = db.query(Product).options(
         joinedload(Product.brand),
         joinedload(Product.tax_class),
         joinedload(Product.delivery),
-        joinedload(Product.categories).joinedload(Category.deliveries),
-        joinedload(Product.translations),
-        joinedload(Product.images).joinedload(ProductImage.alt_texts),
-        joinedload(Product.features).joinedload(ProductFeature.translations),
-        joinedload(Product.attributes).joinedload(ProductAttribute.translations),
-        joinedload(Product.variant_attributes).joinedload(ProductVariantAttribute.translations),
-        joinedload(Product.variants).joinedload(ProductVariant.images).joinedload(ProductVariantImage.alt_texts),
-        joinedload(Product.discounts)
+        selectinload(Product.categories).selectinload(Category.deliveries),
+        selectinload(Product.categories).selectinload(
+            translations(Category.translations, CategoryTranslation)
+        ),
+        selectinload(Product.categories).selectinload(Category.warranties),
+        selectinload(Product.translations),
+        selectinload(Product.images).selectinload(
+            translations(ProductImage.alt_texts, ProductImageAlt)
+        ),
+        selectinload(Product.features).selectinload(
+            translations(ProductFeature.translations, ProductFeatureTranslation)
+        ),
+        selectinload(Product.attributes).selectinload(
+            translations(ProductAttribute.translations, ProductAttributeTranslation)
+        ),
+        selectinload(Product.variant_attributes).selectinload(
+            translations(ProductVariantAttribute.translations, ProductVariantAttributeTranslation)
+        ),
+        selectinload(Product.variants).selectinload(ProductVariant.images).selectinload(
+            translations(ProductVariantImage.alt_texts, ProductVariantImageAlt)
+        ),
+        selectinload(Product.discounts)
     ).filter(Product.id == product_id).first()
     
     return product
@@ -460,6 +465,9 @@ def create_product(db: Session, product_data: ProductCreate) -> Product:
     from app.crud.discount_campaign import apply_active_campaigns_to_product
     apply_active_campaigns_to_product(db, product.id, product_data.categories)
     
+    # Update listing projection
+    refresh_product_listing(db, [product.id])
+    
     return product
 
 
@@ -611,6 +619,9 @@ def update_product(db: Session, product_id: int, product_data: ProductUpdate) ->
         from app.crud.discount_campaign import apply_active_campaigns_to_product
         apply_active_campaigns_to_product(db, product_id, updated_category_ids)
     
+    # Update listing projection
+    refresh_product_listing(db, [product_id])
+    
     return product
 
 
@@ -622,6 +633,8 @@ def delete_product(db: Session, product_id: int) -> bool:
     
     # Hard delete - permanently remove from database
     db.delete(product)
+    db.flush()
+    refresh_product_listing(db, [product_id], commit=False)
     db.commit()
     return True
 
@@ -648,6 +661,8 @@ def update_product_stock(db: Session, product_id: int, stock_data: StockUpdateIn
     
     product.date_update = datetime.utcnow()
     
+    db.flush()
+    refresh_product_listing(db, [product_id], commit=False)
     db.commit()
     db.refresh(product)
     return product
@@ -679,86 +694,44 @@ def update_variant_stock(db: Session, variant_id: int, stock_data: StockUpdateIn
 
 
 def get_products_by_category(db: Session, category_id: int, lang: str = "it") -> List[dict]:
-    """Get simple products by category ID with all required fields"""
+    """Get simple products by category ID with all required fields (served from the listing projection)"""
+    from app.crud.product_listing import get_category_listing
     
     # Get category to check parent_id
     category = db.query(Category).filter(Category.id == category_id).first()
     if not category:
         return []
     
-    # Query simple products that belong to this category
-    products = db.query(Product).join(
-        Product.categories
-    ).filter(
-        Category.id == category_id,
-        Product.product_type == ProductType.SIMPLE
-    ).options(
-        joinedload(Product.translations),
-        joinedload(Product.images),
-        joinedload(Product.categories),
-        joinedload(Product.tax_class),
-        joinedload(Product.discounts)
-    ).all()
+    # The child category name is the same for every product of the page
+    child_category_name = ""
+    child_slug = ""
+    cat_translation = resolve_translation(category.translations, lang)
+    if cat_translation:
+        child_category_name = cat_translation.name
+        child_slug = cat_translation.slug
     
     result = []
-    for product in products:
-        # Get translation for requested language
-        translation = next(
-            (t for t in product.translations if t.lang == lang),
-            next((t for t in product.translations if t.lang == "it"), None)
-        )
-        
-        if not translation:
+    for row in get_category_listing(db, category_id, lang, product_type=ProductType.SIMPLE.value):
+        if row.title is None:
             continue
         
-        # Get first image
-        image_url = product.images[0].url if product.images else None
-        
-        # Get the specific child category name for this product
-        product_category = next(
-            (c for c in product.categories if c.id == category_id),
-            None
-        )
-        
-        child_category_name = ""
-        child_slug = ""
-        if product_category:
-            cat_translation = next(
-                (t for t in product_category.translations if t.lang == lang),
-                next((t for t in product_category.translations if t.lang == "it"), None)
-            )
-            if cat_translation:
-                child_category_name = cat_translation.name
-                child_slug = cat_translation.slug
-        
-        # Calculate discount percentage
-        active_discount = next(
-            (d for d in product.discounts if d.is_active),
-            None
-        )
-        discount_str = f"{int(active_discount.discount_percentage)}%" if active_discount else "0"
-        
-        # Get tax rate
-        tax_rate = product.tax_class.rate if product.tax_class else 0
-        tax_str = f"{int(tax_rate)}%"
-        
         result.append({
-            "id": product.id,
+            "id": row.product_id,
             "child_category": child_category_name,
             "slug": child_slug,
-            "image": image_url,
-            "brand_id": product.brand_id,
-            "condition": product.condition.value,
-            "quantity": product.stock_quantity,
-            "title": translation.title,
-            "sub_title": translation.sub_title,
-            "simple_description": translation.simple_description,
-            "is_active": product.is_active,
+            "image": row.image_url,
+            "brand_id": row.brand_id,
+            "condition": row.condition,
+            "quantity": row.stock_quantity,
+            "title": row.title,
+            "sub_title": row.sub_title,
+            "simple_description": row.simple_description,
+            "is_active": row.is_active,
             "price": {
-                "price": product.price_list or 0.0,
-                "currency": product.currency or "EUR",
-                "discounts": discount_str,
-                "tax_role": tax_str
+                "price": row.price_list or 0.0,
+                "currency": row.currency or "EUR",
+                "discounts": row.discount_label,
+                "tax_role": f"{int(row.tax_rate or 0)}%"
             },
             "parent_id": category.parent_id
         })
@@ -774,63 +747,36 @@ def get_recent_products(db: Session, limit: int = 15) -> List[dict]:
     Sorted by date_add (newest first)
     Returns compact JSON format
     """
-    # Query recent products
-    products = db.query(Product).filter(
-        Product.is_active == True
-    ).order_by(
-        Product.date_add.desc()
-    ).limit(limit).all()
+    from app.crud.product_listing import get_recent_listing
+    
+    # Italian cards (title falls back to the first available translation)
+    rows = get_recent_listing(db, lang="it", limit=limit, order_field="date_add")
+    
+    # Names of the first category of each product, in one query
+    first_category_ids = {row.category_ids[0] for row in rows if row.category_ids}
+    category_names = {}
+    if first_category_ids:
+        categories = db.query(Category).filter(Category.id.in_(first_category_ids)).all()
+        translations = db.query(CategoryTranslation).filter(
+            CategoryTranslation.category_id.in_(first_category_ids),
+            CategoryTranslation.lang == "it"
+        ).all()
+        category_names = {c.id: c.name for c in categories}
+        category_names.update({t.category_id: t.name for t in translations})
     
     result = []
-    
-    for product in products:
-        # Get Italian translation (preferred)
-        translation = db.query(ProductTranslation).filter(
-            ProductTranslation.product_id == product.id,
-            ProductTranslation.lang == "it"
-        ).first()
-        
-        if not translation:
-            # Fallback to first available translation
-            translation = db.query(ProductTranslation).filter(
-                ProductTranslation.product_id == product.id
-            ).first()
-        
-        title = translation.title if translation else "Untitled"
-        
-        # Get first image
-        image = db.query(ProductImage).filter(
-            ProductImage.product_id == product.id
-        ).order_by(ProductImage.position).first()
-        
-        image_url = image.url if image else None
-        
-        # Get first category with Italian translation
-        category_name = None
-        category_id = None
-        if product.categories:
-            first_category = product.categories[0]
-            category_id = first_category.id
-            category_translation = db.query(CategoryTranslation).filter(
-                CategoryTranslation.category_id == first_category.id,
-                CategoryTranslation.lang == "it"
-            ).first()
-            
-            if category_translation:
-                category_name = category_translation.name
-            else:
-                category_name = first_category.name
+    for row in rows:
+        category_id = row.category_ids[0] if row.category_ids else None
         
         result.append({
-            "id": product.id,
-            "title": title,
-            "reference": product.reference,
-            "price": product.price_list or 0.0,
-            "image": image_url,
-            "category": category_name,
+            "id": row.product_id,
+            "title": row.title or "Untitled",
+            "reference": row.reference,
+            "price": row.price_list or 0.0,
+            "image": row.image_url,
+            "category": category_names.get(category_id),
             "category_id": category_id,
-            "date_add": product.date_add.isoformat() if product.date_add else None
+            "date_add": row.date_add.isoformat() if row.date_add else None
         })
     
     return result
-
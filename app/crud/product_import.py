@@ -6,10 +6,13 @@
 Product Import CRUD Operations
 Handles upsert logic and database operations for product imports
 """
+import hashlib
+import json
+from collections import defaultdict
 from typing import Dict, List, Optional, Any
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func, and_, or_, bindparam
 from slugify import slugify
 
 from app.models.product import (
@@ -19,11 +22,16 @@ from app.models.product import (
     ProductCondition,
     StockStatus,
     ProductImage,
+    product_categories,
 )
 from app.models.brand import Brand
 from app.models.category import Category, CategoryTranslation
 from app.models.tax_class import TaxClass
+from app.models.import_job import ImportRowFingerprint
 from app.db.session import SessionLocal
+from app.crud.product_listing import refresh_product_listing
+from app.crud.import_cache import ImportCaches, normalize_brand, clean_path
+from app.db.dialect import dialect_insert
 
 
 class ManualProductSkip(Exception):
@@ -502,7 +510,11 @@ def import_products_batch(
     """
     Import a batch of products
     Returns: statistics dict with created, updated, errors, samples
+    A dry run only reads a snapshot of the batch's keys (validate_products).
     """
+    if dry_run:
+        return validate_products(ImportSnapshot.load(db, products_data), products_data, batch_index)
+
     stats = {
         "created": 0,
         "updated": 0,
@@ -514,6 +526,7 @@ def import_products_batch(
     }
 
     seen_eans: set[str] = set()
+    touched_ids: List[int] = []
     
     for product_data in products_data:
         cleaned_ean = _clean_ean(product_data.get("ean"))
@@ -545,6 +558,7 @@ def import_products_batch(
             log_sample = (batch_index == 0 and len(stats["samples"]) < 5)
             
             action, product, existed_before = upsert_product(db, product_data, dry_run, log_sample)
+            touched_ids.append(product.id)
             
             # Add to samples (first 5)
             if log_sample:
@@ -604,6 +618,8 @@ def import_products_batch(
     
     if not dry_run:
         try:
+            # Listing projection in the same commit (ids rolled back above simply have no product)
+            refresh_product_listing(db, touched_ids, commit=False)
             db.commit()
         except Exception as e:
             db.rollback()
@@ -614,6 +630,437 @@ def import_products_batch(
     return stats
 
 
+
+# ============ Bulk upsert (set-based) ============
+
+def _row_error(product_data: Dict[str, Any], reason: str, details: str) -> Dict[str, Any]:
+    return {
+        "row_number": product_data.get("row_number", 0),
+        "ean": product_data.get("ean"),
+        "reason": reason,
+        "details": details,
+    }
+
+
+FINGERPRINT_VERSION = "1"  # Bump when rows are written differently, to re-import everything once
+
+
+def row_fingerprint(product_data: Dict[str, Any]) -> str:
+    """Content hash of a mapped row (without its position and source)"""
+    content = {key: value for key, value in product_data.items() if key not in ("row_number", "source")}
+    payload = json.dumps(content, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.blake2b(f"{FINGERPRINT_VERSION}:{payload}".encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _unchanged_eans(db: Session, rows: List[Dict[str, Any]], fingerprints: Dict[str, str]) -> set:
+    """EANs whose stored fingerprint for the row's source equals the incoming one (one query per source)"""
+    by_source = defaultdict(list)
+    for row in rows:
+        if row["ean"] in fingerprints:
+            by_source[row["source"]].append(row["ean"])
+
+    unchanged = set()
+    for source, eans in by_source.items():
+        for ean, row_hash in db.query(ImportRowFingerprint.ean, ImportRowFingerprint.row_hash).join(
+            Product, Product.id == ImportRowFingerprint.product_id
+        ).filter(ImportRowFingerprint.source == source, ImportRowFingerprint.ean.in_(eans)):
+            if fingerprints[ean] == row_hash:
+                unchanged.add(ean)
+    return unchanged
+
+
+def _new_import_stats() -> Dict[str, Any]:
+    return {
+        "created": 0,
+        "updated": 0,
+        "errors": [],
+        "samples": [],  # First 5 imports
+        "skipped_invalid_ean13": 0,
+        "skipped_duplicate": 0,
+        "skipped_manual": 0,
+        "skipped_unchanged": 0,
+    }
+
+
+def _check_rows(products_data: List[Dict[str, Any]], stats: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Row checks that need no database: EAN-13, duplicates in the chunk, manual keywords"""
+    rows: List[Dict[str, Any]] = []
+    seen_eans: set[str] = set()
+    for product_data in products_data:
+        cleaned_ean = _clean_ean(product_data.get("ean"))
+        if not _is_valid_ean13(cleaned_ean):
+            stats["skipped_invalid_ean13"] += 1
+            stats["errors"].append(_row_error(product_data, "invalid_ean13", "EAN must be exactly 13 digits"))
+            continue
+
+        if cleaned_ean in seen_eans:
+            stats["skipped_duplicate"] += 1
+            product_data["ean"] = cleaned_ean
+            stats["errors"].append(_row_error(product_data, "duplicate_ean_in_batch", "EAN already processed in this batch"))
+            continue
+
+        product_data["ean"] = cleaned_ean
+        seen_eans.add(cleaned_ean)
+
+        if _is_manual_keyword(product_data.get("title")) or _is_manual_keyword(product_data.get("brand_name")):
+            stats["skipped_manual"] += 1
+            stats["errors"].append(_row_error(product_data, "manual_blocked", "Manual/test product blocked by incoming data"))
+            continue
+
+        rows.append(product_data)
+    return rows
+
+
+def _accept_rows(
+    rows: List[Dict[str, Any]],
+    existing,
+    protected: set,
+    taken_refs: set,
+    stats: Dict[str, Any]
+) -> List[Dict[str, Any]]:
+    """Rows that may be written: not protected, and new products with a free reference (added to taken_refs)"""
+    accepted: List[Dict[str, Any]] = []
+    for row in rows:
+        if row["ean"] in protected:
+            stats["skipped_manual"] += 1
+            stats["errors"].append(_row_error(row, "manual_blocked", "Manual/test product protected"))
+            continue
+        if row["ean"] not in existing:
+            reference = row.get("reference") or row["ean"]
+            if reference in taken_refs:
+                if row.get("reference"):
+                    stats["errors"].append(_row_error(row, "processing_error", f"Reference '{reference}' already exists"))
+                else:
+                    stats["errors"].append(_row_error(row, "integrity_error", f"Reference '{reference}' already exists"))
+                continue
+            taken_refs.add(reference)
+        accepted.append(row)
+    return accepted
+
+
+def _add_samples(accepted: List[Dict[str, Any]], existing, stats: Dict[str, Any], batch_index: int):
+    """Samples (first batch only)"""
+    if batch_index != 0:
+        return
+    from app.core.logging import logger
+    for row in accepted[:5]:
+        existed_before = row["ean"] in existing
+        logger.info(f"[SAMPLE] EAN: {row['ean']} | Existed: {existed_before} | Title: {(row.get('title') or 'N/A')[:50]}")
+        stats["samples"].append({
+            "ean": row["ean"],
+            "existed_before": existed_before,
+            "action": "updated" if existed_before else "created",
+            "title": (row.get("title") or "")[:50]
+        })
+
+
+def import_products_bulk(
+    db: Session,
+    products_data: List[Dict[str, Any]],
+    dry_run: bool = False,
+    batch_index: int = 0,
+    caches: Optional[ImportCaches] = None
+) -> Dict[str, Any]:
+    """
+    Set-based variant of import_products_batch (same statistics dict)
+
+    Existing products and references of the chunk are fetched with a few IN
+    queries; brands and category paths are resolved through `caches` (pass one
+    ImportCaches for the whole import, otherwise it is loaded per chunk).
+    Products and their Italian translations are then written with
+    INSERT ... ON CONFLICT DO UPDATE. If the bulk write fails, the chunk is
+    imported again row by row so every row still gets its own error.
+    stats["cache"] holds the cache hit/miss counters of the chunk.
+
+    Rows whose fingerprint (row_fingerprint) matches the one stored by the
+    last import of their source are not written (skipped_unchanged).
+    A dry run only reads a snapshot of the chunk's keys (validate_products).
+    """
+    caches = caches or ImportCaches()
+    if dry_run:
+        return validate_products(ImportSnapshot.load(db, products_data, caches), products_data, batch_index)
+
+    stats = _new_import_stats()
+
+    # 1. Row checks that need no database
+    rows = _check_rows(products_data, stats)
+
+    # 2. Rows unchanged since the last import of their source
+    fingerprints = {row["ean"]: row_fingerprint(row) for row in rows if row.get("source")}
+    if fingerprints:
+        unchanged = _unchanged_eans(db, rows, fingerprints)
+        stats["skipped_unchanged"] = len(unchanged)
+        rows = [row for row in rows if row["ean"] not in unchanged]
+
+    if not rows:
+        return stats
+
+    # 3. Existing products of the chunk (with brand and Italian title for manual protection)
+    existing: Dict[str, int] = {}
+    protected: set[str] = set()
+    for product_id, ean, reference, brand_name, title in db.query(
+        Product.id, Product.ean, Product.reference, Brand.name, ProductTranslation.title
+    ).outerjoin(Brand, Brand.id == Product.brand_id).outerjoin(
+        ProductTranslation,
+        and_(ProductTranslation.product_id == Product.id, ProductTranslation.lang == "it")
+    ).filter(Product.ean.in_([row["ean"] for row in rows])):
+        existing[ean] = product_id
+        if _is_manual_keyword(reference) or _is_manual_keyword(brand_name) or _is_manual_keyword(title):
+            protected.add(ean)
+
+    # 4. References of the new products that are already taken
+    new_refs = [row.get("reference") or row["ean"] for row in rows if row["ean"] not in existing]
+    taken_refs = set()
+    if new_refs:
+        taken_refs = {
+            reference for (reference,) in
+            db.query(Product.reference).filter(Product.reference.in_(new_refs))
+        }
+
+    accepted = _accept_rows(rows, existing, protected, taken_refs, stats)
+    _add_samples(accepted, existing, stats, batch_index)
+
+    if not accepted:
+        db.commit()
+        return stats
+
+    try:
+        ean_to_id = _write_products_bulk(db, accepted, caches, fingerprints)
+        # Committed with the fingerprints: a resumed chunk skips only rows whose listing is current
+        refresh_product_listing(db, list(ean_to_id.values()), commit=False)
+        db.commit()
+        caches.commit()
+    except Exception as e:
+        db.rollback()
+        caches.rollback()
+        from app.core.logging import logger
+        logger.warning(f"Bulk import of batch {batch_index} failed, retrying row by row: {str(e)}")
+        # Rows already rejected above keep their errors; the rest get per-row results
+        fallback = import_products_batch(db, accepted, False, batch_index)
+        fallback["errors"] = stats["errors"] + fallback["errors"]
+        fallback["samples"] = stats["samples"] or fallback["samples"]
+        fallback["cache"] = caches.take_counters()
+        for key in ("skipped_invalid_ean13", "skipped_duplicate", "skipped_manual"):
+            fallback[key] += stats[key]
+        fallback["skipped_unchanged"] = stats["skipped_unchanged"]
+        return fallback
+
+    for row in accepted:
+        stats["updated" if row["ean"] in existing else "created"] += 1
+    stats["cache"] = caches.take_counters()
+    return stats
+
+
+def _write_products_bulk(
+    db: Session,
+    rows: List[Dict[str, Any]],
+    caches: ImportCaches,
+    fingerprints: Dict[str, str]
+) -> Dict[str, int]:
+    """
+    Upsert products, Italian translations, categories and row fingerprints of validated rows
+    Returns {ean: product id}; the caller commits.
+    """
+    insert = dialect_insert(db)
+    now = func.now()
+
+    brand_ids = caches.resolve_brands(db, [row.get("brand_name") for row in rows])
+    category_ids = caches.resolve_paths(db, [row.get("category_path") for row in rows])
+    tax_class_id = get_or_create_default_tax_class(db).id
+
+    # Products
+    product_rows = []
+    for row in rows:
+        stock_quantity = row.get("stock") or 0
+        brand_name = normalize_brand(row.get("brand_name"))
+        product_rows.append({
+            "product_type": ProductType.SIMPLE,
+            "reference": row.get("reference") or row["ean"],
+            "ean": row["ean"],
+            "is_active": True,
+            "condition": ProductCondition.NEW,
+            "brand_id": brand_ids.get(brand_name) if brand_name else None,
+            "tax_class_id": tax_class_id,
+            "tax_included_in_price": False,
+            "price_list": row.get("price"),
+            "currency": "EUR",
+            "stock_status": StockStatus.IN_STOCK if stock_quantity > 0 else StockStatus.OUT_OF_STOCK,
+            "stock_quantity": stock_quantity,
+        })
+
+    products = Product.__table__
+    stmt = insert(products)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[products.c.ean],
+        set_={
+            # Missing price/brand keep the current value
+            "price_list": func.coalesce(stmt.excluded.price_list, products.c.price_list),
+            "brand_id": func.coalesce(stmt.excluded.brand_id, products.c.brand_id),
+            "stock_quantity": stmt.excluded.stock_quantity,
+            "stock_status": stmt.excluded.stock_status,
+            "date_update": now,
+            "updated_at": now,
+        }
+    ).returning(products.c.id, products.c.ean)
+    ean_to_id = {ean: product_id for product_id, ean in db.execute(stmt, product_rows)}
+
+    # Italian translations
+    translations = ProductTranslation.__table__
+    translation_rows = [
+        {
+            "product_id": ean_to_id[row["ean"]],
+            "lang": "it",
+            "title": row.get("title") or "",
+            "simple_description": row.get("description"),
+        }
+        for row in rows if row.get("title")
+    ]
+    if translation_rows:
+        stmt = insert(translations)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[translations.c.product_id, translations.c.lang],
+            set_={
+                "title": stmt.excluded.title,
+                "simple_description": func.coalesce(
+                    stmt.excluded.simple_description, translations.c.simple_description
+                ),
+                "updated_at": now,
+            }
+        )
+        db.execute(stmt, translation_rows)
+
+    # Categories: replace with the leaf of the incoming path
+    category_rows = [
+        {"product_id": ean_to_id[row["ean"]], "category_id": category_ids[clean_path(row["category_path"])]}
+        for row in rows
+        if row.get("category_path") and clean_path(row["category_path"]) in category_ids
+    ]
+    if category_rows:
+        db.execute(product_categories.delete().where(
+            product_categories.c.product_id.in_([r["product_id"] for r in category_rows])
+        ))
+        db.execute(product_categories.insert(), category_rows)
+
+    # Fingerprints of the written rows
+    fingerprint_rows = [
+        {"source": row["source"], "ean": row["ean"], "product_id": ean_to_id[row["ean"]], "row_hash": fingerprints[row["ean"]]}
+        for row in rows if row["ean"] in fingerprints
+    ]
+    if fingerprint_rows:
+        fingerprint_table = ImportRowFingerprint.__table__
+        stmt = insert(fingerprint_table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[fingerprint_table.c.source, fingerprint_table.c.ean],
+            set_={
+                "product_id": stmt.excluded.product_id,
+                "row_hash": stmt.excluded.row_hash,
+                "updated_at": now,
+            }
+        )
+        db.execute(stmt, fingerprint_rows)
+
+    return ean_to_id
+
+# ============ Dry run (read-only snapshot) ============
+
+class ImportSnapshot:
+    """
+    Read-only view of the keys an import is checked against
+
+    Existing EANs (and which are manual/test products), taken references, row
+    fingerprints, brands and category paths, each loaded with one query.
+    validate_products() then classifies rows in memory; it records the rows it
+    accepts, so later chunks see them as existing, as in a real import.
+    """
+
+    def __init__(self, caches: Optional[ImportCaches] = None):
+        self.products: set[str] = set()  # EANs of existing products
+        self.protected: set[str] = set()  # EANs of manual/test products
+        self.references: set[str] = set()
+        self.fingerprints: Dict[tuple, str] = {}  # (source, ean) -> row hash
+        self.caches = caches or ImportCaches()
+
+    @classmethod
+    def load(
+        cls,
+        db: Session,
+        products_data: Optional[List[Dict[str, Any]]] = None,
+        caches: Optional[ImportCaches] = None
+    ) -> "ImportSnapshot":
+        """Snapshot of the whole catalog, or only of the EANs/references of `products_data`"""
+        snapshot = cls(caches)
+
+        products = db.query(Product.ean, Product.reference, Brand.name, ProductTranslation.title).outerjoin(
+            Brand, Brand.id == Product.brand_id
+        ).outerjoin(
+            ProductTranslation,
+            and_(ProductTranslation.product_id == Product.id, ProductTranslation.lang == "it")
+        )
+        fingerprints = db.query(
+            ImportRowFingerprint.source, ImportRowFingerprint.ean, ImportRowFingerprint.row_hash
+        ).join(Product, Product.id == ImportRowFingerprint.product_id)
+
+        if products_data is not None:
+            eans = {ean for ean in (_clean_ean(row.get("ean")) for row in products_data) if ean}
+            references = {row["reference"] for row in products_data if row.get("reference")} | eans
+            products = products.filter(or_(Product.ean.in_(eans), Product.reference.in_(references)))
+            fingerprints = fingerprints.filter(ImportRowFingerprint.ean.in_(eans))
+
+        for ean, reference, brand_name, title in products.yield_per(5000):
+            snapshot.references.add(reference)
+            if ean:
+                snapshot.products.add(ean)
+                if _is_manual_keyword(reference) or _is_manual_keyword(brand_name) or _is_manual_keyword(title):
+                    snapshot.protected.add(ean)
+
+        for source, ean, row_hash in fingerprints.yield_per(5000):
+            snapshot.fingerprints[(source, ean)] = row_hash
+
+        if not snapshot.caches.loaded:
+            snapshot.caches.load(db)
+        return snapshot
+
+
+def validate_products(
+    snapshot: ImportSnapshot,
+    products_data: List[Dict[str, Any]],
+    batch_index: int = 0
+) -> Dict[str, Any]:
+    """
+    Dry run of import_products_bulk against a snapshot, without any query
+
+    Returns the same statistics dict: would-be created/updated rows, skips and
+    errors, and cache counters (misses are brands/categories that would be created).
+    """
+    stats = _new_import_stats()
+    rows = _check_rows(products_data, stats)
+
+    fingerprints = {row["ean"]: row_fingerprint(row) for row in rows if row.get("source")}
+    unchanged = {
+        row["ean"] for row in rows
+        if row["ean"] in fingerprints and row["ean"] in snapshot.products
+        and snapshot.fingerprints.get((row["source"], row["ean"])) == fingerprints[row["ean"]]
+    }
+    stats["skipped_unchanged"] = len(unchanged)
+    rows = [row for row in rows if row["ean"] not in unchanged]
+
+    accepted = _accept_rows(rows, snapshot.products, snapshot.protected, snapshot.references, stats)
+    _add_samples(accepted, snapshot.products, stats, batch_index)
+
+    # Resolved in memory only (create=False)
+    snapshot.caches.resolve_brands(None, [row.get("brand_name") for row in accepted], create=False)
+    snapshot.caches.resolve_paths(None, [row.get("category_path") for row in accepted], create=False)
+    stats["cache"] = snapshot.caches.take_counters()
+
+    for row in accepted:
+        stats["updated" if row["ean"] in snapshot.products else "created"] += 1
+    for row in accepted:
+        snapshot.products.add(row["ean"])
+        if row["ean"] in fingerprints:
+            snapshot.fingerprints[(row["source"], row["ean"])] = fingerprints[row["ean"]]
+    return stats
+
+
 # ============ Enrichment (fill missing fields only) ============
 
 def enrich_product(
@@ -705,6 +1152,8 @@ def enrich_products_batch(
         "skipped_samples": [],
     }
 
+    touched_ids: List[int] = []
+
     for product_data in products_data:
         try:
             log_sample = batch_index == 0 and len(stats["matched_samples"]) < 5
@@ -722,6 +1171,7 @@ def enrich_products_batch(
 
             if updated_fields:
                 stats["matched"] += 1
+                touched_ids.append(product.id)
                 if log_sample:
                     stats["matched_samples"].append({
                         "ean": product_data.get("ean"),
@@ -748,6 +1198,7 @@ def enrich_products_batch(
 
     if not dry_run:
         try:
+            refresh_product_listing(db, touched_ids, commit=False)
             db.commit()
         except Exception as e:
             db.rollback()
@@ -756,3 +1207,209 @@ def enrich_products_batch(
         db.rollback()
 
     return stats
+
+
+def enrich_products_bulk(
+    db: Session,
+    products_data: List[Dict[str, Any]],
+    dry_run: bool = False,
+    batch_index: int = 0,
+    caches: Optional[ImportCaches] = None,
+) -> Dict[str, Any]:
+    """
+    Set-based variant of enrich_products_batch (same rules and statistics dict)
+
+    The chunk's products are matched by EAN, then by reference, with one query;
+    Italian translations and image presence are loaded with one query each and
+    brands resolved through `caches`. Fills are written with executemany
+    updates and images with one multi-row insert. If the bulk write fails, the
+    chunk is enriched again row by row.
+    """
+    caches = caches or ImportCaches()
+    stats = {
+        "matched": 0,
+        "skipped": 0,
+        "errors": [],
+        "matched_samples": [],
+        "skipped_samples": [],
+    }
+
+    def skip(product_data, reason, details):
+        stats["skipped"] += 1
+        if len(stats["skipped_samples"]) < 5:
+            stats["skipped_samples"].append({"ean": product_data.get("ean"), "reason": reason, "details": details})
+
+    rows = []
+    for product_data in products_data:
+        ean = _clean_ean(product_data.get("ean"))
+        if not ean:
+            stats["errors"].append(_row_error(product_data, "processing_error", "EAN is required"))
+            continue
+        rows.append((ean, product_data))
+    if not rows:
+        return stats
+
+    # 1. Products of the chunk by EAN or reference (one query)
+    keys = list({ean for ean, _ in rows})
+    products: Dict[int, Dict[str, Any]] = {}
+    by_ean: Dict[str, int] = {}
+    by_reference: Dict[str, int] = {}
+    for product_id, ean, reference, price_list, brand_id in db.query(
+        Product.id, Product.ean, Product.reference, Product.price_list, Product.brand_id
+    ).filter(or_(Product.ean.in_(keys), Product.reference.in_(keys))):
+        products[product_id] = {"reference": reference, "price_list": price_list, "brand_id": brand_id}
+        if ean:
+            by_ean[ean] = product_id
+        by_reference.setdefault(reference, product_id)
+
+    # 2. Italian translations and image presence (one query each)
+    translations: Dict[int, Dict[str, Any]] = {}
+    with_images: set[int] = set()
+    if products:
+        for translation_id, product_id, title, description in db.query(
+            ProductTranslation.id, ProductTranslation.product_id, ProductTranslation.title, ProductTranslation.simple_description
+        ).filter(ProductTranslation.product_id.in_(list(products)), ProductTranslation.lang == "it"):
+            translations[product_id] = {"id": translation_id, "title": title, "simple_description": description}
+        with_images = {
+            product_id for (product_id,) in
+            db.query(ProductImage.product_id).filter(ProductImage.product_id.in_(list(products))).distinct()
+        }
+
+    # 3. Brands for products without one
+    brand_names = []
+    for ean, product_data in rows:
+        product_id = by_ean.get(ean) or by_reference.get(ean)
+        if product_id and products[product_id]["brand_id"] is None and product_data.get("brand_name"):
+            brand_names.append(product_data["brand_name"])
+    brand_ids = caches.resolve_brands(db, brand_names, create=not dry_run) if brand_names else {}
+    caches.take_counters()
+
+    # 4. Fill-if-empty in memory (later rows of the chunk see earlier fills)
+    new_translations: Dict[int, Dict[str, Any]] = {}
+    updated_translations: Dict[int, Dict[str, Any]] = {}
+    prices: Dict[int, float] = {}
+    brands: Dict[int, int] = {}
+    image_rows: List[Dict[str, Any]] = []
+    touched_ids: List[int] = []
+    for ean, product_data in rows:
+        product_id = by_ean.get(ean) or by_reference.get(ean)
+        if not product_id:
+            skip(product_data, "not_found", "EAN not found in DB")
+            continue
+
+        product = products[product_id]
+        updated_fields: List[str] = []
+
+        translation = translations.get(product_id)
+        if translation is None:
+            translation = {
+                "id": None,
+                "title": product_data.get("title") or product["reference"],
+                "simple_description": product_data.get("description"),
+            }
+            translations[product_id] = new_translations[product_id] = translation
+            updated_fields.append("translation_created")
+        else:
+            if (not translation["title"]) and product_data.get("title"):
+                translation["title"] = product_data["title"]
+                updated_fields.append("title")
+            if (not translation["simple_description"]) and product_data.get("description"):
+                translation["simple_description"] = product_data["description"]
+                updated_fields.append("description")
+            if translation["id"] and updated_fields:
+                updated_translations[translation["id"]] = translation
+
+        if product["price_list"] is None and product_data.get("price") is not None:
+            product["price_list"] = prices[product_id] = product_data["price"]
+            updated_fields.append("price")
+
+        if product["brand_id"] is None and product_data.get("brand_name"):
+            brand_id = brand_ids.get(normalize_brand(product_data["brand_name"]))
+            if brand_id:
+                product["brand_id"] = brands[product_id] = brand_id
+                updated_fields.append("brand")
+            elif dry_run:
+                updated_fields.append("brand")  # Would be created
+
+        image_urls = product_data.get("image_urls") or []
+        if image_urls and product_id not in with_images:
+            image_rows.extend(
+                {"product_id": product_id, "url": url, "position": pos}
+                for pos, url in enumerate(image_urls, start=1)
+            )
+            with_images.add(product_id)
+            updated_fields.append("images")
+
+        if not updated_fields:
+            skip(product_data, "no_updates", "All target fields already populated")
+            continue
+
+        stats["matched"] += 1
+        touched_ids.append(product_id)
+        if batch_index == 0 and len(stats["matched_samples"]) < 5:
+            stats["matched_samples"].append({
+                "ean": product_data.get("ean"),
+                "updated_fields": updated_fields,
+                "title": product_data.get("title"),
+            })
+
+    if dry_run:
+        db.rollback()
+        return stats
+
+    try:
+        _write_enrichment_bulk(db, new_translations, updated_translations, prices, brands, image_rows)
+        refresh_product_listing(db, touched_ids, commit=False)
+        db.commit()
+        caches.commit()
+    except Exception as e:
+        db.rollback()
+        caches.rollback()
+        from app.core.logging import logger
+        logger.warning(f"Bulk enrichment of batch {batch_index} failed, retrying row by row: {str(e)}")
+        fallback = enrich_products_batch(db, [product_data for _, product_data in rows], False, batch_index)
+        fallback["errors"] = stats["errors"] + fallback["errors"]
+        return fallback
+
+    return stats
+
+
+def _write_enrichment_bulk(
+    db: Session,
+    new_translations: Dict[int, Dict[str, Any]],
+    updated_translations: Dict[int, Dict[str, Any]],
+    prices: Dict[int, float],
+    brands: Dict[int, int],
+    image_rows: List[Dict[str, Any]],
+):
+    """Write the fills computed by enrich_products_bulk; the caller commits"""
+    products = Product.__table__
+    translations = ProductTranslation.__table__
+
+    if new_translations:
+        db.execute(translations.insert(), [
+            {"product_id": product_id, "lang": "it", "title": t["title"], "simple_description": t["simple_description"]}
+            for product_id, t in new_translations.items()
+        ])
+    if updated_translations:
+        db.execute(
+            translations.update().where(translations.c.id == bindparam("t_id")).values(
+                title=bindparam("t_title"), simple_description=bindparam("t_description")
+            ),
+            [
+                {"t_id": translation_id, "t_title": t["title"], "t_description": t["simple_description"]}
+                for translation_id, t in updated_translations.items()
+            ]
+        )
+    if prices:
+        db.execute(
+            products.update().where(products.c.id == bindparam("p_id")).values(price_list=bindparam("p_price")),
+            [{"p_id": product_id, "p_price": price} for product_id, price in prices.items()]
+        )
+    if brands:
+        db.execute(
+            products.update().where(products.c.id == bindparam("p_id")).values(brand_id=bindparam("p_brand")),
+            [{"p_id": product_id, "p_brand": brand_id} for product_id, brand_id in brands.items()]
+        )
+    if image_rows:
+        db.execute(ProductImage.__table__.insert(), image_rows)
@@ -0,0 +1,278 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Product listing projection
+Maintains the denormalized product_listing table and serves listing pages from it
+"""
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from sqlalchemy import select
+from sqlalchemy.orm import Session, selectinload
+
+from app.models.product import (
+    Product, ProductFeature, ProductAttribute, product_categories
+)
+from app.models.product_listing import ProductListing
+from app.core.i18n import resolve_translation
+from app.crud.pagination import paginate_with_total, paginate_keyset
+from app.crud import product_search
+from app.services.suggest_index import suggest_index
+
+
+LISTING_LANGS = ["it", "en", "fr", "de", "ar"]
+REFRESH_CHUNK_SIZE = 500
+
+
+# ============= Projection Builders =============
+
+def best_active_discount(product: Product):
+    """Active discount with the highest priority (then the highest value), or None"""
+    active_discounts = [d for d in product.discounts if d.is_active]
+    if not active_discounts:
+        return None
+    return max(active_discounts, key=lambda d: (d.priority, d.discount_value))
+
+
+def discount_label(product: Product, discount) -> str:
+    """Discount shown on product cards, e.g. "15%" (amount discounts converted to a percentage)"""
+    if not discount:
+        return "0"
+    if discount.discount_type == "percentage":
+        return f"{int(discount.discount_value)}%"
+    if discount.discount_type == "amount" and product.price_list and product.price_list > 0:
+        return f"{int((discount.discount_value / product.price_list) * 100)}%"
+    return "0"
+
+
+def build_listing_rows(product: Product) -> List[Dict[str, Any]]:
+    """Build one projection row per listing language for a fully loaded product"""
+    image = product.images[0] if product.images else None
+    discount = best_active_discount(product)
+    category_ids = sorted(c.id for c in product.categories)
+
+    rows = []
+    for lang in LISTING_LANGS:
+        translation = resolve_translation(product.translations, lang, any_fallback=True)
+
+        features = []
+        for feat in product.features:
+            feat_trans = resolve_translation(feat.translations, lang)
+            if feat_trans:
+                features.append({"name": feat_trans.name, "value": feat_trans.value})
+
+        attributes = []
+        for attr in product.attributes:
+            attr_trans = resolve_translation(attr.translations, lang)
+            if attr_trans:
+                attributes.append({"code": attr.code, "name": attr_trans.name, "value": attr_trans.value})
+
+        rows.append({
+            "product_id": product.id,
+            "lang": lang,
+            "reference": product.reference,
+            "ean": product.ean,
+            "product_type": product.product_type.value if product.product_type else "simple",
+            "condition": product.condition.value if product.condition else None,
+            "is_active": product.is_active,
+            "brand_id": product.brand_id,
+            "brand_name": product.brand.name if product.brand else None,
+            "title": translation.title if translation else None,
+            "sub_title": translation.sub_title if translation else None,
+            "simple_description": translation.simple_description if translation else None,
+            "image_url": image.url if image else None,
+            "tax_class_id": product.tax_class.id if product.tax_class else None,
+            "tax_name": product.tax_class.name if product.tax_class else None,
+            "tax_rate": product.tax_class.rate if product.tax_class else None,
+            "tax_included_in_price": product.tax_included_in_price,
+            "price_list": product.price_list,
+            "currency": product.currency or "EUR",
+            "discount_type": discount.discount_type if discount else None,
+            "discount_value": discount.discount_value if discount else None,
+            "discount_label": discount_label(product, discount),
+            "stock_status": product.stock_status.value if product.stock_status else None,
+            "stock_quantity": product.stock_quantity or 0,
+            "category_ids": category_ids,
+            "features": features,
+            "attributes": attributes,
+            "date_add": product.date_add,
+            "created_at": product.created_at,
+        })
+
+    return rows
+
+
+# ============= Maintenance =============
+
+def refresh_product_listing(db: Session, product_ids: Iterable[int], commit: bool = True) -> int:
+    """
+    Rebuild the projection rows of the given products
+
+    Call after the product changes are flushed. Ids of deleted products just
+    lose their rows. The in-memory autocomplete index follows once the
+    transaction commits.
+    Returns the number of rows written.
+    """
+    ids = sorted({pid for pid in product_ids if pid})
+    written = 0
+
+    for start in range(0, len(ids), REFRESH_CHUNK_SIZE):
+        chunk = ids[start:start + REFRESH_CHUNK_SIZE]
+
+        products = db.query(Product).options(
+            selectinload(Product.translations),
+            selectinload(Product.images),
+            selectinload(Product.brand),
+            selectinload(Product.tax_class),
+            selectinload(Product.discounts),
+            selectinload(Product.categories),
+            selectinload(Product.features).selectinload(ProductFeature.translations),
+            selectinload(Product.attributes).selectinload(ProductAttribute.translations),
+        ).filter(Product.id.in_(chunk)).populate_existing().all()
+
+        rows = []
+        for product in products:
+            rows.extend(build_listing_rows(product))
+        
+        # Keep the autocomplete index in step with the projection
+        found_ids = {product.id for product in products}
+        suggest_index.update_products(db, products, removed_ids=[pid for pid in chunk if pid not in found_ids])
+
+        db.query(ProductListing).filter(
+            ProductListing.product_id.in_(chunk)
+        ).delete(synchronize_session=False)
+        if rows:
+            db.bulk_insert_mappings(ProductListing, rows)
+        written += len(rows)
+
+    if commit:
+        db.commit()
+
+    return written
+
+
+def rebuild_product_listing(db: Session) -> Dict[str, int]:
+    """Rebuild the whole projection, committing chunk by chunk"""
+    products = 0
+    rows = 0
+    last_id = 0
+
+    while True:
+        chunk = [
+            pid for (pid,) in db.query(Product.id)
+            .filter(Product.id > last_id)
+            .order_by(Product.id)
+            .limit(REFRESH_CHUNK_SIZE)
+            .all()
+        ]
+        if not chunk:
+            break
+        rows += refresh_product_listing(db, chunk, commit=True)
+        products += len(chunk)
+        last_id = chunk[-1]
+
+    # Drop rows of products that no longer exist
+    db.query(ProductListing).filter(
+        ~ProductListing.product_id.in_(select(Product.id))
+    ).delete(synchronize_session=False)
+    db.commit()
+
+    return {"products": products, "rows": rows}
+
+
+def ensure_product_listing(db: Session) -> Optional[Dict[str, int]]:
+    """Fill an empty projection (first start after the migration); None when already filled"""
+    if db.query(ProductListing.id).first() or not db.query(Product.id).first():
+        return None
+    return rebuild_product_listing(db)
+
+
+# ============= Queries =============
+
+def _filter_listing_query(
+    db: Session,
+    lang: str,
+    product_type: Optional[str] = None,
+    category_id: Optional[int] = None,
+    brand_id: Optional[int] = None,
+    active_only: bool = False,
+    search: Optional[str] = None
+):
+    """Projection query for one language with the product listing filters applied"""
+    query = db.query(ProductListing).filter(ProductListing.lang == lang)
+    
+    if product_type:
+        query = query.filter(ProductListing.product_type == product_type)
+
+    if category_id:
+        query = query.join(
+            product_categories, product_categories.c.product_id == ProductListing.product_id
+        ).filter(product_categories.c.category_id == category_id)
+
+    if brand_id:
+        query = query.filter(ProductListing.brand_id == brand_id)
+
+    if active_only:
+        query = query.filter(ProductListing.is_active == True)
+
+    if search:
+        # ID / EAN / reference, or full-text on title, brand and descriptions
+        query = query.filter(product_search.search_condition(db, search, lang))
+
+    return query
+
+
+def get_listing_page(
+    db: Session,
+    lang: str = "it",
+    skip: int = 0,
+    limit: int = 100,
+    **filters
+) -> Tuple[List[ProductListing], int]:
+    """Get one page of product cards and the total count in one query (best matches first when searching)"""
+    query = _filter_listing_query(db, lang, **filters)
+    
+    rank = product_search.search_rank(db, filters["search"], lang) if filters.get("search") else None
+    if rank is not None:
+        query = query.order_by(rank.desc(), ProductListing.product_id)
+    else:
+        query = query.order_by(ProductListing.product_id)
+    
+    return paginate_with_total(query, skip, limit)
+
+
+def get_listing_by_cursor(
+    db: Session,
+    lang: str = "it",
+    cursor: Optional[str] = None,
+    limit: int = 100,
+    **filters
+) -> Tuple[List[ProductListing], Optional[str]]:
+    """Get the page of product cards after `cursor` (keyset on product id)"""
+    query = _filter_listing_query(db, lang, **filters)
+    return paginate_keyset(query, [ProductListing.product_id], cursor, limit)
+
+
+def get_recent_listing(
+    db: Session,
+    lang: str = "it",
+    limit: int = 15,
+    order_field: str = "date_add"
+) -> List[ProductListing]:
+    """Get the newest active product cards, by date_add or created_at"""
+    column = getattr(ProductListing, order_field)
+    return db.query(ProductListing).filter(
+        ProductListing.lang == lang,
+        ProductListing.is_active == True
+    ).order_by(column.desc(), ProductListing.product_id.desc()).limit(limit).all()
+
+
+def get_category_listing(
+    db: Session,
+    category_id: int,
+    lang: str = "it",
+    product_type: Optional[str] = None
+) -> List[ProductListing]:
+    """Get all product cards linked directly to a category"""
+    query = _filter_listing_query(db, lang, product_type=product_type, category_id=category_id)
+    return query.order_by(ProductListing.product_id).all()
@@ -0,0 +1,134 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Product search
+Ranked full-text search over the product_listing projection
+
+On PostgreSQL every projection row carries a `search_vector` (title, brand,
+sub title and description, stemmed with the row language) kept up to date by a
+trigger, plus trigram indexes on reference/ean. Other databases (tests) fall
+back to ILIKE matching ordered by product id.
+"""
+import re
+from typing import List, Tuple
+from sqlalchemy import func, literal_column, or_
+from sqlalchemy.orm import Session
+
+from app.models.product_listing import ProductListing
+from app.crud.pagination import paginate_with_total
+
+
+# Text search configuration per listing language
+SEARCH_CONFIGS = {
+    "it": "italian",
+    "en": "english",
+    "fr": "french",
+    "de": "german",
+    "ar": "simple",
+}
+
+# Column added by migration (PostgreSQL only), so it is not mapped on the model
+search_vector = literal_column("product_listing.search_vector")
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def is_postgres(db: Session) -> bool:
+    """True when the session is bound to PostgreSQL"""
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def prefix_tsquery(q: str, lang: str):
+    """
+    tsquery matching every word of `q`, the last one as a prefix (type-ahead)
+
+    Built from word tokens only, so user input can never break the tsquery syntax.
+    Returns None when `q` has no word characters.
+    """
+    tokens = _TOKEN_RE.findall(q.lower())
+    if not tokens:
+        return None
+
+    terms = [f"{token}:*" if i == len(tokens) - 1 else token for i, token in enumerate(tokens)]
+    config = literal_column(f"'{SEARCH_CONFIGS.get(lang, 'simple')}'::regconfig")
+    return func.to_tsquery(config, " & ".join(terms))
+
+
+def search_condition(db: Session, q: str, lang: str):
+    """WHERE clause matching `q` against a product_listing row"""
+    q = q.strip()
+    like = f"%{q}%"
+
+    if q.isdigit():
+        # Product ID, EAN or numeric reference
+        clauses = [
+            ProductListing.ean == q,
+            ProductListing.reference == q,
+            ProductListing.ean.ilike(like),
+            ProductListing.reference.ilike(like),
+        ]
+        if len(q) < 10:
+            clauses.append(ProductListing.product_id == int(q))
+        return or_(*clauses)
+
+    reference_match = or_(ProductListing.reference.ilike(like), ProductListing.ean.ilike(like))
+
+    if is_postgres(db):
+        tsquery = prefix_tsquery(q, lang)
+        if tsquery is None:
+            return reference_match
+        return or_(search_vector.op("@@")(tsquery), reference_match)
+
+    return or_(ProductListing.title.ilike(like), reference_match)
+
+
+def search_rank(db: Session, q: str, lang: str):
+    """Relevance score for ORDER BY (PostgreSQL), None elsewhere"""
+    if not is_postgres(db):
+        return None
+
+    q = q.strip()
+    score = func.greatest(
+        func.similarity(ProductListing.reference, q),
+        func.similarity(func.coalesce(ProductListing.ean, ""), q),
+    )
+    tsquery = prefix_tsquery(q, lang)
+    if tsquery is not None:
+        score = score + func.coalesce(func.ts_rank_cd(search_vector, tsquery), 0)
+    return score
+
+
+def search_products(
+    db: Session,
+    q: str,
+    lang: str = "it",
+    skip: int = 0,
+    limit: int = 20,
+    active_only: bool = False
+) -> Tuple[List[ProductListing], int]:
+    """
+    Ranked, paginated product search
+
+    - numeric `q`: product ID, EAN or reference
+    - text `q`: full-text match on title/brand/sub title/description (all words,
+      last one as prefix) or substring of reference/EAN
+
+    Returns (rows, total)
+    """
+    query = db.query(ProductListing).filter(
+        ProductListing.lang == lang,
+        search_condition(db, q, lang)
+    )
+
+    if active_only:
+        query = query.filter(ProductListing.is_active == True)
+
+    rank = search_rank(db, q, lang)
+    if rank is not None:
+        query = query.order_by(rank.desc(), ProductListing.product_id)
+    else:
+        query = query.order_by(ProductListing.product_id)
+
+    return paginate_with_total(query, skip, limit)
@@ -0,0 +1,121 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Stock reservation
+Takes the stock of order lines, safe under concurrent checkouts
+
+The products of an order (then its variants) are read and locked in one
+SELECT ... FOR UPDATE each, in id order so two checkouts never deadlock, and
+their stock is taken with one conditional UPDATE (stock >= quantity) per
+table, which also moves stock_status like the stock endpoints do. On
+databases without row locks (SQLite) the conditional UPDATE alone keeps the
+stock from going below zero. The caller commits with the order, or rolls back
+when a line is short, then refreshes the listing projection of the products.
+"""
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import case, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.models.product import Product, StockStatus
+from app.models.product_variant import ProductVariant
+
+
+# (product_id, product_variant_id or None, quantity)
+StockLine = Tuple[int, Optional[int], int]
+
+LOW_STOCK_QUANTITY = 5  # Same thresholds as crud.product.update_product_stock
+
+
+class InsufficientStockError(ValueError):
+    """Order lines short of stock (shortfalls as returned by reserve_stock)"""
+
+    def __init__(self, shortfalls: List[Dict[str, Any]]):
+        super().__init__("; ".join(
+            f"Insufficient stock for product {item['product_id']}"
+            + (f" (variant {item['variant_id']})" if item["variant_id"] else "")
+            + f". Available: {item['available']}, Requested: {item['requested']}"
+            for item in shortfalls
+        ))
+        self.shortfalls = shortfalls
+
+
+def _read_stock(db: Session, model, ids: Iterable[int], lock: bool) -> Dict[int, int]:
+    query = select(model.id, model.stock_quantity).where(model.id.in_(list(ids))).order_by(model.id)
+    if lock:
+        query = query.with_for_update()
+    return {row_id: stock or 0 for row_id, stock in db.execute(query)}
+
+
+def _take_stock(db: Session, model, quantities: Dict[int, int]) -> Set[int]:
+    """Take the quantities from the rows that have enough, returns their ids"""
+    quantity = case(quantities, value=model.id)
+    remaining = model.stock_quantity - quantity
+
+    def status(value: StockStatus):
+        return literal(value, model.stock_status.type)
+
+    result = db.execute(
+        update(model)
+        .where(model.id.in_(list(quantities)), model.stock_quantity >= quantity)
+        .values(
+            stock_quantity=remaining,
+            stock_status=case(
+                (remaining == 0, status(StockStatus.OUT_OF_STOCK)),
+                (remaining <= LOW_STOCK_QUANTITY, status(StockStatus.LOW_STOCK)),
+                else_=status(StockStatus.IN_STOCK)
+            )
+        )
+        .returning(model.id)
+    )
+    return set(result.scalars())
+
+
+def reserve_stock(db: Session, lines: Iterable[StockLine]) -> List[Dict[str, Any]]:
+    """
+    Take the stock of (product_id, product_variant_id, quantity) order lines
+
+    The stock of a line with a variant is the variant's. Returns the shortfalls
+    ({product_id, variant_id, requested, available}, lines of the same item
+    summed): empty when all the stock was taken, to be committed by the
+    caller with the order. Otherwise the caller must roll back, as a line
+    taken meanwhile by another checkout may leave the others taken.
+    """
+    requested: Dict[Tuple[int, Optional[int]], int] = {}
+    for product_id, variant_id, quantity in lines:
+        requested[(product_id, variant_id)] = requested.get((product_id, variant_id), 0) + quantity
+
+    # Stock row of each item: the variant when there is one, else the product
+    stock_rows = {
+        key: (ProductVariant, key[1]) if key[1] else (Product, key[0])
+        for key in requested
+    }
+    quantities: Dict[Any, Dict[int, int]] = {}
+    for key, (model, row_id) in stock_rows.items():
+        quantities.setdefault(model, {})[row_id] = requested[key]
+
+    # Products then variants, each in id order: every checkout locks in the same order
+    models = [model for model in (Product, ProductVariant) if model in quantities]
+    stock = {model: _read_stock(db, model, quantities[model], lock=True) for model in models}
+
+    def available(key) -> int:
+        model, row_id = stock_rows[key]
+        return stock[model].get(row_id, 0)
+
+    short = [key for key in requested if available(key) < requested[key]]
+
+    if not short:
+        taken = {model: _take_stock(db, model, quantities[model]) for model in models}
+        short = [key for key, (model, row_id) in stock_rows.items() if row_id not in taken[model]]
+        if not short:
+            return []
+        # Taken meanwhile by another checkout (no row locks): report the stock left,
+        # untouched by this transaction for the short lines
+        stock = {model: _read_stock(db, model, quantities[model], lock=False) for model in models}
+
+    return [
+        {"product_id": key[0], "variant_id": key[1], "requested": requested[key], "available": available(key)}
+        for key in short
+    ]
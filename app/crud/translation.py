@@ -0,0 +1,303 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Machine translation pipeline
+Translation memory, the translation job queue and the job processor
+
+Products and categories are saved with their source language only and a
+TranslationJob is queued. process_translation_jobs (run by the background
+worker) claims a batch of jobs, sends each distinct missing text once per
+target language to the backend - skipping texts already in the translation
+memory - and writes the missing translations.
+"""
+import hashlib
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional
+
+from loguru import logger
+from slugify import slugify
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session, selectinload
+
+from app.core.config import settings
+from app.core.i18n import SUPPORTED_LANGS, resolve_translation
+from app.models.category import Category, CategoryTranslation
+from app.models.product import Product, ProductTranslation
+from app.models.translation import TranslationMemory, TranslationJob
+from app.crud.product_listing import refresh_product_listing
+from app.services.translation import TranslationBackend, TranslationBackendError, get_translation_backend
+
+
+PRODUCT_FIELDS = ["title", "sub_title", "simple_description", "meta_description"]
+MEMORY_CHUNK_SIZE = 500
+RUNNING_TIMEOUT = timedelta(minutes=10)  # Running jobs older than this were abandoned
+
+
+# ============= Translation Memory =============
+
+def source_hash(text: str) -> str:
+    """Translation memory key of a source text"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def translate_with_memory(
+    db: Session,
+    texts: Iterable[str],
+    source_lang: str,
+    target_lang: str,
+    backend: TranslationBackend
+) -> Dict[str, str]:
+    """
+    Translate distinct texts, using the translation memory first
+
+    Only texts never seen before reach the backend, in one batch. New results
+    are stored in the memory (flushed, not committed). Returns {text: translation}.
+    Raises TranslationBackendError if the backend fails.
+    """
+    by_hash = {source_hash(text): text for text in set(texts) if text}
+    result = {}
+
+    hashes = list(by_hash)
+    for start in range(0, len(hashes), MEMORY_CHUNK_SIZE):
+        for entry in db.query(TranslationMemory).filter(
+            TranslationMemory.source_hash.in_(hashes[start:start + MEMORY_CHUNK_SIZE]),
+            TranslationMemory.source_lang == source_lang,
+            TranslationMemory.target_lang == target_lang
+        ):
+            result[by_hash[entry.source_hash]] = entry.translated_text
+
+    missing = [text for text in by_hash.values() if text not in result]
+    if not missing:
+        return result
+
+    translated = backend.translate_batch(missing, source_lang, target_lang)
+    for text, translation in zip(missing, translated):
+        result[text] = translation
+        try:
+            # Another worker may have stored the same text meanwhile
+            with db.begin_nested():
+                db.add(TranslationMemory(
+                    source_hash=source_hash(text),
+                    source_lang=source_lang,
+                    target_lang=target_lang,
+                    source_text=text,
+                    translated_text=translation,
+                    backend=backend.name
+                ))
+        except IntegrityError:
+            pass
+
+    return result
+
+
+# ============= Job Queue =============
+
+def enqueue_translation_job(db: Session, entity_type: str, entity_id: int) -> TranslationJob:
+    """Queue machine translation of an entity (one pending job per entity); the caller commits"""
+    job = db.query(TranslationJob).filter(
+        TranslationJob.entity_type == entity_type,
+        TranslationJob.entity_id == entity_id,
+        TranslationJob.status == "pending"
+    ).first()
+    if job:
+        return job
+
+    job = TranslationJob(entity_type=entity_type, entity_id=entity_id, status="pending", attempts=0)
+    db.add(job)
+    return job
+
+
+def claim_translation_jobs(db: Session, limit: int) -> List[TranslationJob]:
+    """
+    Mark up to `limit` pending jobs as running and return them
+
+    Uses SKIP LOCKED on PostgreSQL so several workers never claim the same job.
+    Jobs left running by a crashed worker are claimed again after RUNNING_TIMEOUT.
+    """
+    now = datetime.now(timezone.utc)
+    db.query(TranslationJob).filter(
+        TranslationJob.status == "running",
+        TranslationJob.started_at < now - RUNNING_TIMEOUT
+    ).update({"status": "pending"}, synchronize_session=False)
+
+    jobs = db.query(TranslationJob).filter(
+        TranslationJob.status == "pending"
+    ).order_by(TranslationJob.id).limit(limit).with_for_update(skip_locked=True).all()
+
+    for job in jobs:
+        job.status = "running"
+        job.started_at = now
+        job.attempts = (job.attempts or 0) + 1
+    db.commit()
+
+    return jobs
+
+
+def get_translation_job_stats(db: Session) -> Dict[str, int]:
+    """Number of jobs per status"""
+    rows = db.query(TranslationJob.status, func.count(TranslationJob.id)).group_by(TranslationJob.status).all()
+    return {status: count for status, count in rows}
+
+
+# ============= Job Processing =============
+
+def _load_entities(db: Session, jobs: List[TranslationJob]):
+    """Products and categories of the jobs, with translations, keyed by id"""
+    product_ids = [job.entity_id for job in jobs if job.entity_type == "product"]
+    category_ids = [job.entity_id for job in jobs if job.entity_type == "category"]
+
+    products = {}
+    if product_ids:
+        products = {
+            p.id: p for p in db.query(Product).options(
+                selectinload(Product.translations)
+            ).filter(Product.id.in_(product_ids))
+        }
+    categories = {}
+    if category_ids:
+        categories = {
+            c.id: c for c in db.query(Category).options(
+                selectinload(Category.translations)
+            ).filter(Category.id.in_(category_ids))
+        }
+    return {"product": products, "category": categories}
+
+
+def _plan(entity, entity_type: str):
+    """(source_lang, {field: text}, missing langs) for an entity, or None if complete"""
+    if entity_type == "product":
+        source = resolve_translation(entity.translations, "it", any_fallback=True)
+        if not source:
+            return None
+        source_lang = source.lang
+        fields = {field: getattr(source, field) for field in PRODUCT_FIELDS if getattr(source, field)}
+    else:
+        source = resolve_translation(entity.translations, "it")
+        source_lang = "it"
+        fields = {"name": source.name if source else entity.name}
+
+    existing = {t.lang for t in entity.translations}
+    missing = [lang for lang in SUPPORTED_LANGS if lang not in existing and lang != source_lang]
+    if not missing:
+        return None
+    return source_lang, fields, missing
+
+
+def _add_translation(db: Session, entity, entity_type: str, lang: str, values: Dict[str, str]):
+    if entity_type == "product":
+        db.add(ProductTranslation(
+            product_id=entity.id,
+            lang=lang,
+            # Empty source titles are not translated: title is required
+            title=values.get("title") or entity.reference,
+            sub_title=values.get("sub_title"),
+            simple_description=values.get("simple_description"),
+            meta_description=values.get("meta_description")
+        ))
+    else:
+        name = values["name"]
+        # For Arabic, keep the Arabic text in slug (don't transliterate)
+        slug = name.replace(" ", "-").lower() if lang == "ar" else slugify(name)
+        db.add(CategoryTranslation(
+            category_id=entity.id,
+            lang=lang,
+            name=name,
+            slug=slug or entity.slug,
+            description=None
+        ))
+
+
+def process_translation_jobs(
+    db: Session,
+    backend: Optional[TranslationBackend] = None,
+    limit: Optional[int] = None
+) -> Dict[str, int]:
+    """
+    Claim and complete one batch of translation jobs
+
+    Texts of all claimed jobs are grouped by (source lang, target lang), so the
+    backend gets one batch per language. If the backend fails, the jobs go back
+    to the queue; after TRANSLATION_MAX_ATTEMPTS the source text is used.
+    Returns counters for the batch.
+    """
+    backend = backend or get_translation_backend()
+    jobs = claim_translation_jobs(db, limit or settings.TRANSLATION_BATCH_SIZE)
+    stats = {"jobs": len(jobs), "translations": 0, "retried": 0, "failed": 0}
+    if not jobs:
+        return stats
+
+    entities = _load_entities(db, jobs)
+    plans = {}
+    texts = defaultdict(set)  # (source_lang, target_lang) -> texts
+    for job in jobs:
+        entity = entities[job.entity_type].get(job.entity_id)
+        plan = _plan(entity, job.entity_type) if entity else None
+        if plan:
+            plans[job.id] = (entity, plan)
+            source_lang, fields, missing = plan
+            for lang in missing:
+                texts[(source_lang, lang)].update(fields.values())
+
+    translated = {}
+    failed_pairs = {}
+    for (source_lang, target_lang), pair_texts in texts.items():
+        try:
+            translated[(source_lang, target_lang)] = translate_with_memory(
+                db, pair_texts, source_lang, target_lang, backend
+            )
+        except TranslationBackendError as e:
+            failed_pairs[(source_lang, target_lang)] = str(e)
+            logger.warning(f"Translation {source_lang}->{target_lang} failed: {str(e)}")
+
+    now = datetime.now(timezone.utc)
+    product_ids = []
+    for job in jobs:
+        if job.id not in plans:
+            job.status = "done"
+            job.finished_at = now
+            continue
+
+        entity, (source_lang, fields, missing) = plans[job.id]
+        errors = [failed_pairs[(source_lang, lang)] for lang in missing if (source_lang, lang) in failed_pairs]
+        if errors and job.attempts < settings.TRANSLATION_MAX_ATTEMPTS:
+            # Retry the whole job later
+            job.status = "pending"
+            job.error = errors[0]
+            stats["retried"] += 1
+            continue
+
+        # One savepoint per job: a job that cannot be saved fails alone
+        try:
+            with db.begin_nested():
+                for lang in missing:
+                    mapping = translated.get((source_lang, lang), {})
+                    # Fallback to original text if translation failed
+                    _add_translation(db, entity, job.entity_type, lang, {
+                        field: mapping.get(text, text) for field, text in fields.items()
+                    })
+        except Exception as e:
+            logger.error(f"Translation job {job.id} failed: {str(e)}")
+            job.status = "failed"
+            job.error = str(e)
+            job.finished_at = now
+            stats["failed"] += 1
+            continue
+        stats["translations"] += len(missing)
+
+        job.status = "failed" if errors else "done"
+        job.error = errors[0] if errors else None
+        job.finished_at = now
+        stats["failed"] += 1 if errors else 0
+        if job.entity_type == "product":
+            product_ids.append(entity.id)
+
+    db.commit()
+
+    if product_ids:
+        refresh_product_listing(db, product_ids)
+
+    return stats
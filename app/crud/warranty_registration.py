@@ -2,14 +2,30 @@
 # © 2026 Muthana. All rights reserved.
 # Unauthorized copying or distribution is prohibited.
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import and_, or_
-from typing import Optional, List
-from datetime import datetime
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timedelta, timezone
 import json
 
+from app.core.config import settings
+from app.db.dialect import dialect_insert
+from app.integrations.http import run_sync
+from app.models.order import Order, OrderItem
 from app.models.warranty_registration import WarrantyRegistration
 from app.schemas.warranty_registration import WarrantyRegistrationCreate
+from app.services.warranty_registration import RETRYABLE_ERRORS, register_warranties
+
+
+RUNNING_TIMEOUT = timedelta(minutes=10)  # Running rows older than this were abandoned
+
+# Garanzia3 service error_code -> stored error_code
+ERROR_CODES = {
+    "timeout": "G3_TIMEOUT",
+    "http_error": "G3_UNAVAILABLE",
+    "connection_error": "G3_UNAVAILABLE",
+    "unknown": "SYSTEM_ERROR",
+}
 
 
 class CRUDWarrantyRegistration:
@@ -21,6 +37,7 @@ class CRUDWarrantyRegistration:
     - Updating registration status
     - Retrieving registration information
     - Listing user registrations
+    - The registration queue (enqueue, claim, register)
     """
     
     def create(
@@ -28,7 +45,8 @@ class CRUDWarrantyRegistration:
         db: Session,
         *,
         registration_in: WarrantyRegistrationCreate,
-        is_test: bool = False
+        is_test: bool = False,
+        claimed: bool = False
     ) -> WarrantyRegistration:
         """
         Create a new warranty registration record
@@ -37,10 +55,12 @@ class CRUDWarrantyRegistration:
             db: Database session
             registration_in: Warranty registration creation schema
             is_test: Whether this is a test mode registration
+            claimed: Created as running, to be registered by the caller (not the worker)
         
         Returns:
             Created WarrantyRegistration object
         """
+        now = datetime.now(timezone.utc)
         
         registration = WarrantyRegistration(
             order_id=registration_in.order_id,
@@ -52,7 +72,9 @@ class CRUDWarrantyRegistration:
             customer_phone=registration_in.customer_phone,
             product_ean13=registration_in.product_ean13,
             product_name=registration_in.product_name,
-            status='pending',
+            status='running' if claimed else 'pending',
+            attempts=1 if claimed else 0,
+            started_at=now if claimed else None,
             is_test=is_test
         )
         
@@ -268,6 +290,242 @@ class CRUDWarrantyRegistration:
             WarrantyRegistration.created_at.desc()
         ).offset(skip).limit(limit).all()
 
+    
+    # ========== Registration queue ==========
+    
+    def enqueue_for_order(self, db: Session, order: Order) -> int:
+        """
+        Queue the Garanzia3 registration of the warranties bought with an order
+        
+        Adds pending registrations without committing, so they are saved in
+        the same transaction as the payment status change. Each order item
+        warranty is queued once (idempotency key), however often the payment
+        is confirmed.
+        
+        Args:
+            db: Database session
+            order: Order object
+        
+        Returns:
+            Number of registrations queued
+        """
+        # Get customer address for contact info
+        customer_address = order.billing_address
+        if not customer_address:
+            # No address, cannot register
+            return 0
+        
+        customer_name = customer_address.get('name') or customer_address.get('first_name') or "Customer"
+        customer_lastname = customer_address.get('last_name') or "Customer"
+        # Email from customer_info (preserved at order time)
+        customer_email = (order.customer_info or {}).get('email', '')
+        customer_phone = customer_address.get('phone', '') or ''
+        
+        # Items may have been added in this transaction
+        db.flush()
+        items = db.query(OrderItem).options(joinedload(OrderItem.product)).filter(
+            OrderItem.order_id == order.id
+        ).all()
+        
+        # Registered before the queue existed (no idempotency key)
+        registered = set(db.query(WarrantyRegistration.product_id, WarrantyRegistration.warranty_id).filter(
+            WarrantyRegistration.order_id == order.id,
+            WarrantyRegistration.status == 'registered'
+        ).all())
+        
+        rows = []
+        for item in items:
+            warranty_id = item.warranty_option.get('id') if isinstance(item.warranty_option, dict) else None
+            product = item.product
+            if not warranty_id or not product or (item.product_id, warranty_id) in registered:
+                continue
+            
+            # EAN13 required by Garanzia3: order item, product, else SKU (often the same)
+            product_ean13 = (
+                getattr(item, 'product_ean13', None) or getattr(product, 'ean13', None) or item.product_sku
+            )
+            if not product_ean13 or len(product_ean13) > 13:
+                continue
+            
+            rows.append({
+                "order_id": order.id,
+                "product_id": item.product_id,
+                "warranty_id": warranty_id,
+                "customer_name": customer_name,
+                "customer_lastname": customer_lastname,
+                "customer_email": customer_email,
+                "customer_phone": customer_phone,
+                "product_ean13": product_ean13,
+                "product_name": item.product_title,
+                "idempotency_key": f"order-item-{item.id}-warranty-{warranty_id}",
+                "status": "pending",
+                "attempts": 0,
+                "is_test": False
+            })
+        
+        if not rows:
+            return 0
+        stmt = dialect_insert(db)(WarrantyRegistration.__table__).values(rows).on_conflict_do_nothing(
+            index_elements=["idempotency_key"]
+        )
+        return db.execute(stmt).rowcount or 0
+    
+    def claim_due(
+        self,
+        db: Session,
+        *,
+        limit: int,
+        ids: Optional[List[int]] = None
+    ) -> List[WarrantyRegistration]:
+        """
+        Mark up to `limit` due pending registrations as running and return them
+        
+        Uses SKIP LOCKED on PostgreSQL so several workers never claim the same
+        registration. Registrations left running by a crashed worker are
+        failed rather than retried: Garanzia3 may have created the contract.
+        
+        Args:
+            db: Database session
+            limit: Maximum number of registrations
+            ids: Only these registrations (admin retry)
+        
+        Returns:
+            Claimed WarrantyRegistration objects
+        """
+        now = datetime.now(timezone.utc)
+        abandoned = [row_id for row_id, in db.query(WarrantyRegistration.id).filter(
+            WarrantyRegistration.status == 'running',
+            WarrantyRegistration.started_at < now - RUNNING_TIMEOUT
+        )]
+        if abandoned:
+            db.query(WarrantyRegistration).filter(WarrantyRegistration.id.in_(abandoned)).update({
+                "status": "failed",
+                "error_code": "INTERRUPTED",
+                "error_message": "Registration interrupted, check Garanzia3 before retrying",
+                "failed_at": now
+            }, synchronize_session=False)
+        
+        query = db.query(WarrantyRegistration).filter(
+            WarrantyRegistration.status == 'pending',
+            or_(WarrantyRegistration.next_attempt_at.is_(None), WarrantyRegistration.next_attempt_at <= now)
+        )
+        if ids is not None:
+            query = query.filter(WarrantyRegistration.id.in_(ids))
+        rows = query.order_by(WarrantyRegistration.id).limit(limit).with_for_update(skip_locked=True).all()
+        
+        for row in rows:
+            row.status = 'running'
+            row.started_at = now
+            row.attempts = (row.attempts or 0) + 1
+        db.commit()
+        
+        return rows
+    
+    def requeue(self, db: Session, *, id: int) -> Optional[WarrantyRegistration]:
+        """
+        Put a failed or pending registration back in the queue, due now
+        
+        Args:
+            db: Database session
+            id: Registration ID
+        
+        Returns:
+            Updated WarrantyRegistration object or None
+        """
+        registration = self.get(db, id=id)
+        if not registration:
+            return None
+        
+        registration.status = 'pending'
+        registration.attempts = 0
+        registration.next_attempt_at = None
+        registration.error_message = None
+        registration.error_code = None
+        db.commit()
+        
+        return registration
+    
+    def save_results(self, db: Session, results: Dict[int, Dict[str, Any]]) -> Dict[str, int]:
+        """
+        Save Garanzia3 results ({registration id: register_warranty result})
+        
+        Connection errors and 5xx answers are retried with exponential backoff
+        until WARRANTY_REGISTRATION_MAX_ATTEMPTS; other failures are final.
+        
+        Returns:
+            Counters (registered, retried, failed)
+        """
+        now = datetime.now(timezone.utc)
+        stats = {"registered": 0, "retried": 0, "failed": 0}
+        if not results:
+            return stats
+        
+        for row in db.query(WarrantyRegistration).filter(WarrantyRegistration.id.in_(list(results))):
+            result = results[row.id]
+            if result.get('success'):
+                row.status = 'registered'
+                row.g3_transaction_id = result.get('transaction')
+                row.g3_pin = result.get('pin')
+                raw_response = result.get('raw_response')
+                row.g3_response = json.dumps(raw_response) if isinstance(raw_response, dict) else raw_response
+                row.registered_at = now
+                row.error_message = None
+                row.error_code = None
+                row.next_attempt_at = None
+                stats["registered"] += 1
+                continue
+            
+            row.error_message = result.get('error')
+            row.error_code = ERROR_CODES.get(result.get('error_code'), 'G3_API_ERROR')
+            if result.get('error_code') in RETRYABLE_ERRORS and row.attempts < settings.WARRANTY_REGISTRATION_MAX_ATTEMPTS:
+                row.status = 'pending'
+                row.next_attempt_at = now + timedelta(
+                    seconds=settings.WARRANTY_REGISTRATION_BACKOFF * 2 ** max(row.attempts - 1, 0)
+                )
+                stats["retried"] += 1
+            else:
+                row.status = 'failed'
+                row.failed_at = now
+                stats["failed"] += 1
+        
+        db.commit()
+        return stats
+    
+    async def register_now(self, db: Session, registrations: List[WarrantyRegistration]) -> Dict[str, int]:
+        """
+        Register claimed registrations with Garanzia3 and save the results
+        (manual registration and admin retry; the worker uses run_pending)
+        """
+        results = await register_warranties(self._jobs(registrations))
+        return self.save_results(db, results)
+    
+    def run_pending(self, db: Session, limit: Optional[int] = None) -> Dict[str, int]:
+        """
+        Claim and register one batch of due registrations
+        Must not run inside an event loop (use a worker thread).
+        
+        Returns:
+            Counters (claimed, registered, retried, failed)
+        """
+        rows = self.claim_due(db, limit=limit or settings.WARRANTY_REGISTRATION_BATCH_SIZE)
+        stats = {"claimed": len(rows), "registered": 0, "retried": 0, "failed": 0}
+        if rows:
+            stats.update(self.save_results(db, run_sync(register_warranties(self._jobs(rows)))))
+        return stats
+    
+    @staticmethod
+    def _jobs(registrations: List[WarrantyRegistration]) -> Dict[int, Dict[str, str]]:
+        """register_warranty arguments per registration id"""
+        return {
+            row.id: {
+                "ean13": row.product_ean13,
+                "customer_name": row.customer_name,
+                "customer_lastname": row.customer_lastname,
+                "customer_email": row.customer_email,
+                "customer_phone": row.customer_phone
+            }
+            for row in registrations
+        }
 
 # Global CRUD instance
 crud_warranty_registration = CRUDWarrantyRegistration()
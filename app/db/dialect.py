@@ -0,0 +1,18 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Dialect-specific statements
+PostgreSQL in production, SQLite in the tests
+"""
+from sqlalchemy.orm import Session
+
+
+def dialect_insert(db: Session):
+    """insert() construct with ON CONFLICT / RETURNING support for the session's database"""
+    if db.get_bind().dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert
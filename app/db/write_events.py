@@ -0,0 +1,102 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Committed write notifications
+Run callbacks after a commit that wrote some tables, for in-process caches
+
+Writes are seen both through ORM flushes and bulk INSERT / UPDATE / DELETE
+statements (ORM or Core) executed by any Session; raw text() SQL is not.
+Tables are matched by name prefix, e.g. ("categor",) for categories and
+category_translations. Work tied to one transaction is queued on its session
+with after_commit and dropped if the transaction rolls back.
+"""
+from typing import Callable, List, Optional, Set, Tuple
+
+from loguru import logger
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+
+_listeners: List[Tuple[Tuple[str, ...], Callable[[], None]]] = []
+
+
+def on_commit(table_prefixes: Tuple[str, ...], callback: Callable[[], None]):
+    """Call `callback` after every commit that wrote a table starting with one of the prefixes"""
+    _listeners.append((table_prefixes, callback))
+
+
+def after_commit(session: Session, callback: Callable[[], None]):
+    """Call `callback` once after the session's current transaction commits (never on rollback)"""
+    transaction = session.get_nested_transaction() or session.get_transaction()
+    session.info.setdefault("after_commit_calls", []).append((transaction, callback))
+
+
+def _within(transaction, ancestor) -> bool:
+    while transaction is not None:
+        if transaction is ancestor:
+            return True
+        transaction = transaction.parent
+    return False
+
+
+def _call(callback: Callable[[], None]):
+    # A failing cache never fails the write
+    try:
+        callback()
+    except Exception as e:
+        logger.warning(f"Write listener {callback.__name__} failed: {str(e)}")
+
+
+def _written(session) -> Set[str]:
+    return session.info.setdefault("written_tables", set())
+
+
+def _add_table(session, name: Optional[str]):
+    if name:
+        _written(session).add(name)
+
+
+@event.listens_for(Session, "after_flush")
+def _track_flush(session, flush_context):
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        _add_table(session, getattr(type(obj), "__tablename__", None))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _track_statement(orm_execute_state):
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        table = getattr(orm_execute_state.statement, "table", None)
+        _add_table(orm_execute_state.session, getattr(table, "name", None))
+
+
+@event.listens_for(Session, "after_commit")
+def _notify(session):
+    if session.in_nested_transaction():
+        return  # A savepoint released, not committed yet
+    for _, callback in session.info.pop("after_commit_calls", []):
+        _call(callback)
+    tables = session.info.pop("written_tables", None)
+    if not tables:
+        return
+    for prefixes, callback in _listeners:
+        if any(name.startswith(prefixes) for name in tables):
+            _call(callback)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget(session):
+    session.info.pop("written_tables", None)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _drop_calls(session, previous_transaction):
+    # A savepoint rollback only drops the work queued inside it
+    if previous_transaction.parent is None:
+        session.info.pop("after_commit_calls", None)
+    elif "after_commit_calls" in session.info:
+        session.info["after_commit_calls"] = [
+            (transaction, callback) for transaction, callback in session.info["after_commit_calls"]
+            if not _within(transaction, previous_transaction)
+        ]
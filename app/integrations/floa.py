@@ -2,64 +2,46 @@
 # © 2026 Muthana. All rights reserved.
 # Unauthorized copying or distribution is prohibited.
 
-import requests
-from typing import Dict, Any, Optional
+import json
+from typing import Dict, Any, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime
 from app.core.config import settings
+from app.integrations.http import IntegrationError, OAuthIntegration
 
 
-class FloaService:
+class FloaService(OAuthIntegration):
     """Floa Payment Integration Service"""
     
+    provider = "floa"
+    
     def __init__(self):
+        super().__init__()
         self.base_url = settings.FLOA_BASE_URL
         self.client_id = settings.FLOA_CLIENT_ID
         self.client_secret = settings.FLOA_CLIENT_SECRET
         self.product_code = settings.FLOA_PRODUCT_CODE
         self.culture = settings.FLOA_CULTURE
-        self._access_token = None
-        self._token_expires_at = None
     
-    def get_access_token(self) -> str:
+    async def _fetch_token(self) -> Tuple[str, int]:
         """
         Get OAuth access token using client_credentials grant
-        Token is cached and reused until it expires
+        (cached by get_access_token until it expires)
         
         Returns:
-            str: Bearer access token
+            tuple: (Bearer access token, lifetime in seconds)
         """
-        # Check if we have a valid cached token
-        if self._access_token and self._token_expires_at:
-            if datetime.now().timestamp() < self._token_expires_at:
-                return self._access_token
-        
-        # Request new token
-        url = f"{self.base_url}/oauth/token"
-        
-        data = {
-            "grant_type": "client_credentials"
-        }
-        
-        response = requests.post(
-            url,
-            data=data,
-            auth=(self.client_id, self.client_secret),
-            headers={"Content-Type": "application/x-www-form-urlencoded"}
+        response = await self.http.request(
+            "POST", "token", f"{self.base_url}/oauth/token",
+            retry=True,
+            data={"grant_type": "client_credentials"},
+            auth=(self.client_id or "", self.client_secret or "")
         )
-        
-        response.raise_for_status()
-        token_data = response.json()
-        
-        # Cache the token
-        self._access_token = token_data["access_token"]
+        token_data = self.http.read_json(response, "token")
         # expires_in is in seconds (usually 3600 = 1 hour)
-        expires_in = token_data.get("expires_in", 3600)
-        self._token_expires_at = datetime.now().timestamp() + expires_in - 60  # 60s buffer
-        
-        return self._access_token
+        return token_data["access_token"], token_data.get("expires_in", 3600)
     
-    def create_deal(
+    async def create_deal(
         self,
         merchant_reference: str,
         amount: Decimal,
@@ -88,7 +70,6 @@ class FloaService:
         Returns:
             dict: Deal data with dealReference and links
         """
-        token = self.get_access_token()
         product_code = product_code or self.product_code
         
         url = f"{self.base_url}/api/v1/deals"
@@ -116,26 +97,20 @@ class FloaService:
                 "notificationUrl": notification_url
             }
         
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
-        
         params = {"productCode": product_code}
         
-        try:
-            response = requests.post(url, json=body, headers=headers, params=params)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.HTTPError as e:
-            # Log the error response for debugging
-            import json
-            error_detail = e.response.text if hasattr(e.response, 'text') else str(e)
-            # Also log the request body for debugging
+        response = await self.authorized_request("POST", "deals.create", url, json=body, params=params)
+        if response.status_code >= 400:
+            # Include the request body for debugging
             request_body = json.dumps(body, indent=2, ensure_ascii=False)
-            raise Exception(f"Floa create_deal failed: {e.response.status_code} - {error_detail}\nRequest Body: {request_body}")
+            raise IntegrationError(
+                self.provider,
+                f"create_deal failed: {response.status_code} - {response.text}\nRequest Body: {request_body}",
+                response.status_code, response.text
+            )
+        return response.json()
     
-    def finalize_deal(
+    async def finalize_deal(
         self,
         deal_reference: str,
         merchant_reference: str,
@@ -158,8 +133,6 @@ class FloaService:
         Returns:
             dict: Contains redirect-payment-journey URL
         """
-        token = self.get_access_token()
-        
         url = f"{self.base_url}/api/v1/deals/{deal_reference}/finalize"
         
         # Convert amount to cents
@@ -177,17 +150,10 @@ class FloaService:
             }
         }
         
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
-        
-        response = requests.post(url, json=body, headers=headers)
-        response.raise_for_status()
-        
-        return response.json()
+        response = await self.authorized_request("POST", "deals.finalize", url, json=body)
+        return self.http.read_json(response, "deals.finalize")
     
-    def get_deal_status(self, deal_reference: str) -> Dict[str, Any]:
+    async def get_deal_status(self, deal_reference: str) -> Dict[str, Any]:
         """
         Get deal installment plan and status
         
@@ -197,20 +163,12 @@ class FloaService:
         Returns:
             dict: Installment plan with status
         """
-        token = self.get_access_token()
-        
         url = f"{self.base_url}/api/v1/deals/{deal_reference}/installment-plan"
         
-        headers = {
-            "Authorization": f"Bearer {token}"
-        }
-        
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        
-        return response.json()
+        response = await self.authorized_request("GET", "deals.installment_plan", url)
+        return self.http.read_json(response, "deals.installment_plan")
     
-    def create_payment(
+    async def create_payment(
         self,
         amount: Decimal,
         order_id: int,
@@ -337,7 +295,7 @@ class FloaService:
         }
         
         # Step 1: Create deal
-        deal_response = self.create_deal(
+        deal_response = await self.create_deal(
             merchant_reference=merchant_reference,
             amount=amount,
             customer_data=customer_data,
@@ -352,7 +310,7 @@ class FloaService:
         deal_reference = deal_response["dealReference"]
         
         # Step 2: Finalize deal
-        finalize_response = self.finalize_deal(
+        finalize_response = await self.finalize_deal(
             deal_reference=deal_reference,
             merchant_reference=merchant_reference,
             amount=amount,
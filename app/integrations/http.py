@@ -0,0 +1,281 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Integration HTTP layer
+Pooled async HTTP clients shared by the payment and warranty integrations
+
+Every provider has one long-lived httpx.AsyncClient per event loop (the API
+loop, or the loop of a worker thread) with a keep-alive pool, HTTP/2
+(INTEGRATION_HTTP2) and explicit connect / read timeouts. Idempotent
+requests are retried on timeouts, connection errors, 429 and 5xx with
+exponential backoff and full jitter. OAuth tokens are refreshed by one
+request while the others wait for it. Every request is timed into a latency
+histogram per provider endpoint (latency_histograms()).
+"""
+import asyncio
+import importlib.util
+import random
+import threading
+import time
+import weakref
+from bisect import bisect_left
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+
+
+# h2 comes with httpx[http2]; without it (old environments) requests use HTTP/1.1
+HTTP2 = importlib.util.find_spec("h2") is not None
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class IntegrationError(Exception):
+    """Failed request to an integration (status_code is None when there was no answer)"""
+
+    def __init__(
+        self,
+        provider: str,
+        message: str,
+        status_code: Optional[int] = None,
+        body: str = "",
+        timeout: bool = False
+    ):
+        super().__init__(f"{provider} {message}")
+        self.provider = provider
+        self.status_code = status_code
+        self.body = body
+        self.timeout = timeout
+
+
+class LatencyHistogram:
+    """Request durations in cumulative buckets (seconds), like a Prometheus histogram"""
+
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    def __init__(self):
+        self._counts = [0] * (len(self.BUCKETS) + 1)
+        self._sum = 0.0
+        self._errors = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, error: bool = False):
+        with self._lock:
+            self._counts[bisect_left(self.BUCKETS, seconds)] += 1
+            self._sum += seconds
+            self._errors += error
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            counts, total, errors = list(self._counts), self._sum, self._errors
+        count = sum(counts)
+        buckets, cumulative = {}, 0
+        for bound, n in zip((*self.BUCKETS, "+Inf"), counts):
+            cumulative += n
+            buckets[str(bound)] = cumulative
+        return {
+            "count": count,
+            "errors": errors,
+            "avg_ms": round(total / count * 1000, 1) if count else None,
+            "buckets": buckets
+        }
+
+
+_histograms: Dict[Tuple[str, str], LatencyHistogram] = {}
+_histograms_lock = threading.Lock()
+
+
+def histogram(provider: str, endpoint: str) -> LatencyHistogram:
+    key = (provider, endpoint)
+    if key not in _histograms:
+        with _histograms_lock:
+            _histograms.setdefault(key, LatencyHistogram())
+    return _histograms[key]
+
+
+def latency_histograms() -> Dict[str, Dict[str, Dict[str, Any]]]:
+    """{provider: {endpoint: histogram snapshot}}"""
+    result: Dict[str, Dict[str, Dict[str, Any]]] = {}
+    for (provider, endpoint), item in sorted(_histograms.items()):
+        result.setdefault(provider, {})[endpoint] = item.snapshot()
+    return result
+
+
+class IntegrationClient:
+    """Pooled HTTP client of one provider"""
+
+    def __init__(self, provider: str, read_timeout: Optional[float] = None):
+        self.provider = provider
+        self.read_timeout = read_timeout
+        # httpx clients belong to the loop they were first used in
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+            weakref.WeakKeyDictionary()
+        )
+        _integration_clients.append(self)
+
+    def client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                http2=HTTP2 and settings.INTEGRATION_HTTP2,
+                timeout=httpx.Timeout(
+                    self.read_timeout or settings.INTEGRATION_HTTP_READ_TIMEOUT,
+                    connect=settings.INTEGRATION_HTTP_CONNECT_TIMEOUT
+                ),
+                limits=httpx.Limits(
+                    max_connections=settings.INTEGRATION_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections=settings.INTEGRATION_HTTP_KEEPALIVE_CONNECTIONS,
+                    keepalive_expiry=settings.INTEGRATION_HTTP_KEEPALIVE_EXPIRY
+                )
+            )
+            self._clients[loop] = client
+        return client
+
+    async def aclose(self):
+        """Close the client of the running loop"""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    async def request(
+        self,
+        method: str,
+        endpoint: str,
+        url: str,
+        retry: Optional[bool] = None,
+        **kwargs
+    ) -> httpx.Response:
+        """
+        Send a request, timed under `endpoint`
+
+        `retry` defaults to True for idempotent methods; retried answers
+        (429, 5xx) still failing at the end raise IntegrationError, others are
+        returned as they are.
+        """
+        if retry is None:
+            retry = method.upper() in IDEMPOTENT_METHODS
+        attempts = settings.INTEGRATION_HTTP_RETRIES + 1 if retry else 1
+        timer = histogram(self.provider, endpoint)
+
+        for attempt in range(attempts):
+            started = time.perf_counter()
+            try:
+                response = await self.client().request(method, url, **kwargs)
+            except httpx.TransportError as e:
+                timer.observe(time.perf_counter() - started, error=True)
+                error = IntegrationError(
+                    self.provider, f"{endpoint} failed: {str(e) or e.__class__.__name__}",
+                    timeout=isinstance(e, httpx.TimeoutException)
+                )
+            else:
+                timer.observe(time.perf_counter() - started, error=response.status_code >= 400)
+                if response.status_code not in RETRY_STATUSES:
+                    return response
+                error = IntegrationError(
+                    self.provider, f"{endpoint} failed: HTTP {response.status_code}",
+                    response.status_code, response.text
+                )
+            if attempt + 1 < attempts:
+                await asyncio.sleep(random.uniform(0, settings.INTEGRATION_HTTP_BACKOFF * 2 ** attempt))
+        raise error
+
+    def read_json(self, response: httpx.Response, endpoint: str) -> Any:
+        """Body of a successful answer, IntegrationError otherwise"""
+        if response.status_code >= 400:
+            raise IntegrationError(
+                self.provider, f"{endpoint} failed: HTTP {response.status_code} - {response.text[:500]}",
+                response.status_code, response.text
+            )
+        return response.json()
+
+
+_integration_clients: List[IntegrationClient] = []
+
+
+async def close_clients():
+    """Close the clients of the running loop (shutdown, end of a worker run)"""
+    for client in _integration_clients:
+        await client.aclose()
+
+
+def run_sync(coro: Awaitable[Any]) -> Any:
+    """Run `coro` in a new event loop from a worker thread, closing the clients it opened"""
+    async def main():
+        try:
+            return await coro
+        finally:
+            await close_clients()
+
+    return asyncio.run(main())
+
+
+class TokenCache:
+    """
+    OAuth token of a provider, shared by all its requests
+
+    When it is missing or expired, one request fetches it and the
+    concurrent ones wait for that token instead of fetching their own.
+    """
+
+    def __init__(self):
+        self._token: Optional[str] = None
+        self._expires_at = 0.0
+        self._locks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _valid(self) -> bool:
+        return bool(self._token) and time.monotonic() < self._expires_at
+
+    async def get(self, fetch: Callable[[], Awaitable[Tuple[str, int]]]) -> str:
+        """Current token; `fetch` returns (token, expires_in seconds)"""
+        if self._valid():
+            return self._token
+        loop = asyncio.get_running_loop()
+        lock = self._locks.get(loop)
+        if lock is None:
+            lock = self._locks[loop] = asyncio.Lock()
+        async with lock:
+            if not self._valid():
+                token, expires_in = await fetch()
+                # Refreshed a minute early
+                self._token, self._expires_at = token, time.monotonic() + max(expires_in - 60, 0)
+        return self._token
+
+    def invalidate(self, token: str):
+        """Drop `token` (rejected by the provider) unless it was already replaced"""
+        if self._token == token:
+            self._token = None
+
+
+class OAuthIntegration:
+    """Integration authenticating with client_credentials Bearer tokens"""
+
+    provider = ""
+
+    def __init__(self):
+        self.http = IntegrationClient(self.provider)
+        self.tokens = TokenCache()
+
+    async def _fetch_token(self) -> Tuple[str, int]:
+        raise NotImplementedError
+
+    async def get_access_token(self) -> str:
+        return await self.tokens.get(self._fetch_token)
+
+    async def authorized_request(self, method: str, endpoint: str, url: str, **kwargs) -> httpx.Response:
+        """Request with the Bearer token, fetched again once if the provider rejects it"""
+        headers = kwargs.pop("headers", {})
+        for attempt in range(2):
+            token = await self.get_access_token()
+            response = await self.http.request(
+                method, endpoint, url, headers={**headers, "Authorization": f"Bearer {token}"}, **kwargs
+            )
+            if response.status_code != 401 or attempt:
+                return response
+            self.tokens.invalidate(token)
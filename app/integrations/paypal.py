@@ -2,69 +2,45 @@
 # © 2026 Muthana. All rights reserved.
 # Unauthorized copying or distribution is prohibited.
 
-import requests
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from decimal import Decimal
 from datetime import datetime
 from app.core.config import settings
-import base64
+from app.integrations.http import OAuthIntegration
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-class PayPalService:
+class PayPalService(OAuthIntegration):
     """PayPal Payment Integration Service"""
     
+    provider = "paypal"
+    
     def __init__(self):
+        super().__init__()
         self.base_url = settings.PAYPAL_BASE_URL
         self.client_id = settings.PAYPAL_CLIENT_ID
         self.client_secret = settings.PAYPAL_CLIENT_SECRET
-        self._access_token = None
-        self._token_expires_at = None
     
-    def get_access_token(self) -> str:
+    async def _fetch_token(self) -> Tuple[str, int]:
         """
         Get OAuth access token using client_credentials grant
-        Token is cached and reused until it expires
+        (cached by get_access_token until it expires)
         
         Returns:
-            str: Bearer access token
+            tuple: (Bearer access token, lifetime in seconds)
         """
-        # Check if we have a valid cached token
-        if self._access_token and self._token_expires_at:
-            if datetime.now().timestamp() < self._token_expires_at:
-                return self._access_token
-        
-        # Create base64 encoded credentials
-        credentials = f"{self.client_id}:{self.client_secret}"
-        encoded_credentials = base64.b64encode(credentials.encode()).decode()
-        
-        # Request new token
-        url = f"{self.base_url}/v1/oauth2/token"
-        
-        headers = {
-            "Authorization": f"Basic {encoded_credentials}",
-            "Content-Type": "application/x-www-form-urlencoded"
-        }
-        
-        data = {
-            "grant_type": "client_credentials"
-        }
-        
-        response = requests.post(url, headers=headers, data=data)
-        response.raise_for_status()
-        
-        token_data = response.json()
-        self._access_token = token_data['access_token']
-        
-        # Calculate expiration time (subtract 60 seconds for safety)
-        expires_in = token_data.get('expires_in', 3600)
-        self._token_expires_at = datetime.now().timestamp() + expires_in - 60
-        
-        return self._access_token
+        response = await self.http.request(
+            "POST", "token", f"{self.base_url}/v1/oauth2/token",
+            retry=True,
+            data={"grant_type": "client_credentials"},
+            auth=(self.client_id or "", self.client_secret or "")
+        )
+        token_data = self.http.read_json(response, "token")
+        return token_data['access_token'], token_data.get('expires_in', 3600)
     
-    def create_order(
+    async def create_order(
         self,
         amount: Decimal,
         currency: str = "EUR",
@@ -85,16 +61,15 @@ class PayPalService:
         Returns:
             dict: Order data with id and approval URL
         """
-        token = self.get_access_token()
-        
         url = f"{self.base_url}/v2/checkout/orders"
+        reference_id = reference_id or f"ORDER_{int(datetime.now().timestamp())}"
         
         # Build request body
         body = {
             "intent": "CAPTURE",
             "purchase_units": [
                 {
-                    "reference_id": reference_id or f"ORDER_{int(datetime.now().timestamp())}",
+                    "reference_id": reference_id,
                     "amount": {
                         "currency_code": currency,
                         "value": f"{float(amount):.2f}"
@@ -116,37 +91,34 @@ class PayPalService:
             }
         }
         
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
-        
+        # PayPal-Request-Id makes the call idempotent, so it can be retried
+        response = await self.authorized_request(
+            "POST", "orders.create", url,
+            retry=True,
+            json=body,
+            headers={"PayPal-Request-Id": reference_id}
+        )
         try:
-            response = requests.post(url, json=body, headers=headers)
-            response.raise_for_status()
-            
-            order_data = response.json()
-            
-            # Extract approval URL
-            approval_url = None
-            for link in order_data.get('links', []):
-                if link.get('rel') == 'payer-action':
-                    approval_url = link.get('href')
-                    break
-            
-            return {
-                'order_id': order_data['id'],
-                'status': order_data['status'],
-                'approval_url': approval_url,
-                'full_response': order_data
-            }
-            
-        except requests.exceptions.HTTPError as e:
-            error_detail = e.response.text if hasattr(e.response, 'text') else str(e)
-            logger.error(f"PayPal create_order failed: {e.response.status_code} - {error_detail}")
-            raise Exception(f"PayPal create_order failed: {error_detail}")
+            order_data = self.http.read_json(response, "orders.create")
+        except Exception as e:
+            logger.error(f"PayPal create_order failed: {str(e)}")
+            raise
+        
+        # Extract approval URL
+        approval_url = None
+        for link in order_data.get('links', []):
+            if link.get('rel') == 'payer-action':
+                approval_url = link.get('href')
+                break
+        
+        return {
+            'order_id': order_data['id'],
+            'status': order_data['status'],
+            'approval_url': approval_url,
+            'full_response': order_data
+        }
     
-    def capture_order(self, order_id: str) -> Dict[str, Any]:
+    async def capture_order(self, order_id: str) -> Dict[str, Any]:
         """
         Capture payment for an approved order
         
@@ -156,33 +128,27 @@ class PayPalService:
         Returns:
             dict: Capture result with status
         """
-        token = self.get_access_token()
-        
         url = f"{self.base_url}/v2/checkout/orders/{order_id}/capture"
         
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
-        
+        response = await self.authorized_request(
+            "POST", "orders.capture", url,
+            retry=True,
+            json={},
+            headers={"PayPal-Request-Id": f"capture-{order_id}"}
+        )
         try:
-            response = requests.post(url, headers=headers)
-            response.raise_for_status()
-            
-            capture_data = response.json()
-            
-            return {
-                'order_id': capture_data['id'],
-                'status': capture_data['status'],
-                'full_response': capture_data
-            }
-            
-        except requests.exceptions.HTTPError as e:
-            error_detail = e.response.text if hasattr(e.response, 'text') else str(e)
-            logger.error(f"PayPal capture_order failed: {e.response.status_code} - {error_detail}")
-            raise Exception(f"PayPal capture_order failed: {error_detail}")
+            capture_data = self.http.read_json(response, "orders.capture")
+        except Exception as e:
+            logger.error(f"PayPal capture_order failed: {str(e)}")
+            raise
+        
+        return {
+            'order_id': capture_data['id'],
+            'status': capture_data['status'],
+            'full_response': capture_data
+        }
     
-    def get_order_details(self, order_id: str) -> Dict[str, Any]:
+    async def get_order_details(self, order_id: str) -> Dict[str, Any]:
         """
         Get order details
         
@@ -192,27 +158,16 @@ class PayPalService:
         Returns:
             dict: Order details
         """
-        token = self.get_access_token()
-        
         url = f"{self.base_url}/v2/checkout/orders/{order_id}"
         
-        headers = {
-            "Authorization": f"Bearer {token}",
-            "Content-Type": "application/json"
-        }
-        
+        response = await self.authorized_request("GET", "orders.get", url)
         try:
-            response = requests.get(url, headers=headers)
-            response.raise_for_status()
-            
-            return response.json()
-            
-        except requests.exceptions.HTTPError as e:
-            error_detail = e.response.text if hasattr(e.response, 'text') else str(e)
-            logger.error(f"PayPal get_order_details failed: {e.response.status_code} - {error_detail}")
-            raise Exception(f"PayPal get_order_details failed: {error_detail}")
+            return self.http.read_json(response, "orders.get")
+        except Exception as e:
+            logger.error(f"PayPal get_order_details failed: {str(e)}")
+            raise
     
-    def create_payment(
+    async def create_payment(
         self,
         amount: Decimal,
         order_id: int,
@@ -244,7 +199,7 @@ class PayPalService:
         cancel_url = cancel_url or f"{settings.FRONTEND_URL}/payment/cancel"
         
         # Create PayPal order
-        order_result = self.create_order(
+        order_result = await self.create_order(
             amount=amount,
             currency="EUR",
             return_url=return_url,
@@ -7,12 +7,13 @@ PayPlug Payment Gateway Integration
 
 This module handles payment processing with PayPlug.
 Supports creating payments and processing webhooks.
+Calls the PayPlug REST API through the pooled integration client.
 """
 
-import payplug
 from typing import Dict, Any, Optional
 from decimal import Decimal
 from app.core.config import settings
+from app.integrations.http import IntegrationClient
 from loguru import logger
 
 
@@ -21,13 +22,23 @@ class PayPlugService:
     
     def __init__(self):
         """Initialize PayPlug with API key"""
+        self.base_url = settings.PAYPLUG_BASE_URL
+        self.http = IntegrationClient("payplug")
         if settings.PAYPLUG_API_KEY:
-            payplug.set_secret_key(settings.PAYPLUG_API_KEY)
             logger.info(f"PayPlug initialized in {settings.PAYPLUG_MODE} mode")
         else:
             logger.warning("PayPlug API key not configured")
     
-    def create_payment(
+    async def _call(self, method: str, endpoint: str, path: str, **kwargs) -> Dict[str, Any]:
+        """PayPlug API call, the answer as a dict"""
+        response = await self.http.request(
+            method, endpoint, f"{self.base_url}/v1{path}",
+            headers={"Authorization": f"Bearer {settings.PAYPLUG_API_KEY}"},
+            **kwargs
+        )
+        return self.http.read_json(response, endpoint)
+    
+    async def create_payment(
         self,
         amount: Decimal,
         order_id: int,
@@ -87,30 +98,31 @@ class PayPlugService:
                 payment_data['notification_url'] = settings.PAYPLUG_WEBHOOK_URL
             
             # Create payment
-            payment = payplug.Payment.create(**payment_data)
+            payment = await self._call("POST", "payments.create", "/payments", json=payment_data)
+            hosted_payment = payment.get('hosted_payment') or {}
             
             logger.info(
                 f"PayPlug payment created successfully. "
-                f"Payment ID: {payment.id}, Order ID: {order_id}, Amount: {amount} EUR"
+                f"Payment ID: {payment['id']}, Order ID: {order_id}, Amount: {amount} EUR"
             )
             
             # Return payment details
             return {
-                'payment_id': payment.id,
-                'payment_url': payment.hosted_payment.payment_url,
-                'return_url': payment.hosted_payment.return_url,
-                'cancel_url': payment.hosted_payment.cancel_url,
+                'payment_id': payment['id'],
+                'payment_url': hosted_payment.get('payment_url'),
+                'return_url': hosted_payment.get('return_url'),
+                'cancel_url': hosted_payment.get('cancel_url'),
                 'amount': amount,
                 'currency': 'EUR',
-                'is_paid': payment.is_paid,
-                'created_at': payment.created_at
+                'is_paid': payment.get('is_paid', False),
+                'created_at': payment.get('created_at')
             }
             
         except Exception as e:
             logger.error(f"Failed to create PayPlug payment for order {order_id}: {str(e)}")
             raise Exception(f"Payment creation failed: {str(e)}")
     
-    def retrieve_payment(self, payment_id: str):
+    async def retrieve_payment(self, payment_id: str) -> Dict[str, Any]:
         """
         Retrieve payment details from PayPlug
         
@@ -118,20 +130,19 @@ class PayPlugService:
             payment_id: PayPlug payment ID
         
         Returns:
-            PayPlug Payment object
+            PayPlug payment resource (dict)
         
         Raises:
             Exception: If retrieval fails
         """
         try:
-            payment = payplug.Payment.retrieve(payment_id)
-            return payment
+            return await self._call("GET", "payments.get", f"/payments/{payment_id}")
             
         except Exception as e:
             logger.error(f"Failed to retrieve PayPlug payment {payment_id}: {str(e)}")
             raise Exception(f"Payment retrieval failed: {str(e)}")
     
-    def process_webhook(self, resource_id: str) -> Dict[str, Any]:
+    async def process_webhook(self, resource_id: str) -> Dict[str, Any]:
         """
         Process PayPlug webhook notification
         
@@ -146,39 +157,40 @@ class PayPlugService:
         """
         try:
             # Retrieve payment details
-            payment = payplug.Payment.retrieve(resource_id)
+            payment = await self._call("GET", "payments.get", f"/payments/{resource_id}")
+            failure = payment.get('failure')
             
             # Extract order ID from metadata
-            order_id = payment.metadata.get('order_id')
+            order_id = (payment.get('metadata') or {}).get('order_id')
             
             # Determine payment status
-            if payment.is_paid:
+            if payment.get('is_paid'):
                 status = 'completed'
-            elif payment.failure:
+            elif failure:
                 status = 'failed'
             else:
                 status = 'pending'
             
             logger.info(
                 f"PayPlug webhook processed. "
-                f"Payment ID: {payment.id}, Order ID: {order_id}, Status: {status}"
+                f"Payment ID: {payment['id']}, Order ID: {order_id}, Status: {status}"
             )
             
             return {
-                'payment_id': payment.id,
+                'payment_id': payment['id'],
                 'order_id': order_id,
                 'status': status,
-                'is_paid': payment.is_paid,
-                'amount': payment.amount / 100,  # Convert cents to EUR
-                'failure_code': payment.failure.code if payment.failure else None,
-                'failure_message': payment.failure.message if payment.failure else None,
+                'is_paid': payment.get('is_paid', False),
+                'amount': payment['amount'] / 100,  # Convert cents to EUR
+                'failure_code': failure.get('code') if failure else None,
+                'failure_message': failure.get('message') if failure else None,
             }
             
         except Exception as e:
             logger.error(f"Failed to process PayPlug webhook for payment {resource_id}: {str(e)}")
             raise Exception(f"Webhook processing failed: {str(e)}")
     
-    def refund_payment(
+    async def refund_payment(
         self,
         payment_id: str,
         amount: Optional[Decimal] = None,
@@ -210,21 +222,22 @@ class PayPlugService:
                 refund_data['metadata'] = metadata
             
             # Create refund
-            payment = payplug.Payment.retrieve(payment_id)
-            refund = payplug.Refund.create(payment_id, **refund_data)
+            refund = await self._call(
+                "POST", "refunds.create", f"/payments/{payment_id}/refunds", json=refund_data
+            )
             
             logger.info(
                 f"PayPlug refund created. "
-                f"Refund ID: {refund.id}, Payment ID: {payment_id}"
+                f"Refund ID: {refund['id']}, Payment ID: {payment_id}"
             )
             
             return {
-                'refund_id': refund.id,
+                'refund_id': refund['id'],
                 'payment_id': payment_id,
-                'amount': refund.amount / 100,  # Convert cents to EUR
-                'currency': refund.currency,
-                'metadata': refund.metadata,
-                'created_at': refund.created_at
+                'amount': refund['amount'] / 100,  # Convert cents to EUR
+                'currency': refund.get('currency'),
+                'metadata': refund.get('metadata'),
+                'created_at': refund.get('created_at')
             }
             
         except Exception as e:
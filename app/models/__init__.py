@@ -24,6 +24,10 @@ from app.models.product import (
 from app.models.product_variant import (
     ProductVariant, ProductVariantImage, ProductVariantImageAlt
 )
+from app.models.product_listing import ProductListing
+from app.models.translation import TranslationMemory, TranslationJob
+from app.models.import_job import ImportJob, ImportJobChunk, ImportRowFingerprint
+from app.models.image_ingestion import ImageIngestion
 
 __all__ = [
     "User",
@@ -42,5 +46,9 @@ __all__ = [
     "ProductAttribute", "ProductAttributeTranslation",
     "ProductVariantAttribute", "ProductVariantAttributeTranslation",
     "ProductDiscount", "ProductType", "ProductCondition", "StockStatus",
-    "ProductVariant", "ProductVariantImage", "ProductVariantImageAlt"
+    "ProductVariant", "ProductVariantImage", "ProductVariantImageAlt",
+    "ProductListing",
+    "TranslationMemory", "TranslationJob",
+    "ImportJob", "ImportJobChunk", "ImportRowFingerprint",
+    "ImageIngestion"
 ]
\ No newline at end of file
@@ -0,0 +1,34 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class ImageIngestion(Base):
+    """
+    Copy of one supplier image URL to Cloudinary
+
+    One row per distinct source URL found in product_images. When done,
+    product images with that URL point to cdn_url. Rows with the same
+    content_hash share one upload.
+    """
+    __tablename__ = "image_ingestions"
+    __table_args__ = (
+        Index("ix_image_ingestions_status_id", "status", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_url = Column(String(500), unique=True, nullable=False)
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    content_hash = Column(String(64), nullable=True, index=True)  # sha256 of the downloaded bytes
+    cdn_url = Column(String(500), nullable=True)
+    public_id = Column(String(255), nullable=True)
+    bytes = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
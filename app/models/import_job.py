@@ -0,0 +1,90 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Text, JSON, ForeignKey, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class ImportJob(Base):
+    """
+    Background product import (or enrichment) of one Excel file
+
+    The import worker streams the file in chunks of `chunk_size` rows. After each
+    chunk, chunks_done and the running totals are committed, so a job left
+    running by a crashed process resumes at the next chunk.
+    """
+    __tablename__ = "import_jobs"
+    __table_args__ = (
+        Index("ix_import_jobs_status_id", "status", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    kind = Column(String(20), nullable=False, default="import")  # import, enrich, multi
+    source = Column(String(50), nullable=True)  # effezzeta, erregame, ..., commerce_clarity, multi
+    filename = Column(String(255), nullable=True)  # Original file name
+    file_path = Column(String(500), nullable=True)  # NULL for multi-source jobs
+    sources = Column(JSON, nullable=True)  # Multi-source: [{"source", "file_path"}] in priority order
+    delete_file = Column(Boolean, default=False)  # Uploaded copy, removed when the job ends
+    dry_run = Column(Boolean, default=False)
+    verbose_errors = Column(Boolean, default=False)
+    chunk_size = Column(Integer, nullable=False)
+
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    chunks_done = Column(Integer, nullable=False, default=0)
+    rows_read = Column(Integer, nullable=False, default=0)
+    totals = Column(JSON, nullable=True)  # Running totals after chunks_done chunks
+    report = Column(JSON, nullable=True)  # ImportReport / EnrichmentReport when done
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)  # Last committed chunk
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    chunks = relationship(
+        "ImportJobChunk", back_populates="job", cascade="all, delete-orphan", order_by="ImportJobChunk.chunk_index"
+    )
+
+
+class ImportJobChunk(Base):
+    """Statistics of one committed chunk of an import job"""
+    __tablename__ = "import_job_chunks"
+    __table_args__ = (
+        UniqueConstraint("job_id", "chunk_index", name="uq_import_job_chunks_job_chunk"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    job_id = Column(Integer, ForeignKey("import_jobs.id", ondelete="CASCADE"), nullable=False)
+    chunk_index = Column(Integer, nullable=False)
+    rows = Column(Integer, nullable=False, default=0)
+    created = Column(Integer, nullable=False, default=0)
+    updated = Column(Integer, nullable=False, default=0)  # Matched rows for enrichment
+    skipped = Column(Integer, nullable=False, default=0)
+    errors = Column(Integer, nullable=False, default=0)
+    duration_ms = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    job = relationship("ImportJob", back_populates="chunks")
+
+
+class ImportRowFingerprint(Base):
+    """
+    Content hash of the last imported mapped row per (source, EAN)
+
+    A re-imported row with the same hash is skipped without writing the product.
+    """
+    __tablename__ = "import_row_fingerprints"
+    __table_args__ = (
+        UniqueConstraint("source", "ean", name="uq_import_row_fingerprints_source_ean"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    source = Column(String(50), nullable=False)
+    ean = Column(String(13), nullable=False)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False, index=True)
+    row_hash = Column(String(32), nullable=False)  # blake2b-128 hex of the mapped row
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
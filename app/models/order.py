@@ -3,7 +3,7 @@
 # Unauthorized copying or distribution is prohibited.
 
 from sqlalchemy import Column, String, Integer, ForeignKey, Numeric, DateTime, Text, JSON
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
 from app.models.base import BaseModel
 
@@ -91,7 +91,7 @@ class Order(BaseModel):
     payment_method = Column(String(50), nullable=True)
     
     # Payment transaction ID from payment gateway
-    payment_transaction_id = Column(String(255), nullable=True)
+    payment_transaction_id = Column(String(255), nullable=True, index=True)
     
     # Payment info (new - comprehensive payment details)
     # {
@@ -102,6 +102,12 @@ class Order(BaseModel):
     # }
     payment_info = Column(JSON, nullable=True)
     
+    # payment_info["payment_id"] as text, indexed for webhook lookups (set from payment_info)
+    provider_payment_ref = Column(String(255), nullable=True, index=True)
+    
+    # Last check of a pending payment with the gateway (payment reconciliation)
+    payment_checked_at = Column(DateTime(timezone=True), nullable=True)
+    
     # ========== Shipping Information ==========
     # Shipping method: shippy_pro, poste_italiane, express, standard
     shipping_method = Column(String(100), nullable=True)
@@ -145,6 +151,13 @@ class Order(BaseModel):
     # Relationship to order items
     items = relationship("OrderItem", back_populates="order", cascade="all, delete-orphan")
     
+    @validates("payment_info")
+    def _set_provider_payment_ref(self, key, payment_info):
+        """Keep provider_payment_ref in step with payment_info (assigned, not mutated in place)"""
+        payment_id = payment_info.get("payment_id") if isinstance(payment_info, dict) else None
+        self.provider_payment_ref = str(payment_id) if payment_id not in (None, "") else None
+        return payment_info
+    
     def __repr__(self):
         return f"<Order(id={self.id}, user_id={self.user_id}, status={self.status}, total={self.total_amount})>"
 
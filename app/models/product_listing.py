@@ -0,0 +1,76 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Text, JSON, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class ProductListing(Base):
+    """
+    Denormalized product card - one row per (product, lang)
+
+    Read model for listing endpoints. Rows are rebuilt from Product and its
+    relations by app.crud.product_listing whenever a product, its discounts or
+    its import data change; never edit them directly.
+    """
+    __tablename__ = "product_listing"
+    __table_args__ = (
+        UniqueConstraint("product_id", "lang", name="uq_product_listing_product_lang"),
+        Index("ix_product_listing_lang_active_product", "lang", "is_active", "product_id"),
+        Index("ix_product_listing_lang_date_add", "lang", "date_add"),
+        Index("ix_product_listing_lang_created_at", "lang", "created_at"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    product_id = Column(Integer, ForeignKey("products.id", ondelete="CASCADE"), nullable=False, index=True)
+    lang = Column(String(5), nullable=False)  # it, en, fr, de, ar
+
+    # Product
+    reference = Column(String(100), nullable=False)
+    ean = Column(String(255), nullable=True)
+    product_type = Column(String(20), nullable=False)
+    condition = Column(String(20), nullable=True)
+    is_active = Column(Boolean, default=True)
+    brand_id = Column(Integer, nullable=True, index=True)
+    brand_name = Column(String(255), nullable=True)
+
+    # Translation (requested lang, falling back to "it"); title is NULL if the product has none
+    title = Column(String(255), nullable=True)
+    sub_title = Column(String(500), nullable=True)
+    simple_description = Column(Text, nullable=True)
+
+    # First image by position
+    image_url = Column(String(500), nullable=True)
+
+    # Tax
+    tax_class_id = Column(Integer, nullable=True)
+    tax_name = Column(String(100), nullable=True)
+    tax_rate = Column(Float, nullable=True)
+    tax_included_in_price = Column(Boolean, default=True)
+
+    # Price and best active discount (highest priority, then highest value)
+    price_list = Column(Float, nullable=True)
+    currency = Column(String(3), default="EUR")
+    discount_type = Column(String(20), nullable=True)
+    discount_value = Column(Float, nullable=True)
+    discount_label = Column(String(10), nullable=False, default="0")  # e.g. "15%"
+
+    # Stock
+    stock_status = Column(String(20), nullable=True)
+    stock_quantity = Column(Integer, default=0)
+
+    # Category ids, localized features [{name, value}] and attributes [{code, name, value}]
+    category_ids = Column(JSON, nullable=True)
+    features = Column(JSON, nullable=True)
+    attributes = Column(JSON, nullable=True)
+
+    # Product timestamps (copied for ordering)
+    date_add = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=True)
+
+    refreshed_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    # PostgreSQL also has a `search_vector` tsvector column, filled by a trigger
+    # (see app.crud.product_search); it is not mapped here.
@@ -0,0 +1,52 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, UniqueConstraint
+from sqlalchemy.sql import func
+from app.db.session import Base
+
+
+class TranslationMemory(Base):
+    """
+    Machine translation cache - one row per (source text, source lang, target lang)
+
+    Filled by app.crud.translation; a text is sent to the translation backend
+    only the first time it is seen.
+    """
+    __tablename__ = "translation_memory"
+    __table_args__ = (
+        UniqueConstraint("source_hash", "source_lang", "target_lang", name="uq_translation_memory_key"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    source_hash = Column(String(64), nullable=False)  # sha256 of source_text
+    source_lang = Column(String(5), nullable=False)
+    target_lang = Column(String(5), nullable=False)
+    source_text = Column(Text, nullable=False)
+    translated_text = Column(Text, nullable=False)
+    backend = Column(String(50), nullable=True)  # e.g. "google"
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class TranslationJob(Base):
+    """
+    Pending machine translation of a product or category
+
+    The entity is saved with its source language only; the translation worker
+    adds the missing languages and marks the job done.
+    """
+    __tablename__ = "translation_jobs"
+    __table_args__ = (
+        Index("ix_translation_jobs_status_id", "status", "id"),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    entity_type = Column(String(20), nullable=False)  # product, category
+    entity_id = Column(Integer, nullable=False, index=True)
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, done, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
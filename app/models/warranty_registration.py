@@ -2,7 +2,7 @@
 # © 2026 Muthana. All rights reserved.
 # Unauthorized copying or distribution is prohibited.
 
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Boolean
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, Boolean, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.db.session import Base
@@ -14,8 +14,15 @@ class WarrantyRegistration(Base):
     
     After a successful payment that includes a warranty product, this model stores
     the registration details received from Garanzia3 API (transaction ID and PIN).
+    
+    Pending rows are also the registration queue: they are added in the same
+    transaction as the payment status change and registered by the warranty
+    registration worker.
     """
     __tablename__ = "warranty_registrations"
+    __table_args__ = (
+        Index("ix_warranty_registrations_status_next_attempt_at", "status", "next_attempt_at"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -41,11 +48,18 @@ class WarrantyRegistration(Base):
     
     # ========== Registration Status ==========
     status = Column(String(50), nullable=False, default="pending", index=True)
-    # pending: Not yet registered
+    # pending: Not yet registered (queued)
+    # running: Being registered by the worker
     # registered: Successfully registered with G3
     # failed: Registration failed
     # cancelled: Registration cancelled
     
+    # ========== Queue ==========
+    idempotency_key = Column(String(100), unique=True, nullable=True)  # One registration per order item warranty
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    next_attempt_at = Column(DateTime(timezone=True), nullable=True)  # Retry not before this
+    started_at = Column(DateTime(timezone=True), nullable=True)  # Claimed by the worker
+    
     # ========== Error Tracking ==========
     error_message = Column(Text, nullable=True)
     error_code = Column(String(50), nullable=True)
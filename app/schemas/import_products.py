@@ -29,6 +29,19 @@ class ImportErrorDetail(BaseModel):
     details: Optional[str] = None
 
 
+class ImportSourceStats(BaseModel):
+    """Per-source statistics of a multi-source import"""
+    source: str
+    filename: str
+    total_rows: int
+    valid_rows: int
+    skipped: int
+    duplicates: int = Field(0, description="Rows repeating an EAN of this source (duplicate_ean_in_batch)")
+    won: int = Field(description="EANs whose row came from this source")
+    merged: int = Field(description="Rows merged into a higher-priority source's row")
+    parse_seconds: float
+
+
 class ImportReport(BaseModel):
     """Import operation report"""
     source: str
@@ -39,6 +52,7 @@ class ImportReport(BaseModel):
     skipped_invalid_ean13: int = Field(default=0, description="Rows skipped because EAN was not 13 digits")
     skipped_duplicate: int = Field(default=0, description="Rows skipped because of duplicate EAN")
     skipped_manual: int = Field(default=0, description="Rows skipped to protect manual/test products")
+    skipped_unchanged: int = Field(default=0, description="Rows identical to their last import (not written)")
     errors_summary: Dict[str, int] = Field(
         default_factory=dict,
         description="Summary of errors by reason"
@@ -55,6 +69,18 @@ class ImportReport(BaseModel):
         default_factory=list,
         description="Sample of first 5 imports with EAN and status"
     )
+    sources: List[ImportSourceStats] = Field(
+        default_factory=list,
+        description="Multi-source imports: rows and parse time per source"
+    )
+    parse_seconds: Optional[float] = Field(
+        default=None,
+        description="Multi-source imports: wall time of the parallel parse"
+    )
+    cache_stats: Dict[str, int] = Field(
+        default_factory=dict,
+        description="Brand/category cache: hits, misses and records created"
+    )
     duration_seconds: float
     dry_run: bool
     timestamp: datetime = Field(default_factory=datetime.utcnow)
@@ -183,3 +209,66 @@ class EnrichmentReport(BaseModel):
                 "timestamp": "2026-01-11T12:00:00"
             }
         }
+
+
+# ============= Import Job Schemas =============
+
+class ImportJobChunkStats(BaseModel):
+    """Statistics of one committed chunk"""
+    chunk_index: int
+    rows: int
+    created: int
+    updated: int
+    skipped: int
+    errors: int
+    duration_ms: int
+
+    class Config:
+        from_attributes = True
+
+
+class ImportJobResponse(BaseModel):
+    """Background import job with live progress"""
+    id: int
+    kind: str
+    source: Optional[str] = None
+    filename: Optional[str] = None
+    status: str
+    dry_run: bool
+    attempts: int
+    chunks_done: int
+    rows_read: int
+    progress: Dict[str, Any] = Field(default_factory=dict, description="Running counters")
+    chunks: List[ImportJobChunkStats] = Field(default_factory=list)
+    report: Optional[Dict[str, Any]] = Field(
+        default=None,
+        description="ImportReport (or EnrichmentReport) once the job is done"
+    )
+    error: Optional[str] = None
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "id": 12,
+                "kind": "import",
+                "source": "effezzeta",
+                "filename": "Listino-prodotti.xlsx",
+                "status": "running",
+                "dry_run": False,
+                "attempts": 1,
+                "chunks_done": 4,
+                "rows_read": 1210,
+                "progress": {"total_rows": 1210, "created": 1100, "updated": 80, "errors_summary": {"missing_ean": 20}},
+                "chunks": [
+                    {"chunk_index": 0, "rows": 300, "created": 290, "updated": 10, "skipped": 0, "errors": 0, "duration_ms": 640}
+                ],
+                "report": None,
+                "error": None,
+                "created_at": "2026-01-08T12:00:00",
+                "started_at": "2026-01-08T12:00:01",
+                "finished_at": None
+            }
+        }
@@ -0,0 +1,253 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Category tree snapshot
+The whole category tree in memory, for navigation without a query per node
+
+Loaded with two queries (categories, translations) and replaced after any
+committed category write in this process, or after CATEGORY_TREE_MAX_AGE
+seconds (writes made by other workers). Every node keeps its children in
+listing order (sort_order, id) and its localized names and slugs. Nodes
+are numbered in pre-order, so a subtree is one contiguous range: "is
+descendant" is two comparisons and a subtree is one slice.
+"""
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.write_events import on_commit
+from app.models.category import Category, CategoryTranslation
+
+
+class CategoryView(NamedTuple):
+    """A category with its name and slug in one language"""
+    id: int
+    name: str
+    slug: Optional[str]
+    image: Optional[str]
+    icon: Optional[str]
+    sort_order: int
+    is_active: bool
+    parent_id: Optional[int]
+    has_children: bool
+
+
+class CategoryNode:
+    __slots__ = ("id", "parent_id", "name", "slug", "image", "icon", "sort_order", "is_active", "children", "names")
+
+    def __init__(self, id, parent_id, name, slug, image, icon, sort_order, is_active):
+        self.id = id
+        self.parent_id = parent_id
+        self.name = name
+        self.slug = slug
+        self.image = image
+        self.icon = icon
+        self.sort_order = sort_order or 0
+        self.is_active = bool(is_active)
+        self.children: Tuple[int, ...] = ()
+        self.names: Dict[str, Tuple[str, str]] = {}  # {lang: (name, slug)}
+
+    @property
+    def has_children(self) -> bool:
+        return bool(self.children)
+
+    def localized(self, lang: Optional[str]) -> Tuple[str, Optional[str]]:
+        """(name, slug) in `lang`, else the category's own"""
+        return self.names.get(lang) or (self.name, self.slug)
+
+    def view(self, lang: Optional[str] = None) -> CategoryView:
+        name, slug = self.localized(lang)
+        return CategoryView(
+            self.id, name, slug, self.image, self.icon, self.sort_order,
+            self.is_active, self.parent_id, self.has_children
+        )
+
+
+class CategoryTreeSnapshot:
+    """Immutable category tree; build with load_category_tree"""
+
+    def __init__(self, nodes: Dict[int, CategoryNode]):
+        self.nodes = nodes
+        self.built_at = time.monotonic()
+
+        # Categories whose parent is missing are listed as roots
+        children = defaultdict(list)
+        for node in nodes.values():
+            children[node.parent_id if node.parent_id in nodes else None].append(node)
+        for siblings in children.values():
+            siblings.sort(key=lambda node: (node.sort_order, node.id))
+        for node in nodes.values():
+            node.children = tuple(child.id for child in children.get(node.id, ()))
+        self.roots = tuple(node.id for node in children.get(None, ()))
+
+        # Pre-order numbering: the subtree of a node is order[start[id]:end[id]]
+        self.order: List[int] = []
+        self.start: Dict[int, int] = {}
+        self.end: Dict[int, int] = {}
+        stack = [(root, False) for root in reversed(self.roots)]
+        while stack:
+            node_id, visited = stack.pop()
+            if visited:
+                self.end[node_id] = len(self.order)
+                continue
+            self.start[node_id] = len(self.order)
+            self.order.append(node_id)
+            stack.append((node_id, True))
+            stack.extend((child, False) for child in reversed(nodes[node_id].children))
+
+        if len(self.order) < len(nodes):
+            logger.warning(f"Category tree: {len(nodes) - len(self.order)} categories in a parent cycle")
+
+        self._trees: Dict[Tuple[Optional[str], bool], Tuple[List[Dict[str, Any]], int]] = {}
+
+    def get(self, category_id: int) -> Optional[CategoryNode]:
+        return self.nodes.get(category_id)
+
+    def main_categories(self, active_only: bool = True) -> List[CategoryNode]:
+        return [self.nodes[i] for i in self.roots if not active_only or self.nodes[i].is_active]
+
+    def children(self, category_id: int, active_only: bool = True) -> List[CategoryNode]:
+        node = self.nodes.get(category_id)
+        if not node:
+            return []
+        return [self.nodes[i] for i in node.children if not active_only or self.nodes[i].is_active]
+
+    def is_descendant(self, category_id: int, ancestor_id: int) -> bool:
+        """True if category_id is ancestor_id or below it"""
+        position = self.start.get(category_id)
+        start = self.start.get(ancestor_id)
+        return position is not None and start is not None and start <= position < self.end[ancestor_id]
+
+    def subtree_ids(self, category_id: int) -> List[int]:
+        """The category and all its descendants (empty if unknown)"""
+        if category_id not in self.start:
+            return [category_id] if category_id in self.nodes else []
+        return self.order[self.start[category_id]:self.end[category_id]]
+
+    def search(
+        self,
+        q: str,
+        lang: Optional[str] = None,
+        active_only: bool = True,
+        parent_only: bool = False
+    ) -> List[CategoryNode]:
+        """
+        Categories whose name or slug contains `q` (case-insensitive), also in the
+        `lang` translation (any translation without lang); main categories first
+        """
+        q = (q or "").strip().casefold()
+        if not q:
+            return []
+
+        matches = []
+        for node in self.nodes.values():
+            if (active_only and not node.is_active) or (parent_only and node.parent_id is not None):
+                continue
+            texts = [node.name, node.slug]
+            if lang:
+                texts.extend(node.names.get(lang, ()))
+            else:
+                for name, slug in node.names.values():
+                    texts.extend((name, slug))
+            if any(text and q in text.casefold() for text in texts):
+                matches.append(node)
+
+        matches.sort(key=lambda node: (node.parent_id is not None, node.parent_id or 0, node.sort_order, node.id))
+        return matches
+
+    def tree(self, lang: Optional[str] = None, active_only: bool = True) -> Tuple[List[Dict[str, Any]], int]:
+        """Nested categories ({..., "children": [...]}) and their count, built once per language"""
+        key = (lang, active_only)
+        if key not in self._trees:
+            count = 0
+
+            def build(ids):
+                nonlocal count
+                items = []
+                for category_id in ids:
+                    node = self.nodes[category_id]
+                    if active_only and not node.is_active:
+                        continue
+                    count += 1
+                    name, slug = node.localized(lang)
+                    items.append({
+                        "id": node.id,
+                        "name": name,
+                        "slug": slug,
+                        "image": node.image,
+                        "icon": node.icon,
+                        "sort_order": node.sort_order,
+                        "is_active": node.is_active,
+                        "parent_id": node.parent_id,
+                        "children": build(node.children)
+                    })
+                return items
+
+            self._trees[key] = (build(self.roots), count)
+        return self._trees[key]
+
+
+def load_category_tree(db: Session) -> CategoryTreeSnapshot:
+    """Build a snapshot with two queries"""
+    nodes = {
+        row.id: CategoryNode(
+            row.id, row.parent_id, row.name, row.slug, row.image, row.icon, row.sort_order, row.is_active
+        )
+        for row in db.query(
+            Category.id, Category.parent_id, Category.name, Category.slug,
+            Category.image, Category.icon, Category.sort_order, Category.is_active
+        )
+    }
+    for category_id, lang, name, slug in db.query(
+        CategoryTranslation.category_id, CategoryTranslation.lang, CategoryTranslation.name, CategoryTranslation.slug
+    ):
+        node = nodes.get(category_id)
+        if node:
+            node.names[lang] = (name, slug)
+    return CategoryTreeSnapshot(nodes)
+
+
+class CategoryTree:
+    """Process-wide holder of the current snapshot, rebuilt lazily when stale"""
+
+    def __init__(self):
+        self._snapshot: Optional[CategoryTreeSnapshot] = None
+        self._stale = True
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        self._stale = True
+
+    def _expired(self) -> bool:
+        snapshot = self._snapshot
+        return (
+            snapshot is None
+            or self._stale
+            or time.monotonic() - snapshot.built_at > settings.CATEGORY_TREE_MAX_AGE
+        )
+
+    def get(self, db: Session) -> CategoryTreeSnapshot:
+        if self._expired():
+            with self._lock:
+                if self._expired():
+                    # Cleared before loading: a write committed meanwhile marks it stale again
+                    self._stale = False
+                    try:
+                        self._snapshot = load_category_tree(db)
+                    except Exception:
+                        self._stale = True
+                        raise
+        return self._snapshot
+
+
+# Process-wide tree
+category_tree = CategoryTree()
+
+on_commit(("categor",), category_tree.invalidate)
@@ -2,11 +2,11 @@
 # © 2026 Muthana. All rights reserved.
 # Unauthorized copying or distribution is prohibited.
 
-import httpx
 import json
 from typing import Dict, Optional
 from datetime import datetime
 from app.core.config import settings
+from app.integrations.http import IntegrationClient, IntegrationError
 
 
 class Garanzia3Service:
@@ -21,7 +21,8 @@ class Garanzia3Service:
         self.api_url = settings.GARANZIA3_API_URL
         self.token = settings.GARANZIA3_TOKEN
         self.is_test_mode = settings.GARANZIA3_MODE == "test"
-        self.timeout = 30.0
+        self.timeout = settings.GARANZIA3_TIMEOUT
+        self.http = IntegrationClient("garanzia3", read_timeout=self.timeout)
     
     async def register_warranty(
         self,
@@ -70,49 +71,50 @@ class Garanzia3Service:
                 "cache-control": "no-cache"
             }
             
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.post(
-                    f"{self.api_url}/api/v_1/contract/new",
-                    json=payload,
-                    headers=headers
-                )
-                
-                # Parse response
-                response_data = response.json()
-                
-                # Check if successful (200 status)
-                if response.status_code == 200 and response_data.get("message") == "OK":
-                    data = response_data.get("data", [])[0] if response_data.get("data") else {}
-                    
-                    return {
-                        "success": True,
-                        "transaction": data.get("transaction"),
-                        "pin": data.get("pin"),
-                        "raw_response": response_data
-                    }
-                
-                # Handle errors
-                error_code = response_data.get("code", response.status_code)
-                error_message = response_data.get("message", "Unknown error")
+            # Not retried: a lost answer could register the contract twice
+            response = await self.http.request(
+                "POST", "contract.new", f"{self.api_url}/api/v_1/contract/new",
+                json=payload,
+                headers=headers
+            )
+            
+            # Parse response
+            response_data = response.json()
+            
+            # Check if successful (200 status)
+            if response.status_code == 200 and response_data.get("message") == "OK":
+                data = response_data.get("data", [])[0] if response_data.get("data") else {}
                 
                 return {
-                    "success": False,
-                    "error": error_message,
-                    "error_code": str(error_code),
+                    "success": True,
+                    "transaction": data.get("transaction"),
+                    "pin": data.get("pin"),
                     "raw_response": response_data
                 }
-                
-        except httpx.TimeoutException:
+            
+            # Handle errors
+            error_code = response_data.get("code", response.status_code)
+            error_message = response_data.get("message", "Unknown error")
+            
             return {
                 "success": False,
-                "error": "Request timeout - Garanzia3 API did not respond in time",
-                "error_code": "timeout"
+                "error": error_message,
+                "error_code": str(error_code),
+                "raw_response": response_data
             }
-        except httpx.HTTPError as e:
+                
+        except IntegrationError as e:
+            if e.timeout:
+                return {
+                    "success": False,
+                    "error": "Request timeout - Garanzia3 API did not respond in time",
+                    "error_code": "timeout"
+                }
             return {
                 "success": False,
                 "error": f"HTTP error: {str(e)}",
-                "error_code": "http_error"
+                # No answer at all: the contract was not created
+                "error_code": "http_error" if e.status_code else "connection_error"
             }
         except json.JSONDecodeError:
             return {
@@ -0,0 +1,201 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Supplier image ingestion
+Downloads supplier image URLs and stores them on Cloudinary
+
+Downloads are async with a global concurrency limit and, per host, a limit
+of requests in flight and of request starts per second, so one slow or
+strict supplier host neither blocks the others nor gets hammered. The
+uploader is pluggable (CloudinaryUploader in production, fakes in tests).
+The database side (progress, deduplication, URL rewrite) is in
+app.crud.image_ingestion.
+"""
+import asyncio
+import io
+import threading
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Iterable, Optional, Union
+from urllib.parse import urlsplit
+
+import httpx
+from loguru import logger
+
+from app.core.config import settings
+
+
+CLOUDINARY_PREFIX = "https://res.cloudinary.com/"
+
+
+class ImageDownloadError(Exception):
+    """Source URL did not return a usable image"""
+    pass
+
+
+class HostLimiter:
+    """At most `per_host` requests in flight and `rate` request starts per second, per host"""
+
+    def __init__(self, per_host: int, rate: float):
+        self.per_host = per_host
+        self.interval = 1.0 / rate if rate else 0.0
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._next_start: Dict[str, float] = {}
+
+    @asynccontextmanager
+    async def slot(self, host: str):
+        semaphore = self._semaphores.setdefault(host, asyncio.Semaphore(self.per_host))
+        async with semaphore:
+            if self.interval:
+                now = asyncio.get_running_loop().time()
+                start = max(now, self._next_start.get(host, now))
+                self._next_start[host] = start + self.interval
+                if start > now:
+                    await asyncio.sleep(start - now)
+            yield
+
+
+async def download_images(
+    urls: Iterable[str],
+    concurrency: Optional[int] = None,
+    per_host: Optional[int] = None,
+    host_rate: Optional[float] = None,
+    timeout: Optional[float] = None,
+    max_bytes: Optional[int] = None,
+    transport: Optional[httpx.AsyncBaseTransport] = None
+) -> Dict[str, Union[bytes, Exception]]:
+    """
+    Download URLs concurrently
+    Returns {url: bytes} with the exception instead of bytes for failed URLs
+    """
+    urls = list(dict.fromkeys(urls))
+    max_bytes = max_bytes or settings.IMAGE_INGESTION_MAX_BYTES
+    limiter = HostLimiter(per_host or settings.IMAGE_INGESTION_PER_HOST, settings.IMAGE_INGESTION_HOST_RATE if host_rate is None else host_rate)
+    in_flight = asyncio.Semaphore(concurrency or settings.IMAGE_INGESTION_CONCURRENCY)
+
+    async with httpx.AsyncClient(
+        timeout=timeout or settings.IMAGE_INGESTION_TIMEOUT,
+        follow_redirects=True,
+        transport=transport
+    ) as client:
+
+        async def fetch(url: str) -> bytes:
+            # Wait for the host first, so a busy host does not hold global slots
+            async with limiter.slot(urlsplit(url).hostname or ""), in_flight:
+                async with client.stream("GET", url) as response:
+                    if response.status_code != 200:
+                        raise ImageDownloadError(f"HTTP {response.status_code}")
+                    content_type = response.headers.get("content-type", "")
+                    if content_type and not content_type.startswith("image/"):
+                        raise ImageDownloadError(f"Not an image ({content_type})")
+                    chunks = []
+                    size = 0
+                    async for chunk in response.aiter_bytes():
+                        size += len(chunk)
+                        if size > max_bytes:
+                            raise ImageDownloadError(f"Image larger than {max_bytes} bytes")
+                        chunks.append(chunk)
+                    if not size:
+                        raise ImageDownloadError("Empty response")
+                    return b"".join(chunks)
+
+        results = await asyncio.gather(*(fetch(url) for url in urls), return_exceptions=True)
+    return dict(zip(urls, results))
+
+
+class ImageUploader:
+    """Stores image bytes under a public id; returns {"url", "public_id"}"""
+
+    def upload(self, data: bytes, public_id: str) -> Dict[str, Any]:
+        raise NotImplementedError
+
+
+class CloudinaryUploader(ImageUploader):
+    """Uploads with the Cloudinary account and options of app/api/v1/upload.py"""
+
+    def __init__(self, folder: str = "products"):
+        import cloudinary
+        cloudinary.config(
+            cloud_name=settings.CLOUDINARY_CLOUD_NAME,
+            api_key=settings.CLOUDINARY_API_KEY,
+            api_secret=settings.CLOUDINARY_API_SECRET
+        )
+        self.folder = f"onebby/{folder}"
+
+    def upload(self, data: bytes, public_id: str) -> Dict[str, Any]:
+        import cloudinary.uploader
+        # Public id = content hash: uploading the same image again is a no-op
+        result = cloudinary.uploader.upload(
+            io.BytesIO(data),
+            folder=self.folder,
+            public_id=public_id,
+            overwrite=False,
+            resource_type="image",
+            transformation=[
+                {"quality": "auto"},
+                {"fetch_format": "auto"}
+            ]
+        )
+        return {"url": result["secure_url"], "public_id": result["public_id"]}
+
+
+class ImageIngestionWorker:
+    """
+    Background thread copying supplier image URLs to Cloudinary
+
+    Every IMAGE_INGESTION_INTERVAL seconds it queues new supplier URLs of
+    product images and processes them batch by batch; wake() makes it run at once.
+    """
+
+    def __init__(self):
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="image-ingestion-worker", daemon=True)
+        self._thread.start()
+        logger.info("Image ingestion worker started")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        from app.db.session import SessionLocal
+        from app.crud.image_ingestion import queue_product_images, run_image_ingestion
+
+        uploader = CloudinaryUploader()
+        while not self._stop.is_set():
+            self._wake.clear()
+            db = SessionLocal()
+            try:
+                queue_product_images(db)
+                # Drain the queue, then sleep
+                while not self._stop.is_set():
+                    stats = run_image_ingestion(db, uploader)
+                    if stats["claimed"]:
+                        logger.info(f"Image ingestion batch: {stats}")
+                    if stats["claimed"] < settings.IMAGE_INGESTION_BATCH_SIZE:
+                        break
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Image ingestion worker error: {str(e)}")
+            finally:
+                db.close()
+
+            self._wake.wait(settings.IMAGE_INGESTION_INTERVAL)
+
+
+# Process-wide worker
+image_ingestion_worker = ImageIngestionWorker()
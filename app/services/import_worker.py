@@ -0,0 +1,73 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+import threading
+
+from loguru import logger
+
+from app.core.config import settings
+
+
+class ImportWorker:
+    """
+    Pool of background threads running queued import jobs
+
+    Each thread claims one job at a time (SKIP LOCKED, so several API
+    processes can run workers) and sleeps IMPORT_WORKER_INTERVAL seconds when
+    the queue is empty; wake() makes idle threads look at once.
+    """
+    
+    def __init__(self):
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads = []
+    
+    def start(self, threads: int = None):
+        if any(thread.is_alive() for thread in self._threads):
+            return
+        self._stop.clear()
+        self._threads = [
+            threading.Thread(target=self._run, name=f"import-worker-{i}", daemon=True)
+            for i in range(threads or settings.IMPORT_WORKER_THREADS)
+        ]
+        for thread in self._threads:
+            thread.start()
+        logger.info(f"Import worker started ({len(self._threads)} threads)")
+    
+    def stop(self, timeout: float = 5.0):
+        # A running job stops at a chunk boundary when the process exits and resumes later
+        self._stop.set()
+        self._wake.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
+    
+    def wake(self):
+        self._wake.set()
+    
+    def _run(self):
+        from app.db.session import SessionLocal
+        from app.crud.import_job import claim_import_job, run_import_job
+        
+        while not self._stop.is_set():
+            self._wake.clear()
+            db = SessionLocal()
+            try:
+                # Drain the queue, then sleep
+                while not self._stop.is_set():
+                    job = claim_import_job(db)
+                    if not job:
+                        break
+                    run_import_job(db, job)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Import worker error: {str(e)}")
+            finally:
+                db.close()
+            
+            self._wake.wait(settings.IMPORT_WORKER_INTERVAL)
+
+
+# Process-wide worker pool
+import_worker = ImportWorker()
@@ -0,0 +1,183 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Multi-source product import
+Parses several supplier workbooks in parallel processes and merges them by EAN
+
+openpyxl parsing is CPU-bound and holds the GIL, so each workbook is parsed
+in its own process (spawned, safe inside the threaded API process). Mapped
+rows are merged by EAN: the row of the highest-priority source wins and its
+empty fields are filled from lower-priority sources. The merged rows are then
+written by the usual chunked upsert, in a deterministic order (priority,
+then row order), so a resumed job sees the same chunks.
+"""
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.services.product_import import ProductImportService
+from app.services.product_enrichment import EnrichmentReader, to_import_rows
+
+
+# Default priority (highest first) when several sources have the same EAN
+SOURCE_PRIORITY = [
+    "effezzeta",
+    "erregame",
+    "dixe",
+    "telefonia",
+    "informatica",
+    "giochi",
+    "cartoleria",
+    "accessori",
+    "commerce_clarity",
+]
+
+# Fields filled from a lower-priority source when empty in the winning row
+FILL_FIELDS = ("price", "brand_name", "category_path", "description", "image_urls")
+
+
+def parse_source_file(source: str, file_path: str) -> Dict[str, Any]:
+    """
+    Read and map one workbook (runs in a worker process)
+    Returns mapped rows, skipped rows, counters and the parse time
+    """
+    started = time.perf_counter()
+    skipped: List[Dict[str, Any]] = []
+    counter = {"rows": 0}
+
+    def counted(rows):
+        for row in rows:
+            counter["rows"] += 1
+            yield row
+
+    if source == "commerce_clarity":
+        rows = list(to_import_rows(counted(EnrichmentReader(Path(file_path)).iter_rows()), skipped.append))
+        for row in rows:
+            row["source"] = source
+    else:
+        service = ProductImportService(source)
+        rows = list(service.iter_mapped_rows(counted(service.iter_excel_rows(Path(file_path))), skipped.append))
+
+    return {
+        "source": source,
+        "filename": Path(file_path).name,
+        "rows": rows,
+        "skipped": skipped,
+        "total_rows": counter["rows"],
+        "parse_seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def parse_sources(files: List[Tuple[str, str]], max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+    """Parse (source, file_path) pairs in parallel; results keep the input order"""
+    workers = min(len(files), max_workers or os.cpu_count() or 1)
+    if workers <= 1:
+        return [parse_source_file(source, file_path) for source, file_path in files]
+
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        return list(pool.map(
+            parse_source_file,
+            [source for source, _ in files],
+            [file_path for _, file_path in files]
+        ))
+
+
+def _is_empty(value: Any) -> bool:
+    return value is None or value == "" or value == []
+
+
+def merge_sources(parsed: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Merge parsed files (highest priority first) into one row per EAN
+
+    Returns (rows, per-source stats). `won` counts EANs whose row came from the
+    source, `merged` rows folded into a higher-priority row. Only rows of
+    different sources are merged: a repeated EAN within a source is dropped
+    and listed in the source's "duplicates" as duplicate_ean_in_batch, like in
+    a single-source import.
+    """
+    merged: Dict[str, Dict[str, Any]] = {}
+    source_stats = []
+    for result in parsed:
+        won = 0
+        folded = 0
+        seen = set()
+        result["duplicates"] = []
+        for row in result["rows"]:
+            if row["ean"] in seen:
+                result["duplicates"].append({
+                    "row_number": row.get("row_number", 0),
+                    "ean": row["ean"],
+                    "reason": "duplicate_ean_in_batch",
+                    "details": "EAN already processed in this batch"
+                })
+                continue
+            seen.add(row["ean"])
+            current = merged.get(row["ean"])
+            if current is None:
+                merged[row["ean"]] = row
+                won += 1
+                continue
+            for field in FILL_FIELDS:
+                if _is_empty(current.get(field)) and not _is_empty(row.get(field)):
+                    current[field] = row[field]
+            folded += 1
+        source_stats.append({
+            "source": result["source"],
+            "filename": result["filename"],
+            "total_rows": result["total_rows"],
+            "valid_rows": len(seen),
+            "skipped": len(result["skipped"]),
+            "duplicates": len(result["duplicates"]),
+            "won": won,
+            "merged": folded,
+            "parse_seconds": result["parse_seconds"],
+        })
+    return list(merged.values()), source_stats
+
+
+def iter_multi_source_rows(
+    files: List[Tuple[str, str]],
+    totals: Any,
+    max_workers: Optional[int] = None
+) -> Iterator[Dict[str, Any]]:
+    """
+    Merged row stream of several files for import_in_chunks
+
+    `files` is in priority order. Counts read and skipped rows into `totals`
+    (an ImportTotals) and stores the per-source stats in totals.sources.
+    """
+    started = time.perf_counter()
+    parsed = parse_sources(files, max_workers)
+    rows, source_stats = merge_sources(parsed)
+
+    totals.sources = source_stats
+    totals.parse_seconds = round(time.perf_counter() - started, 3)
+    for result in parsed:
+        if not totals.replaying:
+            totals.total_rows += result["total_rows"]
+        for skip in result["skipped"]:
+            skip["details"] = f"[{result['source']}: {result['filename']}] {skip.get('details') or ''}".strip()
+            totals.add_skipped(skip)
+        # Counted like the duplicates of a single-source batch
+        if not totals.replaying:
+            for duplicate in result["duplicates"]:
+                duplicate["details"] = f"[{result['source']}: {result['filename']}] {duplicate['details']}"
+                totals.add_error(duplicate)
+    del parsed
+
+    yield from rows
+
+
+__all__ = [
+    "SOURCE_PRIORITY",
+    "parse_source_file",
+    "parse_sources",
+    "merge_sources",
+    "iter_multi_source_rows",
+]
@@ -0,0 +1,191 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Payment reconciliation
+Asks PayPal and Floa for the status of pending payments, concurrently
+
+Lookups go through the integration services (pooled clients, retries,
+shared OAuth tokens, see app.integrations.http); each provider has its own
+limit of lookups in flight, shared by every check made in the same event loop. The database side (which orders are due,
+batched status updates) is in app.crud.payment_reconciliation.
+"""
+import asyncio
+import threading
+import weakref
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+from loguru import logger
+
+from app.core.config import settings
+from app.integrations.floa import floa_service
+from app.integrations.http import IntegrationError
+from app.integrations.paypal import paypal_service
+
+
+# (new payment_status or None for no change, message)
+Decision = Tuple[Optional[str], str]
+
+
+class PaymentProvider:
+    """Status lookups of one gateway"""
+
+    name = ""
+
+    def __init__(self, concurrency: int):
+        self.concurrency = concurrency
+        # Semaphores only work in the loop they were created in (run_sync starts a new one)
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.concurrency)
+        return semaphore
+
+    async def fetch(self, payment_id: str) -> Dict[str, Any]:
+        """Gateway payload of the payment"""
+        raise NotImplementedError
+
+    def decide(self, payload: Dict[str, Any]) -> Decision:
+        raise NotImplementedError
+
+    async def check(self, payment_id: str) -> Decision:
+        async with self._semaphore():
+            try:
+                payload = await self.fetch(payment_id)
+            except IntegrationError as e:
+                if e.status_code == 404:
+                    return None, "Payment not found"
+                raise
+        return self.decide(payload)
+
+
+class PayPalProvider(PaymentProvider):
+    name = "paypal"
+
+    async def fetch(self, payment_id):
+        return await paypal_service.get_order_details(payment_id)
+
+    def decide(self, payload):
+        order_status = payload.get("status", "UNKNOWN")
+        if order_status in ("COMPLETED", "APPROVED"):
+            return "completed", f"Confirmed ({order_status})"
+        if order_status in ("VOIDED", "CANCELLED"):
+            return "failed", f"Failed ({order_status})"
+        return None, f"No change ({order_status})"
+
+
+class FloaProvider(PaymentProvider):
+    name = "floa"
+
+    async def fetch(self, payment_id):
+        return await floa_service.get_deal_status(payment_id)
+
+    def decide(self, payload):
+        deal_status = payload.get("dealStatus", "UNKNOWN")
+        if deal_status == "APPROVED":
+            return "completed", "Confirmed (APPROVED)"
+        # The integration environment leaves paid deals in DRAFT
+        if deal_status == "DRAFT" and "live-int" in settings.FLOA_BASE_URL and payload.get("installmentsList"):
+            return "completed", "Confirmed (DRAFT-integration)"
+        if deal_status in ("CANCELLED", "REJECTED"):
+            return "failed", f"Failed ({deal_status})"
+        return None, f"No change ({deal_status})"
+
+
+def create_providers() -> Dict[str, PaymentProvider]:
+    return {
+        "paypal": PayPalProvider(settings.PAYMENT_RECONCILIATION_PAYPAL_CONCURRENCY),
+        "floa": FloaProvider(settings.PAYMENT_RECONCILIATION_FLOA_CONCURRENCY),
+    }
+
+
+# Process-wide providers, so the concurrency limits hold across calls
+providers = create_providers()
+
+RECONCILED_METHODS = ("paypal", "floa")
+
+
+async def check_payment(method: Optional[str], payment_id: Optional[str]) -> Decision:
+    """Decision for one payment; methods without lookups (PayPlug has webhook) are not checked"""
+    provider = providers.get((method or "").lower())
+    if provider is None or not payment_id:
+        return None, "Not checked"
+    return await provider.check(str(payment_id))
+
+
+async def check_payments(checks: Iterable[Tuple[int, str, str]]) -> Dict[int, Union[Decision, Exception]]:
+    """
+    Look up (order_id, method, payment_id) payments concurrently
+    Returns {order_id: decision} with the exception instead for failed lookups
+    """
+    checks = list(checks)
+    results = await asyncio.gather(
+        *(providers[method].check(payment_id) for _, method, payment_id in checks),
+        return_exceptions=True
+    )
+    return {order_id: result for (order_id, _, _), result in zip(checks, results)}
+
+
+class PaymentReconciliationWorker:
+    """
+    Background thread reconciling pending payments
+
+    Every PAYMENT_RECONCILIATION_INTERVAL seconds it checks, batch by batch,
+    the pending orders not checked for PAYMENT_RECONCILIATION_RECHECK_MINUTES;
+    wake() makes it run at once.
+    """
+
+    def __init__(self):
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="payment-reconciliation-worker", daemon=True)
+        self._thread.start()
+        logger.info("Payment reconciliation worker started")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        from app.db.session import SessionLocal
+        from app.crud.payment_reconciliation import reconcile_payments
+
+        while not self._stop.is_set():
+            self._wake.clear()
+            db = SessionLocal()
+            try:
+                stats = reconcile_payments(db, stop=self._stop)
+                if stats["total_checked"]:
+                    logger.info(
+                        f"Payment reconciliation: {stats['total_checked']} checked, {stats['updated']} updated, "
+                        f"{stats['failed']} failed, {stats['skipped']} skipped"
+                    )
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Payment reconciliation worker error: {str(e)}")
+            finally:
+                db.close()
+
+            self._wake.wait(settings.PAYMENT_RECONCILIATION_INTERVAL)
+
+
+# Process-wide worker
+payment_reconciliation_worker = PaymentReconciliationWorker()
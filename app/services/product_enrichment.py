@@ -6,9 +6,11 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 import openpyxl
 
+from app.services.product_import import normalize_ean, is_valid_ean13
+
 
 class EnrichmentReader:
     """Read vendor XLS/XLSX files and normalize rows for enrichment.
@@ -118,19 +120,118 @@ class EnrichmentReader:
             "row_number": row_number,
         }
 
-    def read(self) -> List[Dict[str, Any]]:
+    def iter_rows(self) -> Iterator[Dict[str, Any]]:
+        """Stream normalized rows (empty rows are skipped)"""
         wb = openpyxl.load_workbook(self.file_path, read_only=True, data_only=True)
-        ws = wb.active
+        try:
+            ws = wb.active
 
-        header_row_idx, headers = self._detect_header(ws)
+            header_row_idx, headers = self._detect_header(ws)
 
-        rows: List[Dict[str, Any]] = []
-        for row_idx, row in enumerate(ws.iter_rows(min_row=header_row_idx + 1, values_only=True), start=header_row_idx + 1):
-            if not any(cell is not None for cell in row):
-                continue
-            mapped = self._parse_row(headers, list(row), row_idx)
-            rows.append(mapped)
-        return rows
+            for row_idx, row in enumerate(ws.iter_rows(min_row=header_row_idx + 1, values_only=True), start=header_row_idx + 1):
+                if not any(cell is not None for cell in row):
+                    continue
+                yield self._parse_row(headers, list(row), row_idx)
+        finally:
+            wb.close()
+
+    def read(self) -> List[Dict[str, Any]]:
+        return list(self.iter_rows())
+
+
+class EnrichmentTotals:
+    """Running totals of a chunked enrichment (see ImportTotals)"""
+
+    SAMPLE_SIZE = 5
+    ERRORS_SAMPLE_SIZE = 20
+
+    def __init__(self, keep_errors: bool = False):
+        self.keep_errors = keep_errors
+        self.replaying = False
+        self.total_rows = 0
+        self.matched = 0
+        self.skipped = 0
+        self.errors = 0
+        self.errors_summary: Dict[str, int] = {}
+        self.errors_sample: List[Dict[str, Any]] = []
+        self.matched_samples: List[Dict[str, Any]] = []
+        self.skipped_samples: List[Dict[str, Any]] = []
+
+    def count_rows(self, rows: Iterable[Any]) -> Iterator[Any]:
+        for row in rows:
+            if not self.replaying:
+                self.total_rows += 1
+            yield row
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {key: value for key, value in vars(self).items() if key != "replaying"}
+
+    def restore(self, data: Dict[str, Any]):
+        for key, value in data.items():
+            setattr(self, key, value)
+
+    def add_batch(self, stats: Dict[str, Any]):
+        """Add the statistics of one enrich_products_bulk / enrich_products_batch call"""
+        self.matched += stats["matched"]
+        self.skipped += stats["skipped"]
+        self.errors += len(stats["errors"])
+        for error in stats["errors"]:
+            reason = error.get("reason", "unknown")
+            self.errors_summary[reason] = self.errors_summary.get(reason, 0) + 1
+            if self.keep_errors and len(self.errors_sample) < self.ERRORS_SAMPLE_SIZE:
+                self.errors_sample.append(error)
+        self.matched_samples = (self.matched_samples + stats.get("matched_samples", []))[:self.SAMPLE_SIZE]
+        self.skipped_samples = (self.skipped_samples + stats.get("skipped_samples", []))[:self.SAMPLE_SIZE]
+
+
+def to_import_rows(rows: Iterable[Dict[str, Any]], on_skip: Callable[[Dict[str, Any]], None]) -> Iterator[Dict[str, Any]]:
+    """
+    Validate EnrichmentReader rows and map them to the product import format
+    (commerce_clarity imports); rejected rows are passed to `on_skip`
+    """
+    for row in rows:
+        row_number = row.get("row_number", 0)
+        raw_ean = row.get("ean")
+        if not raw_ean:
+            on_skip({
+                "row_number": row_number,
+                "ean": None,
+                "reason": "missing_ean",
+                "details": "Product has no EAN code"
+            })
+            continue
+
+        ean = normalize_ean(raw_ean)
+        if not is_valid_ean13(ean):
+            on_skip({
+                "row_number": row_number,
+                "ean": raw_ean,
+                "reason": "invalid_ean13",
+                "details": "EAN must be exactly 13 digits"
+            })
+            continue
+
+        title = row.get("title")
+        if not title:
+            on_skip({
+                "row_number": row_number,
+                "ean": ean,
+                "reason": "missing_title",
+                "details": "Product has no title"
+            })
+            continue
+
+        yield {
+            "ean": ean,
+            "title": title,
+            "price": row.get("price"),
+            "stock": 0,
+            "brand_name": row.get("brand_name"),
+            "category_path": [],
+            "description": row.get("description"),
+            "image_urls": row.get("image_urls") or [],
+            "row_number": row_number,
+        }
 
 
-__all__ = ["EnrichmentReader"]
+__all__ = ["EnrichmentReader", "EnrichmentTotals", "to_import_rows"]
@@ -5,8 +5,12 @@
 """
 Product Import Service
 Handles multi-source product imports with source-aware mapping
+
+Files are streamed: rows are read (openpyxl read_only), mapped, validated and
+handed to the upsert one chunk at a time, so memory does not grow with the
+file size.
 """
-from typing import Dict, Optional, List, Any
+from typing import Callable, Dict, Iterable, Iterator, Optional, List, Any
 from pathlib import Path
 import openpyxl
 from slugify import slugify
@@ -580,6 +584,18 @@ class ProductImportService:
         "accessori": AccessoriMapper,
     }
     
+    # Default file per source in app/excel
+    DEFAULT_FILES = {
+        "effezzeta": "Listino-prodotti.xlsx",
+        "erregame": "erregame_organized.xlsx",
+        "dixe": "Dixe_organized.xlsx",
+        "telefonia": "Listino Telefonia web.xlsx",
+        "informatica": "Listino INFORMATICA web.xlsx",
+        "giochi": "Listino GIOCHI.xlsx",
+        "cartoleria": "Listino Cartoleria.xlsx",
+        "accessori": "Listino ACCESSORI telefonia.xlsx",
+    }
+    
     CHUNK_SIZE = 300
     
     def __init__(self, source: str):
@@ -589,46 +605,50 @@ class ProductImportService:
         self.source = source
         self.mapper = self.MAPPERS[source]()
     
+    def iter_excel_rows(self, file_path: Path) -> Iterator[Dict[str, Any]]:
+        """Stream Excel rows as {"data": row dict, "row_number": n}"""
+        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+        try:
+            ws = wb.active
+            
+            # Get header row from mapper configuration
+            header_row = self.mapper.header_row
+            
+            # Get headers from specified row
+            headers = []
+            for cell in next(ws.iter_rows(min_row=header_row, max_row=header_row)):
+                headers.append(cell.value)
+            columns = [(idx, header) for idx, header in enumerate(headers) if header]
+            
+            # Read data rows (starting from row after header)
+            data_start_row = header_row + 1
+            for row_idx, row in enumerate(ws.iter_rows(min_row=data_start_row, values_only=True), start=data_start_row):
+                row_dict = {header: row[idx] for idx, header in columns if idx < len(row)}
+                yield {"data": row_dict, "row_number": row_idx}
+        finally:
+            # read_only workbooks keep the file open until closed
+            wb.close()
+    
     def read_excel_file(self, file_path: Path) -> List[Dict[str, Any]]:
         """Read Excel file and return list of row dictionaries"""
-        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
-        ws = wb.active
-        
-        # Get header row from mapper configuration
-        header_row = self.mapper.header_row
-        
-        # Get headers from specified row
-        headers = []
-        for cell in next(ws.iter_rows(min_row=header_row, max_row=header_row)):
-            headers.append(cell.value)
-        
-        # Read data rows (starting from row after header)
-        rows = []
-        data_start_row = header_row + 1
-        for row_idx, row in enumerate(ws.iter_rows(min_row=data_start_row, values_only=True), start=data_start_row):
-            row_dict = {}
-            for idx, value in enumerate(row):
-                if idx < len(headers) and headers[idx]:
-                    row_dict[headers[idx]] = value
-            rows.append({"data": row_dict, "row_number": row_idx})
-        
-        return rows
+        return list(self.iter_excel_rows(file_path))
     
-    def map_rows(self, rows: List[Dict[str, Any]]) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    def iter_mapped_rows(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        on_skip: Callable[[Dict[str, Any]], None]
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Map raw rows to standard format
-        Returns: (valid_rows, skipped_rows)
+        Map raw rows to standard format, yielding valid rows
+        Rows that cannot be imported are passed to `on_skip`
         """
-        valid_rows = []
-        skipped_rows = []
-        
         for row_info in rows:
             row_data = row_info["data"]
             row_number = row_info["row_number"]
 
             ean = self.mapper.get_ean(row_data)
             if not ean:
-                skipped_rows.append({
+                on_skip({
                     "row_number": row_number,
                     "ean": None,
                     "reason": "missing_ean",
@@ -637,7 +657,7 @@ class ProductImportService:
                 continue
 
             if not is_valid_ean13(ean):
-                skipped_rows.append({
+                on_skip({
                     "row_number": row_number,
                     "ean": ean,
                     "reason": "invalid_ean13",
@@ -648,20 +668,157 @@ class ProductImportService:
             mapped = self.mapper.map_row(row_data, row_number)
 
             if mapped is None:
-                skipped_rows.append({
+                on_skip({
                     "row_number": row_number,
                     "ean": ean,
                     "reason": "missing_title",
                     "details": "Product has no title"
                 })
             else:
-                valid_rows.append(mapped)
-        
+                yield mapped
+    
+    def map_rows(self, rows: List[Dict[str, Any]]) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Map raw rows to standard format
+        Returns: (valid_rows, skipped_rows)
+        """
+        skipped_rows = []
+        valid_rows = list(self.iter_mapped_rows(rows, skipped_rows.append))
         return valid_rows, skipped_rows
     
-    def chunk_rows(self, rows: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    def chunk_rows(self, rows: Iterable[Dict[str, Any]]) -> Iterator[List[Dict[str, Any]]]:
         """Split rows into chunks for batch processing"""
-        chunks = []
-        for i in range(0, len(rows), self.CHUNK_SIZE):
-            chunks.append(rows[i:i + self.CHUNK_SIZE])
-        return chunks
+        return iter_chunks(rows, self.CHUNK_SIZE)
+
+
+def iter_chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    """Group a row stream into lists of `size` rows"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+class ImportTotals:
+    """
+    Running totals of a chunked import
+
+    Keeps counters, the first samples and the first errors; every error is
+    kept only with `keep_errors` (verbose reports).
+    """
+
+    SAMPLE_SIZE = 5
+    ERRORS_SAMPLE_SIZE = 20
+
+    def __init__(self, keep_errors: bool = False):
+        self.keep_errors = keep_errors
+        self.replaying = False  # Re-reading chunks a previous run imported (not counted)
+        self.total_rows = 0
+        self.created = 0
+        self.updated = 0
+        self.skipped_rows = 0  # Rows rejected before the upsert (mapping/validation)
+        self.skipped_unchanged = 0  # Rows identical to their last import (not written)
+        self.errors_summary: Dict[str, int] = {}
+        self.errors: List[Dict[str, Any]] = []
+        self.errors_sample: List[Dict[str, Any]] = []
+        self.samples: List[Dict[str, Any]] = []
+        self.sources: List[Dict[str, Any]] = []  # Per-source stats of multi-source imports
+        self.parse_seconds: Optional[float] = None
+        self.cache: Dict[str, int] = {}  # Brand/category cache hits, misses and creations
+
+    def count_rows(self, rows: Iterable[Any]) -> Iterator[Any]:
+        """Pass rows through, counting them as read"""
+        for row in rows:
+            if not self.replaying:
+                self.total_rows += 1
+            yield row
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON-serializable state, restored with restore()"""
+        return {key: value for key, value in vars(self).items() if key != "replaying"}
+
+    def restore(self, data: Dict[str, Any]):
+        for key, value in data.items():
+            setattr(self, key, value)
+
+    def add_error(self, error: Dict[str, Any]):
+        error = {
+            "row_number": error.get("row_number", 0),
+            "ean": error.get("ean"),
+            "reason": error.get("reason", "unknown"),
+            "details": error.get("details"),
+        }
+        self.errors_summary[error["reason"]] = self.errors_summary.get(error["reason"], 0) + 1
+        if len(self.errors_sample) < self.ERRORS_SAMPLE_SIZE:
+            self.errors_sample.append(error)
+        if self.keep_errors:
+            self.errors.append(error)
+
+    def add_skipped(self, error: Dict[str, Any]):
+        if self.replaying:
+            return
+        self.skipped_rows += 1
+        self.add_error(error)
+
+    def add_batch(self, stats: Dict[str, Any]):
+        """Add the statistics of one import_products_bulk / import_products_batch call"""
+        self.created += stats["created"]
+        self.updated += stats["updated"]
+        self.skipped_unchanged += stats.get("skipped_unchanged", 0)
+        for error in stats["errors"]:
+            self.add_error(error)
+        for sample in stats["samples"]:
+            if len(self.samples) < self.SAMPLE_SIZE:
+                self.samples.append(sample)
+        for key, value in stats.get("cache", {}).items():
+            self.cache[key] = self.cache.get(key, 0) + value
+
+    @property
+    def skipped_invalid_ean13(self) -> int:
+        return self.errors_summary.get("invalid_ean13", 0)
+
+    @property
+    def skipped_duplicate(self) -> int:
+        return self.errors_summary.get("duplicate_ean_in_batch", 0) + self.errors_summary.get("duplicate_ean_db", 0)
+
+    @property
+    def skipped_manual(self) -> int:
+        return self.errors_summary.get("manual_blocked", 0)
+
+    @property
+    def skipped(self) -> int:
+        return self.skipped_rows + self.skipped_duplicate + self.skipped_manual
+
+
+def import_in_chunks(
+    rows: Iterable[Dict[str, Any]],
+    import_chunk: Callable[[List[Dict[str, Any]], int], Dict[str, Any]],
+    totals: Any,
+    chunk_size: int = ProductImportService.CHUNK_SIZE,
+    start_chunk: int = 0,
+    on_chunk: Optional[Callable[[int, List[Dict[str, Any]], Dict[str, Any]], None]] = None
+) -> Any:
+    """
+    Drive a row stream through `import_chunk(chunk, batch_index)` one chunk at a time
+    Only the current chunk is held in memory.
+
+    `totals` is an ImportTotals (or EnrichmentTotals). Chunks before
+    `start_chunk` were imported by an earlier run: they are read again but
+    neither imported nor counted. `on_chunk(index, chunk, stats)` runs after
+    each imported chunk.
+    """
+    totals.replaying = start_chunk > 0
+    for idx, chunk in enumerate(iter_chunks(rows, chunk_size)):
+        if idx >= start_chunk:
+            stats = import_chunk(chunk, idx)
+            totals.add_batch(stats)
+            if on_chunk:
+                on_chunk(idx, chunk, stats)
+        # Rows read from here on belong to the next chunk
+        totals.replaying = idx + 1 < start_chunk
+    totals.replaying = False
+    return totals
@@ -0,0 +1,225 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Catalogue response cache
+Serves repeated hits on the public catalogue endpoints without rebuilding the JSON
+
+Responses are keyed by (catalogue version, path, sorted query params, lang,
+API key). Every commit that writes a catalogue table (products, categories,
+brands, tax classes, discounts) bumps the version, so the next request
+already misses; older entries are never read again and age out (LRU / TTL).
+Cached responses keep the endpoint's headers, carry an ETag and
+If-None-Match gets a 304. The middleware sits inside CORSMiddleware, which
+adds the CORS headers to hits and misses alike.
+
+The default backend lives in the process, so with several workers a write
+made in one of them reaches the others after RESPONSE_CACHE_TTL. With
+RESPONSE_CACHE_REDIS_URL the entries and the version are shared by all workers.
+"""
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from loguru import logger
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.core.i18n import FALLBACK_LANG
+from app.db.write_events import on_commit
+
+
+CACHEABLE_PATHS = [
+    re.compile(f"^{settings.API_V1_STR}{pattern}$") for pattern in (
+        r"/v1/products",
+        r"/v1/products/\d+",
+        r"/v1/categories",
+        r"/v1/categories/main",
+        r"/v1/categories/tree",
+        r"/v1/categories/\d+",
+        r"/v1/categories/\d+/(children|subcategories)",
+        r"/v1/categories/children/\d+/products",
+        r"/v1/brands",
+        r"/v1/brands/\d+",
+        r"/v1/tax-classes",
+        r"/v1/tax-classes/\d+",
+    )
+]
+
+# Tables whose writes change catalogue responses (product_* covers the listing,
+# images, translations, variants and product_categories)
+CATALOGUE_TABLE_PREFIXES = ("product", "categor", "brand", "tax_class", "discount")
+
+VERSION_KEY = "catalogue:version"
+
+# Set again on every cached response
+REPLACED_HEADERS = {"content-length", "etag", "cache-control", "x-cache"}
+
+
+class MemoryCacheBackend:
+    """
+    In-process LRU with TTL
+    Implements the get / set(ex=) / incr subset of the Redis client it replaces.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[Optional[float], bytes]]" = OrderedDict()
+        self._counters: Dict[str, int] = {}  # Never evicted
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            if key in self._counters:
+                return str(self._counters[key]).encode()
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires is not None and expires < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: bytes, ex: Optional[int] = None):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ex if ex else None, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def incr(self, key: str) -> int:
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + 1
+            return self._counters[key]
+
+
+def create_backend():
+    """Redis client when RESPONSE_CACHE_REDIS_URL is set, else the in-process LRU"""
+    if settings.RESPONSE_CACHE_REDIS_URL:
+        try:
+            import redis
+            return redis.Redis.from_url(settings.RESPONSE_CACHE_REDIS_URL)
+        except ImportError:
+            logger.warning("RESPONSE_CACHE_REDIS_URL is set but redis is not installed, using the in-process cache")
+    return MemoryCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+
+
+def make_etag(body: bytes) -> str:
+    return '"' + hashlib.blake2b(body, digest_size=16).hexdigest() + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match header (list, weak tags or *) matches the ETag"""
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in tags or etag in (tag[2:] if tag.startswith("W/") else tag for tag in tags)
+
+
+class ResponseCache:
+    """Versioned cache of response bodies"""
+
+    def __init__(self, backend=None):
+        self.backend = backend or create_backend()
+
+    def version(self) -> int:
+        return int(self.backend.get(VERSION_KEY) or 0)
+
+    def bump(self) -> int:
+        """Invalidate every cached response"""
+        return self.backend.incr(VERSION_KEY)
+
+    def key(self, request: Request, version: int) -> str:
+        params = sorted((name, value) for name, value in request.query_params.multi_items() if name != "lang")
+        lang = request.query_params.get("lang") or FALLBACK_LANG
+        # Endpoints behind an API key are only served to callers with the same key
+        api_key = request.headers.get("x-api-key")
+        api_key = hashlib.sha256(api_key.encode()).hexdigest() if api_key else None
+        raw = json.dumps([request.url.path, params, lang, api_key])
+        return f"response:{version}:{hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()}"
+
+    def get(self, key: str) -> Optional[Tuple[str, List[Tuple[str, str]], bytes]]:
+        """(etag, response headers, body) or None"""
+        value = self.backend.get(key)
+        if value is None:
+            return None
+        etag, headers, body = value.split(b"\n", 2)
+        return etag.decode(), [tuple(header) for header in json.loads(headers)], body
+
+    def set(self, key: str, etag: str, headers: List[Tuple[str, str]], body: bytes):
+        value = f"{etag}\n{json.dumps(headers)}\n".encode() + body
+        self.backend.set(key, value, ex=settings.RESPONSE_CACHE_TTL)
+
+
+# Process-wide cache
+response_cache = ResponseCache()
+
+
+def bump_catalogue_version():
+    """Invalidate cached catalogue responses; a cache outage never fails the write"""
+    try:
+        response_cache.bump()
+    except Exception as e:
+        logger.warning(f"Catalogue version not bumped: {str(e)}")
+
+
+# Committed catalogue writes (ORM or bulk statements) invalidate at once
+on_commit(CATALOGUE_TABLE_PREFIXES, bump_catalogue_version)
+
+
+# ============= Middleware =============
+
+class ResponseCacheMiddleware(BaseHTTPMiddleware):
+    """Serve CACHEABLE_PATHS GET requests from the response cache"""
+
+    async def dispatch(self, request: Request, call_next):
+        if (
+            request.method != "GET"
+            or not settings.RESPONSE_CACHE_ENABLED
+            or not any(pattern.match(request.url.path) for pattern in CACHEABLE_PATHS)
+        ):
+            return await call_next(request)
+
+        try:
+            key = response_cache.key(request, response_cache.version())
+            cached = response_cache.get(key)
+        except Exception as e:
+            logger.warning(f"Response cache unavailable: {str(e)}")
+            return await call_next(request)
+
+        if cached:
+            etag, headers, body = cached
+            return self._respond(request, etag, headers, body, "HIT")
+
+        response = await call_next(request)
+        if response.status_code != 200:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        etag = make_etag(body)
+        headers = [
+            (name, value) for name, value in response.headers.items() if name not in REPLACED_HEADERS
+        ]
+        try:
+            response_cache.set(key, etag, headers, body)
+        except Exception as e:
+            logger.warning(f"Response not cached: {str(e)}")
+        return self._respond(request, etag, headers, body, "MISS")
+
+    def _respond(
+        self, request: Request, etag: str, headers: List[Tuple[str, str]], body: bytes, status: str
+    ) -> Response:
+        # no-cache: browsers and CDNs may store it but revalidate with the ETag
+        cache_headers = {"etag": etag, "cache-control": "public, no-cache", "x-cache": status}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=cache_headers)
+        return Response(content=body, headers={**dict(headers), **cache_headers})
@@ -0,0 +1,318 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Autocomplete index
+In-process prefix index for the storefront search box (no database hit per keystroke)
+
+Every bucket is a sorted list of (key, id) tuples searched with bisect:
+- "title:<lang>": every word-start suffix of the active product titles, so
+  "lavatr" matches "Samsung Lavatrice 8kg"
+- "reference" / "ean": active product codes
+- "brand": active brand names
+
+The index is loaded once at startup (load) and kept current by
+app.crud.product_listing.refresh_product_listing (applied when its transaction
+commits) and the brand CRUD. Readers only wait for the swap of changed buckets:
+large updates are merged into new bucket lists before taking the lock.
+"""
+import sys
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, insort
+from heapq import merge
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from loguru import logger
+from sqlalchemy.orm import Session
+
+from app.db import write_events
+from app.models.brand import Brand
+from app.models.product import Product, ProductTranslation
+
+
+SUGGEST_LANGS = ["it", "en", "fr", "de", "ar"]
+MAX_KEY_LENGTH = 64  # Longer suffixes never help a type-ahead prefix
+BULK_UPDATE_KEYS = 1000  # Above this many key changes, buckets are rebuilt outside the lock
+
+# (product id, [(bucket, key)], {reference, ean, titles} or None when dropped)
+ProductEntry = Tuple[int, List[Tuple[str, str]], Optional[Dict[str, Any]]]
+
+
+def normalize(text: Optional[str]) -> str:
+    """Lowercase, strip accents and collapse whitespace"""
+    if not text:
+        return ""
+    text = unicodedata.normalize("NFKD", text)
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.lower().split())
+
+
+def word_suffixes(text: str) -> List[str]:
+    """Suffixes of a normalized text starting at each word"""
+    suffixes = []
+    start = 0
+    while start < len(text):
+        suffixes.append(text[start:start + MAX_KEY_LENGTH])
+        space = text.find(" ", start)
+        if space == -1:
+            break
+        start = space + 1
+    return suffixes
+
+
+class SuggestIndex:
+    """Sorted-array prefix index over product titles, codes and brands"""
+
+    def __init__(self):
+        self._lock = threading.Lock()  # Readers and the swap of changes
+        self._write_lock = threading.Lock()  # One writer at a time
+        self._reset()
+
+    def _reset(self):
+        self._buckets: Dict[str, List[Tuple[str, int]]] = {}
+        self._product_keys: Dict[int, List[Tuple[str, str]]] = {}  # product id -> [(bucket, key)]
+        self._products: Dict[int, Dict[str, Any]] = {}  # product id -> {reference, ean, titles}
+        self._brands: Dict[int, str] = {}
+        self.loaded_at: Optional[float] = None
+
+    # ============= Building =============
+
+    def _add(self, bucket: str, key: str, item_id: int):
+        insort(self._buckets.setdefault(bucket, []), (key, item_id))
+
+    def _discard(self, bucket: str, key: str, item_id: int):
+        entries = self._buckets.get(bucket)
+        if not entries:
+            return
+        pos = bisect_left(entries, (key, item_id))
+        if pos < len(entries) and entries[pos] == (key, item_id):
+            del entries[pos]
+
+    @staticmethod
+    def _keys_for_product(reference: str, ean: Optional[str], titles: Dict[str, str]) -> List[Tuple[str, str]]:
+        """(bucket, key) pairs of a product; `titles` maps lang -> title"""
+        keys = []
+        for lang, title in titles.items():
+            for suffix in set(word_suffixes(normalize(title))):
+                keys.append((f"title:{lang}", suffix))
+        if reference:
+            keys.append(("reference", normalize(reference)))
+        if ean:
+            keys.append(("ean", normalize(ean)))
+        return [(bucket, key) for bucket, key in keys if key]
+
+    def _set_brand(self, brand_id: int, name: Optional[str]):
+        old = self._brands.pop(brand_id, None)
+        if old is not None:
+            self._discard("brand", normalize(old), brand_id)
+        if name and normalize(name):
+            self._brands[brand_id] = name
+            self._add("brand", normalize(name), brand_id)
+
+    @staticmethod
+    def _titles_by_lang(translations: Iterable[Tuple[str, str]]) -> Dict[str, str]:
+        """lang -> title for every suggest language, falling back to Italian"""
+        available = {lang: title for lang, title in translations if title}
+        fallback = available.get("it")
+        titles = {}
+        for lang in SUGGEST_LANGS:
+            title = available.get(lang, fallback)
+            if title:
+                titles[lang] = title
+        return titles
+
+    def load(self, db: Session) -> Dict[str, Any]:
+        """(Re)build the whole index from the database"""
+        started = time.perf_counter()
+
+        products = db.query(Product.id, Product.reference, Product.ean).filter(
+            Product.is_active == True
+        ).all()
+        translations: Dict[int, List[Tuple[str, str]]] = {}
+        for product_id, lang, title in db.query(
+            ProductTranslation.product_id, ProductTranslation.lang, ProductTranslation.title
+        ).join(Product, Product.id == ProductTranslation.product_id).filter(Product.is_active == True):
+            translations.setdefault(product_id, []).append((lang, title))
+        brands = db.query(Brand.id, Brand.name).filter(Brand.is_active == True).all()
+
+        # Build unsorted, sort once, then swap in
+        fresh = SuggestIndex()
+        for product_id, reference, ean in products:
+            titles = self._titles_by_lang(translations.get(product_id, []))
+            keys = self._keys_for_product(reference, ean, titles)
+            fresh._products[product_id] = {"reference": reference, "ean": ean, "titles": titles}
+            fresh._product_keys[product_id] = keys
+            for bucket, key in keys:
+                fresh._buckets.setdefault(bucket, []).append((key, product_id))
+        for brand_id, name in brands:
+            fresh._brands[brand_id] = name
+            fresh._buckets.setdefault("brand", []).append((normalize(name), brand_id))
+        for entries in fresh._buckets.values():
+            entries.sort()
+
+        with self._write_lock, self._lock:
+            self._buckets = fresh._buckets
+            self._product_keys = fresh._product_keys
+            self._products = fresh._products
+            self._brands = fresh._brands
+            self.loaded_at = time.time()
+
+        took_ms = round((time.perf_counter() - started) * 1000, 1)
+        logger.info(f"Suggest index loaded: {len(products)} products, {len(brands)} brands in {took_ms} ms")
+        return {"products": len(products), "brands": len(brands), "took_ms": took_ms}
+
+    # ============= Incremental Updates =============
+
+    def update_products(self, db: Session, products: Iterable[Product], removed_ids: Iterable[int] = ()):
+        """
+        Re-index products loaded with translations once `db` commits
+
+        Inactive products and `removed_ids` are dropped from the index. Nothing
+        changes if the transaction rolls back.
+        """
+        entries: List[ProductEntry] = [(product_id, [], None) for product_id in removed_ids]
+        for product in products:
+            if not product.is_active:
+                entries.append((product.id, [], None))
+                continue
+            titles = self._titles_by_lang((t.lang, t.title) for t in product.translations)
+            entries.append((
+                product.id,
+                self._keys_for_product(product.reference, product.ean, titles),
+                {"reference": product.reference, "ean": product.ean, "titles": titles}
+            ))
+
+        def apply_suggest_updates():
+            self._apply_products(entries)
+
+        write_events.after_commit(db, apply_suggest_updates)
+
+    def _apply_products(self, entries: List[ProductEntry]):
+        with self._write_lock:
+            dropped: Dict[str, Set[Tuple[str, int]]] = {}
+            added: Dict[str, List[Tuple[str, int]]] = {}
+            for product_id, keys, _ in entries:
+                for bucket, key in self._product_keys.get(product_id, []):
+                    dropped.setdefault(bucket, set()).add((key, product_id))
+                for bucket, key in keys:
+                    added.setdefault(bucket, []).append((key, product_id))
+
+            changes = sum(map(len, dropped.values())) + sum(map(len, added.values()))
+            if changes <= BULK_UPDATE_KEYS:
+                with self._lock:
+                    for bucket, items in dropped.items():
+                        for key, product_id in items:
+                            self._discard(bucket, key, product_id)
+                    for bucket, items in added.items():
+                        for key, product_id in items:
+                            self._add(bucket, key, product_id)
+                    self._set_products(entries)
+                return
+
+            # Only this thread changes the buckets: merge outside the lock, then swap
+            buckets = {}
+            for bucket in dropped.keys() | added.keys():
+                gone = dropped.get(bucket, set())
+                kept = [entry for entry in self._buckets.get(bucket, []) if entry not in gone]
+                buckets[bucket] = list(merge(kept, sorted(added.get(bucket, []))))
+            with self._lock:
+                self._buckets.update(buckets)
+                self._set_products(entries)
+
+    def _set_products(self, entries: List[ProductEntry]):
+        for product_id, keys, data in entries:
+            self._product_keys.pop(product_id, None)
+            self._products.pop(product_id, None)
+            if data:
+                self._product_keys[product_id] = keys
+                self._products[product_id] = data
+
+    def update_brand(self, brand: Brand):
+        """Index a created/updated brand (inactive brands are dropped)"""
+        with self._write_lock, self._lock:
+            self._set_brand(brand.id, brand.name if brand.is_active else None)
+
+    def remove_brand(self, brand_id: int):
+        with self._write_lock, self._lock:
+            self._set_brand(brand_id, None)
+
+    # ============= Queries =============
+
+    def _prefix_ids(self, bucket: str, prefix: str, limit: int) -> List[int]:
+        """Distinct ids whose key starts with `prefix`, in key order"""
+        entries = self._buckets.get(bucket)
+        if not entries or not prefix:
+            return []
+        ids = []
+        seen = set()
+        pos = bisect_left(entries, (prefix,))
+        while pos < len(entries) and len(ids) < limit:
+            key, item_id = entries[pos]
+            if not key.startswith(prefix):
+                break
+            if item_id not in seen:
+                seen.add(item_id)
+                ids.append(item_id)
+            pos += 1
+        return ids
+
+    def suggest(self, q: str, lang: str = "it", limit: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+        """Products (by title, then reference/EAN) and brands starting with `q`"""
+        prefix = normalize(q)
+        with self._lock:
+            product_ids = self._prefix_ids(f"title:{lang}", prefix, limit)
+            for bucket in ("reference", "ean"):
+                if len(product_ids) >= limit:
+                    break
+                for product_id in self._prefix_ids(bucket, prefix, limit):
+                    if product_id not in product_ids and len(product_ids) < limit:
+                        product_ids.append(product_id)
+
+            products = []
+            for product_id in product_ids:
+                data = self._products[product_id]
+                products.append({
+                    "id": product_id,
+                    "title": data["titles"].get(lang),
+                    "reference": data["reference"],
+                    "ean": data["ean"],
+                })
+            brands = [
+                {"id": brand_id, "name": self._brands[brand_id]}
+                for brand_id in self._prefix_ids("brand", prefix, limit)
+            ]
+
+        return {"products": products, "brands": brands}
+
+    def memory_report(self) -> Dict[str, Any]:
+        """Entry counts and approximate memory held by the index"""
+        with self._lock:
+            buckets = {}
+            total_bytes = 0
+            for bucket, entries in sorted(self._buckets.items()):
+                size = sys.getsizeof(entries) + sum(
+                    sys.getsizeof(entry) + sys.getsizeof(entry[0]) for entry in entries
+                )
+                buckets[bucket] = {"entries": len(entries), "bytes": size}
+                total_bytes += size
+
+            for product_id, keys in self._product_keys.items():
+                total_bytes += sys.getsizeof(keys) + sum(sys.getsizeof(k) for k in keys)
+            for data in self._products.values():
+                total_bytes += sys.getsizeof(data) + sum(sys.getsizeof(t) for t in data["titles"].values())
+
+            return {
+                "products": len(self._products),
+                "brands": len(self._brands),
+                "buckets": buckets,
+                "approx_bytes": total_bytes,
+                "approx_mb": round(total_bytes / (1024 * 1024), 2),
+                "loaded_at": self.loaded_at,
+            }
+
+
+# Process-wide index
+suggest_index = SuggestIndex()
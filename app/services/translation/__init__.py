@@ -0,0 +1,40 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+from typing import Optional
+from app.services.translation.base import TranslationBackend, TranslationBackendError
+from app.services.translation.stub import StubTranslationBackend
+from app.core.config import settings
+
+
+def get_translation_backend(name: Optional[str] = None) -> TranslationBackend:
+    """
+    Create the configured translation backend
+    
+    Args:
+        name: Backend name ('google', 'stub'). If None, uses settings.TRANSLATION_BACKEND.
+    
+    Raises:
+        ValueError: If backend name is invalid
+    """
+    name = name or settings.TRANSLATION_BACKEND
+    
+    if name == "stub":
+        return StubTranslationBackend()
+    
+    elif name == "google":
+        from app.services.translation.google import GoogleTranslationBackend
+        return GoogleTranslationBackend()
+    
+    else:
+        raise ValueError(f"Unknown translation backend: {name}")
+
+
+# Export main classes
+__all__ = [
+    "TranslationBackend",
+    "TranslationBackendError",
+    "StubTranslationBackend",
+    "get_translation_backend"
+]
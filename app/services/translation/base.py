@@ -0,0 +1,32 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+from abc import ABC, abstractmethod
+from typing import List
+
+
+class TranslationBackendError(Exception):
+    """Raised when a translation backend cannot translate a batch"""
+    pass
+
+
+class TranslationBackend(ABC):
+    """
+    Abstract base class for machine translation backends
+    
+    Backends translate whole batches so the pipeline makes one call per
+    target language instead of one per field.
+    """
+    
+    name = "base"
+    
+    @abstractmethod
+    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        """
+        Translate `texts` from `source_lang` to `target_lang`
+        
+        Returns the translations in the same order.
+        Raises TranslationBackendError on failure.
+        """
+        pass
@@ -0,0 +1,25 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+from typing import List
+from deep_translator import GoogleTranslator
+
+from app.services.translation.base import TranslationBackend, TranslationBackendError
+
+
+class GoogleTranslationBackend(TranslationBackend):
+    """Google Translate through deep_translator"""
+    
+    name = "google"
+    
+    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        if not texts:
+            return []
+        try:
+            translated = GoogleTranslator(source=source_lang, target=target_lang).translate_batch(texts)
+        except Exception as e:
+            raise TranslationBackendError(str(e))
+        
+        # deep_translator returns None for texts it could not translate
+        return [result or text for text, result in zip(texts, translated)]
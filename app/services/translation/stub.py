@@ -0,0 +1,25 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+from typing import List
+
+from app.services.translation.base import TranslationBackend
+
+
+class StubTranslationBackend(TranslationBackend):
+    """
+    Local backend for tests and development - no network calls
+    
+    "Lavatrice" -> "[en] Lavatrice". Every call is recorded in `calls` as
+    (source_lang, target_lang, texts).
+    """
+    
+    name = "stub"
+    
+    def __init__(self):
+        self.calls = []
+    
+    def translate_batch(self, texts: List[str], source_lang: str, target_lang: str) -> List[str]:
+        self.calls.append((source_lang, target_lang, list(texts)))
+        return [f"[{target_lang}] {text}" for text in texts]
@@ -0,0 +1,71 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+import threading
+
+from loguru import logger
+
+from app.core.config import settings
+
+
+class TranslationWorker:
+    """
+    Background thread draining the translation job queue
+    
+    Polls every TRANSLATION_WORKER_INTERVAL seconds; wake() makes it run at
+    once after new jobs are committed. Runs in every API process - jobs are
+    claimed with SKIP LOCKED, so processes never translate the same job.
+    """
+    
+    def __init__(self):
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="translation-worker", daemon=True)
+        self._thread.start()
+        logger.info("Translation worker started")
+    
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+    
+    def wake(self):
+        self._wake.set()
+    
+    def _run(self):
+        from app.db.session import SessionLocal
+        from app.crud.translation import process_translation_jobs
+        from app.services.translation import get_translation_backend
+        
+        backend = get_translation_backend()
+        while not self._stop.is_set():
+            self._wake.clear()
+            db = SessionLocal()
+            try:
+                # Drain the queue, then sleep
+                while not self._stop.is_set():
+                    stats = process_translation_jobs(db, backend)
+                    if stats["jobs"]:
+                        logger.info(f"Translation batch: {stats}")
+                    if stats["jobs"] < settings.TRANSLATION_BATCH_SIZE:
+                        break
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Translation worker error: {str(e)}")
+            finally:
+                db.close()
+            
+            self._wake.wait(settings.TRANSLATION_WORKER_INTERVAL)
+
+
+# Process-wide worker
+translation_worker = TranslationWorker()
@@ -0,0 +1,111 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Warranty registration
+Registers queued warranty contracts with Garanzia3, off the payment path
+
+Payment webhooks, order creation and payment syncs only queue pending
+warranty_registrations rows, in the same transaction as the status change
+(an outbox). The worker claims due rows and registers them with at most
+WARRANTY_REGISTRATION_CONCURRENCY calls in flight; connection errors and
+5xx answers are retried later with backoff. The database side is in
+app.crud.warranty_registration.
+"""
+import asyncio
+import threading
+from typing import Any, Dict
+
+from loguru import logger
+
+from app.core.config import settings
+from app.db.write_events import on_commit
+from app.services.garanzia3_service import garanzia3_service
+
+
+# Garanzia3 did not answer or was unavailable: the contract was not created.
+# Timeouts are not retried (the contract may exist), an admin retries them.
+RETRYABLE_ERRORS = {"connection_error", "http_error"}
+
+
+async def register_warranties(jobs: Dict[int, Dict[str, str]]) -> Dict[int, Dict[str, Any]]:
+    """
+    Register {registration id: register_warranty arguments} concurrently
+    Returns {registration id: register_warranty result}
+    """
+    semaphore = asyncio.Semaphore(settings.WARRANTY_REGISTRATION_CONCURRENCY)
+
+    async def register(arguments):
+        async with semaphore:
+            try:
+                return await garanzia3_service.register_warranty(**arguments)
+            except Exception as e:
+                return {"success": False, "error": str(e), "error_code": "unknown"}
+
+    results = await asyncio.gather(*(register(arguments) for arguments in jobs.values()))
+    return dict(zip(jobs, results))
+
+
+class WarrantyRegistrationWorker:
+    """
+    Background thread registering queued warranties
+
+    Polls every WARRANTY_REGISTRATION_INTERVAL seconds; a commit that queues
+    registrations in this process wakes it at once.
+    """
+
+    def __init__(self):
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="warranty-registration-worker", daemon=True)
+        self._thread.start()
+        logger.info("Warranty registration worker started")
+
+    def stop(self, timeout: float = 5.0):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def wake(self):
+        self._wake.set()
+
+    def _run(self):
+        from app.db.session import SessionLocal
+        from app.crud.warranty_registration import crud_warranty_registration
+
+        while not self._stop.is_set():
+            self._wake.clear()
+            db = SessionLocal()
+            try:
+                # Drain the due registrations batch by batch
+                while not self._stop.is_set():
+                    stats = crud_warranty_registration.run_pending(db)
+                    if stats["claimed"]:
+                        logger.info(
+                            f"Warranty registration: {stats['registered']} registered, "
+                            f"{stats['retried']} to retry, {stats['failed']} failed"
+                        )
+                    if stats["claimed"] < settings.WARRANTY_REGISTRATION_BATCH_SIZE:
+                        break
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Warranty registration worker error: {str(e)}")
+            finally:
+                db.close()
+
+            self._wake.wait(settings.WARRANTY_REGISTRATION_INTERVAL)
+
+
+# Process-wide worker
+warranty_registration_worker = WarrantyRegistrationWorker()
+
+on_commit(("warranty_registrations",), warranty_registration_worker.wake)
@@ -14,6 +14,7 @@ from app.core.exceptions_handlers import (
     general_exception_handler
 )
 from app.core.logging_config import setup_logging
+from app.services.response_cache import ResponseCacheMiddleware
 from loguru import logger
 
 # Setup logging
@@ -27,6 +28,9 @@ app = FastAPI(
     redoc_url="/redoc",
 )
 
+# Cache public catalogue responses (ETag / 304); added first so CORS wraps it
+app.add_middleware(ResponseCacheMiddleware)
+
 # Configure CORS
 app.add_middleware(
     CORSMiddleware,
@@ -50,12 +54,75 @@ async def startup_event():
     """Startup event"""
     logger.info(f"Starting {settings.PROJECT_NAME}")
     logger.info(f"Documentation available at: /docs")
+    
+    # Fill product_listing on the first start after its migration,
+    # then warm the in-memory autocomplete index (the API still works without it)
+    from app.db.session import SessionLocal
+    from app.crud.product_listing import ensure_product_listing
+    from app.services.suggest_index import suggest_index
+    db = SessionLocal()
+    try:
+        rebuilt = ensure_product_listing(db)
+        if rebuilt:
+            logger.info(f"Product listing built: {rebuilt['products']} products, {rebuilt['rows']} rows")
+    except Exception as e:
+        db.rollback()
+        logger.warning(f"Product listing not built: {str(e)}")
+    try:
+        suggest_index.load(db)
+    except Exception as e:
+        logger.warning(f"Suggest index not loaded: {str(e)}")
+    finally:
+        db.close()
+    
+    # Machine translations of new products/categories
+    if settings.TRANSLATION_WORKER_ENABLED:
+        from app.services.translation.worker import translation_worker
+        translation_worker.start()
+    
+    # Queued product imports
+    if settings.IMPORT_WORKER_ENABLED:
+        from app.services.import_worker import import_worker
+        import_worker.start()
+    
+    # Supplier image URLs copied to Cloudinary
+    if settings.IMAGE_INGESTION_ENABLED:
+        from app.services.image_ingestion import image_ingestion_worker
+        image_ingestion_worker.start()
+    
+    # Garanzia3 registrations queued by payments
+    if settings.WARRANTY_REGISTRATION_ENABLED:
+        from app.services.warranty_registration import warranty_registration_worker
+        warranty_registration_worker.start()
+    
+    # Scheduled check of pending PayPal / Floa payments
+    if settings.PAYMENT_RECONCILIATION_ENABLED:
+        from app.services.payment_reconciliation import payment_reconciliation_worker
+        payment_reconciliation_worker.start()
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Shutdown event"""
     logger.info(f"Shutting down {settings.PROJECT_NAME}")
+    
+    from app.services.translation.worker import translation_worker
+    translation_worker.stop()
+    
+    from app.services.import_worker import import_worker
+    import_worker.stop()
+    
+    from app.services.image_ingestion import image_ingestion_worker
+    image_ingestion_worker.stop()
+    
+    from app.services.payment_reconciliation import payment_reconciliation_worker
+    payment_reconciliation_worker.stop()
+    
+    from app.services.warranty_registration import warranty_registration_worker
+    warranty_registration_worker.stop()
+    
+    from app.integrations.http import close_clients
+    await close_clients()
 
 
 @app.get("/run-migration-temp")
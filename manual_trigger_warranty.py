@@ -1,6 +1,6 @@
 """
 Manually trigger warranty auto-registration for Order 14
-This script calls the API directly to complete the order and register warranties
+This script completes the order, queues its warranties and registers them now
 """
 import asyncio
 import sys
@@ -9,7 +9,7 @@ sys.path.append('/f/onebby-api')
 from sqlalchemy.orm import Session
 from app.db.session import SessionLocal
 from app.models.order import Order
-from app.api.v1.webhooks import auto_register_warranties
+from app.crud.warranty_registration import crud_warranty_registration
 
 async def main():
     # Get database session
@@ -47,23 +47,25 @@ async def main():
         order.payment_status = 'completed'
         order.payment_transaction_id = 'manual_test_completion'
         
+        # Queued in the same transaction, like the payment webhooks do
+        queued = crud_warranty_registration.enqueue_for_order(db, order)
         db.commit()
         db.refresh(order)
         
-        print(f"✅ Order 14 updated to completed")
+        print(f"✅ Order 14 updated to completed ({queued} registration(s) queued)")
         
-        # Trigger auto warranty registration
+        # Register the queued warranties now instead of waiting for the worker
         print("\n" + "=" * 80)
         print("TRIGGERING AUTO WARRANTY REGISTRATION")
         print("=" * 80)
         
-        await auto_register_warranties(db, order)
+        ids = [reg.id for reg in crud_warranty_registration.get_by_order(db, order_id=14)]
+        claimed = crud_warranty_registration.claim_due(db, limit=len(ids), ids=ids) if ids else []
+        stats = await crud_warranty_registration.register_now(db, claimed) if claimed else {}
         
-        print(f"✅ Auto warranty registration completed")
+        print(f"✅ Auto warranty registration completed: {stats}")
         
         # Check registrations
-        from app.crud.warranty_registration import crud_warranty_registration
-        
         registrations = crud_warranty_registration.get_by_order(db, order_id=14)
         
         print(f"\n" + "=" * 80)
@@ -0,0 +1,5 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+# Micro-benchmarks (run as modules, not collected by pytest)
@@ -0,0 +1,133 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Benchmark: row-by-row vs set-based product enrichment over the bundled Listino *.xlsx files
+
+The enrichment files are read once. For each path a fresh temporary SQLite
+database is seeded with the files' brands and one bare product per EAN (no
+translation, price, brand or images), then enriched twice (first run fills,
+second run finds everything filled). Reports wall time, rows per second and
+SQL statements.
+
+Run: python -m tests.benchmarks.bench_product_enrichment [max_rows]
+"""
+import os
+import sys
+import tempfile
+import time
+from functools import partial
+
+from slugify import slugify
+from sqlalchemy import create_engine, event
+
+from app.db.session import Base, SessionLocal
+from app.api.v1.import_products import EXCEL_DIR, ENRICHMENT_DEFAULTS
+from app.crud.import_cache import ImportCaches
+from app.crud.product_import import (
+    enrich_products_batch, enrich_products_bulk, get_or_create_default_tax_class, _clean_ean
+)
+from app.models.brand import Brand
+from app.models.product import Product, ProductType, ProductCondition, StockStatus
+from app.services.product_enrichment import EnrichmentReader
+from app.services.product_import import ProductImportService, iter_chunks
+
+
+def load_chunks(max_rows=None):
+    rows = []
+    for filename in ENRICHMENT_DEFAULTS.values():
+        path = EXCEL_DIR / filename
+        if path.exists():
+            rows.extend(row for row in EnrichmentReader(path).iter_rows() if _clean_ean(row.get("ean")))
+    if max_rows:
+        rows = rows[:max_rows]
+    return list(iter_chunks(rows, ProductImportService.CHUNK_SIZE)), rows
+
+
+def seed(db, rows):
+    # Brands exist up front: on SQLite, get_or_create_brand's own session would
+    # wait for the main session's write lock on every new brand
+    brands = {}
+    for row in rows:
+        name = " ".join(str(row.get("brand_name") or "").split())
+        if name and slugify(name) and slugify(name) not in brands:
+            brands[slugify(name)] = name
+    if brands:
+        db.execute(Brand.__table__.insert(), [
+            {"name": name, "slug": slug, "is_active": True, "sort_order": 0} for slug, name in brands.items()
+        ])
+
+    tax_class_id = get_or_create_default_tax_class(db).id
+    eans = list(dict.fromkeys(_clean_ean(row["ean"]) for row in rows))
+    db.execute(Product.__table__.insert(), [
+        {
+            "product_type": ProductType.SIMPLE,
+            "reference": ean,
+            "ean": ean,
+            "is_active": True,
+            "condition": ProductCondition.NEW,
+            "tax_class_id": tax_class_id,
+            "tax_included_in_price": False,
+            "currency": "EUR",
+            "stock_status": StockStatus.OUT_OF_STOCK,
+            "stock_quantity": 0,
+        }
+        for ean in eans
+    ])
+    db.commit()
+
+
+def run(enrich_fn, chunks, rows):
+    fd, path = tempfile.mkstemp(suffix=".db")
+    os.close(fd)
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+
+    @event.listens_for(engine, "connect")
+    def no_fsync(dbapi_connection, connection_record):
+        # Measure the SQL work, not the disk: both paths commit once per chunk
+        dbapi_connection.execute("PRAGMA synchronous=OFF")
+    # get_or_create_brand opens its own session
+    SessionLocal.configure(bind=engine)
+
+    statements = [0]
+    timings = []
+    db = SessionLocal()
+    try:
+        seed(db, rows)
+
+        @event.listens_for(engine, "before_cursor_execute")
+        def count(*args):
+            statements[0] += 1
+
+        for _ in range(2):
+            started = time.perf_counter()
+            for idx, chunk in enumerate(chunks):
+                enrich_fn(db, [dict(row) for row in chunk], False, idx)
+            timings.append(time.perf_counter() - started)
+    finally:
+        db.close()
+        engine.dispose()
+        os.unlink(path)
+    return timings, statements[0]
+
+
+def main():
+    chunks, rows = load_chunks(int(sys.argv[1]) if len(sys.argv) > 1 else None)
+    print(f"{len(rows)} enrichment rows in {len(chunks)} chunks")
+    print(f"{'path':<12}{'fill s':>10}{'re-run s':>10}{'rows/s':>10}{'statements':>12}")
+    results = {}
+    for name, enrich_fn in (
+        ("row-by-row", enrich_products_batch),
+        ("bulk", partial(enrich_products_bulk, caches=ImportCaches())),
+    ):
+        timings, statements = run(enrich_fn, chunks, rows)
+        results[name] = sum(timings)
+        rows_per_second = round(2 * len(rows) / sum(timings))
+        print(f"{name:<12}{timings[0]:>10.2f}{timings[1]:>10.2f}{rows_per_second:>10}{statements:>12}")
+    print(f"speedup: {results['row-by-row'] / results['bulk']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
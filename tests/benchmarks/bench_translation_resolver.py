@@ -0,0 +1,68 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+"""
+Micro-benchmark: resolving the translations of a product with 200 features
+
+Compares the old two-scan `next(...)` pattern on fully loaded collections with
+resolve_translation on the same collections and on collections loaded with
+fallback_langs (what get_product(lang=...) now loads).
+
+Run: python -m tests.benchmarks.bench_translation_resolver
+"""
+import timeit
+
+from app.core.i18n import SUPPORTED_LANGS, fallback_langs, resolve_translation
+from app.models.product import Product, ProductFeature, ProductFeatureTranslation
+
+
+FEATURES = 200
+ROUNDS = 200
+
+
+def build_product(langs):
+    product = Product(reference="BENCH")
+    for i in range(FEATURES):
+        feature = ProductFeature(code=f"feature_{i}")
+        feature.translations = [
+            ProductFeatureTranslation(lang=lang, name=f"Name {i}", value=f"Value {i}")
+            for lang in langs
+        ]
+        product.features.append(feature)
+    return product
+
+
+def legacy(product, lang):
+    names = []
+    for feat in product.features:
+        feat_trans = next((t for t in feat.translations if t.lang == lang), None)
+        if not feat_trans:
+            feat_trans = next((t for t in feat.translations if t.lang == "it"), None)
+        names.append(feat_trans.name)
+    return names
+
+
+def resolver(product, lang):
+    return [resolve_translation(feat.translations, lang).name for feat in product.features]
+
+
+def main():
+    # "ar" has no feature translations here, so it exercises the fallback
+    full = build_product(["it", "en", "fr", "de"])
+
+    print(f"{FEATURES} features, {ROUNDS} rounds, microseconds per product")
+    print(f"{'lang':<6}{'legacy':>10}{'resolver':>10}{'filtered':>10}{'speedup':>10}")
+    for lang in SUPPORTED_LANGS:
+        filtered = build_product([l for l in ["it", "en", "fr", "de"] if l in fallback_langs(lang)])
+        assert legacy(full, lang) == resolver(full, lang) == resolver(filtered, lang)
+
+        timings = [
+            timeit.timeit(lambda: fn(product, lang), number=ROUNDS) / ROUNDS * 1e6
+            for fn, product in ((legacy, full), (resolver, full), (resolver, filtered))
+        ]
+        print(f"{lang:<6}{timings[0]:>10.0f}{timings[1]:>10.0f}{timings[2]:>10.0f}{timings[0] / timings[2]:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,11 +2,33 @@
 # © 2026 Muthana. All rights reserved.
 # Unauthorized copying or distribution is prohibited.
 
+import os
+
+# Background workers would poll the real DATABASE_URL, not the test database
+for flag in (
+    "TRANSLATION_WORKER_ENABLED", "IMPORT_WORKER_ENABLED", "IMAGE_INGESTION_ENABLED",
+    "WARRANTY_REGISTRATION_ENABLED", "PAYMENT_RECONCILIATION_ENABLED"
+):
+    os.environ[flag] = "false"
+
+import threading
+from http.server import ThreadingHTTPServer
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 from app.db.session import Base, get_db
+from app.crud.product_listing import refresh_product_listing
+from app.models.order import Order
+from app.models.product import (
+    Product, ProductTranslation, ProductImage, ProductImageAlt,
+    ProductFeature, ProductFeatureTranslation,
+    ProductAttribute, ProductAttributeTranslation, ProductDiscount
+)
+from app.models.tax_class import TaxClass
+from app.services.response_cache import bump_catalogue_version
+from app.services.category_tree import category_tree
 from main import app
 
 # Test database URL (use SQLite for testing)
@@ -40,6 +62,99 @@ def client(db):
             db.close()
     
     app.dependency_overrides[get_db] = override_get_db
+    # Responses and snapshots cached by earlier tests belong to another database
+    bump_catalogue_version()
+    category_tree.invalidate()
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
+
+
+# ============= Factories =============
+
+def _tax_class(db) -> TaxClass:
+    tax = db.query(TaxClass).first()
+    if not tax:
+        tax = TaxClass(name="IVA 22%", rate=22.0)
+        db.add(tax)
+        db.flush()
+    return tax
+
+
+@pytest.fixture
+def make_product(db):
+    """make_product(reference, **fields): a flushed product (price 100, IVA 22%)"""
+    def make(reference: str, **fields) -> Product:
+        product = Product(**{"reference": reference, "tax_class_id": _tax_class(db).id, "price_list": 100.0, **fields})
+        db.add(product)
+        db.flush()
+        return product
+    return make
+
+
+@pytest.fixture
+def seed_products(db):
+    """seed_products(count): committed products with every relation the listing touches, listing refreshed"""
+    def seed(count: int):
+        tax = _tax_class(db)
+        products = []
+        for i in range(count):
+            product = Product(reference=f"REF-{i}", tax_class_id=tax.id, price_list=100.0)
+            product.translations = [
+                ProductTranslation(lang="it", title=f"Prodotto {i}"),
+                ProductTranslation(lang="en", title=f"Product {i}"),
+                ProductTranslation(lang="de", title=f"Produkt {i}"),
+            ]
+            image = ProductImage(url=f"https://img/{i}.jpg", position=1)
+            image.alt_texts = [ProductImageAlt(lang="en", alt_text=f"alt {i}")]
+            product.images = [image]
+            feature = ProductFeature(code="color")
+            feature.translations = [ProductFeatureTranslation(lang="it", name="Colore", value="Rosso")]
+            product.features = [feature]
+            attribute = ProductAttribute(code="size")
+            attribute.translations = [ProductAttributeTranslation(lang="en", name="Size", value="L")]
+            product.attributes = [attribute]
+            product.discounts = [ProductDiscount(discount_type="percentage", discount_value=10, priority=1)]
+            db.add(product)
+            products.append(product)
+
+        db.commit()
+        refresh_product_listing(db, [p.id for p in products])
+    return seed
+
+
+@pytest.fixture
+def make_order(db):
+    """make_order(payment_method, payment_id, **fields): a committed pending order of 10 EUR"""
+    def make(payment_method: str = "paypal", payment_id=None, **fields) -> Order:
+        order = Order(**{
+            "customer_info": {"email": "mario@example.com"},
+            "billing_address": {"name": "Mario"},
+            "shipping_address": {"name": "Mario"},
+            "subtotal": 10, "total_amount": 10,
+            "payment_method": payment_method,
+            "payment_info": {"payment_id": payment_id} if payment_id is not None else None,
+            **fields
+        })
+        db.add(order)
+        db.commit()
+        return order
+    return make
+
+
+@pytest.fixture
+def stub_server():
+    """stub_server(handler_class): base URL of a local HTTP server running the handler"""
+    servers = []
+
+    def start(handler) -> str:
+        quiet = type(handler.__name__, (handler,), {"log_message": lambda self, *args: None})
+        server = ThreadingHTTPServer(("127.0.0.1", 0), quiet)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
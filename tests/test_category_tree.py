@@ -0,0 +1,58 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+from app.models.category import Category, CategoryTranslation
+from app.services.category_tree import category_tree
+
+
+def test_category_tree_snapshot_and_endpoint(client, db):
+    home = Category(name="Casa", slug="casa", sort_order=2)
+    tech = Category(name="Tecnologia", slug="tecnologia", sort_order=1)
+    db.add_all([home, tech])
+    db.flush()
+    phones = Category(name="Telefoni", slug="telefoni", parent_id=tech.id, sort_order=2)
+    tv = Category(name="TV", slug="tv", parent_id=tech.id, sort_order=1)
+    db.add_all([phones, tv])
+    db.flush()
+    smartphones = Category(name="Smartphone", slug="smartphone", parent_id=phones.id)
+    hidden = Category(name="Nascosta", slug="nascosta", parent_id=home.id, is_active=False)
+    db.add_all([smartphones, hidden])
+    db.add(CategoryTranslation(category_id=phones.id, lang="en", name="Phones", slug="phones"))
+    db.commit()
+    ids = {c.slug: c.id for c in db.query(Category)}
+
+    tree = category_tree.get(db)
+    assert tree.subtree_ids(ids["tecnologia"]) == [ids["tecnologia"], ids["tv"], ids["telefoni"], ids["smartphone"]]
+    assert tree.is_descendant(ids["smartphone"], ids["tecnologia"])
+    assert not tree.is_descendant(ids["tecnologia"], ids["smartphone"])
+    assert not tree.is_descendant(ids["nascosta"], ids["tecnologia"])
+
+    response = client.get("/api/v1/categories/tree", params={"lang": "en"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["meta"]["total"] == 5
+    assert [c["slug"] for c in data["data"]] == ["tecnologia", "casa"]
+    assert [c["name"] for c in data["data"][0]["children"]] == ["TV", "Phones"]
+    assert data["data"][0]["children"][1]["children"][0]["slug"] == "smartphone"
+    assert data["data"][1]["children"] == []
+
+    # A committed category write rebuilds the snapshot
+    db.add(Category(name="Tablet", slug="tablet", parent_id=ids["tecnologia"], sort_order=3))
+    db.commit()
+    children = client.get(f"/api/v1/categories/{ids['tecnologia']}/children").json()["data"]
+    assert [c["slug"] for c in children] == ["tv", "telefoni", "tablet"]
+    assert [c["has_children"] for c in children] == [False, True, False]
+
+
+def test_main_categories_are_served_from_the_tree(client, db):
+    from app.core.config import settings
+
+    db.add_all([Category(name=f"Reparto {i}", slug=f"reparto-{i}", sort_order=i) for i in range(3)])
+    db.add(Category(name="Chiuso", slug="chiuso", is_active=False))
+    db.commit()
+
+    page = client.get("/api/v1/categories", params={"parent_only": True, "skip": 1, "limit": 1}).json()
+    assert ([c["slug"] for c in page["data"]], page["meta"]["total"]) == (["reparto-1"], 3)
+    main = client.get("/api/v1/categories/main", headers={"X-API-Key": settings.API_KEY}).json()
+    assert [c["slug"] for c in main["data"]] == ["reparto-0", "reparto-1", "reparto-2"]
@@ -0,0 +1,27 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+from types import SimpleNamespace
+
+from app.core.i18n import resolve_translation
+
+
+def test_resolve_translation_fallback_policy():
+    translations = [SimpleNamespace(lang="en"), SimpleNamespace(lang="it")]
+
+    assert resolve_translation(translations, "en").lang == "en"
+    assert resolve_translation(translations, "de").lang == "it"
+    assert resolve_translation(translations[:1], "de") is None
+    assert resolve_translation(translations[:1], "de", any_fallback=True).lang == "en"
+    assert resolve_translation([], "it") is None
+
+
+def test_product_detail_resolves_with_filtered_translations(client, seed_products):
+    seed_products(1)
+
+    data = client.get("/api/v1/products/1?lang=fr").json()["data"]
+
+    assert data["title"] == "Prodotto 0"
+    assert data["features"] == [{"name": "Colore", "value": "Rosso"}]
+    assert data["attributes"] == []
@@ -0,0 +1,83 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from app.core.config import settings
+from app.models.brand import Brand
+from app.models.image_ingestion import ImageIngestion
+from app.models.product import Product, ProductImage
+from app.crud.image_ingestion import queue_product_images, run_image_ingestion
+from app.crud.product_import import import_products_bulk
+from app.services.image_ingestion import ImageUploader
+
+
+IMAGES = {"/a.jpg": b"same-image", "/b.jpg": b"same-image", "/c.jpg": b"other-image"}
+
+
+class StubImageHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = IMAGES.get(self.path)
+        self.send_response(200 if body else 404)
+        self.send_header("Content-Type", "image/jpeg" if body else "text/plain")
+        self.end_headers()
+        self.wfile.write(body or b"not found")
+
+
+@pytest.fixture
+def image_host(stub_server):
+    return stub_server(StubImageHandler)
+
+
+class FakeUploader(ImageUploader):
+    def __init__(self, fail_first: bool = False):
+        self.uploads = []
+        self.fail_first = fail_first
+
+    def upload(self, data, public_id):
+        if self.fail_first:
+            self.fail_first = False
+            raise RuntimeError("cloudinary down")
+        self.uploads.append(data)
+        return {"url": f"https://res.cloudinary.com/test/{public_id}.jpg", "public_id": public_id}
+
+
+def test_images_are_deduplicated_uploaded_and_rewritten(db, image_host, monkeypatch):
+    monkeypatch.setattr(settings, "IMAGE_INGESTION_MAX_ATTEMPTS", 2)
+    db.add(Brand(name="Bosch", slug="bosch"))
+    db.commit()
+    import_products_bulk(db, [
+        {"ean": f"800123456789{i}", "title": f"Prodotto {i}", "price": 1.0, "stock": 1, "brand_name": "Bosch",
+         "category_path": [], "row_number": i}
+        for i in range(3)
+    ])
+    products = db.query(Product).order_by(Product.id).all()
+    for product, path in zip(products, ["/a.jpg", "/b.jpg", "/c.jpg"]):
+        db.add(ProductImage(product_id=product.id, url=f"{image_host}{path}", position=1))
+    db.add(ProductImage(product_id=products[0].id, url=f"{image_host}/missing.jpg", position=2))
+    db.commit()
+
+    assert queue_product_images(db) == 4
+    assert queue_product_images(db) == 0
+
+    # First run: the upload of one content fails, it stays pending
+    uploader = FakeUploader(fail_first=True)
+    stats = run_image_ingestion(db, uploader)
+    assert (stats["claimed"], stats["downloaded"], stats["uploaded"]) == (4, 3, 1)
+    assert stats["retried"] + stats["rewritten"] == 4
+
+    # Resumed run: only pending URLs, each distinct image uploaded once overall
+    stats = run_image_ingestion(db, uploader)
+    assert stats["failed"] == 1  # missing.jpg, after IMAGE_INGESTION_MAX_ATTEMPTS
+    assert sorted(uploader.uploads) == [b"other-image", b"same-image"]
+    assert run_image_ingestion(db, uploader)["claimed"] == 0
+
+    db.expire_all()
+    urls = [image.url for product in products for image in product.images]
+    assert [url.startswith("https://res.cloudinary.com/test/") for url in urls] == [True, False, True, True]
+    assert urls[0] == urls[2]  # a.jpg and b.jpg have the same content
+    failed = db.query(ImageIngestion).filter_by(status="failed").one()
+    assert (failed.source_url.endswith("/missing.jpg"), failed.error) == (True, "Download failed: HTTP 404")
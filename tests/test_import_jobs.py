@@ -0,0 +1,116 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+import io
+
+import openpyxl
+
+from app.core.config import settings
+from app.models.import_job import ImportJob
+from app.models.brand import Brand
+from app.models.product import Product
+from app.crud import import_job as crud_import_job
+
+
+def workbook_bytes(rows: int) -> bytes:
+    """Effezzeta-shaped workbook; the first row has no EAN"""
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.append(["Codice a barre EAN-13 o JAN", "Nome prodotto", "Listino - IVA Esclusa", "Quantità", "Categoria"])
+    ws.append([None, "Senza EAN", 1.0, 1, "Casa"])
+    for i in range(rows):
+        ws.append([str(8000000000000 + i), f"Prodotto {i}", 9.99, 2, "Casa"])
+    out = io.BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+
+def test_import_job_is_queued_and_resumes_after_a_crash(client, db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_UPLOAD_DIR", str(tmp_path))
+    headers = {"X-API-Key": settings.API_KEY}
+
+    response = client.post(
+        "/api/import/products?source=effezzeta",
+        files={"file": ("listino.xlsx", workbook_bytes(7), "application/octet-stream")},
+        headers=headers
+    )
+    assert response.status_code == 202
+    job_id = response.json()["id"]
+    assert response.json()["status"] == "pending"
+
+    # Small chunks; the second chunk crashes once
+    db.query(ImportJob).filter_by(id=job_id).update({"chunk_size": 2})
+    db.commit()
+    real_import = crud_import_job.import_products_bulk
+    calls = []
+
+    def flaky_import(db, chunk, dry_run, batch_index, caches=None):
+        calls.append(batch_index)
+        if calls == [0, 1]:
+            raise RuntimeError("worker killed")
+        return real_import(db, chunk, dry_run, batch_index=batch_index, caches=caches)
+
+    monkeypatch.setattr(crud_import_job, "import_products_bulk", flaky_import)
+
+    job = crud_import_job.claim_import_job(db)
+    crud_import_job.run_import_job(db, job)
+    assert (job.status, job.chunks_done, job.error) == ("pending", 1, "worker killed")
+    assert db.query(Product).count() == 2
+
+    job = crud_import_job.claim_import_job(db)
+    crud_import_job.run_import_job(db, job)
+    # Chunk 0 is not imported again
+    assert calls == [0, 1, 1, 2, 3]
+
+    data = client.get(f"/api/import/jobs/{job_id}", headers=headers).json()
+    assert (data["status"], data["attempts"], data["chunks_done"]) == ("done", 2, 4)
+    assert [c["chunk_index"] for c in data["chunks"]] == [0, 1, 2, 3]
+    report = data["report"]
+    assert (report["total_rows"], report["created"], report["skipped"]) == (8, 7, 1)
+    assert report["errors_summary"] == {"missing_ean": 1}
+    assert db.query(Product).count() == 7
+    # The uploaded copy is removed with the job
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_multi_source_job_merges_rows_by_ean_priority(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_PARSE_PROCESSES", 2)
+    db.add(Brand(name="Acme", slug="acme"))
+    db.commit()
+
+    effezzeta = openpyxl.Workbook()
+    effezzeta.active.append(["Codice a barre EAN-13 o JAN", "Nome prodotto", "Listino - IVA Esclusa", "Quantità", "Categoria"])
+    effezzeta.active.append(["8000000000001", "Frullatore", None, 4, "Casa"])
+    effezzeta.active.append(["8000000000002", "Tostapane", 19.0, 1, "Casa"])
+    effezzeta.save(tmp_path / "effezzeta.xlsx")
+
+    erregame = openpyxl.Workbook()
+    erregame.active.append(["EAN", "Title", "Price", "Available", "Brand", "Category"])
+    erregame.active.append(["8000000000001", "Frullatore Acme", 25.0, 9, "Acme", "Cucina"])
+    erregame.active.append(["8000000000003", "Bollitore", 15.0, 2, "Acme", "Cucina"])
+    erregame.active.append(["8000000000003", "Bollitore XL", 18.0, 1, "Acme", "Cucina"])
+    erregame.save(tmp_path / "erregame.xlsx")
+
+    job = crud_import_job.create_import_job(db, kind="multi", source="multi", sources=[
+        {"source": "effezzeta", "file_path": str(tmp_path / "effezzeta.xlsx")},
+        {"source": "erregame", "file_path": str(tmp_path / "erregame.xlsx")},
+    ])
+    job = crud_import_job.claim_import_job(db)
+    crud_import_job.run_import_job(db, job)
+
+    assert job.status == "done"
+    report = job.report
+    assert (report["total_rows"], report["created"], report["skipped"]) == (5, 3, 1)
+    assert [(s["source"], s["won"], s["merged"], s["duplicates"]) for s in report["sources"]] == [
+        ("effezzeta", 2, 0, 0), ("erregame", 1, 1, 1)
+    ]
+    # A repeated EAN within one source is a duplicate, not a merge
+    assert report["errors_summary"] == {"duplicate_ean_in_batch": 1}
+    assert all(s["parse_seconds"] >= 0 for s in report["sources"])
+
+    # effezzeta wins title and stock; its missing price and brand come from erregame
+    product = db.query(Product).filter_by(ean="8000000000001").one()
+    assert (product.translations[0].title, product.stock_quantity, product.price_list) == ("Frullatore", 4, 25.0)
+    assert product.brand.name == "Acme"
+    assert [c.name for c in product.categories] == ["Casa"]
@@ -0,0 +1,74 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import openpyxl
+
+
+ROWS = 200_000
+# Peak RSS growth while importing; loading all rows into lists needs ~220 MB here
+MEMORY_CEILING_MB = 64
+
+# Runs in a fresh interpreter so the peak RSS belongs to the import only
+CHILD = """
+import json, resource, sys
+from app.services.product_import import ProductImportService, ImportTotals, import_in_chunks
+
+service = ProductImportService("effezzeta")
+totals = ImportTotals()
+batches = []
+
+def import_chunk(chunk, batch_index):
+    batches.append(len(chunk))
+    return {"created": len(chunk), "updated": 0, "errors": [], "samples": []}
+
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+raw_rows = totals.count_rows(service.iter_excel_rows(sys.argv[1]))
+import_in_chunks(service.iter_mapped_rows(raw_rows, totals.add_skipped), import_chunk, totals)
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+print(json.dumps({
+    "total_rows": totals.total_rows,
+    "created": totals.created,
+    "errors_summary": totals.errors_summary,
+    "errors_sample": len(totals.errors_sample),
+    "errors": len(totals.errors),
+    "max_batch": max(batches),
+    "growth_mb": (after - before) / 1024,
+}))
+"""
+
+
+def write_workbook(path, rows: int):
+    """Effezzeta-shaped workbook; every 1000th row has a short EAN"""
+    wb = openpyxl.Workbook(write_only=True)
+    ws = wb.create_sheet()
+    ws.append(["Codice a barre EAN-13 o JAN", "Nome prodotto", "Listino - IVA Esclusa", "Quantità", "Categoria"])
+    for i in range(rows):
+        ean = "123" if i % 1000 == 0 else str(8000000000000 + i)
+        ws.append([ean, f"Prodotto {i}", 9.99, i % 7, "Casa"])
+    wb.save(path)
+
+
+def test_streaming_import_memory_is_constant_in_rows(tmp_path):
+    path = tmp_path / "synthetic.xlsx"
+    write_workbook(path, ROWS)
+
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, str(path)],
+        cwd=Path(__file__).parent.parent, capture_output=True, text=True, check=True
+    ).stdout
+    result = json.loads(output.strip().splitlines()[-1])
+
+    assert result["total_rows"] == ROWS
+    assert result["created"] == ROWS - ROWS // 1000
+    assert result["errors_summary"] == {"invalid_ean13": ROWS // 1000}
+    # Without verbose errors only the first 20 are kept
+    assert (result["errors_sample"], result["errors"]) == (20, 0)
+    assert result["max_batch"] == 300
+    assert result["growth_mb"] < MEMORY_CEILING_MB, f"peak RSS grew {result['growth_mb']:.0f} MB"
@@ -0,0 +1,148 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+import json
+from http.server import BaseHTTPRequestHandler
+
+import pytest
+
+from app.core.config import settings
+from app.crud.payment_reconciliation import reconcile_payments
+from app.integrations.floa import floa_service
+from app.integrations.http import TokenCache, latency_histograms
+from app.integrations.paypal import paypal_service
+from app.models.order import Order
+
+
+PAYPAL_ORDERS = {"PP-PAID": "COMPLETED", "PP-VOID": "VOIDED", "PP-FLAKY": "APPROVED"}
+FLOA_DEALS = {"FL-OK": "APPROVED", "FL-NO": "REJECTED"}
+
+
+class StubGateway(BaseHTTPRequestHandler):
+    """PayPal and Floa endpoints used by the reconciliation"""
+
+    calls = []
+
+    def _send(self, status, body=None):
+        payload = json.dumps(body or {}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_POST(self):
+        self.calls.append(self.path)
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self._send(200, {"access_token": "stub-token", "expires_in": 3600})
+
+    def do_GET(self):
+        self.calls.append(self.path)
+        if self.headers.get("Authorization") != "Bearer stub-token":
+            return self._send(401)
+        payment_id = self.path.split("/")[-1] if "/paypal/" in self.path else self.path.split("/")[-2]
+        if payment_id == "PP-FLAKY" and self.calls.count(self.path) == 1:
+            return self._send(503)
+        if payment_id in PAYPAL_ORDERS:
+            return self._send(200, {"id": payment_id, "status": PAYPAL_ORDERS[payment_id]})
+        if payment_id in FLOA_DEALS:
+            return self._send(200, {"dealStatus": FLOA_DEALS[payment_id]})
+        self._send(404)
+
+
+@pytest.fixture
+def gateway(monkeypatch, stub_server):
+    base_url = stub_server(StubGateway)
+    for service, path in ((paypal_service, "paypal"), (floa_service, "floa")):
+        monkeypatch.setattr(service, "base_url", f"{base_url}/{path}")
+        monkeypatch.setattr(service, "tokens", TokenCache())
+    monkeypatch.setattr(settings, "INTEGRATION_HTTP_BACKOFF", 0.01)
+    StubGateway.calls = []
+    return StubGateway.calls
+
+
+def test_reconciliation_updates_pending_orders_once(db, gateway, make_order):
+    lookups = latency_histograms().get("paypal", {}).get("orders.get", {}).get("count", 0)
+    ids = {
+        payment_id: make_order(method, payment_id).id
+        for method, payment_id in [
+            ("paypal", "PP-PAID"), ("paypal", "PP-VOID"), ("paypal", "PP-FLAKY"), ("paypal", "PP-GONE"),
+            ("floa", "FL-OK"), ("floa", "FL-NO"), ("payplug", "pay_123")
+        ]
+    }
+
+    stats = reconcile_payments(db, recheck_minutes=0)
+    assert {k: stats[k] for k in ("total_checked", "updated", "failed", "skipped")} == {
+        "total_checked": 7, "updated": 5, "failed": 0, "skipped": 1
+    }
+    results = {result["payment_id"]: result["status"] for result in stats["results"]}
+    assert results["PP-GONE"] == "no_change" and results["pay_123"] == "skipped"
+
+    db.expire_all()
+    statuses = {payment_id: (db.get(Order, order_id).payment_status, db.get(Order, order_id).status)
+                for payment_id, order_id in ids.items()}
+    assert statuses == {
+        "PP-PAID": ("completed", "confirmed"),
+        "PP-VOID": ("failed", "cancelled"),
+        "PP-FLAKY": ("completed", "confirmed"),
+        "PP-GONE": ("pending", "pending"),
+        "FL-OK": ("completed", "confirmed"),
+        "FL-NO": ("failed", "cancelled"),
+        "pay_123": ("pending", "pending"),
+    }
+    # One token per provider, the 503 retried
+    assert gateway.count("/paypal/v1/oauth2/token") == 1 and gateway.count("/floa/oauth/token") == 1
+    assert gateway.count("/paypal/v2/checkout/orders/PP-FLAKY") == 2
+    assert latency_histograms()["paypal"]["orders.get"]["count"] - lookups == 5
+
+    # Checkpoint: nothing is due again until the recheck delay has passed
+    assert reconcile_payments(db, recheck_minutes=15)["total_checked"] == 0
+
+
+def test_orders_settled_during_the_check_are_left_alone(db, gateway, monkeypatch, make_order):
+    import app.crud.payment_reconciliation as crud_reconciliation
+    from app.models.warranty_registration import WarrantyRegistration
+
+    order_id = make_order("paypal", "PP-PAID").id
+    check_payments = crud_reconciliation.check_payments
+
+    async def settled_by_webhook(checks):
+        # The refund webhook lands while the gateway is being asked
+        db.query(Order).filter(Order.id == order_id).update({"payment_status": "refunded", "status": "cancelled"})
+        db.commit()
+        return await check_payments(checks)
+
+    monkeypatch.setattr(crud_reconciliation, "check_payments", settled_by_webhook)
+    monkeypatch.setattr(
+        crud_reconciliation.crud_warranty_registration, "enqueue_for_order",
+        lambda db, order: pytest.fail("warranty queued for a settled order")
+    )
+
+    stats = reconcile_payments(db, recheck_minutes=0)
+    assert (stats["updated"], stats["results"][0]["status"]) == (0, "no_change")
+    db.expire_all()
+    assert (db.get(Order, order_id).payment_status, db.query(WarrantyRegistration).count()) == ("refunded", 0)
+
+
+def test_concurrency_limit_holds_across_checks(monkeypatch):
+    import asyncio
+    from app.services.payment_reconciliation import check_payment, providers
+
+    in_flight, peak = [], []
+
+    async def get_order_details(payment_id):
+        in_flight.append(1)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.pop()
+        return {"status": "COMPLETED"}
+
+    monkeypatch.setattr(paypal_service, "get_order_details", get_order_details)
+    monkeypatch.setattr(providers["paypal"], "concurrency", 2)
+
+    async def checkout_confirmations():
+        return await asyncio.gather(*(check_payment("paypal", f"PP-{i}") for i in range(6)))
+
+    decisions = asyncio.run(checkout_confirmations())
+    assert {status for status, _ in decisions} == {"completed"} and max(peak) == 2
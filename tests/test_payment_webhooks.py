@@ -0,0 +1,24 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+from app.crud.order import crud_order
+
+
+def test_webhook_finds_order_by_checkout_payment_id(client, db, make_order):
+    order = make_order("paypal", "5O190127TN364715T")
+    other = make_order("paypal", 42)
+    assert (order.provider_payment_ref, other.provider_payment_ref) == ("5O190127TN364715T", "42")
+    other_id = other.id
+    assert crud_order.get_by_payment_ref(db, 42).id == other_id
+
+    response = client.post("/api/webhooks/paypal", json={
+        "event_type": "PAYMENT.CAPTURE.COMPLETED",
+        "resource": {"id": "5O190127TN364715T", "status": "COMPLETED"}
+    })
+    assert response.json()["payment_status"] == "completed"
+
+    db.expire_all()
+    order = crud_order.get_by_payment_ref(db, "5O190127TN364715T")
+    assert (order.payment_status, order.payment_transaction_id) == ("completed", "5O190127TN364715T")
+    assert crud_order.get(db, other_id).payment_status == "pending"
@@ -0,0 +1,218 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+from app.models.brand import Brand
+from app.models.category import Category
+from app.models.product import Product, ProductTranslation
+from app.crud.import_cache import ImportCaches
+from app.crud.product_import import (
+    import_products_bulk, import_products_batch, enrich_products_bulk, ImportSnapshot, validate_products
+)
+
+
+def make_row(ean: str, title: str, row_number: int, **extra):
+    row = {
+        "ean": ean,
+        "title": title,
+        "price": 10.0,
+        "stock": 3,
+        "brand_name": "Bosch",
+        "category_path": ["Elettrodomestici", "Lavatrici"],
+        "description": None,
+        "image_urls": [],
+        "row_number": row_number,
+    }
+    row.update(extra)
+    return row
+
+
+def test_bulk_import_creates_then_updates_with_row_errors(db):
+    brand = Brand(name="Bosch", slug="bosch")
+    db.add(brand)
+    db.commit()
+
+    rows = [
+        make_row("8001234567890", "Lavatrice 8kg", 2),
+        make_row("8001234567891", "Asciugatrice", 3),
+        make_row("8001234567890", "Lavatrice doppia", 4),
+        make_row("123", "EAN corto", 5),
+        make_row("8001234567892", "Samsung Galaxy", 6),
+    ]
+    stats = import_products_bulk(db, rows)
+
+    assert (stats["created"], stats["updated"]) == (2, 0)
+    assert [e["reason"] for e in stats["errors"]] == ["duplicate_ean_in_batch", "invalid_ean13", "manual_blocked"]
+    assert [e["row_number"] for e in stats["errors"]] == [4, 5, 6]
+    assert len(stats["samples"]) == 2
+
+    product = db.query(Product).filter_by(ean="8001234567890").one()
+    assert (product.reference, product.brand_id, product.stock_quantity) == ("8001234567890", brand.id, 3)
+    assert [c.name for c in product.categories] == ["Lavatrici"]
+
+    # Second run: updates in place, a missing price keeps the current one
+    stats = import_products_bulk(db, [
+        make_row("8001234567890", "Lavatrice 9kg", 2, price=None, stock=0),
+        make_row("8001234567893", "Forno", 3),
+    ])
+    assert (stats["created"], stats["updated"], stats["errors"]) == (1, 1, [])
+
+    db.expire_all()
+    product = db.query(Product).filter_by(ean="8001234567890").one()
+    assert (product.price_list, product.stock_quantity) == (10.0, 0)
+    titles = db.query(ProductTranslation.title).filter_by(product_id=product.id).all()
+    assert titles == [("Lavatrice 9kg",)]
+    assert db.query(Product).count() == 3
+
+
+def test_import_caches_create_each_brand_and_path_once(db):
+    db.add(Brand(name="Bosch", slug="bosch"))
+    db.commit()
+    caches = ImportCaches()
+
+    rows = [
+        make_row(f"800123456{i:04d}", f"Prodotto {i}", i + 2, brand_name=brand, category_path=path)
+        for i, (brand, path) in enumerate([
+            ("Bosch", ["Elettrodomestici", "Lavatrici"]),
+            (" bosch ", ["Elettrodomestici", "Lavatrici"]),
+            ("Miele", ["Elettrodomestici", "Forni"]),
+            ("MIELE", ["Elettrodomestici", "Forni"]),
+            ("Miele", ["Cucina"]),
+        ])
+    ]
+    stats = import_products_bulk(db, rows, caches=caches)
+    assert stats["created"] == 5
+    assert stats["cache"] == {
+        "brand_hits": 2, "brand_misses": 3, "brands_created": 1,
+        "category_hits": 0, "category_misses": 5, "categories_created": 4,
+    }
+    assert db.query(Brand).count() == 2
+    assert sorted(name for (name,) in db.query(Category.name)) == ["Cucina", "Elettrodomestici", "Forni", "Lavatrici"]
+    assert db.query(Category).filter_by(slug="elettrodomestici-forni").one().parent.name == "Elettrodomestici"
+
+    # Next chunk: everything comes from the cache, nothing is created
+    stats = import_products_bulk(db, [make_row("8001234569999", "Forno 2", 2, brand_name="Miele",
+                                               category_path=["Elettrodomestici", "Forni"])], caches=caches)
+    assert stats["cache"] == {
+        "brand_hits": 1, "brand_misses": 0, "brands_created": 0,
+        "category_hits": 1, "category_misses": 0, "categories_created": 0,
+    }
+    product = db.query(Product).filter_by(ean="8001234569999").one()
+    assert (product.brand.name, [c.name for c in product.categories]) == ("Miele", ["Forni"])
+
+
+def test_unchanged_rows_are_skipped_on_reimport(db):
+    db.add(Brand(name="Bosch", slug="bosch"))
+    db.commit()
+
+    def price_list(price_of_first):
+        return [
+            make_row("8001234567890", "Lavatrice 8kg", 2, source="effezzeta", price=price_of_first),
+            make_row("8001234567891", "Asciugatrice", 3, source="effezzeta"),
+            make_row("8001234567892", "Forno", 4, source="effezzeta"),
+        ]
+
+    stats = import_products_bulk(db, price_list(10.0))
+    assert (stats["created"], stats["skipped_unchanged"]) == (3, 0)
+
+    stats = import_products_bulk(db, price_list(10.0))
+    assert (stats["created"], stats["updated"], stats["skipped_unchanged"]) == (0, 0, 3)
+
+    # Only the changed row is written; the same row from another source is not "unchanged"
+    stats = import_products_bulk(db, price_list(12.5))
+    assert (stats["updated"], stats["skipped_unchanged"]) == (1, 2)
+    stats = import_products_bulk(db, [make_row("8001234567891", "Asciugatrice", 2, source="dixe")])
+    assert (stats["updated"], stats["skipped_unchanged"]) == (1, 0)
+    db.expire_all()
+    assert db.query(Product).filter_by(ean="8001234567890").one().price_list == 12.5
+
+
+def test_listing_commits_with_the_imported_rows(db, monkeypatch):
+    from app.crud import product_import
+    from app.models.product_listing import ProductListing
+
+    refresh = product_import.refresh_product_listing
+    calls = []
+
+    def refresh_failing_once(db, ids, commit=True):
+        calls.append(list(ids))
+        if len(calls) == 1:
+            raise RuntimeError("listing unavailable")
+        return refresh(db, ids, commit=commit)
+
+    monkeypatch.setattr(product_import, "refresh_product_listing", refresh_failing_once)
+    rows = [make_row("8001234567890", "Lavatrice 8kg", 2), make_row("8001234567891", "Asciugatrice", 3)]
+
+    # The failed bulk write keeps no fingerprint, so the row-by-row retry writes the listing
+    stats = import_products_bulk(db, rows)
+    assert stats["created"] == 2 and len(calls) == 2
+    assert db.query(ProductListing.product_id).distinct().count() == 2
+
+
+def test_dry_run_validates_against_snapshot_without_writes(db):
+    db.add(Brand(name="Bosch", slug="bosch"))
+    db.commit()
+    import_products_bulk(db, [make_row("8001234567890", "Lavatrice 8kg", 2)])
+    counts = (db.query(Product).count(), db.query(Brand).count(), db.query(Category).count())
+
+    snapshot = ImportSnapshot.load(db)
+    first = validate_products(snapshot, [
+        make_row("8001234567890", "Lavatrice 9kg", 2),
+        make_row("8001234567891", "Frigo", 3, brand_name="Liebherr", category_path=["Frigoriferi"]),
+        make_row("8001234567892", "Forno", 4, reference="8001234567890"),
+    ])
+    # The next chunk sees the first chunk's new product as existing
+    second = validate_products(snapshot, [make_row("8001234567891", "Frigo", 2, brand_name="Liebherr")], batch_index=1)
+
+    assert (first["created"], first["updated"]) == (1, 1)
+    assert [e["reason"] for e in first["errors"]] == ["processing_error"]
+    assert (first["cache"]["brand_misses"], first["cache"]["category_misses"]) == (1, 1)
+    assert (second["created"], second["updated"]) == (0, 1)
+    assert (db.query(Product).count(), db.query(Brand).count(), db.query(Category).count()) == counts
+
+    # import_products_batch dry run goes through the same engine (no get_or_create_brand)
+    stats = import_products_batch(db, [make_row("8001234567899", "Frigo", 2, brand_name="Smeg")], dry_run=True)
+    assert stats["created"] == 1
+    assert db.query(Brand).filter_by(name="Smeg").count() == 0
+
+
+def test_bulk_enrichment_fills_only_empty_fields(db):
+    db.add(Brand(name="Bosch", slug="bosch"))
+    db.commit()
+    import_products_bulk(db, [
+        make_row("8001234567890", "Lavatrice", 2, description=None),
+        make_row("8001234567891", "Forno", 3, price=None, brand_name=None),
+    ])
+    tax_class_id = db.query(Product.tax_class_id).first()[0]
+    bare = Product(reference="7700042", ean=None, tax_class_id=tax_class_id)
+    db.add(bare)
+    db.commit()
+
+    rows = [
+        {"ean": "8001234567890", "title": "Altro titolo", "description": "Carica frontale", "price": 99.0,
+         "brand_name": "Miele", "image_urls": ["https://img/1.jpg", "https://img/2.jpg"], "row_number": 2},
+        {"ean": "8001234567891", "title": "Forno", "description": None, "price": 250.0,
+         "brand_name": "Smeg", "image_urls": [], "row_number": 3},
+        {"ean": "7700042", "title": "Trovato per riferimento", "description": None, "price": None,
+         "brand_name": None, "image_urls": ["https://img/3.jpg"], "row_number": 4},
+        {"ean": "8009999999999", "title": "Sconosciuto", "image_urls": [], "row_number": 5},
+    ]
+    stats = enrich_products_bulk(db, rows)
+
+    assert (stats["matched"], stats["skipped"], stats["errors"]) == (3, 1, [])
+    assert [s["updated_fields"] for s in stats["matched_samples"]] == [
+        ["description", "images"], ["price", "brand"], ["translation_created", "images"]
+    ]
+    db.expire_all()
+    washer = db.query(Product).filter_by(ean="8001234567890").one()
+    assert (washer.price_list, washer.brand.name) == (10.0, "Bosch")  # Not overwritten
+    assert washer.translations[0].simple_description == "Carica frontale"
+    assert [(i.url, i.position) for i in washer.images] == [("https://img/1.jpg", 1), ("https://img/2.jpg", 2)]
+    oven = db.query(Product).filter_by(ean="8001234567891").one()
+    assert (oven.price_list, oven.brand.name) == (250.0, "Smeg")
+    bare = db.query(Product).filter_by(reference="7700042").one()
+    assert [t.title for t in bare.translations] == ["Trovato per riferimento"]
+
+    # Second run: everything is already filled
+    stats = enrich_products_bulk(db, rows)
+    assert (stats["matched"], stats["skipped"]) == (0, 4)
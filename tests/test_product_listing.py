@@ -0,0 +1,212 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+from contextlib import contextmanager
+from sqlalchemy import event
+
+from app.models.product import Product, ProductImage, ProductImageAlt, ProductFeature, ProductFeatureTranslation
+from app.crud.pagination import encode_cursor
+from app.crud.product_listing import refresh_product_listing
+
+
+@contextmanager
+def count_queries(db):
+    """Count SQL statements executed on the session's engine"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.get_bind()
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def test_listing_query_count_is_constant(client, db, seed_products):
+    seed_products(30)
+
+    counts = []
+    for limit in (1, 10, 30):
+        db.expire_all()
+        with count_queries(db) as statements:
+            response = client.get(f"/api/v1/products?limit={limit}&lang=en")
+        assert response.status_code == 200
+        assert len(response.json()["data"]) == limit
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1] == counts[2]
+
+
+def test_product_detail_query_count_does_not_grow_with_relations(client, db, seed_products):
+    seed_products(2)
+    small, large = db.query(Product).order_by(Product.id).all()
+    for i in range(10):
+        image = ProductImage(url=f"https://img/extra-{i}.jpg", position=i + 2)
+        image.alt_texts = [ProductImageAlt(lang="en", alt_text=f"extra {i}")]
+        large.images.append(image)
+        feature = ProductFeature(code=f"extra-{i}")
+        feature.translations = [ProductFeatureTranslation(lang="it", name=f"Extra {i}", value="Si")]
+        large.features.append(feature)
+    db.commit()
+
+    counts = []
+    for product_id in (small.id, large.id):
+        db.expire_all()
+        with count_queries(db) as statements:
+            response = client.get(f"/api/v1/products/{product_id}?lang=en")
+        assert response.status_code == 200
+        counts.append(len(statements))
+
+    assert counts[0] == counts[1]
+
+
+def test_listing_uses_requested_lang_with_it_fallback(client, db, seed_products):
+    seed_products(2)
+
+    response = client.get("/api/v1/products?lang=en")
+    item = response.json()["data"][0]
+
+    assert item["title"] == "Product 0"
+    assert item["features"] == [{"name": "Colore", "value": "Rosso"}]
+    assert item["attributes"] == [{"code": "size", "name": "Size", "value": "L"}]
+    assert item["price"]["discounts"] == "10%"
+
+
+def test_listing_cursor_pages_cover_all_products(client, db, seed_products):
+    seed_products(7)
+
+    seen = []
+    cursor = ""
+    while True:
+        response = client.get("/api/v1/products", params={"limit": 3, "cursor": cursor})
+        assert response.status_code == 200
+        body = response.json()
+        seen.extend(item["id"] for item in body["data"])
+        cursor = body["meta"]["next_cursor"]
+        if not cursor:
+            break
+
+    assert seen == sorted(seen)
+    assert len(seen) == 7
+
+    assert client.get("/api/v1/products?cursor=not-a-cursor").status_code == 400
+    # Well-formed, but a string where the id is an integer
+    assert client.get("/api/v1/products", params={"cursor": encode_cursor(["7"])}).status_code == 400
+
+
+def test_listing_projection_follows_stock_updates(client, db, seed_products):
+    from app.crud import product as crud_product
+    from app.schemas.product import StockUpdateInput
+
+    seed_products(1)
+    product = db.query(Product).first()
+
+    crud_product.update_product_stock(db, product.id, StockUpdateInput(stock_quantity=0))
+
+    item = client.get("/api/v1/products").json()["data"][0]
+    assert item["stock"] == {"status": "out_of_stock", "quantity": 0}
+
+
+def test_listing_projection_follows_brand_and_tax_updates(client, db, seed_products):
+    from app.crud import brand_tax as crud_brand_tax
+    from app.models.brand import Brand
+    from app.models.product_listing import ProductListing
+    from app.schemas.brand_tax import BrandUpdate, TaxClassUpdate
+
+    seed_products(1)
+    product = db.query(Product).first()
+    brand = Brand(name="Miele", slug="miele")
+    db.add(brand)
+    db.flush()
+    product.brand_id = brand.id
+    db.commit()
+    refresh_product_listing(db, [product.id])
+
+    crud_brand_tax.update_brand(db, brand.id, BrandUpdate(name="Smeg"))
+    crud_brand_tax.update_tax_class(db, product.tax_class_id, TaxClassUpdate(name="IVA 10%", rate=10.0))
+
+    rows = db.query(ProductListing).filter(ProductListing.product_id == product.id).all()
+    assert {(row.brand_name, row.tax_name, row.tax_rate) for row in rows} == {("Smeg", "IVA 10%", 10.0)}
+
+
+def test_empty_listing_is_built_once(client, db, seed_products):
+    from app.crud.product_listing import ensure_product_listing
+    from app.models.product_listing import ProductListing
+
+    seed_products(2)
+    # As after the migration: products without listing rows
+    db.query(ProductListing).delete()
+    db.commit()
+    assert client.get("/api/v1/products").json()["data"] == []
+
+    assert ensure_product_listing(db)["products"] == 2
+    assert len(client.get("/api/v1/products").json()["data"]) == 2
+    assert ensure_product_listing(db) is None
+
+
+def test_search_is_ranked_paginated_and_not_shadowed(client, db, seed_products):
+    seed_products(5)
+
+    response = client.get("/api/v1/products/search", params={"q": "Prodotto", "limit": 2})
+    assert response.status_code == 200
+    body = response.json()
+    assert body["total"] == 5
+    assert [r["title"] for r in body["results"]] == ["Prodotto 0", "Prodotto 1"]
+    assert body["meta"]["has_next"] is True
+
+    response = client.get("/api/v1/products/search", params={"q": "REF-3", "lang": "en"})
+    assert [r["title"] for r in response.json()["results"]] == ["Product 3"]
+
+
+def test_suggest_serves_prefixes_from_memory(client, db, seed_products):
+    from app.models.brand import Brand
+    from app.services.suggest_index import suggest_index
+
+    db.add(Brand(name="Samsung", slug="samsung"))
+    seed_products(3)
+    suggest_index.load(db)
+
+    with count_queries(db) as statements:
+        body = client.get("/api/v1/products/suggest", params={"q": "produ", "lang": "en"}).json()
+    assert statements == []
+    assert [p["title"] for p in body["products"]] == ["Product 0", "Product 1", "Product 2"]
+    assert client.get("/api/v1/products/suggest?q=sams").json()["brands"][0]["name"] == "Samsung"
+
+    # Deactivated products drop out on the next refresh
+    product = db.query(Product).filter(Product.reference == "REF-1").first()
+    product.is_active = False
+    db.commit()
+    refresh_product_listing(db, [product.id])
+    body = client.get("/api/v1/products/suggest", params={"q": "ref-"}).json()
+    assert [p["reference"] for p in body["products"]] == ["REF-0", "REF-2"]
+
+
+def test_suggest_follows_committed_refreshes_only(db, monkeypatch, seed_products):
+    from app.services import suggest_index as suggest_module
+    from app.services.suggest_index import suggest_index
+
+    seed_products(2)
+    suggest_index.load(db)
+    product = db.query(Product).filter(Product.reference == "REF-1").first()
+
+    def rename(title):
+        next(t for t in product.translations if t.lang == "it").title = title
+        db.flush()
+
+    # Rolled back: the index keeps the committed title
+    rename("Lavatrice 1")
+    refresh_product_listing(db, [product.id], commit=False)
+    db.rollback()
+    assert suggest_index.suggest("lavat")["products"] == []
+    assert [p["reference"] for p in suggest_index.suggest("prodotto 1")["products"]] == ["REF-1"]
+
+    # Large updates are merged outside the lock, with the same result
+    monkeypatch.setattr(suggest_module, "BULK_UPDATE_KEYS", 0)
+    rename("Lavatrice 1")
+    refresh_product_listing(db, [product.id])
+    assert [p["reference"] for p in suggest_index.suggest("lavat")["products"]] == ["REF-1"]
+    assert [p["reference"] for p in suggest_index.suggest("prodotto")["products"]] == ["REF-0"]
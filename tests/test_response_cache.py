@@ -0,0 +1,60 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+from app.models.brand import Brand
+
+
+def test_catalogue_responses_are_cached_until_a_write(client, db):
+    db.add(Brand(name="Bosch", slug="bosch"))
+    db.commit()
+
+    first = client.get("/api/v1/brands", params={"limit": 10, "skip": 0})
+    assert (first.status_code, first.headers["X-Cache"]) == (200, "MISS")
+    etag = first.headers["ETag"]
+
+    # Same query in another order: served from the cache, or 304 for a known ETag
+    second = client.get("/api/v1/brands", params={"skip": 0, "limit": 10}, headers={"Origin": "https://shop.example"})
+    assert (second.headers["X-Cache"], second.json()) == ("HIT", first.json())
+    assert second.headers["content-type"] == first.headers["content-type"]
+    assert second.headers["access-control-allow-origin"] == "*"
+    assert second.headers["access-control-allow-credentials"] == "true"
+    not_modified = client.get("/api/v1/brands?limit=10&skip=0", headers={"If-None-Match": etag})
+    assert (not_modified.status_code, not_modified.content) == (304, b"")
+
+    # ORM write: the next request misses and sees the change
+    brand = db.query(Brand).filter_by(slug="bosch").one()
+    brand.name = "Bosch Home"
+    db.commit()
+    after_update = client.get("/api/v1/brands?limit=10&skip=0", headers={"If-None-Match": etag})
+    assert (after_update.status_code, after_update.headers["X-Cache"]) == (200, "MISS")
+    assert after_update.json()["data"][0]["name"] == "Bosch Home"
+
+    # Bulk UPDATE statement
+    db.query(Brand).update({"name": "Bosch Pro"})
+    db.commit()
+    assert client.get("/api/v1/brands?limit=10&skip=0").json()["data"][0]["name"] == "Bosch Pro"
+
+    # Errors are not cached
+    assert client.get("/api/v1/brands/999").status_code == 404
+    assert client.get("/api/v1/brands/999").headers.get("X-Cache") is None
+
+
+def test_brand_offset_and_cursor_pages_share_the_order(client, db):
+    db.add_all([
+        Brand(name="Bosch", slug="bosch", sort_order=1),
+        Brand(name="Miele", slug="miele"),
+        Brand(name="Smeg", slug="smeg", sort_order=-1),
+    ])
+    db.commit()
+    # Rows created before sort_order had a default
+    db.query(Brand).filter_by(slug="miele").update({"sort_order": None})
+    db.commit()
+
+    offset = [b["slug"] for b in client.get("/api/v1/brands").json()["data"]]
+    cursor_pages, cursor = [], ""
+    while cursor is not None:
+        body = client.get("/api/v1/brands", params={"cursor": cursor, "limit": 1}).json()
+        cursor_pages += [b["slug"] for b in body["data"]]
+        cursor = body["meta"]["next_cursor"]
+    assert offset == cursor_pages == ["smeg", "miele", "bosch"]
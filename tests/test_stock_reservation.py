@@ -0,0 +1,105 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+import threading
+
+import pytest
+from sqlalchemy.orm import sessionmaker
+
+from app.crud.stock_reservation import reserve_stock
+from app.models.product import Product, StockStatus
+from app.models.product_variant import ProductVariant
+
+
+def test_concurrent_checkouts_never_oversell(db, make_product):
+    product_id = make_product("HOT-1", stock_quantity=5).id
+    db.commit()
+    start = threading.Barrier(20)
+    outcomes = []
+    new_session = sessionmaker(bind=db.get_bind())
+
+    def checkout():
+        session = new_session()
+        try:
+            start.wait()
+            shortfalls = reserve_stock(session, [(product_id, None, 1)])
+            if shortfalls:
+                session.rollback()
+            else:
+                session.commit()
+            outcomes.append(shortfalls)
+        finally:
+            session.close()
+
+    threads = [threading.Thread(target=checkout) for _ in range(20)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sum(not shortfalls for shortfalls in outcomes) == 5
+    assert all(shortfalls[0]["requested"] == 1 for shortfalls in outcomes if shortfalls)
+    db.expire_all()
+    assert db.get(Product, product_id).stock_quantity == 0
+
+
+def test_short_line_takes_nothing(db, make_product):
+    product_id = make_product("LAV-1", stock_quantity=3).id
+    parent_id = make_product("TV-1", stock_quantity=0).id
+    variant = ProductVariant(
+        parent_product_id=parent_id, reference="TV-1-55", attributes={"size": "55"}, price_list=100.0, stock_quantity=1
+    )
+    db.add(variant)
+    db.commit()
+    variant_id = variant.id
+
+    # Lines of the same item are summed
+    shortfalls = reserve_stock(db, [(product_id, None, 2), (parent_id, variant_id, 1), (product_id, None, 2)])
+    assert shortfalls == [{"product_id": product_id, "variant_id": None, "requested": 4, "available": 3}]
+    assert db.get(Product, product_id).stock_quantity == 3
+    assert db.get(ProductVariant, variant_id).stock_quantity == 1
+
+    db.rollback()
+
+    assert reserve_stock(db, [(product_id, None, 2), (parent_id, variant_id, 1)]) == []
+    db.commit()
+    db.expire_all()
+    product, variant = db.get(Product, product_id), db.get(ProductVariant, variant_id)
+    assert (product.stock_quantity, product.stock_status) == (1, StockStatus.LOW_STOCK)
+    assert (variant.stock_quantity, variant.stock_status) == (0, StockStatus.OUT_OF_STOCK)
+
+
+def test_cart_order_takes_stock_and_refreshes_listing(db, make_product):
+    from app.crud.order import crud_order
+    from app.crud.stock_reservation import InsufficientStockError
+    from app.models.cart import Cart, CartItem
+    from app.models.order import Order
+    from app.models.product_listing import ProductListing
+    from app.schemas.order import OrderCreate
+
+    product_id = make_product("LAV-1", stock_quantity=2).id
+    cart = Cart(session_id="guest-1")
+    cart.items = [CartItem(product_id=product_id, quantity=2, price_at_add=100)]
+    db.add(cart)
+    db.commit()
+    address = {
+        "name": "Mario", "address_house_number": "Via Roma", "house_number": "1", "city": "Milano",
+        "postal_code": "20100", "country": "IT", "phone": "3331234567"
+    }
+    order_data = OrderCreate(
+        payment_method="paypal",
+        customer_info={"reg_type": "user", "first_name": "Mario", "last_name": "Rossi", "email": "mario@example.com"},
+        billing_address=address,
+        shipping_address=address
+    )
+
+    crud_order.create_from_cart(db, cart, order_data, session_id="guest-1")
+    rows = db.query(ProductListing).filter(ProductListing.product_id == product_id).all()
+    assert rows and {(row.stock_quantity, row.stock_status) for row in rows} == {(0, "out_of_stock")}
+
+    # Sold out: the order is refused and nothing is written
+    with pytest.raises(InsufficientStockError) as error:
+        crud_order.create_from_cart(db, cart, order_data, session_id="guest-1")
+    assert error.value.shortfalls == [{"product_id": product_id, "variant_id": None, "requested": 2, "available": 0}]
+    assert db.query(Order).count() == 1
@@ -0,0 +1,90 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+import pytest
+
+from app.models.category import Category, CategoryTranslation
+from app.models.product import ProductTranslation
+from app.models.product_listing import ProductListing
+from app.models.translation import TranslationJob
+from app.crud.product import create_product_translations
+from app.crud.category import create_default_translations
+from app.crud.translation import process_translation_jobs
+from app.services.translation import StubTranslationBackend
+
+
+@pytest.fixture
+def create_product(db, make_product):
+    """create_product(reference): product saved in Italian, its translation job queued"""
+    def create(reference: str):
+        product = make_product(reference)
+        create_product_translations(db, product, [{"lang": "it", "title": "Lavatrice", "sub_title": "8 kg"}])
+        return product
+    return create
+
+
+def test_products_are_saved_in_italian_and_translated_in_batches(db, create_product):
+    backend = StubTranslationBackend()
+    product = create_product("LAV-1")
+
+    assert [t.lang for t in db.query(ProductTranslation)] == ["it"]
+    assert db.query(TranslationJob).one().status == "pending"
+
+    stats = process_translation_jobs(db, backend)
+
+    assert stats == {"jobs": 1, "translations": 4, "retried": 0, "failed": 0}
+    assert db.query(TranslationJob).one().status == "done"
+    en = db.query(ProductTranslation).filter_by(product_id=product.id, lang="en").one()
+    assert (en.title, en.sub_title) == ("[en] Lavatrice", "[en] 8 kg")
+    # One backend call per target language
+    assert sorted(call[1] for call in backend.calls) == ["ar", "de", "en", "fr"]
+    listing = db.query(ProductListing).filter_by(product_id=product.id, lang="fr").one()
+    assert listing.title == "[fr] Lavatrice"
+
+    # Same texts again: served from the translation memory
+    create_product("LAV-2")
+    process_translation_jobs(db, backend)
+    assert len(backend.calls) == 4
+    assert db.query(ProductTranslation).filter_by(lang="de").count() == 2
+
+
+def test_category_translations_are_queued(db):
+    category = Category(name="Frigoriferi", slug="frigoriferi")
+    db.add(category)
+    db.commit()
+
+    create_default_translations(db, category)
+    assert [t.lang for t in category.translations] == ["it"]
+
+    process_translation_jobs(db, StubTranslationBackend())
+
+    en = db.query(CategoryTranslation).filter_by(category_id=category.id, lang="en").one()
+    assert (en.name, en.slug) == ("[en] Frigoriferi", "en-frigoriferi")
+
+
+def test_a_job_that_cannot_be_saved_fails_alone(db, monkeypatch, create_product):
+    from app.crud import translation as crud_translation
+
+    untitled = create_product("LAV-EMPTY")
+    db.query(ProductTranslation).filter_by(product_id=untitled.id).update({"title": ""})
+    broken = create_product("LAV-BROKEN")
+    db.commit()
+
+    add_translation = crud_translation._add_translation
+
+    def failing_add_translation(db, entity, entity_type, lang, values):
+        if entity.id == broken.id:
+            raise ValueError("cannot save")
+        add_translation(db, entity, entity_type, lang, values)
+
+    monkeypatch.setattr(crud_translation, "_add_translation", failing_add_translation)
+    stats = process_translation_jobs(db, StubTranslationBackend())
+
+    assert stats == {"jobs": 2, "translations": 4, "retried": 0, "failed": 1}
+    statuses = {job.entity_id: (job.status, job.error) for job in db.query(TranslationJob)}
+    assert statuses == {untitled.id: ("done", None), broken.id: ("failed", "cannot save")}
+    # Empty source title: the reference is used
+    en = db.query(ProductTranslation).filter_by(product_id=untitled.id, lang="en").one()
+    assert (en.title, en.sub_title) == ("LAV-EMPTY", "[en] 8 kg")
+    assert db.query(ProductTranslation).filter_by(product_id=broken.id).count() == 1
@@ -0,0 +1,44 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+import threading
+import time
+
+import cloudinary.uploader
+
+from app.core.config import settings
+
+
+def test_multiple_images_upload_concurrently(client, monkeypatch):
+    in_flight = {"now": 0, "max": 0}
+    lock = threading.Lock()
+
+    def slow_upload(file, folder, **options):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        data = file.read()
+        time.sleep(0.2)
+        with lock:
+            in_flight["now"] -= 1
+        return {"secure_url": f"https://res.cloudinary.com/test/{len(data)}.jpg", "public_id": f"{folder}/{len(data)}", "bytes": len(data)}
+
+    monkeypatch.setattr(cloudinary.uploader, "upload", slow_upload)
+    files = [("files", (f"image{i}.jpg", b"x" * (i + 1), "image/jpeg")) for i in range(5)]
+    files.append(("files", ("notes.txt", b"text", "text/plain")))
+
+    response = client.post(
+        "/api/upload/admin/upload/images",
+        files=files,
+        data={"folder": "products"},
+        headers={"X-API-Key": settings.API_KEY}
+    )
+
+    data = response.json()
+    assert response.status_code == 200
+    assert (data["total_uploaded"], data["total_errors"]) == (5, 1)
+    assert [image["size"] for image in data["uploaded"]] == [1, 2, 3, 4, 5]  # Request order, streamed whole
+    assert all(image["duration_ms"] >= 200 for image in data["uploaded"])
+    assert in_flight["max"] > 1
+    assert data["duration_ms"] < 5 * 200
@@ -0,0 +1,84 @@
+# Author: Muthana
+# © 2026 Muthana. All rights reserved.
+# Unauthorized copying or distribution is prohibited.
+
+import pytest
+
+from app.core.config import settings
+from app.crud.warranty_registration import crud_warranty_registration
+from app.models.order import OrderItem
+from app.models.warranty import Warranty
+from app.models.warranty_registration import WarrantyRegistration
+from app.services.garanzia3_service import garanzia3_service
+
+
+@pytest.fixture
+def warranty_order(db, make_product, make_order):
+    """Order of a washing machine with a 3-year warranty"""
+    product = make_product("LAV-1", price_list=500.0)
+    warranty = Warranty(title="Garanzia 3 anni", price=49)
+    db.add(warranty)
+    db.flush()
+    return make_order(
+        "paypal",
+        billing_address={"first_name": "Mario", "last_name": "Rossi", "phone": "3331234567"},
+        subtotal=549, total_amount=549,
+        items=[OrderItem(
+            product_id=product.id, product_title="Lavatrice", product_sku="8001234567890",
+            quantity=1, unit_price=549, subtotal=549, warranty_option={"id": warranty.id}
+        )]
+    )
+
+
+def test_registrations_are_queued_once_and_retried(db, monkeypatch, warranty_order):
+    order = warranty_order
+    # Confirmed twice (webhook and sync): queued once
+    assert crud_warranty_registration.enqueue_for_order(db, order) == 1
+    crud_warranty_registration.enqueue_for_order(db, order)
+    db.commit()
+    rows = db.query(WarrantyRegistration).all()
+    assert len(rows) == 1 and rows[0].status == "pending" and rows[0].product_ean13 == "8001234567890"
+    assert rows[0].idempotency_key == f"order-item-{order.items[0].id}-warranty-{rows[0].warranty_id}"
+
+    answers = [
+        {"success": False, "error": "Garanzia3 unavailable", "error_code": "connection_error"},
+        {"success": True, "transaction": "TX-1", "pin": "1234", "raw_response": {"ok": True}},
+    ]
+
+    async def register_warranty(**kwargs):
+        assert kwargs["customer_email"] == "mario@example.com"
+        return answers.pop(0)
+
+    monkeypatch.setattr(garanzia3_service, "register_warranty", register_warranty)
+
+    stats = crud_warranty_registration.run_pending(db)
+    assert stats == {"claimed": 1, "registered": 0, "retried": 1, "failed": 0}
+    registration = db.query(WarrantyRegistration).one()
+    assert registration.status == "pending" and registration.next_attempt_at is not None
+    assert registration.error_code == "G3_UNAVAILABLE"
+
+    # Not due before the backoff
+    assert crud_warranty_registration.run_pending(db)["claimed"] == 0
+
+    registration.next_attempt_at = None
+    db.commit()
+    assert crud_warranty_registration.run_pending(db)["registered"] == 1
+    db.expire_all()
+    registration = db.query(WarrantyRegistration).one()
+    assert (registration.status, registration.g3_transaction_id, registration.attempts) == ("registered", "TX-1", 2)
+
+
+def test_timeouts_are_not_retried(db, monkeypatch, warranty_order):
+    order = warranty_order
+    crud_warranty_registration.enqueue_for_order(db, order)
+    db.commit()
+
+    async def register_warranty(**kwargs):
+        return {"success": False, "error": "Timeout", "error_code": "timeout"}
+
+    monkeypatch.setattr(garanzia3_service, "register_warranty", register_warranty)
+    monkeypatch.setattr(settings, "WARRANTY_REGISTRATION_MAX_ATTEMPTS", 5)
+
+    assert crud_warranty_registration.run_pending(db)["failed"] == 1
+    registration = db.query(WarrantyRegistration).one()
+    assert (registration.status, registration.error_code) == ("failed", "G3_TIMEOUT")